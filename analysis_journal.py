@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Journal of a competitor_research.py run
+Kept free of the analysis dependencies so the research orchestrator and other
+tools can check for an interrupted run without importing the researcher.
+"""
+
+import json
+import os
+from datetime import datetime
+
+class AnalysisJournal:
+    """Append-only JSON Lines record of a competitor run, written as each site finishes
+
+    The first line holds the run's inputs, then one line per analysed URL and a
+    final line once the reports are written. A run killed part-way through can
+    be resumed from the journal, re-analysing only the URLs it never finished.
+    """
+    
+    FILENAME = 'competitor_analysis_journal.jsonl'
+    
+    def __init__(self, folder_name):
+        self.path = os.path.join(folder_name, '02_market_research', self.FILENAME)
+        self.run = None
+        self.results = {}
+        self.complete = False
+    
+    def load(self):
+        """Read an existing journal, returning False if there is none"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                if record.get('type') == 'run':
+                    self.run, self.results, self.complete = record, {}, False
+                elif record.get('type') == 'result':
+                    self.results[record['url']] = record['analysis']
+                elif record.get('type') == 'complete':
+                    self.complete = True
+        return self.run is not None
+    
+    def start(self, timestamp, business_description, competitor_urls, target_keywords):
+        """Begin a new journal for this run's inputs (replaces any previous journal)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.run = {
+            'type': 'run',
+            'timestamp': timestamp,
+            'business_description': business_description,
+            'competitor_urls': competitor_urls,
+            'target_keywords': target_keywords
+        }
+        self.results = {}
+        self.complete = False
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.run) + '\n')
+    
+    def _append(self, record):
+        line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+        with open(self.path, 'a+b') as f:
+            # Start on a fresh line if a crash left the last record half-written
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def record(self, url, analysis):
+        """Persist one finished analysis before moving on"""
+        self.results[url] = analysis
+        self._append({'type': 'result', 'url': url, 'analysis': analysis})
+    
+    def mark_complete(self):
+        self.complete = True
+        self._append({'type': 'complete', 'completed_at': datetime.now().isoformat()})
+    
+    def pending_urls(self):
+        """Run URLs without a successful analysis (failed sites are retried on resume)"""
+        return [url for url in self.run['competitor_urls']
+                if url not in self.results or 'error' in self.results[url]]
+    
+    def ordered_results(self):
+        """Journaled analyses in the run's URL order"""
+        return [self.results[url] for url in self.run['competitor_urls'] if url in self.results]
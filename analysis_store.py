@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Versioned JSON snapshots of conversion optimization analyses
+A snapshot holds everything a report renders from: the CRO/SEO sections, the
+ranked recommendations and the measured page weight. Snapshots are keyed by
+the SHA-256 of the fetched page together with its URL, the analysis settings
+and the rule set, next to the response cache's bodies, so identical content is
+not analysed twice, and any report format can be re-rendered from a snapshot
+without fetching or analysing the page again.
+
+Layout:
+    <cache_dir>/analyses/<sha256 of page body, URL, settings and rules>.json
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from http_cache import DEFAULT_TTL_SECONDS
+
+# Bump when the snapshot layout changes; older snapshots are then re-analysed rather than misread
+ANALYSIS_VERSION = 1
+ANALYSES_DIRNAME = 'analyses'
+
+def content_hash(content):
+    """SHA-256 of a page body (str bodies are hashed as UTF-8)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def snapshot_key(content_sha256, url, settings, rules):
+    """Snapshot name for one page body analysed at one URL with given settings and rules"""
+    identity = json.dumps([content_sha256, url, settings, rules], sort_keys=True, default=str)
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+def save_analysis(document, path):
+    """Write a snapshot atomically so readers never see a partial file"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def load_analysis(path):
+    """Read a snapshot, refusing ones written in another layout version"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('version') != ANALYSIS_VERSION:
+        raise ValueError(f"{path} is analysis version {document.get('version')}, expected {ANALYSIS_VERSION}")
+    return document
+
+class AnalysisStore:
+    """Analysis snapshots keyed by the content hash, URL, settings and rules they were made from"""
+
+    def __init__(self, cache_dir, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.directory = os.path.join(cache_dir, ANALYSES_DIRNAME)
+        self.ttl_seconds = ttl_seconds
+
+    def path(self, content_sha256, url, settings, rules):
+        return os.path.join(self.directory, f"{snapshot_key(content_sha256, url, settings, rules)}.json")
+
+    def lookup(self, content_sha256, url, settings, rules):
+        """The stored analysis of identical content at url with these settings and rules, or None if it has expired
+
+        Link health and asset sizes can change while the page does not, so
+        snapshots expire with the response cache's TTL.
+        """
+        try:
+            document = load_analysis(self.path(content_sha256, url, settings, rules))
+        except (OSError, ValueError):
+            return None
+        if (document.get('url'), document.get('settings'), document.get('rules')) != (url, settings, rules):
+            return None
+        if time.time() - document.get('saved_at', 0) > self.ttl_seconds:
+            return None
+        return document
+
+    def store(self, document):
+        document = dict(document, saved_at=time.time())
+        return save_analysis(document, self.path(document['content_sha256'], document['url'],
+                                                 document['settings'], document['rules']))
+
+    def prune(self):
+        """Remove snapshots past their TTL"""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
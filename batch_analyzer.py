@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Batch Conversion Optimization Analysis
+Usage: python batch_analyzer.py urls.txt [--fetch-workers 8] [--processes 4] [--client NAME]
+       cat urls.txt | python batch_analyzer.py -
+
+Fetches a list of landing pages concurrently, analyses them in a process pool
+(parsing and the CRO/SEO frameworks are CPU-bound), writes one PDF report per
+URL and a combined comparison table, and reports throughput in pages/minute.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from html_parser import parse_html
+
+from conversion_optimization_agent import ConversionOptimizationAgent
+from http_cache import HttpCache, OfflineCacheMiss, DEFAULT_CACHE_DIRNAME, client_cache_dir
+from http_client import get_http_client, UserAgentRotation
+
+COMPARISON_FIELDS = ['url', 'title', 'cro_issues', 'seo_issues', 'total_issues', 'high_priority',
+                     'word_count', 'images_missing_alt', 'schema_blocks', 'page_size_kb', 'report', 'error']
+
+def read_urls(lines, fix_typos=None):
+    """URLs from a list file: one per line, blank lines and # comments skipped, duplicates dropped"""
+    urls = []
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith('#'):
+            continue
+        if fix_typos:
+            url = fix_typos(url)
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        if urlparse(url).netloc and url not in urls:
+            urls.append(url)
+    return urls
+
+def report_slug(url):
+    """Filesystem-safe name for a URL's report"""
+    parsed = urlparse(url)
+    slug = re.sub(r'[^a-z0-9]+', '_', f"{parsed.netloc}{parsed.path}".lower()).strip('_')
+    return slug[:80] or 'page'
+
+def analyze_markup(url, content, report_path, agent_options=None):
+    """Parse a fetched page, run both frameworks and write its PDF (runs in a worker process)
+
+    agent_options are ConversionOptimizationAgent keyword arguments (cache, link checks, asset audit).
+    """
+    start = time.perf_counter()
+    agent = ConversionOptimizationAgent(**(agent_options or {}))
+    agent.url = url
+    agent.soup = parse_html(content)
+    agent.html_bytes = len(content)
+    cro = agent.analyze_cro_framework(verbose=False)
+    seo = agent.analyze_seo_framework(verbose=False)
+    # Ranked once here; the PDF renders the same ranking
+    agent.recommendations = recommendations = agent.generate_recommendations()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pdf_file = agent.generate_pdf_report(report_path)
+
+    cro_issues = sum(len(data.get('issues', [])) for data in cro.values())
+    seo_issues = sum(len(data.get('issues', [])) for data in seo.values())
+    return {
+        'url': url,
+        'title': (seo['meta_tags']['title'] or '').strip(),
+        'cro_issues': cro_issues,
+        'seo_issues': seo_issues,
+        'total_issues': cro_issues + seo_issues,
+        'high_priority': len(recommendations['high_priority']),
+        'word_count': seo['content_quality']['word_count'],
+        'images_missing_alt': seo['images']['missing_alt'],
+        'schema_blocks': seo['schema_markup']['schema_found'],
+        'page_size_kb': seo['page_weight']['page_size_kb'],
+        'report': pdf_file or '',
+        'error': '' if pdf_file else 'PDF generation failed',
+        'analysis_seconds': time.perf_counter() - start
+    }
+
+class BatchAnalyzer:
+    """Fetches pages on a thread pool and hands each one to a process pool as soon as it arrives"""
+
+    def __init__(self, urls, output_dir='.', fetch_workers=8, processes=None,
+                 cache_dir=DEFAULT_CACHE_DIRNAME, offline=False, check_links=False, audit_assets=False):
+        self.urls = urls
+        self.output_dir = output_dir
+        self.fetch_workers = fetch_workers
+        self.processes = processes or os.cpu_count() or 1
+        self.http_cache = HttpCache(cache_dir, offline=offline)
+        self.http_client = get_http_client()
+        self.fetch_strategy = UserAgentRotation()
+        self.agent_options = {'cache_dir': cache_dir, 'offline': offline,
+                              'check_links': check_links, 'audit_assets': audit_assets}
+        self.results = []
+
+    def cached_get(self, url, headers, timeout, retry=True):
+        """GET through the batch's shared cache, so hit/miss counts cover the whole batch"""
+        return self.http_cache.fetch(url, headers=headers, timeout=timeout, session=self.http_client,
+                                     retry=retry, allow_redirects=True, page=True)
+
+    def fetch(self, url):
+        """Fetch one page through the cache and the agent's user-agent fallbacks (runs in a worker thread)
+
+        Returns (url, content, detail): detail is the error when content is None,
+        otherwise where the page came from.
+        """
+        start = time.perf_counter()
+        try:
+            response = self.fetch_strategy.fetch(url, self.cached_get)
+        except OfflineCacheMiss:
+            return url, None, 'Not in cache (run once without --offline)'
+        except requests.exceptions.HTTPError as e:
+            return url, None, f"HTTP {e.response.status_code}"
+        except Exception as e:
+            return url, None, str(e)
+
+        if 'html' not in response.headers.get('Content-Type', 'text/html').lower():
+            return url, None, 'Not an HTML page'
+        source = 'cache' if getattr(response, 'from_cache', False) else f"{time.perf_counter() - start:.1f}s"
+        return url, response.content, source
+
+    def record(self, result):
+        """Store a finished page and print its outcome"""
+        self.results.append(result)
+        if result['error']:
+            print(f"  ⚠️  [{len(self.results)}/{len(self.urls)}] {result['url']} - {result['error']}")
+        else:
+            print(f"  ✅ [{len(self.results)}/{len(self.urls)}] {result['url']} - "
+                  f"{result['total_issues']} issues, report: {os.path.basename(result['report'])}")
+
+    def failed(self, url, error):
+        """Result row for a page that could not be analysed"""
+        row = {field: '' for field in COMPARISON_FIELDS}
+        row.update({'url': url, 'error': error})
+        return row
+
+    def run(self):
+        """Fetch and analyse every URL, returning one result row per URL in input order"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        print(f"📋 {len(self.urls)} URLs | {self.fetch_workers} fetch threads | {self.processes} analysis processes")
+        report_paths = {url: os.path.join(self.output_dir, f"{i:03d}_{report_slug(url)}.pdf")
+                        for i, url in enumerate(self.urls, 1)}
+        batch_start = time.perf_counter()
+
+        # Spawned workers: forking while fetch threads hold locks can deadlock the child
+        context = multiprocessing.get_context('spawn')
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetchers, \
+                ProcessPoolExecutor(max_workers=self.processes, mp_context=context) as analysers:
+            fetches = {fetchers.submit(self.fetch, url) for url in self.urls}
+            analyses = {}
+            pending = set(fetches)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetches:
+                        url, content, detail = future.result()
+                        if content is None:
+                            self.record(self.failed(url, detail))
+                            continue
+                        print(f"  📥 Fetched {url} ({len(content) / 1024:.0f}KB, {detail})")
+                        analysis = analysers.submit(analyze_markup, url, content, report_paths[url], self.agent_options)
+                        analyses[analysis] = url
+                        pending.add(analysis)
+                    else:
+                        try:
+                            self.record(future.result())
+                        except Exception as e:
+                            self.record(self.failed(analyses[future], f"Analysis failed: {e}"))
+
+        self.elapsed = time.perf_counter() - batch_start
+        print(f"🗄️  {self.http_cache.summary()}")
+        if not self.http_cache.offline:
+            self.http_cache.prune()
+        order = {url: i for i, url in enumerate(self.urls)}
+        self.results.sort(key=lambda result: order[result['url']])
+        return self.results
+
+    def save_comparison(self):
+        """Write the comparison table as markdown and CSV, returning both paths"""
+        report_path = os.path.join(self.output_dir, 'batch_comparison.md')
+        csv_path = os.path.join(self.output_dir, 'batch_comparison.csv')
+        analysed = [result for result in self.results if not result['error']]
+        ranked = sorted(analysed, key=lambda result: -result['total_issues'])
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("# Batch Conversion Optimization Comparison\n\n")
+            f.write(f"**Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"**Pages Analysed**: {len(analysed)} of {len(self.results)}\n\n")
+            f.write("| Rank | URL | Title | CRO Issues | SEO Issues | Total | Words | Images Missing Alt | Schema | Report |\n")
+            f.write("|------|-----|-------|------------|------------|-------|-------|--------------------|--------|--------|\n")
+            for rank, result in enumerate(ranked, 1):
+                title = result['title'].replace('|', '/')[:60]
+                f.write(f"| {rank} | {result['url']} | {title} | {result['cro_issues']} | {result['seo_issues']} | "
+                        f"{result['total_issues']} | {result['word_count']} | {result['images_missing_alt']} | "
+                        f"{result['schema_blocks']} | {os.path.basename(result['report'])} |\n")
+
+            failed = [result for result in self.results if result['error']]
+            if failed:
+                f.write("\n## Pages That Could Not Be Analysed\n\n")
+                for result in failed:
+                    f.write(f"- {result['url']}: {result['error']}\n")
+
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COMPARISON_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.results)
+
+        print(f"✅ Comparison table saved: {report_path}")
+        print(f"✅ Comparison data saved: {csv_path}")
+        return report_path, csv_path
+
+    def print_summary(self):
+        """Print throughput for the batch"""
+        analysed = sum(1 for result in self.results if not result['error'])
+        rate = analysed / self.elapsed * 60 if self.elapsed else 0
+        print(f"\n🏁 Analysed {analysed}/{len(self.results)} pages in {self.elapsed:.1f}s ({rate:.0f} pages/min)")
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Analyse a list of landing pages without prompting')
+    parser.add_argument('url_file', help='File with one URL per line, or - to read from stdin')
+    parser.add_argument('--fetch-workers', type=int, default=8, help='Pages downloaded in parallel')
+    parser.add_argument('--processes', type=int, default=None, help='Analysis processes (default: CPU count)')
+    parser.add_argument('--output-dir', help='Where reports go (default: a timestamped batch folder)')
+    parser.add_argument('--client', help='Client name - cache and reports go in that client\'s project folder')
+    parser.add_argument('--cache-dir', help='Directory for the HTTP response cache')
+    parser.add_argument('--offline', action='store_true', help='Replay cached pages only (no network requests)')
+    parser.add_argument('--check-links', action='store_true', help='Check every linked URL for errors, redirects and slow responses')
+    parser.add_argument('--audit-assets', action='store_true',
+                        help='Measure the size of every image, script, stylesheet and font on each page')
+    args = parser.parse_args(argv)
+
+    if args.url_file == '-':
+        lines = sys.stdin.readlines()
+    else:
+        with open(args.url_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+    print("🚀 Batch Conversion Optimization Analysis")
+    print("=" * 50)
+    urls = read_urls(lines, ConversionOptimizationAgent().fix_url_typos)
+    if not urls:
+        print("❌ No URLs found")
+        return None
+
+    cache_dir = args.cache_dir or (client_cache_dir(args.client) if args.client else DEFAULT_CACHE_DIRNAME)
+    batch_folder = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    output_dir = args.output_dir or (os.path.join(os.path.dirname(client_cache_dir(args.client)), '08_reporting', batch_folder)
+                                     if args.client else batch_folder)
+
+    batch = BatchAnalyzer(urls, output_dir=output_dir, fetch_workers=args.fetch_workers,
+                          processes=args.processes, cache_dir=cache_dir, offline=args.offline,
+                          check_links=args.check_links, audit_assets=args.audit_assets)
+    batch.run()
+    batch.print_summary()
+    batch.save_comparison()
+    return batch
+
+if __name__ == "__main__":
+    main()
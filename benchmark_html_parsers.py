@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on saved landing pages
+Usage: python benchmark_html_parsers.py [page.html ...] [--runs 10]
+Times parsing alone and parsing + the conversion agent's CRO/SEO frameworks
+for every installed backend, and reports the speedup over html.parser.
+"""
+
+import argparse
+import statistics
+import time
+
+from conversion_optimization_agent import ConversionOptimizationAgent
+from html_parser import available_parsers, parse_html
+
+DEFAULT_PAGES = ['reality-events-balloon-garland-landing.html']
+
+def time_runs(func, runs):
+    """Median seconds over several runs"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def analyse(markup, parser):
+    """Parse a page and run both frameworks, as a single-page agent run does"""
+    agent = ConversionOptimizationAgent()
+    agent.url = 'https://example.com/landing-page'
+    agent.soup = parse_html(markup, parser)
+    agent.analyze_cro_framework(verbose=False)
+    agent.analyze_seo_framework(verbose=False)
+
+def benchmark_page(path, runs):
+    """Parse and analysis timings for one page, per backend"""
+    with open(path, 'rb') as f:
+        markup = f.read()
+
+    results = {}
+    for parser in available_parsers():
+        results[parser] = {
+            'parse': time_runs(lambda: parse_html(markup, parser), runs),
+            'analysis': time_runs(lambda: analyse(markup, parser), runs)
+        }
+    return len(markup), results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends')
+    parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES, help='Saved HTML pages to parse')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per measurement (median is reported)')
+    args = parser.parse_args()
+
+    print("⏱️  HTML Parser Benchmark")
+    print("=" * 70)
+    print(f"Backends installed: {', '.join(available_parsers())}")
+
+    for path in args.pages:
+        size, results = benchmark_page(path, args.runs)
+        baseline = results['html.parser']
+        print(f"\n📄 {path} ({size / 1024:.0f}KB, median of {args.runs} runs)")
+        print(f"{'Backend':<14}{'Parse (ms)':>12}{'Speedup':>10}{'Parse+analyse (ms)':>22}{'Speedup':>10}")
+        for name, timing in results.items():
+            print(f"{name:<14}{timing['parse'] * 1000:>12.1f}{baseline['parse'] / timing['parse']:>9.1f}x"
+                  f"{timing['analysis'] * 1000:>22.1f}{baseline['analysis'] / timing['analysis']:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the analysis hot paths
+Usage: python benchmark_suite.py [--quick] [--save-baseline] [--threshold 0.2]
+
+Runs competitor analysis, the conversion agent's CRO/SEO frameworks and rule
+engine and the markdown exporters against fixture pages and documents (no network needed),
+records ops/sec, peak memory and retained allocations, and compares them
+with benchmark_baseline.json. Exits non-zero if anything regressed by more
+than the threshold. Baselines are machine-specific: save one on the machine
+that runs the comparison.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from competitor_research import EnhancedCompetitorResearcher
+from conversion_optimization_agent import ConversionOptimizationAgent
+from cro_rules import RULES, RuleSet, default_rules
+from html_parser import get_parser_name, parse_html
+from simple_document_exporter import SimpleDocumentExporter, parse_markdown, DOCX_AVAILABLE, PDF_AVAILABLE
+
+if DOCX_AVAILABLE:
+    from docx import Document
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_FILE = os.path.join(BASE_DIR, 'benchmark_baseline.json')
+DEFAULT_THRESHOLD = 0.20
+
+HTML_FIXTURES = {
+    'landing_page': os.path.join(BASE_DIR, 'reality-events-balloon-garland-landing.html'),
+    'service_page': os.path.join(BASE_DIR, 'benchmark_fixtures', 'service_page.html'),
+}
+
+MARKDOWN_FIXTURES = {
+    'optimization_recommendations': os.path.join(BASE_DIR, 'exports', 'leap_centre_optimization_recommendations.md'),
+    'testing_framework': os.path.join(BASE_DIR, 'client_projects', 'ongoing_clients', 'reality_events',
+                                      'claude_code_analysis', 'reality_events_Focused_Testing_Framework.md'),
+}
+
+# Synthetic rules added to the real ones to time a large rule set (they share the real rules' tags)
+EXTRA_RULES = 300
+
+# Synthetic pages built by repeating the landing page body up to these sizes
+SYNTHETIC_SIZES = {'synthetic_1mb': 1024 * 1024, 'synthetic_10mb': 10 * 1024 * 1024}
+
+# Each benchmark runs in several timed rounds and reports its best round, which keeps
+# scheduler noise out of the comparison (large inputs still run at least once per round)
+ROUNDS = 5
+MIN_ROUND_SECONDS = 0.2
+MAX_RUNS_PER_ROUND = 20
+
+def scale_page(html, target_bytes):
+    """Repeat the page body until the document reaches target_bytes"""
+    head, _, rest = html.partition('<body')
+    body = '<body' + rest.rsplit('</body>', 1)[0]
+    body_open, _, body_inner = body.partition('>')
+    copies = max(1, (target_bytes - len(head)) // max(1, len(body_inner)))
+    return f"{head}{body_open}>{body_inner * copies}</body></html>"
+
+def load_fixtures(quick=False):
+    """HTML and markdown fixtures keyed by name"""
+    pages = {}
+    for name, path in HTML_FIXTURES.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[name] = f.read()
+    for name, size in SYNTHETIC_SIZES.items():
+        if quick and size > 1024 * 1024:
+            continue
+        pages[name] = scale_page(pages['landing_page'], size)
+
+    documents = {}
+    for name, path in MARKDOWN_FIXTURES.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            documents[name] = f.read()
+    return pages, documents
+
+class FixtureFetcher:
+    """Stands in for the HTTP cache so competitor analysis reads a fixture instead of the network"""
+    offline = True
+
+    def __init__(self, html):
+        self.html = html
+
+    def fetch(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self.html.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8', 'Server': 'nginx'})
+        response.elapsed = timedelta(seconds=0.3)
+        return response
+
+def competitor_benchmark(html):
+    """enhanced_website_analysis on one fixture page"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        researcher = EnhancedCompetitorResearcher('benchmark_client')
+    researcher.http_cache = FixtureFetcher(html)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = researcher.enhanced_website_analysis('https://competitor.example.com/', waited=0)
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+    return run
+
+def agent_benchmark(html, framework):
+    """One of the agent's frameworks on an already parsed fixture page"""
+    agent = ConversionOptimizationAgent()
+    agent.url = 'https://www.example.com/landing-page'
+    agent.soup = parse_html(html)
+    method = getattr(agent, framework)
+    return lambda: method(verbose=False)
+
+def rules_benchmark(html):
+    """Every CRO/SEO rule evaluated against an already parsed fixture page (the agent memoizes this per page)"""
+    soup = parse_html(html)
+    rules = default_rules()
+    return lambda: rules.evaluate(soup, 'https://www.example.com/landing-page')
+
+def many_rules_benchmark(html):
+    """The real rules plus EXTRA_RULES synthetic ones, evaluated in one pass over an already parsed page"""
+    soup = parse_html(html)
+    rules = RuleSet(RULES + [{'id': f'extra_{i}', 'area': 'extra', 'select': f'a[href*=/page-{i}], img[src*=.gif]',
+                              'measure': 'count', 'test': ('>', 0), 'issue': 'Extra {value}'}
+                             for i in range(EXTRA_RULES)])
+    return lambda: rules.evaluate(soup, 'https://www.example.com/landing-page')
+
+def exporter_benchmark(markdown, output_format, work_dir):
+    """Markdown to HTML, Word or PDF conversion for one fixture document"""
+    exporter = SimpleDocumentExporter('benchmark_client', work_dir)
+    if output_format == 'html':
+        return lambda: exporter._markdown_to_html(markdown)
+    if output_format == 'pdf':
+        return lambda: exporter._render_pdf(parse_markdown(markdown), os.path.join(work_dir, 'benchmark.pdf'))
+    return lambda: exporter._convert_markdown_to_word(markdown, Document())
+
+def build_benchmarks(pages, documents, work_dir):
+    """Benchmark name -> setup function returning the callable to time
+
+    Setup is deferred so only one benchmark's parsed page is alive at a time;
+    a parsed 10MB page left in memory would slow every later benchmark's GC.
+    """
+    benchmarks = {}
+    for name, html in pages.items():
+        benchmarks[f"competitor.enhanced_website_analysis[{name}]"] = lambda html=html: competitor_benchmark(html)
+        benchmarks[f"agent.analyze_cro_framework[{name}]"] = lambda html=html: agent_benchmark(html, 'analyze_cro_framework')
+        benchmarks[f"agent.analyze_seo_framework[{name}]"] = lambda html=html: agent_benchmark(html, 'analyze_seo_framework')
+        benchmarks[f"rules.evaluate[{name}]"] = lambda html=html: rules_benchmark(html)
+        benchmarks[f"rules.evaluate_{EXTRA_RULES}_extra[{name}]"] = lambda html=html: many_rules_benchmark(html)
+    for name, markdown in documents.items():
+        benchmarks[f"exporter.parse_markdown[{name}]"] = lambda md=markdown: (lambda: parse_markdown(md))
+        benchmarks[f"exporter.markdown_to_html[{name}]"] = lambda md=markdown: exporter_benchmark(md, 'html', work_dir)
+        if DOCX_AVAILABLE:
+            benchmarks[f"exporter.markdown_to_word[{name}]"] = lambda md=markdown: exporter_benchmark(md, 'word', work_dir)
+        if PDF_AVAILABLE:
+            benchmarks[f"exporter.markdown_to_pdf[{name}]"] = lambda md=markdown: exporter_benchmark(md, 'pdf', work_dir)
+    return benchmarks
+
+def measure(func):
+    """Best-round ops/sec, then peak memory and retained blocks from one traced run"""
+    func()  # warm-up: caches, imports and lazily compiled patterns
+
+    best_rate, total_runs, total_elapsed = 0.0, 0, 0.0
+    for _ in range(ROUNDS):
+        runs, elapsed = 0, 0.0
+        while runs < MAX_RUNS_PER_ROUND and (elapsed < MIN_ROUND_SECONDS or runs < 1):
+            start = time.perf_counter()
+            func()
+            elapsed += time.perf_counter() - start
+            runs += 1
+        best_rate = max(best_rate, runs / elapsed)
+        total_runs += runs
+        total_elapsed += elapsed
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return {
+        'ops_per_sec': round(best_rate, 3),
+        'mean_ms': round(total_elapsed / total_runs * 1000, 2),
+        'runs': total_runs,
+        'peak_kb': round(peak / 1024, 1),
+        'retained_blocks': retained
+    }
+
+def run_suite(quick=False, only=None):
+    """Run every benchmark (optionally filtered by substring), returning name -> metrics"""
+    pages, documents = load_fixtures(quick)
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, setup in build_benchmarks(pages, documents, work_dir).items():
+            if only and only not in name:
+                continue
+            results[name] = measure(setup())
+            gc.collect()
+            metrics = results[name]
+            print(f"  {name:<62}{metrics['ops_per_sec']:>10.2f} ops/s{metrics['peak_kb']:>12.0f} KB peak"
+                  f"{metrics['retained_blocks']:>9} blocks")
+    return results
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions beyond threshold as (benchmark, metric, baseline value, current value) tuples"""
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        if metrics['ops_per_sec'] < previous['ops_per_sec'] * (1 - threshold):
+            regressions.append((name, 'ops_per_sec', previous['ops_per_sec'], metrics['ops_per_sec']))
+        # Tiny memory figures are noise, so only flag growth above 64KB
+        if metrics['peak_kb'] > max(previous['peak_kb'] * (1 + threshold), previous['peak_kb'] + 64):
+            regressions.append((name, 'peak_kb', previous['peak_kb'], metrics['peak_kb']))
+        if metrics['retained_blocks'] > max(previous['retained_blocks'] * (1 + threshold), previous['retained_blocks'] + 100):
+            regressions.append((name, 'retained_blocks', previous['retained_blocks'], metrics['retained_blocks']))
+    return regressions
+
+def save_baseline(results, path=DEFAULT_BASELINE_FILE):
+    """Write results as the new baseline"""
+    baseline = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'html_parser': get_parser_name(),
+        'benchmarks': results
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"✅ Baseline saved: {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for the analysis hot paths')
+    parser.add_argument('--quick', action='store_true', help='Skip the 10MB synthetic page')
+    parser.add_argument('--only', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_FILE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Record this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed regression as a fraction (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print("⏱️  Analysis Benchmark Suite")
+    print("=" * 70)
+    print(f"HTML parser: {get_parser_name()} | python-docx: {'yes' if DOCX_AVAILABLE else 'not installed (Word export skipped)'}")
+    results = run_suite(quick=args.quick, only=args.only)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, metric, before, after in regressions:
+            print(f"   • {name} {metric}: {before} → {after}")
+        return 1
+
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} against baseline from {baseline.get('created')}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
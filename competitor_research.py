@@ -2,30 +2,111 @@
 
 """
 Enhanced PPC Competitor Research Script
-Usage: python competitor_research.py "Client Name"
+Usage: python competitor_research.py "Client Name" [--resume] [--full-analysis]
 Provides detailed, actionable insights for PPC campaigns
 """
 
-import requests
 import json
 import time
 import csv
 from datetime import datetime
 import os
 import sys
+import argparse
 from urllib.parse import urlparse, urljoin, parse_qs, urlunparse
 import re
-from bs4 import BeautifulSoup
+from html_parser import parse_html
 import collections
+import statistics
+from page_features import get_page_features
+from signature_matcher import get_signature_registry
+from http_cache import HttpCache, DEFAULT_CACHE_DIRNAME
+from http_client import get_http_client
+from analysis_journal import AnalysisJournal
+from competitor_store import CompetitorStore, client_store_path, snapshot_time
+from content_fingerprint import content_fingerprint
+from keyword_engine import PhraseMatrix, STOP_WORDS, client_keyword_settings
+from keyword_expansion import expand_keywords, write_ads_editor_csv
+from search_term_ngrams import load_ngram_stats, write_ngram_report
+from negative_conflicts import NegativeMatcher, find_conflicts, load_negatives, negative_keyword_files
+from page_weight import audit_page, get_asset_sizer, page_weight_fields, write_waterfall_report
+import threading
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Fields compared between runs in the change report: (analysis key, label, separator for multi-value fields)
+CHANGE_REPORT_FIELDS = [
+    ('title_tag', 'Title', None),
+    ('calls_to_action', 'CTAs', ' | '),
+    ('pricing_mentions', 'Pricing', ' | '),
+    ('tracking_stack', 'Tracking stack', ', ')
+]
+
+# keyword_opportunities source for n-grams of the client's search terms that spend without converting
+NEGATIVE_SOURCE = 'Negative keyword (search terms)'
+
+class HostThrottle:
+    """Space out requests to the same host for single-page analyses run outside analyze_competitors"""
+    
+    def __init__(self, delay_seconds):
+        self.delay_seconds = delay_seconds
+        self._lock = threading.Lock()
+        self._next_slot = {}
+    
+    def wait(self, url):
+        """Block until this host may be requested again, returns seconds waited"""
+        host = urlparse(url).netloc.lower()
+        
+        # Reserve the next free slot for this host so concurrent workers queue up politely
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay_seconds
+        
+        waited = slot - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
 
 class EnhancedCompetitorResearcher:
-    def __init__(self, client_name):
+    def __init__(self, client_name, max_workers=6, politeness_delay=3, offline=False,
+                 store_path=None, full_analysis=False):
         self.client_name = client_name
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Find existing client folder or create sanitized name
         self.folder_name = self.find_existing_folder(client_name)
         
+        # Concurrent fetch settings - the delay applies per host, not globally
+        self.max_workers = max_workers
+        self.throttle = HostThrottle(politeness_delay)
+        self.url_timings = {}
+        self._timings_lock = threading.Lock()
+        
+        # Responses are cached under the client folder and revalidated on each run
+        self.http_cache = HttpCache(os.path.join(self.folder_name, DEFAULT_CACHE_DIRNAME), offline=offline)
+        self.http_client = get_http_client()
+        
+        # Asset sizes share the cache folder; each page's audit feeds the page weight waterfall report
+        self.asset_cache_dir = self.http_cache.cache_dir
+        self.page_weights = {}
+        
+        # Every run's analyses are kept in a history store in the client folder, next to the journal
+        self.store = CompetitorStore(store_path or client_store_path(self.folder_name))
+        self.store_client = os.path.basename(os.path.normpath(self.folder_name))
+        
+        # Pages whose fingerprint matches the previous run reuse its analysis unless full_analysis is set
+        self.full_analysis = full_analysis
+        self.previous_analyses = {}
+        self.unchanged_urls = set()
+        
+        # Visible text of each analysed page feeds the TF-IDF keyword engine
+        self.keyword_settings = client_keyword_settings(self.folder_name)
+        self.page_texts = {}
+        
+        # Wasted-spend n-grams from the client's search-term exports (05_historical_data/)
+        self.negative_candidates = []
+        
         self.results = {
             'competitors': [],
             'ad_copy_analysis': [],
@@ -79,8 +160,20 @@ class EnhancedCompetitorResearcher:
         
         print(f"✅ Detailed analysis saved: {filepath}")
     
-    def enhanced_website_analysis(self, url):
-        """Comprehensive website analysis with actionable insights"""
+    def save_snapshot(self, analyses):
+        """Store this run's analyses and write enhanced_competitor_analysis_<timestamp>.csv from the store"""
+        if not analyses:
+            print(f"⚠️  No data to save for enhanced_competitor_analysis_{self.timestamp}.csv")
+            return
+        
+        self.store.save_run(self.store_client, self.timestamp, analyses)
+        filepath = f"{self.folder_name}/02_market_research/enhanced_competitor_analysis_{self.timestamp}.csv"
+        self.store.export_csv(self.store_client, self.timestamp, filepath)
+        print(f"🗃️  Snapshot stored in {self.store.path} (client '{self.store_client}')")
+        print(f"✅ Detailed analysis saved: {filepath}")
+    
+    def enhanced_website_analysis(self, url, waited=None):
+        """Comprehensive website analysis with actionable insights (waited: politeness wait already served)"""
         try:
             print(f"🔍 Deep analysis of {url}...")
             
@@ -88,15 +181,34 @@ class EnhancedCompetitorResearcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            if waited is None:
+                # Offline replay sends no requests, so there is nothing to be polite about
+                waited = 0 if self.http_cache.offline else self.throttle.wait(url)
+            fetch_start = time.perf_counter()
+            response = self.http_cache.fetch(url, headers=headers, timeout=15, session=self.http_client, page=True)
             html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
+            analysis_start = time.perf_counter()
+            soup = parse_html(html)
+            fingerprint = content_fingerprint(soup, html)
+            
+            # An unchanged page keeps its analysis and page weight, so its assets are not sized again
+            previous = self.previous_analyses.get(url)
+            if not self.full_analysis and previous and previous.get('content_fingerprint') == fingerprint:
+                analysis = self.reuse_analysis(previous, url, soup, response)
+                self.record_timing(url, waited, analysis_start - fetch_start, time.perf_counter() - analysis_start)
+                return analysis
+            
+            with self._timings_lock:
+                self.page_texts[url] = get_page_features(soup).text
+            weight = self.measure_page_weight(url, soup, response)
             
             analysis = {
                 'competitor_url': url,
                 'domain_authority_proxy': self.estimate_domain_strength(url, response),
                 'page_load_time': round(response.elapsed.total_seconds(), 2),
-                'page_size_kb': round(len(html) / 1024, 2),
+                
+                # Page weight: HTML plus every image, script, stylesheet and font it loads
+                **weight,
                 
                 # SEO & Content Analysis
                 'title_tag': self.extract_title(soup),
@@ -137,15 +249,131 @@ class EnhancedCompetitorResearcher:
                 # PPC Readiness
                 'ppc_landing_quality': self.assess_ppc_readiness(soup),
                 'conversion_funnel': self.map_conversion_funnel(soup),
-                'ad_compliance_issues': self.check_ad_compliance(soup)
+                'ad_compliance_issues': self.check_ad_compliance(soup),
+                
+                # Change detection for the next recrawl
+                'content_fingerprint': fingerprint
             }
             
+            self.record_timing(url, waited, analysis_start - fetch_start, time.perf_counter() - analysis_start)
             return analysis
             
         except Exception as e:
             print(f"❌ Error analyzing {url}: {str(e)}")
             return {'competitor_url': url, 'error': str(e)}
     
+    def reuse_analysis(self, previous, url, soup, response):
+        """Previous analysis of an unchanged page, with this fetch's response time and domain strength
+
+        Its page weight is reused too, unless it was stored before page weights were measured.
+        """
+        print(f"♻️  {url} unchanged since the last run - reusing its analysis")
+        with self._timings_lock:
+            self.unchanged_urls.add(url)
+        analysis = dict(previous)
+        analysis.update({
+            'domain_authority_proxy': self.estimate_domain_strength(url, response),
+            'page_load_time': round(response.elapsed.total_seconds(), 2),
+        })
+        if 'page_size_kb' not in previous:
+            analysis.update(self.measure_page_weight(url, soup, response))
+        return analysis
+    
+    def measure_page_weight(self, url, soup, response):
+        """Size every asset the page loads (cached sizes only when offline) and return the summary fields"""
+        sizer = get_asset_sizer(self.asset_cache_dir, offline=self.http_cache.offline)
+        audit = audit_page(soup, response.url or url, len(response.content), sizer)
+        with self._timings_lock:
+            self.page_weights[url] = audit
+        return page_weight_fields(audit)
+    
+    def record_timing(self, url, wait_seconds, fetch_seconds, analysis_seconds):
+        """Record per-URL timing (safe to call from worker threads)"""
+        with self._timings_lock:
+            self.url_timings[url] = {
+                'wait': round(wait_seconds, 2),
+                'fetch': round(fetch_seconds, 2),
+                'analysis': round(analysis_seconds, 2),
+                'total': round(wait_seconds + fetch_seconds + analysis_seconds, 2)
+            }
+    
+    def analyze_competitors(self, competitor_urls, journal=None):
+        """Analyze competitor URLs concurrently, returning results in input order
+
+        With a journal, each result is written to disk as soon as it completes.
+        """
+        if not competitor_urls:
+            return []
+        
+        self.url_timings = {}
+        self.unchanged_urls = set()
+        results = [None] * len(competitor_urls)
+        workers = max(1, min(self.max_workers, len(competitor_urls)))
+        delay = 0 if self.http_cache.offline else self.throttle.delay_seconds
+        crawl_start = time.perf_counter()
+        
+        # One queue per host; a host's next URL is only submitted once its politeness slot is due,
+        # so pool workers never sit sleeping while other hosts have work ready
+        host_queues = collections.OrderedDict()
+        for index, url in enumerate(competitor_urls):
+            host_queues.setdefault(urlparse(url).netloc.lower(), collections.deque()).append(index)
+        
+        now = time.monotonic()
+        due_hosts = [(now, order, host, now) for order, host in enumerate(host_queues)]
+        heapq.heapify(due_hosts)
+        in_flight = {}
+        completed = 0
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while due_hosts or in_flight:
+                now = time.monotonic()
+                while due_hosts and due_hosts[0][0] <= now and len(in_flight) < workers:
+                    _, order, host, ready_at = heapq.heappop(due_hosts)
+                    index = host_queues[host].popleft()
+                    future = executor.submit(self.enhanced_website_analysis, competitor_urls[index], now - ready_at)
+                    in_flight[future] = (index, order, host, now)
+                
+                if not in_flight:
+                    # Every remaining host is waiting on its politeness delay
+                    time.sleep(max(0, due_hosts[0][0] - now))
+                    continue
+                
+                timeout = None
+                if due_hosts and len(in_flight) < workers:
+                    timeout = max(0, due_hosts[0][0] - now)
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index, order, host, started = in_flight.pop(future)
+                    results[index] = future.result()
+                    if journal:
+                        journal.record(competitor_urls[index], results[index])
+                    completed += 1
+                    print(f"📊 Completed {completed}/{len(competitor_urls)}: {competitor_urls[index]}")
+                    if host_queues[host]:
+                        heapq.heappush(due_hosts, (started + delay, order, host, time.monotonic()))
+        
+        self.print_timing_report(competitor_urls, time.perf_counter() - crawl_start)
+        print(f"🗄️  {self.http_cache.summary()}")
+        if not self.http_cache.offline:
+            self.http_cache.prune()
+        return results
+    
+    def print_timing_report(self, competitor_urls, wall_seconds):
+        """Print per-URL fetch and analysis timings"""
+        self.print_step("Crawl Timing")
+        for url in competitor_urls:
+            timing = self.url_timings.get(url)
+            if timing:
+                reused = ' (unchanged, analysis reused)' if url in self.unchanged_urls else ''
+                print(f"⏱️  {url}: wait {timing['wait']}s | fetch {timing['fetch']}s | "
+                      f"analysis {timing['analysis']}s | total {timing['total']}s{reused}")
+            else:
+                print(f"⏱️  {url}: failed before timing was recorded")
+        
+        busy_seconds = sum(t['fetch'] + t['analysis'] for t in self.url_timings.values())
+        print(f"🏁 Wall clock: {wall_seconds:.1f}s for {busy_seconds:.1f}s of fetch + analysis work")
+    
     def estimate_domain_strength(self, url, response):
         """Estimate domain authority based on various signals"""
         signals = {
@@ -162,39 +390,33 @@ class EnhancedCompetitorResearcher:
     
     def extract_title(self, soup):
         """Extract and clean page title"""
-        title_tag = soup.find('title')
-        return title_tag.get_text().strip() if title_tag else None
+        features = get_page_features(soup)
+        title_tag = features.find('title')
+        return features.element_text(title_tag).strip() if title_tag else None
     
     def extract_meta_description(self, soup):
         """Extract meta description"""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = get_page_features(soup).find('meta', attrs={'name': 'description'})
         return meta_desc.get('content', '').strip() if meta_desc else None
     
     def extract_headings(self, soup, tag):
         """Extract all headings of specified tag"""
-        headings = soup.find_all(tag)
-        return [h.get_text().strip() for h in headings if h.get_text().strip()]
+        features = get_page_features(soup)
+        texts = (features.element_text(h).strip() for h in features.find_all(tag))
+        return [text for text in texts if text]
     
     def count_words(self, soup):
         """Count words in main content"""
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text = soup.get_text()
-        words = len(text.split())
-        return words
+        # Page text already excludes script and style elements
+        return get_page_features(soup).word_count
     
     def extract_content_themes(self, soup):
         """Identify main content themes and topics"""
         # Get all text from paragraphs and headings
-        content_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        all_text = ' '.join([elem.get_text() for elem in content_elements])
-        
-        # Common words to filter out
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can', 'may', 'might', 'must', 'shall', 'this', 'that', 'these', 'those', 'a', 'an'}
+        all_text = get_page_features(soup).section_text('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
         
         words = re.findall(r'\b[a-zA-Z]{3,}\b', all_text.lower())
-        word_counts = collections.Counter([w for w in words if w not in stop_words])
+        word_counts = collections.Counter([w for w in words if w not in STOP_WORDS])
         
         # Return top themes
         top_themes = [word for word, count in word_counts.most_common(10) if count >= 3]
@@ -203,18 +425,19 @@ class EnhancedCompetitorResearcher:
     def extract_key_phrases(self, soup):
         """Extract key phrases that might be used in ads"""
         phrases = []
+        features = get_page_features(soup)
         
         # Look for phrases in headings
-        headings = soup.find_all(['h1', 'h2', 'h3'])
+        headings = features.find_all('h1', 'h2', 'h3')
         for heading in headings:
-            text = heading.get_text().strip()
+            text = features.element_text(heading).strip()
             if 5 <= len(text) <= 60:  # Good length for ad headlines
                 phrases.append(text)
         
         # Look for phrases in strong/em tags
-        emphasis = soup.find_all(['strong', 'em', 'b'])
+        emphasis = features.find_all('strong', 'em', 'b')
         for em in emphasis:
-            text = em.get_text().strip()
+            text = features.element_text(em).strip()
             if 5 <= len(text) <= 60:
                 phrases.append(text)
         
@@ -223,22 +446,24 @@ class EnhancedCompetitorResearcher:
     def extract_ctas(self, soup):
         """Extract call-to-action buttons and links"""
         ctas = []
+        features = get_page_features(soup)
         
         # Look for button elements
-        buttons = soup.find_all(['button', 'input'])
+        buttons = features.find_all('button', 'input')
         for button in buttons:
-            text = button.get('value') or button.get_text()
+            text = button.get('value') or features.element_text(button)
             if text and text.strip():
                 ctas.append(text.strip())
         
         # Look for CTA-like links
-        links = soup.find_all('a')
+        links = features.find_all('a')
         cta_keywords = ['book', 'buy', 'order', 'contact', 'call', 'get', 'start', 'try', 'download', 'sign up', 'learn more', 'discover', 'shop', 'hire']
         
         for link in links:
-            text = link.get_text().strip().lower()
+            link_text = features.element_text(link).strip()
+            text = link_text.lower()
             if any(keyword in text for keyword in cta_keywords) and len(text) <= 50:
-                ctas.append(link.get_text().strip())
+                ctas.append(link_text)
         
         # Remove duplicates and return top CTAs
         unique_ctas = list(dict.fromkeys(ctas))[:10]
@@ -246,52 +471,46 @@ class EnhancedCompetitorResearcher:
     
     def check_mobile_viewport(self, soup):
         """Check for mobile viewport meta tag"""
-        viewport = soup.find('meta', attrs={'name': 'viewport'})
+        viewport = get_page_features(soup).find('meta', attrs={'name': 'viewport'})
         return bool(viewport)
     
     def detect_structured_data(self, html):
         """Detect structured data/schema markup"""
-        schema_indicators = [
-            'application/ld+json',
-            'schema.org',
-            'itemscope',
-            'itemtype',
-            'itemprop'
-        ]
-        return any(indicator in html for indicator in schema_indicators)
+        return bool(get_signature_registry().detect(html, 'structured_data'))
     
     def extract_canonical(self, soup):
         """Extract canonical URL"""
-        canonical = soup.find('link', attrs={'rel': 'canonical'})
+        canonical = get_page_features(soup).find('link', rel='canonical')
         return canonical.get('href') if canonical else None
     
     def analyze_contact_methods(self, soup):
         """Analyze available contact methods"""
         contact_methods = []
+        features = get_page_features(soup)
         
         # Phone numbers
         phone_pattern = r'(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})'
-        if re.search(phone_pattern, soup.get_text()):
+        if re.search(phone_pattern, features.text):
             contact_methods.append('Phone')
         
         # Email addresses
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        if re.search(email_pattern, soup.get_text()):
+        if re.search(email_pattern, features.text):
             contact_methods.append('Email')
         
         # Contact forms
-        if soup.find('form'):
+        if features.find('form'):
             contact_methods.append('Contact Form')
         
         # Social media links
         social_platforms = ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 'tiktok']
         for platform in social_platforms:
-            if soup.find('a', href=re.compile(platform, re.I)):
+            if features.find('a', href=re.compile(platform, re.I)):
                 contact_methods.append(f'{platform.title()}')
         
         # Chat widgets
         chat_indicators = ['chat', 'messenger', 'intercom', 'zendesk', 'tawk']
-        page_text = soup.get_text().lower()
+        page_text = features.text_lower
         for indicator in chat_indicators:
             if indicator in page_text:
                 contact_methods.append('Live Chat')
@@ -302,7 +521,7 @@ class EnhancedCompetitorResearcher:
     def identify_trust_signals(self, soup):
         """Identify trust signals on the page"""
         trust_signals = []
-        page_text = soup.get_text().lower()
+        page_text = get_page_features(soup).text_lower
         
         # Testimonials/Reviews
         review_keywords = ['testimonial', 'review', 'customer says', 'client says', 'rated', 'stars']
@@ -343,7 +562,7 @@ class EnhancedCompetitorResearcher:
             r'[\d,]+ dollars?',       # Written dollar amounts
         ]
         
-        page_text = soup.get_text()
+        page_text = get_page_features(soup).text
         found_prices = []
         for pattern in price_patterns:
             matches = re.findall(pattern, page_text, re.IGNORECASE)
@@ -360,7 +579,7 @@ class EnhancedCompetitorResearcher:
             'custom': ['custom pricing', 'quote', 'contact for price']
         }
         
-        page_text_lower = page_text.lower()
+        page_text_lower = get_page_features(soup).text_lower
         for strategy, keywords in pricing_keywords.items():
             if any(keyword in page_text_lower for keyword in keywords):
                 pricing_info.append(f"{strategy.title()} positioning")
@@ -370,7 +589,8 @@ class EnhancedCompetitorResearcher:
     def identify_social_proof(self, soup):
         """Identify social proof elements"""
         social_proof = []
-        page_text = soup.get_text()
+        features = get_page_features(soup)
+        page_text = features.text
         
         # Look for numbers that indicate scale
         number_patterns = [
@@ -388,60 +608,27 @@ class EnhancedCompetitorResearcher:
                     social_proof.append(match)
         
         # Look for testimonial indicators
-        if soup.find_all(text=re.compile(r'".*"', re.DOTALL)):
+        quote_pattern = re.compile(r'".*"', re.DOTALL)
+        if any(quote_pattern.search(string) for string in features.strings):
             social_proof.append('Customer testimonials present')
         
         # Look for logo sections (client logos)
-        if soup.find('img', alt=re.compile('client|partner|customer', re.I)):
+        if features.find('img', alt=re.compile('client|partner|customer', re.I)):
             social_proof.append('Client logos displayed')
         
         return ' | '.join(social_proof[:5]) if social_proof else 'Limited social proof'
     
     def comprehensive_tracking_analysis(self, html):
         """Comprehensive analysis of tracking and marketing tools"""
-        tracking_tools = []
-        
-        tracking_patterns = {
-            'Google Analytics': [r'gtag\(["\']config["\']', r'ga\(["\']create["\']', r'googletagmanager'],
-            'Facebook Pixel': [r'fbq\(["\']init["\']', r'facebook\.com/tr'],
-            'Google Ads': [r'gtag\(["\']config["\'],\s*["\']AW-', r'google_conversion'],
-            'LinkedIn Insight': [r'_linkedin_partner_id', r'snap\.licdn\.com'],
-            'Twitter Ads': [r'twq\(', r'analytics\.twitter\.com'],
-            'TikTok Pixel': [r'ttq\.', r'analytics\.tiktok\.com'],
-            'Hotjar': [r'hj\(', r'hotjar\.com'],
-            'Klaviyo': [r'klaviyo', r'_learnq'],
-            'Mailchimp': [r'mailchimp', r'mc\.us\d+\.list-manage'],
-            'HubSpot': [r'hubspot', r'hs-analytics'],
-            'Intercom': [r'intercom', r'widget\.intercom'],
-            'Shopify': [r'shopify', r'cdn\.shopify\.com'],
-        }
-        
-        for tool, patterns in tracking_patterns.items():
-            if any(re.search(pattern, html, re.IGNORECASE) for pattern in patterns):
-                tracking_tools.append(tool)
-        
+        tracking_tools = get_signature_registry().detect(html, 'tracking')
         return ', '.join(tracking_tools) if tracking_tools else 'Basic tracking only'
     
     def detect_cms_detailed(self, html, headers):
         """Detailed CMS and platform detection"""
-        html_lower = html.lower()
-        
-        platforms = {
-            'WordPress': ['wp-content', 'wp-includes', 'wordpress'],
-            'Shopify': ['shopify', 'cdn.shopify.com'],
-            'Squarespace': ['squarespace', 'static1.squarespace'],
-            'Wix': ['wix.com', '_wixCIDX'],
-            'Webflow': ['webflow', 'assets.website-files.com'],
-            'Drupal': ['drupal', '/sites/default/'],
-            'Joomla': ['joomla', '/media/jui/'],
-            'Magento': ['magento', 'var/view_preprocessed'],
-            'BigCommerce': ['bigcommerce', 'cdn11.bigcommerce'],
-            'WooCommerce': ['woocommerce', 'wc-'],
-        }
-        
-        for platform, indicators in platforms.items():
-            if any(indicator in html_lower for indicator in indicators):
-                return platform
+        # Platforms are listed in priority order in tool_signatures.json
+        platforms = get_signature_registry().detect(html, 'cms')
+        if platforms:
+            return platforms[0]
         
         # Check server headers
         server = headers.get('server', '').lower()
@@ -456,29 +643,13 @@ class EnhancedCompetitorResearcher:
     
     def identify_third_party_tools(self, html):
         """Identify third-party tools and services"""
-        tools = []
-        
-        tool_patterns = {
-            'Live Chat': [r'tawk\.to', r'intercom', r'zendesk', r'livechat'],
-            'Email Marketing': [r'mailchimp', r'klaviyo', r'constant-contact', r'mailerlite'],
-            'Reviews': [r'trustpilot', r'yelp', r'google.*reviews'],
-            'Booking System': [r'calendly', r'acuity', r'bookingkit', r'appointlet'],
-            'Payment Processing': [r'stripe', r'paypal', r'square', r'braintree'],
-            'Social Media': [r'instagram.*embed', r'facebook.*plugin', r'twitter.*widget'],
-            'Analytics': [r'hotjar', r'crazy.*egg', r'mouseflow', r'fullstory'],
-            'A/B Testing': [r'optimizely', r'google.*optimize', r'unbounce', r'vwo']
-        }
-        
-        for tool_type, patterns in tool_patterns.items():
-            if any(re.search(pattern, html, re.IGNORECASE) for pattern in patterns):
-                tools.append(tool_type)
-        
+        tools = get_signature_registry().detect(html, 'third_party')
         return ', '.join(tools) if tools else 'Standard tools only'
     
     def identify_unique_features(self, soup):
         """Identify unique features or selling points"""
         features = []
-        page_text = soup.get_text().lower()
+        page_text = get_page_features(soup).text_lower
         
         # Service-specific features for balloon/party industry
         party_features = {
@@ -512,7 +683,7 @@ class EnhancedCompetitorResearcher:
     def identify_content_opportunities(self, soup):
         """Identify content gaps and opportunities"""
         opportunities = []
-        page_text = soup.get_text().lower()
+        page_text = get_page_features(soup).text_lower
         
         # Missing content opportunities for balloon/party industry
         content_gaps = {
@@ -540,25 +711,26 @@ class EnhancedCompetitorResearcher:
     def identify_technical_issues(self, soup, response):
         """Identify technical SEO issues"""
         issues = []
+        features = get_page_features(soup)
         
         # Check basic technical elements
-        if not soup.find('title'):
+        if not features.find('title'):
             issues.append("Missing title tag")
-        elif len(soup.find('title').get_text()) > 60:
+        elif len(features.element_text(features.find('title'))) > 60:
             issues.append("Title tag too long")
         
-        if not soup.find('meta', attrs={'name': 'description'}):
+        if not features.find('meta', attrs={'name': 'description'}):
             issues.append("Missing meta description")
         
         # Check heading structure
-        h1_tags = soup.find_all('h1')
+        h1_tags = features.find_all('h1')
         if len(h1_tags) == 0:
             issues.append("No H1 tag")
         elif len(h1_tags) > 1:
             issues.append("Multiple H1 tags")
         
         # Check images
-        images = soup.find_all('img')
+        images = features.find_all('img')
         images_without_alt = [img for img in images if not img.get('alt')]
         if len(images_without_alt) > 3:
             issues.append(f"{len(images_without_alt)} images missing alt text")
@@ -568,7 +740,7 @@ class EnhancedCompetitorResearcher:
             issues.append(f"Slow loading ({response.elapsed.total_seconds():.1f}s)")
         
         # Check mobile viewport
-        if not soup.find('meta', attrs={'name': 'viewport'}):
+        if not features.find('meta', attrs={'name': 'viewport'}):
             issues.append("Missing mobile viewport")
         
         return ' | '.join(issues) if issues else 'No major technical issues'
@@ -577,20 +749,21 @@ class EnhancedCompetitorResearcher:
         """Assess how ready the site is for PPC traffic"""
         readiness_score = 0
         max_score = 10
+        features = get_page_features(soup)
         
         factors = {
-            'Clear CTA': bool(soup.find_all(['button', 'input']) or 
-                            [link for link in soup.find_all('a') if any(cta in link.get_text().lower() 
+            'Clear CTA': bool(features.find_all('button', 'input') or 
+                            [link for link in features.find_all('a') if any(cta in features.element_text(link).lower() 
                             for cta in ['contact', 'book', 'call', 'buy'])]),
-            'Contact Info': bool(re.search(r'(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', soup.get_text())),
-            'Trust Signals': 'testimonial' in soup.get_text().lower() or 'review' in soup.get_text().lower(),
-            'Mobile Friendly': bool(soup.find('meta', attrs={'name': 'viewport'})),
+            'Contact Info': bool(re.search(r'(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', features.text)),
+            'Trust Signals': 'testimonial' in features.text_lower or 'review' in features.text_lower,
+            'Mobile Friendly': bool(features.find('meta', attrs={'name': 'viewport'})),
             'Fast Loading': True,  # We'll assume this for now
-            'Clear Value Prop': len(soup.find_all(['h1', 'h2'])) >= 2,
-            'Contact Form': bool(soup.find('form')),
-            'Social Proof': any(word in soup.get_text().lower() for word in ['customers', 'clients', 'events']),
-            'Professional Design': len(soup.find_all('img')) > 3,  # Has images
-            'Clear Navigation': len(soup.find_all('nav')) > 0 or len(soup.find_all('a')) > 5
+            'Clear Value Prop': features.count('h1', 'h2') >= 2,
+            'Contact Form': bool(features.find('form')),
+            'Social Proof': any(word in features.text_lower for word in ['customers', 'clients', 'events']),
+            'Professional Design': features.count('img') > 3,  # Has images
+            'Clear Navigation': features.count('nav') > 0 or features.count('a') > 5
         }
         
         readiness_score = sum(factors.values())
@@ -610,24 +783,25 @@ class EnhancedCompetitorResearcher:
     def map_conversion_funnel(self, soup):
         """Map the conversion funnel"""
         funnel_elements = []
+        features = get_page_features(soup)
         
         # Entry points
-        if soup.find_all('a'):
+        if features.count('a'):
             funnel_elements.append("Entry: Navigation links")
         
         # Information gathering
-        if soup.find_all(['h2', 'h3']):
+        if features.count('h2', 'h3'):
             funnel_elements.append("Info: Service descriptions")
         
         # Trust building
-        if 'testimonial' in soup.get_text().lower() or 'review' in soup.get_text().lower():
+        if 'testimonial' in features.text_lower or 'review' in features.text_lower:
             funnel_elements.append("Trust: Customer reviews")
         
         # Contact methods
         contact_methods = []
-        if soup.find('form'):
+        if features.find('form'):
             contact_methods.append("Contact form")
-        if re.search(r'(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', soup.get_text()):
+        if re.search(r'(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', features.text):
             contact_methods.append("Phone number")
         if contact_methods:
             funnel_elements.append(f"Convert: {', '.join(contact_methods)}")
@@ -637,7 +811,7 @@ class EnhancedCompetitorResearcher:
     def check_ad_compliance(self, soup):
         """Check for potential ad compliance issues"""
         issues = []
-        page_text = soup.get_text().lower()
+        page_text = get_page_features(soup).text_lower
         
         # Check for superlative claims that might need substantiation
         superlatives = ['best', 'number one', '#1', 'top rated', 'fastest', 'cheapest', 'guaranteed']
@@ -757,78 +931,194 @@ class EnhancedCompetitorResearcher:
                 'priority': 'High'
             })
         
+        # Page weight, measured from every asset each page loads (see measure_page_weight)
+        page_weights = [analysis['page_size_kb'] for analysis in all_analyses
+                        if 'error' not in analysis and analysis.get('page_size_kb') and analysis.get('unmeasured_assets') == 0]
+        if page_weights:
+            median_kb = statistics.median(page_weights)
+            client_audit = self.page_weights.get(self.keyword_settings.get('website'))
+            finding = f"Median competitor page weight: {median_kb:,.0f}KB"
+            opportunity = f"Keep landing pages under {median_kb:,.0f}KB so they load faster than the competition"
+            if client_audit and client_audit['measured'] == client_audit['asset_count']:
+                client_kb = client_audit['total_bytes'] / 1024
+                finding += f" (your site: {client_kb:,.0f}KB)"
+                if client_kb > median_kb:
+                    opportunity = f"Trim {client_kb - median_kb:,.0f}KB from your page - see page_weight_{self.timestamp}.md"
+            insights.append({
+                'insight_type': 'Page Weight',
+                'finding': finding,
+                'opportunity': opportunity,
+                'priority': 'Medium'
+            })
+        
+        # Spend the client's own search terms wasted (see analyze_search_term_waste)
+        if self.negative_candidates:
+            top_waste = self.negative_candidates[:3]
+            insights.append({
+                'insight_type': 'Search Term Waste',
+                'finding': "No conversions from " + ', '.join(
+                    f"'{row['ngram']}' ({row['cost']:,.2f} spent)" for row in top_waste),
+                'opportunity': 'Add these as negative keywords before bidding on new competitor keywords',
+                'priority': 'High'
+            })
+        
         return insights
     
+    def cached_page(self, url):
+        """Response for a page from the HTTP cache, fetched if it has never been cached (None offline)"""
+        entry = self.http_cache.lookup(url)
+        if entry is not None:
+            return self.http_cache.build_response(entry)
+        # The client's own site has not been fetched by this researcher before
+        if self.http_cache.offline:
+            return None
+        return self.http_cache.fetch(url, timeout=15, session=self.http_client, page=True)
+    
+    def page_text(self, url):
+        """Visible text of a page, from this run or else from the HTTP cache (None if unavailable)"""
+        if url in self.page_texts:
+            return self.page_texts[url]
+        try:
+            response = self.cached_page(url)
+            if response is None:
+                return None
+            text = get_page_features(parse_html(response.text)).text
+        except Exception as e:
+            print(f"⚠️  Could not read {url} for keyword analysis: {e}")
+            return None
+        self.page_texts[url] = text
+        return text
+    
     def generate_keyword_opportunities(self, analyses, target_keywords):
-        """Generate keyword opportunities based on competitor analysis"""
+        """Generate keyword opportunities from TF-IDF phrases across competitor pages and the client's site"""
         self.print_step("Identifying Keyword Opportunities")
         
+        settings = self.keyword_settings
         opportunities = []
-        
-        # Analyze competitor content for keyword ideas
-        all_content_themes = []
-        all_headings = []
-        all_titles = []
-        
+        targeted = ' '.join(target_keywords).lower()
+        suggested = set()
+        negatives = [f" {row['ngram']} " for row in self.negative_candidates]
+        
+        def add(keyword, **details):
+            if keyword.lower() in suggested:
+                return
+            # A suggestion containing a wasted n-gram would only buy the same unconverting clicks again
+            if details['source'] != NEGATIVE_SOURCE and any(negative in f" {keyword.lower()} " for negative in negatives):
+                return
+            suggested.add(keyword.lower())
+            opportunities.append(dict(keyword_opportunity=keyword, **details))
+        
+        # Negative keywords from the client's own search terms come first
+        for row in self.negative_candidates:
+            add(row['ngram'],
+                source=NEGATIVE_SOURCE,
+                frequency=row['search_terms'],
+                suggestion=f"Add as a negative: {row['cost']:,.2f} spent over {row['clicks']} clicks with no conversions",
+                priority='High' if row['cost'] >= 2 * settings['negative_min_cost'] else 'Medium')
+        
+        # Competitor pages (resumed runs read earlier pages back from the HTTP cache) plus the client's site
+        documents = {}
         for analysis in analyses:
             if 'error' not in analysis:
-                if analysis.get('content_themes'):
-                    all_content_themes.extend(analysis['content_themes'].split(', '))
-                if analysis.get('h1_tags'):
-                    all_headings.extend(analysis['h1_tags'])
-                if analysis.get('h2_tags'):
-                    all_headings.extend(analysis['h2_tags'])
-                if analysis.get('title_tag'):
-                    all_titles.append(analysis['title_tag'])
-        
-        # Find common terms
-        all_terms = all_content_themes + [word for heading in all_headings for word in heading.split() if len(word) > 3]
-        term_counter = collections.Counter([term.lower() for term in all_terms])
-        
-        # Generate keyword suggestions
-        common_terms = [term for term, count in term_counter.most_common(15) if count >= 2]
-        
-        for term in common_terms:
-            if term not in ' '.join(target_keywords).lower():
-                opportunities.append({
-                    'keyword_opportunity': term,
-                    'source': 'Competitor content analysis',
-                    'frequency': term_counter[term],
-                    'suggestion': f"Consider targeting '{term}' in campaigns",
-                    'priority': 'High' if term_counter[term] >= 3 else 'Medium'
-                })
-        
-        # Location-based opportunities
-        location_terms = ['brisbane', 'gold coast', 'melbourne', 'sydney', 'queensland', 'australia']
-        for location in location_terms:
+                text = self.page_text(analysis['competitor_url'])
+                if text:
+                    documents[analysis['competitor_url']] = text
+        competitor_urls = list(documents)
+        client_site = settings.get('website')
+        if client_site and client_site not in documents and competitor_urls:
+            text = self.page_text(client_site)
+            if text:
+                documents[client_site] = text
+        
+        if competitor_urls:
+            matrix = PhraseMatrix(documents, ngram_range=tuple(settings['ngram_range']),
+                                  min_document_frequency=settings['min_document_frequency'],
+                                  max_document_share=settings['max_document_share'])
+            
+            # Phrases competitors share that the client's site never uses
+            if client_site in documents:
+                for phrase, weight, used_by in matrix.gaps(client_site, competitor_urls, settings['max_gap_phrases']):
+                    if phrase in targeted:
+                        continue
+                    add(phrase,
+                        source='Gap vs your site',
+                        frequency=used_by,
+                        suggestion=f"{used_by}/{len(competitor_urls)} competitors use '{phrase}' but your site does not",
+                        priority='High' if used_by * 2 >= len(competitor_urls) else 'Medium')
+            
+            # What sets each competitor apart
+            for url in competitor_urls:
+                domain = urlparse(url).netloc
+                for phrase, weight, count in matrix.top_phrases(url, settings['distinctive_per_competitor'],
+                                                                settings['min_phrase_count']):
+                    if phrase in targeted:
+                        continue
+                    add(phrase,
+                        source=f'Distinctive to {domain}',
+                        frequency=count,
+                        suggestion=f"Consider targeting '{phrase}' in campaigns",
+                        priority='Medium')
+        
+        # Location and service modifiers come from the client's business data or config.yaml
+        for location in settings['locations']:
             for keyword in target_keywords:
-                if location not in keyword.lower():
-                    opportunities.append({
-                        'keyword_opportunity': f"{keyword} {location}",
-                        'source': 'Location targeting',
-                        'frequency': 'N/A',
-                        'suggestion': f"Add location modifier to '{keyword}'",
-                        'priority': 'High'
-                    })
-        
-        # Service-specific opportunities
-        balloon_services = ['balloon arch', 'balloon wall', 'balloon bouquet', 'balloon delivery', 'balloon setup', 'balloon styling', 'balloon artist']
-        for service in balloon_services:
-            if not any(service in keyword.lower() for keyword in target_keywords):
-                opportunities.append({
-                    'keyword_opportunity': service,
-                    'source': 'Service expansion',
-                    'frequency': 'N/A',
-                    'suggestion': f"Target '{service}' if you offer this service",
-                    'priority': 'Medium'
-                })
-        
-        return opportunities[:20]  # Return top 20 opportunities
+                if location.lower() not in keyword.lower():
+                    add(f"{keyword} {location.lower()}",
+                        source='Location targeting',
+                        frequency='N/A',
+                        suggestion=f"Add location modifier to '{keyword}'",
+                        priority='High')
+        
+        for service in settings['services']:
+            if not any(service.lower() in keyword.lower() for keyword in target_keywords):
+                add(service.lower(),
+                    source='Service expansion',
+                    frequency='N/A',
+                    suggestion=f"Target '{service.lower()}' if you offer this service",
+                    priority='Medium')
+        
+        return opportunities[:settings['max_opportunities']]
+    
+    def flag_negative_conflicts(self, opportunities):
+        """Mark opportunities the client's existing negative keywords would block, returning how many"""
+        negatives, _ = load_negatives(negative_keyword_files(self.folder_name))
+        if not negatives or not opportunities:
+            return 0
+        
+        matcher = NegativeMatcher(negatives)
+        blocked = 0
+        for opportunity in opportunities:
+            conflicts = []
+            if opportunity['source'] != NEGATIVE_SOURCE:
+                conflicts = find_conflicts(matcher, [{'keyword': opportunity['keyword_opportunity'],
+                                                      'source': opportunity['source']}])
+            opportunity['blocked_by_negative'] = '; '.join(
+                f"{row['negative_keyword']} ({row['negative_match_type']}, {row['campaign'] or 'all campaigns'})"
+                for row in conflicts)
+            blocked += bool(conflicts)
+        if blocked:
+            print(f"🚫 {blocked} keyword opportunities are blocked by existing negative keywords")
+        return blocked
     
-    def run_enhanced_analysis(self):
-        """Run the enhanced competitive analysis"""
+    def run_enhanced_analysis(self, resume=False):
+        """Run the enhanced competitive analysis (resume=True continues the journaled run)"""
         self.print_header(f"Enhanced PPC Competitor Research for {self.client_name}")
         
+        journal = AnalysisJournal(self.folder_name)
+        if resume:
+            if journal.load():
+                if journal.complete:
+                    # Re-running would rebuild every report and retry the sites that failed, so leave it alone
+                    print(f"✅ Run {journal.run['timestamp']} already finished - its reports are in {self.folder_name}")
+                    print("💡 Run without --resume to start a new analysis")
+                    return
+                self.timestamp = journal.run['timestamp']
+                done = len(journal.run['competitor_urls']) - len(journal.pending_urls())
+                print(f"♻️  Resuming run {self.timestamp}: {done}/{len(journal.run['competitor_urls'])} competitors already analysed")
+                self.complete_analysis(journal)
+                return
+            print(f"⚠️  No journal at {journal.path} - starting a new run")
+        
         print("📝 Please provide the following information:")
         
         business_description = input("Business Description: ")
@@ -858,22 +1148,39 @@ class EnhancedCompetitorResearcher:
             print("❌ No competitor URLs provided. Exiting.")
             return
         
-        print(f"\n🚀 Starting enhanced analysis for {len(competitor_urls)} competitors...")
-        print("⏱️  This may take 2-3 minutes for comprehensive analysis...")
+        journal.start(self.timestamp, business_description, competitor_urls, target_keywords)
+        self.complete_analysis(journal)
+    
+    def complete_analysis(self, journal):
+        """Analyse the journal's outstanding URLs, then build every report from the journal"""
+        run = journal.run
+        business_description = run['business_description']
+        target_keywords = run['target_keywords']
+        pending = journal.pending_urls()
+        
+        # The last stored snapshot of each page, before this run, drives change detection
+        self.previous_analyses = {
+            snapshot['url']: snapshot['analysis']
+            for snapshot in self.store.latest(self.store_client, before=snapshot_time(self.timestamp))
+            if not snapshot['error']
+        }
+        
+        if pending:
+            print(f"\n🚀 Starting enhanced analysis for {len(pending)} competitors...")
+            print(f"⚡ Fetching up to {self.max_workers} sites in parallel ({self.throttle.delay_seconds}s delay per host)")
+            print(f"📓 Progress journal: {journal.path}")
+            self.analyze_competitors(pending, journal=journal)
         
-        # Run enhanced analysis
-        enhanced_results = []
-        for i, url in enumerate(competitor_urls, 1):
-            print(f"\n📊 Analyzing competitor {i}/{len(competitor_urls)}: {url}")
-            result = self.enhanced_website_analysis(url)
-            enhanced_results.append(result)
-            
-            # Be respectful with requests
-            if i < len(competitor_urls):
-                time.sleep(3)
+        # Reports cover the whole run, including sites analysed before a resume
+        enhanced_results = journal.ordered_results()
+        
+        # Record the run in the snapshot history, then export its CSV view
+        self.save_snapshot(enhanced_results)
+        changes = self.generate_change_report(enhanced_results)
+        page_weight_report = self.generate_page_weight_report(enhanced_results)
         
-        # Save enhanced results
-        self.save_to_csv(enhanced_results, f'enhanced_competitor_analysis_{self.timestamp}.csv')
+        # Search-term n-grams that cost money without converting
+        self.negative_candidates = self.analyze_search_term_waste()
         
         # Generate competitive insights
         insights = self.generate_competitive_insights(enhanced_results)
@@ -882,9 +1189,13 @@ class EnhancedCompetitorResearcher:
         
         # Generate keyword opportunities
         keyword_opportunities = self.generate_keyword_opportunities(enhanced_results, target_keywords)
+        self.flag_negative_conflicts(keyword_opportunities)
         if keyword_opportunities:
             self.save_to_csv(keyword_opportunities, f'keyword_opportunities_{self.timestamp}.csv')
         
+        # Full keyword expansion for Google Ads Editor
+        expansion_count = self.write_keyword_expansion(target_keywords)
+        
         # Generate actionable summary
         self.generate_actionable_summary(enhanced_results, insights, keyword_opportunities, target_keywords, business_description)
         
@@ -895,6 +1206,153 @@ class EnhancedCompetitorResearcher:
         print(f"   - competitive_insights_{self.timestamp}.csv (strategic insights)")
         print(f"   - keyword_opportunities_{self.timestamp}.csv (keyword suggestions)")
         print(f"   - actionable_summary_{self.timestamp}.md (executive summary)")
+        if changes:
+            print(f"   - competitor_changes_{self.timestamp}.md (what changed since the last run)")
+        if page_weight_report:
+            print(f"   - page_weight_{self.timestamp}.md (page weight and asset waterfalls)")
+        if self.negative_candidates:
+            print(f"   - search_term_ngrams_{self.timestamp}.csv ({len(self.negative_candidates)} negative keyword candidates)")
+        if expansion_count:
+            print(f"   - 06_campaign_structure/keyword_expansion_{self.timestamp}.csv ({expansion_count:,} keywords for Google Ads Editor)")
+        journal.mark_complete()
+    
+    def diff_analyses(self, previous, current):
+        """Changes in the compared fields between two analyses of one page"""
+        changes = []
+        for key, label, separator in CHANGE_REPORT_FIELDS:
+            before, after = previous.get(key) or '', current.get(key) or ''
+            if before == after:
+                continue
+            if separator:
+                before_items = [item for item in before.split(separator) if item]
+                after_items = [item for item in after.split(separator) if item]
+                added = [item for item in after_items if item not in before_items]
+                removed = [item for item in before_items if item not in after_items]
+                if added or removed:
+                    changes.append({'field': label, 'added': added, 'removed': removed})
+            else:
+                changes.append({'field': label, 'before': before, 'after': after})
+        return changes
+    
+    def generate_change_report(self, analyses):
+        """Write competitor_changes_<timestamp>.md for pages that changed since their last snapshot"""
+        changed_pages = []
+        for analysis in analyses:
+            url = analysis['competitor_url']
+            previous = self.previous_analyses.get(url)
+            if 'error' in analysis or not previous:
+                continue
+            fingerprint = analysis.get('content_fingerprint')
+            if fingerprint and fingerprint == previous.get('content_fingerprint'):
+                continue
+            changed_pages.append((url, self.diff_analyses(previous, analysis)))
+        
+        compared = sum(1 for a in analyses if 'error' not in a and a['competitor_url'] in self.previous_analyses)
+        if not compared:
+            return []
+        
+        self.print_step("Detecting Competitor Changes")
+        print(f"🔁 {compared - len(changed_pages)}/{compared} previously analysed pages unchanged")
+        if not changed_pages:
+            return []
+        
+        report_lines = [
+            "# Competitor Changes",
+            f"**Client:** {self.client_name}",
+            f"**Run:** {self.timestamp}",
+            f"**Pages changed:** {len(changed_pages)} of {compared} seen in earlier runs",
+            ""
+        ]
+        for url, changes in changed_pages:
+            report_lines.append(f"## {url}")
+            if not changes:
+                report_lines.append("- Page content changed (title, CTAs, pricing and tracking stack unchanged)")
+            for change in changes:
+                if 'before' in change:
+                    report_lines.append(f"- **{change['field']}:** {change['before'] or '(none)'} → {change['after'] or '(none)'}")
+                    continue
+                if change['added']:
+                    report_lines.append(f"- **{change['field']} added:** {', '.join(change['added'])}")
+                if change['removed']:
+                    report_lines.append(f"- **{change['field']} removed:** {', '.join(change['removed'])}")
+            report_lines.append("")
+        
+        report_path = f"{self.folder_name}/02_market_research/competitor_changes_{self.timestamp}.md"
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(report_lines))
+        
+        print(f"📝 {len(changed_pages)} changed pages reported in: {report_path}")
+        return changed_pages
+    
+    def client_page_weight(self):
+        """Page-weight audit of the client's own website, to compare with competitors (None if unavailable)"""
+        url = self.keyword_settings.get('website')
+        if not url:
+            return None
+        if url not in self.page_weights:
+            try:
+                response = self.cached_page(url)
+                if response is None:
+                    return None
+                sizer = get_asset_sizer(self.asset_cache_dir, offline=self.http_cache.offline)
+                self.page_weights[url] = audit_page(parse_html(response.content), response.url or url,
+                                                    len(response.content), sizer)
+            except Exception as e:
+                print(f"⚠️  Could not measure {url} for the page weight comparison: {e}")
+                return None
+        return self.page_weights[url]
+    
+    def generate_page_weight_report(self, analyses):
+        """Write page_weight_<timestamp>.md with an asset waterfall for the client's site and each competitor"""
+        # Unchanged pages are not audited again, and pages analysed before a resume were audited by
+        # another process, so only the pages audited in this run appear
+        audits = [(analysis['competitor_url'], self.page_weights[analysis['competitor_url']])
+                  for analysis in analyses
+                  if 'error' not in analysis and analysis['competitor_url'] in self.page_weights]
+        if not audits:
+            return None
+        
+        self.print_step("Comparing Page Weight")
+        client_audit = self.client_page_weight()
+        if client_audit:
+            audits.insert(0, (f"{self.client_name} (your site)", client_audit))
+        filepath = f"{self.folder_name}/02_market_research/page_weight_{self.timestamp}.md"
+        write_waterfall_report(audits, filepath, heading=f"Page Weight - {self.client_name}")
+        print(f"⚖️  Asset waterfalls for {len(audits)} pages saved to {filepath}")
+        return filepath
+    
+    def analyze_search_term_waste(self):
+        """Aggregate the client's search-term exports by n-gram and return the negative keyword candidates"""
+        settings = self.keyword_settings
+        try:
+            stats = load_ngram_stats(self.folder_name, tuple(settings['ngram_range']))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not analyse search-term exports: {e}")
+            return []
+        if stats is None:
+            return []
+        
+        self.print_step("Analysing Search Term Waste")
+        filepath = f"{self.folder_name}/02_market_research/search_term_ngrams_{self.timestamp}.csv"
+        candidates = write_ngram_report(stats, filepath, settings['negative_min_cost'],
+                                        settings['negative_min_clicks'], settings['max_negative_candidates'])
+        print(f"🔎 {stats.term_count:,} search terms, {len(stats):,} n-grams: "
+              f"{len(candidates)} negative keyword candidates saved to {filepath}")
+        return candidates
+    
+    def write_keyword_expansion(self, target_keywords):
+        """Stream every keyword x service x location x modifier combination to a Google Ads Editor CSV"""
+        if not target_keywords:
+            return 0
+        settings = self.keyword_settings
+        filepath = f"{self.folder_name}/06_campaign_structure/keyword_expansion_{self.timestamp}.csv"
+        expansions = expand_keywords(target_keywords, settings['services'], settings['locations'],
+                                     settings['intent_modifiers'])
+        count = write_ads_editor_csv(expansions, filepath, f"{self.client_name} - Search",
+                                     settings['expansion_match_types'])
+        print(f"🔀 Keyword expansion: {count:,} unique keywords saved to {filepath}")
+        return count
     
     def generate_actionable_summary(self, analyses, insights, opportunities, keywords, business_desc):
         """Generate an actionable summary report"""
@@ -1032,11 +1490,21 @@ class EnhancedCompetitorResearcher:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Enhanced PPC competitor research')
+    parser.add_argument('client_name', nargs='?', help='Client or business name')
+    parser.add_argument('--offline', action='store_true',
+                        help='Replay cached pages only (no network requests)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the last run from its journal, analysing only unfinished URLs')
+    parser.add_argument('--full-analysis', action='store_true',
+                        help='Re-analyse every page, even ones unchanged since the last run')
+    args = parser.parse_args()
+    
     print("🎯 Enhanced PPC Competitor Research Tool")
     print("=" * 50)
     
-    if len(sys.argv) > 1:
-        client_name = sys.argv[1]
+    if args.client_name:
+        client_name = args.client_name
     else:
         client_name = input("Enter client name: ").strip()
     
@@ -1051,8 +1519,8 @@ def main():
         print("💡 Install it with: pip3 install beautifulsoup4")
         sys.exit(1)
     
-    researcher = EnhancedCompetitorResearcher(client_name)
-    researcher.run_enhanced_analysis()
+    researcher = EnhancedCompetitorResearcher(client_name, offline=args.offline, full_analysis=args.full_analysis)
+    researcher.run_enhanced_analysis(resume=args.resume)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Competitor snapshot store
+Usage: python competitor_store.py [--store PATH] import [client_projects]
+       python competitor_store.py [--store PATH] history <url or domain> [--client NAME] [--since YYYY-MM-DD]
+       python competitor_store.py [--store PATH] latest [--client NAME]
+
+Every competitor analysis row is kept in a SQLite database, keyed by client,
+competitor URL and snapshot time, so "how has this competitor changed" is an
+indexed query instead of re-reading dozens of timestamped CSVs. Each client's
+store lives in its project folder, next to the competitor journal:
+<client>/02_market_research/competitor_snapshots.sqlite. The
+enhanced_competitor_analysis_<timestamp>.csv files are exported from the store
+as a view of one run; `import` backfills each client's store from CSVs already
+on disk. history and latest read one client's store with --client, or every
+client store under the current directory.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from urllib.parse import urlparse
+
+from http_cache import client_cache_dir
+
+STORE_FILENAME = 'competitor_snapshots.sqlite'
+STORE_DIRNAME = '02_market_research'
+RUN_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+CSV_EXPORT_PATTERN = 'enhanced_competitor_analysis_*.csv'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    client TEXT NOT NULL,
+    url TEXT NOT NULL,
+    snapshot_at TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    domain TEXT NOT NULL,
+    error TEXT,
+    title_tag TEXT,
+    total_word_count INTEGER,
+    ppc_readiness INTEGER,
+    tracking_stack TEXT,
+    cms_platform TEXT,
+    pricing_mentions TEXT,
+    content_fingerprint TEXT,
+    analysis TEXT NOT NULL,
+    PRIMARY KEY (client, url, snapshot_at)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_url ON snapshots (url, snapshot_at);
+CREATE INDEX IF NOT EXISTS snapshots_by_domain ON snapshots (domain, snapshot_at);
+CREATE INDEX IF NOT EXISTS snapshots_by_run ON snapshots (client, snapshot_at, position);
+"""
+
+def client_store_path(folder_name):
+    """Store inside a client's project folder, next to its competitor journal"""
+    return os.path.join(folder_name, STORE_DIRNAME, STORE_FILENAME)
+
+def find_store_paths(root='.'):
+    """Every client store under root"""
+    return sorted(glob.glob(os.path.join(root, '**', STORE_DIRNAME, STORE_FILENAME), recursive=True))
+
+def snapshot_time(run_timestamp):
+    """ISO snapshot time for a run timestamp such as 20250618_141949"""
+    return datetime.strptime(run_timestamp, RUN_TIMESTAMP_FORMAT).isoformat()
+
+def _as_int(value):
+    """Integer column value from a live analysis or a CSV cell (None when absent)"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _ppc_readiness(value):
+    """Score out of 10 from 'Good (7/10) - 70% ready'"""
+    match = re.search(r'\((\d+)/\d+\)', value or '')
+    return int(match.group(1)) if match else None
+
+def _domain(url):
+    return urlparse(url).netloc.lower()
+
+class CompetitorStore:
+    """SQLite history of competitor analyses (one client's by default, any number of clients in one file)"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executescript(SCHEMA)
+                # Stores created before change detection lack the fingerprint column
+                columns = {row['name'] for row in conn.execute('PRAGMA table_info(snapshots)')}
+                if 'content_fingerprint' not in columns:
+                    conn.execute('ALTER TABLE snapshots ADD COLUMN content_fingerprint TEXT')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def save_run(self, client, run_timestamp, analyses):
+        """Store one run's analyses in order (re-saving a run replaces its rows)"""
+        snapshot_at = snapshot_time(run_timestamp)
+        rows = []
+        for position, analysis in enumerate(analyses):
+            url = analysis['competitor_url']
+            rows.append((
+                client, url, snapshot_at, position, _domain(url), analysis.get('error'),
+                analysis.get('title_tag'), _as_int(analysis.get('total_word_count')),
+                _ppc_readiness(analysis.get('ppc_landing_quality')), analysis.get('tracking_stack'),
+                analysis.get('cms_platform'), analysis.get('pricing_mentions'),
+                analysis.get('content_fingerprint'), json.dumps(analysis, default=str)
+            ))
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO snapshots (client, url, snapshot_at, position, domain, error, '
+                    'title_tag, total_word_count, ppc_readiness, tracking_stack, cms_platform, '
+                    'pricing_mentions, content_fingerprint, analysis) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        finally:
+            conn.close()
+        return snapshot_at
+
+    def _query(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return [self._snapshot(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _snapshot(row):
+        snapshot = dict(row)
+        snapshot['analysis'] = json.loads(snapshot['analysis'])
+        return snapshot
+
+    def run(self, client, run_timestamp):
+        """Analyses of one run in their original order"""
+        return [s['analysis'] for s in self._query(
+            'SELECT * FROM snapshots WHERE client = ? AND snapshot_at = ? ORDER BY position',
+            (client, snapshot_time(run_timestamp)))]
+
+    def history(self, competitor, client=None, since=None):
+        """Snapshots of a competitor URL (or every page on a domain), oldest first"""
+        column = 'url' if '://' in competitor else 'domain'
+        value = competitor if column == 'url' else competitor.lower()
+        sql = f'SELECT * FROM snapshots WHERE {column} = ?'
+        params = [value]
+        if client:
+            sql += ' AND client = ?'
+            params.append(client)
+        if since:
+            sql += ' AND snapshot_at >= ?'
+            params.append(since)
+        return self._query(sql + ' ORDER BY snapshot_at, client', params)
+
+    def latest(self, client=None, before=None):
+        """Most recent snapshot of every competitor URL (for one client or all of them)
+
+        before (an ISO snapshot time) limits this to snapshots taken earlier, e.g. the
+        previous run's view of each page.
+        """
+        newest = 'SELECT client, url, MAX(snapshot_at) AS snapshot_at FROM snapshots'
+        params = []
+        if before:
+            newest += ' WHERE snapshot_at < ?'
+            params.append(before)
+        sql = f'SELECT s.* FROM snapshots s JOIN ({newest} GROUP BY client, url) newest USING (client, url, snapshot_at)'
+        if client:
+            sql += ' WHERE s.client = ?'
+            params.append(client)
+        return self._query(sql + ' ORDER BY s.client, s.domain, s.url', params)
+
+    def clients(self):
+        conn = self._connect()
+        try:
+            return [row[0] for row in conn.execute('SELECT DISTINCT client FROM snapshots ORDER BY client')]
+        finally:
+            conn.close()
+
+    def export_csv(self, client, run_timestamp, filepath):
+        """Write one run as the enhanced_competitor_analysis CSV, returning False if it has no rows"""
+        analyses = self.run(client, run_timestamp)
+        if not analyses:
+            return False
+
+        # Failed sites only carry url and error, so columns come from every row in first-seen order
+        fieldnames = list(dict.fromkeys(key for analysis in analyses for key in analysis))
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(analyses)
+        return True
+
+    def import_csv(self, filepath, client=None):
+        """Backfill one exported CSV (client defaults to the folder above 02_market_research)"""
+        match = re.search(r'enhanced_competitor_analysis_(\d{8}_\d{6})\.csv$', filepath)
+        if not match:
+            return 0
+        if client is None:
+            client = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(filepath))))
+        with open(filepath, newline='', encoding='utf-8') as csvfile:
+            analyses = [row for row in csv.DictReader(csvfile) if row.get('competitor_url')]
+        for analysis in analyses:
+            if not analysis.get('error'):
+                analysis.pop('error', None)
+        self.save_run(client, match.group(1), analyses)
+        return len(analyses)
+
+    def import_tree(self, root):
+        """Backfill every exported CSV under root, returning (files, rows) imported"""
+        files = rows = 0
+        for filepath in sorted(glob.glob(os.path.join(root, '**', CSV_EXPORT_PATTERN), recursive=True)):
+            imported = self.import_csv(filepath)
+            if imported:
+                files += 1
+                rows += imported
+        return files, rows
+
+def print_snapshots(snapshots):
+    for snapshot in snapshots:
+        if snapshot['error']:
+            print(f"{snapshot['snapshot_at']}  {snapshot['client']:<20} {snapshot['url']}  ❌ {snapshot['error']}")
+            continue
+        readiness = snapshot['ppc_readiness'] if snapshot['ppc_readiness'] is not None else '-'
+        print(f"{snapshot['snapshot_at']}  {snapshot['client']:<20} {snapshot['url']}")
+        print(f"    title: {snapshot['title_tag']}")
+        print(f"    words: {snapshot['total_word_count']} | PPC readiness: {readiness}/10 | "
+              f"CMS: {snapshot['cms_platform']}")
+        print(f"    tracking: {snapshot['tracking_stack']}")
+        print(f"    pricing: {snapshot['pricing_mentions']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the competitor snapshot history')
+    parser.add_argument('--store', help='SQLite store path (default: each client\'s own store)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='Backfill from existing CSV exports')
+    import_parser.add_argument('root', nargs='?', default='client_projects')
+
+    history_parser = commands.add_parser('history', help='Snapshots of one competitor over time')
+    history_parser.add_argument('competitor', help='Competitor URL or domain')
+    history_parser.add_argument('--client')
+    history_parser.add_argument('--since', help='Earliest snapshot date (YYYY-MM-DD)')
+
+    latest_parser = commands.add_parser('latest', help='Latest snapshot of every competitor')
+    latest_parser.add_argument('--client')
+
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        if args.store:
+            store = CompetitorStore(args.store)
+            files, rows = store.import_tree(args.root)
+            print(f"✅ Imported {rows} snapshots from {files} CSV files into {store.path}")
+            return
+        # Each CSV goes into the store of the client folder it was exported to
+        files = rows = 0
+        for filepath in sorted(glob.glob(os.path.join(args.root, '**', CSV_EXPORT_PATTERN), recursive=True)):
+            folder_name = os.path.dirname(os.path.dirname(filepath))
+            imported = CompetitorStore(client_store_path(folder_name)).import_csv(filepath)
+            if imported:
+                files += 1
+                rows += imported
+        print(f"✅ Imported {rows} snapshots from {files} CSV files into each client's store")
+        return
+
+    if args.store:
+        paths = [args.store]
+    elif args.client:
+        folder_name = os.path.dirname(client_cache_dir(args.client))
+        paths = [client_store_path(folder_name)]
+    else:
+        paths = find_store_paths()
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        print("❌ No competitor store found: run competitor_research.py or pass --store")
+        sys.exit(1)
+
+    stores = [CompetitorStore(path) for path in paths]
+    if args.command == 'history':
+        snapshots = sorted((snapshot for store in stores
+                            for snapshot in store.history(args.competitor, since=args.since)),
+                           key=lambda snapshot: (snapshot['snapshot_at'], snapshot['client']))
+        if not snapshots:
+            print(f"⚠️  No snapshots of {args.competitor}")
+            sys.exit(1)
+        print_snapshots(snapshots)
+    else:
+        print_snapshots([snapshot for store in stores for snapshot in store.latest()])
+
+if __name__ == "__main__":
+    main()
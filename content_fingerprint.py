@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Normalised content fingerprints for competitor pages
+A fingerprint hashes what the competitor analysis reads from a page: its
+visible text, the key tags (title, meta description, headings, CTAs, forms,
+images, outbound links) and the detected tool stack. Tokens that change on
+every request without the page changing - times, ISO dates, Unix timestamps,
+nonces and cache-busting query strings - are stripped first, so an unchanged
+page keeps its fingerprint from one weekly recrawl to the next.
+"""
+
+import hashlib
+import re
+from urllib.parse import urlparse
+
+from page_features import get_page_features
+from signature_matcher import get_signature_registry
+
+FINGERPRINT_VERSION = 'v1'
+
+VOLATILE_PATTERNS = [
+    re.compile(r'\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b'),  # ISO dates
+    re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?', re.IGNORECASE),  # clock times
+    re.compile(r'\b1[5-9]\d{8}(?:\d{3})?\b'),  # Unix timestamps in seconds or milliseconds
+    re.compile(r'\b(?=[A-Za-z_-]*\d)(?=[0-9_-]*[A-Za-z])[A-Za-z0-9_-]{20,}\b'),  # nonces, session and build ids
+    re.compile(r'(?:©|\(c\)|copyright)\s*\d{4}(?:\s*[-–]\s*\d{4})?', re.IGNORECASE),  # footer copyright years
+]
+
+# Tags whose counts feed the technical, funnel and readiness checks
+COUNTED_TAGS = ['h1', 'h2', 'h3', 'img', 'form', 'nav', 'a', 'button', 'input']
+
+def normalise_text(text):
+    """Lowercased text with volatile tokens removed and whitespace collapsed"""
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub(' ', text)
+    return ' '.join(text.lower().split())
+
+def _resource(url):
+    """Host and path of a URL, dropping cache-busting query strings and fragments"""
+    parsed = urlparse(url or '')
+    return f"{parsed.netloc.lower()}{parsed.path}"
+
+def content_fingerprint(soup, html):
+    """SHA-256 fingerprint of the page content the competitor analysis depends on"""
+    features = get_page_features(soup)
+    registry = get_signature_registry()
+    parts = [FINGERPRINT_VERSION]
+
+    title = features.find('title')
+    description = features.find('meta', attrs={'name': 'description'})
+    canonical = features.find('link', rel='canonical')
+    parts.append('title:' + normalise_text(features.element_text(title) if title else ''))
+    parts.append('description:' + normalise_text(description.get('content', '') if description else ''))
+    parts.append('canonical:' + _resource(canonical.get('href') if canonical else ''))
+    parts.append('viewport:' + str(bool(features.find('meta', attrs={'name': 'viewport'}))))
+
+    for tag in features.find_all('h1', 'h2', 'h3', 'button'):
+        parts.append(f"{tag.name}:{normalise_text(features.element_text(tag))}")
+    for tag in features.find_all('input'):
+        parts.append('input:' + normalise_text(tag.get('value') or ''))
+
+    counts = {name: features.count(name) for name in COUNTED_TAGS}
+    counts['img_missing_alt'] = sum(1 for img in features.find_all('img') if not img.get('alt'))
+    parts.append('counts:' + ','.join(f"{name}={count}" for name, count in sorted(counts.items())))
+
+    link_hosts = {urlparse(a.get('href') or '').netloc.lower() for a in features.find_all('a')}
+    parts.append('links:' + ','.join(sorted(host for host in link_hosts if host)))
+    scripts = {_resource(script.get('src')) for script in features.find_all('script') if script.get('src')}
+    parts.append('scripts:' + ','.join(sorted(scripts)))
+
+    for category in registry.categories:
+        parts.append(f"{category}:{','.join(registry.detect(html, category))}")
+
+    parts.append('text:' + normalise_text(features.text))
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
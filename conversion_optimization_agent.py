@@ -7,24 +7,61 @@ then generates a PDF report with actionable recommendations.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from html_parser import parse_html
+from page_features import get_page_features
 from urllib.parse import urljoin, urlparse
 import json
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 import os
 import sys
+import argparse
+from xml.sax.saxutils import escape
+from http_cache import HttpCache, OfflineCacheMiss, DEFAULT_CACHE_DIRNAME, client_cache_dir
+from http_client import get_http_client, UserAgentRotation, NotHtmlError
+from link_checker import get_link_checker, link_targets
+from analysis_store import AnalysisStore, ANALYSIS_VERSION, content_hash, load_analysis, save_analysis
+from cro_rules import default_rules, add_issue, add_recommendation, DEFAULT_SCORES
+from page_weight import (audit_page, get_asset_sizer, page_weight_fields, waterfall_markdown, waterfall_rows,
+                         OVERSIZED_IMAGE_KB, HEAVY_PAGE_KB, SCRIPT_MS_PER_KB)
+from simple_document_exporter import SimpleDocumentExporter
+
+REPORT_FORMATS = ['pdf', 'html', 'docx']
+
+EXECUTIVE_SUMMARY = ("This report analyzes your website using a comprehensive 25-point Conversion Rate Optimization (CRO) "
+                     "framework and 11-point SEO optimization checklist. The analysis identifies critical issues affecting "
+                     "user experience and search engine performance, along with actionable recommendations for improvement.")
+
+ROADMAP = [
+    ("Week 1-2: Critical Issues", ["Fix meta titles and descriptions", "Optimize page speed", "Improve mobile experience"]),
+    ("Week 3-4: CRO Improvements", ["Optimize headlines and CTAs", "Add social proof elements", "Simplify forms"]),
+    ("Week 5-8: Content & SEO", ["Improve content structure", "Implement schema markup", "Optimize internal linking"]),
+    ("Ongoing: Testing & Optimization", ["A/B testing", "Performance monitoring", "Weekly optimization reviews"])
+]
 
 class ConversionOptimizationAgent:
-    def __init__(self):
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIRNAME, offline=False, check_links=False, audit_assets=False):
         self.url = None
         self.soup = None
         self.analysis_results = {}
         self.recommendations = []
+        self.http_cache = HttpCache(cache_dir, offline=offline)
+        self.analysis_store = AnalysisStore(cache_dir)
+        self.http_client = get_http_client()
+        self.fetch_strategy = UserAgentRotation()
+        # Link health checks hit every linked URL, so they are opt-in (the command line turns them on)
+        self.check_links = check_links
+        # Likewise asset sizes: without them the page-weight audit only makes its static checks
+        self.audit_assets = audit_assets
+        self.html_bytes = None
+        self._page_weight = None
+        self._rule_report = None
+        self.content_sha256 = None
+        self.analyzed_at = None
         
     def get_url_input(self):
         """Get URL input from user with improved validation and typo correction"""
@@ -88,86 +125,68 @@ class ConversionOptimizationAgent:
         # Return unchanged if no obvious typos found
         return url
                 
+    def fetch_page(self):
+        """Fetch self.url through the response cache, rotating user agents if the site blocks us"""
+        def cached_get(url, headers, timeout, retry=True):
+            return self.http_cache.fetch(url, headers=headers, timeout=timeout, session=self.http_client,
+                                         retry=retry, allow_redirects=True, page=True)
+        
+        return self.fetch_strategy.fetch(self.url, cached_get)
+        
     def scrape_website(self):
         """Scrape and analyze the website content with multiple fallback strategies"""
         print(f"\n🔍 Analyzing website: {self.url}")
         
-        # Multiple user agents to try
-        user_agents = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
-        ]
-        
-        for i, user_agent in enumerate(user_agents):
-            try:
-                headers = {
-                    'User-Agent': user_agent,
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Cache-Control': 'max-age=0'
-                }
-                
-                if i > 0:
-                    print(f"  🔄 Trying fallback method {i}...")
-                
-                # Add session for better handling
-                session = requests.Session()
-                session.headers.update(headers)
-                
-                response = session.get(self.url, timeout=15, allow_redirects=True)
-                response.raise_for_status()
-                
-                self.soup = BeautifulSoup(response.content, 'html.parser')
-                print("✅ Website content retrieved successfully")
-                return True
-                
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    print(f"  ⚠️  Access denied (403) with user agent {i+1}")
-                    continue
-                elif e.response.status_code == 404:
-                    print(f"❌ Page not found (404): {self.url}")
-                    return False
-                else:
-                    print(f"  ⚠️  HTTP error {e.response.status_code}")
-                    continue
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  ⚠️  Request failed: {str(e)}")
-                continue
-        
-        # If all user agents fail, try with minimal headers
         try:
-            print("  🔄 Trying minimal headers approach...")
-            simple_headers = {'User-Agent': 'curl/7.68.0'}
-            response = requests.get(self.url, headers=simple_headers, timeout=10)
-            response.raise_for_status()
+            response = self.fetch_page()
+            if not self.http_cache.offline:
+                self.http_cache.prune()
+                self.analysis_store.prune()
+            
+        except OfflineCacheMiss as e:
+            print(f"❌ {e}")
+            print("💡 Run once without --offline to cache this page")
+            return False
+            
+        except NotHtmlError as e:
+            print(f"❌ {e}")
+            return False
             
-            self.soup = BeautifulSoup(response.content, 'html.parser')
-            print("✅ Website content retrieved successfully (minimal headers)")
-            return True
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 404:
+                print(f"❌ Page not found (404): {self.url}")
+                return False
+            print(f"❌ All methods failed. Final error: {e}")
+            self.print_blocked_suggestions()
+            return False
             
         except Exception as e:
             print(f"❌ All methods failed. Final error: {e}")
-            print("💡 Suggestions:")
-            print("   • The website may have strict bot protection")
-            print("   • Try running the analysis from a different network")
-            print("   • Some sites block automated access entirely")
+            self.print_blocked_suggestions()
             return False
+        
+        self.soup = parse_html(response.content)
+        self.html_bytes = len(response.content)
+        self.content_sha256 = content_hash(response.content)
+        if getattr(response, 'truncated', False):
+            print(f"⚠️  Page is larger than the download limit - analysing the first {len(response.content) // 1048576}MB")
+        if getattr(response, 'from_cache', False):
+            print("✅ Website content loaded from cache")
+        else:
+            print("✅ Website content retrieved successfully")
+        return True
+        
+    def print_blocked_suggestions(self):
+        """Explain why a site may refuse automated requests"""
+        print("💡 Suggestions:")
+        print("   • The website may have strict bot protection")
+        print("   • Try running the analysis from a different network")
+        print("   • Some sites block automated access entirely")
             
-    def analyze_cro_framework(self):
+    def analyze_cro_framework(self, verbose=True):
         """Analyze using the 25-point CRO framework"""
-        print("\n📊 Running CRO Analysis...")
+        if verbose:
+            print("\n📊 Running CRO Analysis...")
         
         cro_analysis = {
             "headline_analysis": self.analyze_headlines(),
@@ -183,14 +202,16 @@ class ConversionOptimizationAgent:
         self.analysis_results['cro'] = cro_analysis
         return cro_analysis
         
-    def analyze_seo_framework(self):
+    def analyze_seo_framework(self, verbose=True):
         """Analyze using the SEO framework"""
-        print("\n🔍 Running SEO Analysis...")
+        if verbose:
+            print("\n🔍 Running SEO Analysis...")
         
         seo_analysis = {
             "meta_tags": self.analyze_meta_tags(),
             "url_structure": self.analyze_url_structure(),
             "images": self.analyze_images(),
+            "page_weight": self.analyze_page_weight(),
             "internal_links": self.analyze_internal_links(),
             "headings": self.analyze_headings(),
             "content_quality": self.analyze_content_quality(),
@@ -200,351 +221,308 @@ class ConversionOptimizationAgent:
         self.analysis_results['seo'] = seo_analysis
         return seo_analysis
         
+    def rule_report(self):
+        """CRO/SEO rule results for the current page, evaluated once per parsed page"""
+        if self._rule_report is None or self._rule_report[0] is not self.soup or self._rule_report[1] != self.url:
+            self._rule_report = (self.soup, self.url, default_rules().evaluate(self.soup, self.url))
+        return self._rule_report[2]
+        
     def analyze_headlines(self):
         """Analyze headlines using 4-U formula"""
-        headlines = []
-        h1_tags = self.soup.find_all('h1')
-        
-        for h1 in h1_tags:
-            if h1.get_text(strip=True):
-                headlines.append(h1.get_text(strip=True))
-                
-        analysis = {
-            "headlines_found": headlines,
-            "count": len(headlines),
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if len(headlines) == 0:
-            analysis["issues"].append("No H1 headlines found")
-            analysis["recommendations"].append("Add a compelling H1 headline using the 4-U formula (Useful, Unique, Urgent, Ultra-specific)")
-        elif len(headlines) > 1:
-            analysis["issues"].append(f"Multiple H1 tags found ({len(headlines)})")
-            analysis["recommendations"].append("Use only one H1 per page for better SEO")
-            
-        return analysis
+        report = self.rule_report()
+        headlines = [text for text in (h1.get_text(strip=True) for h1 in report.matches('h1_missing')) if text]
+        return report.section('headline_analysis', headlines_found=headlines, count=len(headlines))
         
     def analyze_value_proposition(self):
         """Analyze above-fold value proposition"""
-        analysis = {
-            "above_fold_content": [],
-            "issues": [],
-            "recommendations": []
-        }
-        
-        # Look for content that should be above fold
-        main_content = self.soup.find(['main', 'div'], class_=['hero', 'banner', 'main', 'content'])
-        if main_content:
-            text = main_content.get_text(strip=True)[:200]  # First 200 chars
-            analysis["above_fold_content"].append(text)
-        
-        analysis["recommendations"].append("Ensure value proposition is clear above the fold with customer problem focus")
-        return analysis
+        report = self.rule_report()
+        main_content = report.matches('value_proposition')
+        # First 200 chars of the hero/main content block
+        above_fold = [main_content[0].get_text(strip=True)[:200]] if main_content else []
+        return report.section('value_proposition', above_fold_content=above_fold)
         
     def analyze_ctas(self):
         """Analyze Call-to-Action elements"""
-        ctas = []
-        
-        # Look for buttons and links that might be CTAs
-        buttons = self.soup.find_all(['button', 'a'], class_=lambda x: x and any(
-            keyword in str(x).lower() for keyword in ['btn', 'button', 'cta', 'call-to-action']
-        ))
-        
-        for btn in buttons:
-            text = btn.get_text(strip=True)
-            if text:
-                ctas.append(text)
-                
-        analysis = {
-            "ctas_found": ctas,
-            "count": len(ctas),
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if len(ctas) == 0:
-            analysis["issues"].append("No clear CTAs found")
-            
-        # Check for first-person psychology
-        first_person_count = sum(1 for cta in ctas if any(word in cta.lower() for word in ['my', 'i', "i'll"]))
-        
-        analysis["recommendations"].append("Use first-person psychology in CTAs ('Get MY guide' vs 'Get YOUR guide')")
-        analysis["recommendations"].append("Place CTAs in mobile thumb zone for better accessibility")
-        
-        return analysis
+        report = self.rule_report()
+        ctas = [text for text in (button.get_text(strip=True) for button in report.matches('cta_missing')) if text]
+        return report.section('cta_analysis', ctas_found=ctas, count=len(ctas))
         
     def analyze_forms(self):
         """Analyze form complexity"""
-        forms = self.soup.find_all('form')
-        analysis = {
-            "forms_found": len(forms),
-            "field_counts": [],
-            "issues": [],
-            "recommendations": []
-        }
-        
-        for form in forms:
-            inputs = form.find_all(['input', 'select', 'textarea'])
-            field_count = len([inp for inp in inputs if inp.get('type') not in ['hidden', 'submit']])
-            analysis["field_counts"].append(field_count)
-            
-            if field_count > 5:
-                analysis["issues"].append(f"Form has {field_count} fields (recommended max: 5)")
-                
-        analysis["recommendations"].append("Limit forms to maximum 5 fields - every additional field kills conversions")
-        return analysis
+        report = self.rule_report()
+        field_counts = report.value('form_fields')
+        return report.section('form_analysis', forms_found=len(field_counts), field_counts=field_counts)
         
     def analyze_social_proof(self):
         """Analyze social proof elements"""
-        social_proof_elements = []
-        
-        # Look for testimonials, reviews, ratings
-        testimonials = self.soup.find_all(['div', 'section'], class_=lambda x: x and any(
-            keyword in str(x).lower() for keyword in ['testimonial', 'review', 'rating', 'star']
-        ))
-        
-        analysis = {
-            "elements_found": len(testimonials),
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if len(testimonials) == 0:
-            analysis["issues"].append("No clear social proof elements found")
-            
-        analysis["recommendations"].append("Add testimonials with faces/names near CTAs")
-        analysis["recommendations"].append("Include specific results and outcomes in testimonials")
-        
-        return analysis
+        report = self.rule_report()
+        return report.section('social_proof', elements_found=report.value('social_proof_missing'))
         
     def analyze_trust_signals(self):
         """Analyze trust signals"""
-        trust_elements = []
-        
-        # Look for security badges, guarantees, etc.
-        trust_keywords = ['security', 'ssl', 'guarantee', 'certified', 'secure', 'trust', 'badge']
-        
-        for keyword in trust_keywords:
-            elements = self.soup.find_all(text=lambda x: x and keyword.lower() in x.lower())
-            trust_elements.extend(elements)
-            
-        analysis = {
-            "trust_signals_found": len(trust_elements),
-            "recommendations": ["Cluster trust signals (security badges, guarantees, policies) together for maximum impact"]
-        }
-        
-        return analysis
+        report = self.rule_report()
+        return report.section('trust_signals', trust_signals_found=report.value('trust_signals'))
         
     def analyze_mobile_elements(self):
         """Analyze mobile optimization"""
-        viewport_meta = self.soup.find('meta', attrs={'name': 'viewport'})
-        
-        analysis = {
-            "viewport_meta": bool(viewport_meta),
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if not viewport_meta:
-            analysis["issues"].append("No viewport meta tag found")
-            
-        analysis["recommendations"].append("Ensure CTAs are in mobile thumb zone")
-        analysis["recommendations"].append("Test on real devices, not just browser tools")
-        
-        return analysis
+        report = self.rule_report()
+        return report.section('mobile_optimization', viewport_meta=report.value('viewport_missing') > 0)
         
     def analyze_content_structure(self):
         """Analyze content structure and readability"""
-        paragraphs = self.soup.find_all('p')
-        
-        analysis = {
-            "paragraph_count": len(paragraphs),
-            "recommendations": [
-                "Use Grade 6 reading level - smart people prefer simple",
-                "Keep sentences to 11 words maximum",
-                "Use benefit-first language - features tell, benefits sell"
-            ]
-        }
-        
-        return analysis
+        report = self.rule_report()
+        return report.section('content_structure', paragraph_count=get_page_features(self.soup).count('p'))
         
     def analyze_meta_tags(self):
         """Analyze meta tags"""
-        title = self.soup.find('title')
-        description = self.soup.find('meta', attrs={'name': 'description'})
-        
-        analysis = {
-            "title": title.get_text() if title else None,
-            "description": description.get('content') if description else None,
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if not title:
-            analysis["issues"].append("Missing page title")
-        elif title and len(title.get_text()) > 60:
-            analysis["issues"].append("Title too long (over 60 characters)")
-            
-        if not description:
-            analysis["issues"].append("Missing meta description")
-        elif description and len(description.get('content')) > 156:
-            analysis["issues"].append("Meta description too long (over 156 characters)")
-            
-        analysis["recommendations"].append("Include target keyword in title and description")
-        
-        return analysis
+        report = self.rule_report()
+        title = report.matches('title_missing')
+        description = report.matches('description_missing')
+        return report.section('meta_tags', title=title[0].get_text() if title else None,
+                              description=description[0].get('content') if description else None)
         
     def analyze_url_structure(self):
         """Analyze URL structure"""
-        parsed_url = urlparse(self.url)
-        
-        analysis = {
-            "url": self.url,
-            "path_length": len(parsed_url.path),
-            "issues": [],
-            "recommendations": []
-        }
+        report = self.rule_report()
+        return report.section('url_structure', url=self.url, path_length=len(urlparse(self.url).path))
         
-        if len(self.url) > 80:
-            analysis["issues"].append("URL too long (over 80 characters)")
-            
-        if '_' in parsed_url.path:
-            analysis["issues"].append("URL contains underscores")
-            
-        analysis["recommendations"].append("Keep URLs 50-60 characters for optimal SEO")
-        analysis["recommendations"].append("Include target keywords in URL structure")
-        
-        return analysis
+    def page_weight(self):
+        """Asset audit of the current page, made once per parsed page (sizes only when audit_assets is on)"""
+        if self._page_weight is None or self._page_weight[0] is not self.soup:
+            sizer = get_asset_sizer(self.http_cache.cache_dir, offline=self.http_cache.offline) if self.audit_assets else None
+            self._page_weight = (self.soup, audit_page(self.soup, self.url or '', self.html_bytes, sizer))
+        return self._page_weight[1]
         
     def analyze_images(self):
         """Analyze image optimization"""
-        images = self.soup.find_all('img')
+        report = self.rule_report()
+        analysis = report.section('images', image_count=len(report.matches('img_alt_missing')),
+                                  missing_alt=report.value('img_alt_missing'))
+            
+        weight = self.page_weight()
+        if not weight['measured']:
+            add_recommendation(analysis, f"Compress images to under {OVERSIZED_IMAGE_KB}KB each", 'low')
+            add_recommendation(analysis, "Use WebP format instead of large JPEGs or PNGs", 'low')
+        else:
+            oversized, legacy = weight['oversized_images'], weight['legacy_images']
+            analysis["oversized_images"] = [(image['url'], round(image['bytes'] / 1024)) for image in oversized]
+            analysis["legacy_format_images"] = [image['url'] for image in legacy]
+            if oversized:
+                add_issue(analysis, f"{len(oversized)} images over {OVERSIZED_IMAGE_KB}KB "
+                                    f"(largest {round(oversized[0]['bytes'] / 1024)}KB)", 'high',
+                          f"Compress to under {OVERSIZED_IMAGE_KB}KB: " + ", ".join(
+                              f"{url.rsplit('/', 1)[-1]} ({size}KB)" for url, size in analysis["oversized_images"][:3]))
+            if legacy:
+                add_issue(analysis, f"{len(legacy)} images not served as WebP/AVIF", 'medium',
+                          "Serve JPEG/PNG/GIF images as WebP or AVIF, largest first: " + ", ".join(
+                              image['url'].rsplit('/', 1)[-1] for image in legacy[:3]))
+        add_recommendation(analysis, "Include relevant keywords in alt text naturally")
         
-        analysis = {
-            "image_count": len(images),
-            "missing_alt": 0,
-            "issues": [],
-            "recommendations": []
-        }
+        return analysis
         
-        for img in images:
-            if not img.get('alt'):
-                analysis["missing_alt"] += 1
-                
-        if analysis["missing_alt"] > 0:
-            analysis["issues"].append(f"{analysis['missing_alt']} images missing alt text")
-            
-        analysis["recommendations"].append("Compress images to under 200KB each")
-        analysis["recommendations"].append("Use WebP format instead of large JPEGs or PNGs")
-        analysis["recommendations"].append("Include relevant keywords in alt text naturally")
+    def analyze_page_weight(self):
+        """Analyze total page weight, render-blocking resources and third-party scripts"""
+        weight = self.page_weight()
+        analysis = page_weight_fields(weight)
+        analysis.update({"issues": [], "recommendations": [], "scores": {}})
+        
+        if weight['measured'] and weight['total_bytes'] > HEAVY_PAGE_KB * 1024:
+            largest = max(weight['bytes_by_type'], key=weight['bytes_by_type'].get)
+            add_issue(analysis, f"Page weighs {weight['total_bytes'] / 1048576:.1f}MB including assets", 'high',
+                      f"Cut page weight below {HEAVY_PAGE_KB // 1024}MB, starting with {largest}s "
+                      f"({analysis[largest + '_kb']:,.0f}KB)")
+            
+        if weight['render_blocking']:
+            add_issue(analysis, f"{len(weight['render_blocking'])} render-blocking scripts/stylesheets in the page head",
+                      'medium', "Add async or defer to scripts in <head> and inline the critical CSS")
+            
+        third_party = weight['third_party_scripts']
+        script_bytes = sum(entry['bytes'] for entry in third_party)
+        if script_bytes:
+            add_issue(analysis, f"{sum(entry['scripts'] for entry in third_party)} third-party scripts add "
+                                f"{script_bytes / 1024:,.0f}KB (~{script_bytes / 1024 * SCRIPT_MS_PER_KB:,.0f}ms on mobile)", 'medium')
+        if third_party:
+            add_recommendation(analysis, "Review third-party scripts from " + ", ".join(
+                entry['host'] for entry in third_party[:3]) + " and load them after the page is interactive", 'medium')
         
         return analysis
         
     def analyze_internal_links(self):
-        """Analyze internal linking"""
-        links = self.soup.find_all('a', href=True)
-        internal_links = []
-        
-        for link in links:
-            href = link.get('href')
-            if href and (href.startswith('/') or self.url in href):
-                internal_links.append(href)
+        """Analyze internal linking and, when check_links is on, the health of every linked URL"""
+        internal_links, outbound_links = link_targets(self.soup, self.url or '')
                 
-        analysis = {
-            "internal_link_count": len(internal_links),
-            "recommendations": [
-                "Use descriptive anchor text with keywords",
-                "Ensure linked pages are live and not redirected",
-                "Create logical linking structure"
-            ]
-        }
+        analysis = self.rule_report().section('internal_links', internal_link_count=len(internal_links),
+                                              outbound_link_count=len(outbound_links))
+        
+        if not self.check_links:
+            add_recommendation(analysis, "Ensure linked pages are live and not redirected", position=1)
+            return analysis
+            
+        checker = get_link_checker(self.http_cache.cache_dir, offline=self.http_cache.offline)
+        summary = checker.summarize(checker.check(internal_links + outbound_links))
+        analysis.update({
+            "broken_links": summary["broken"],
+            "redirected_links": summary["redirected"],
+            "slow_links": summary["slow"]
+        })
+        
+        if summary["broken"]:
+            add_issue(analysis, f"{len(summary['broken'])} broken links (4xx/5xx or unreachable)", 'high')
+            add_recommendation(analysis, "Fix or remove broken links: " + ", ".join(
+                link["url"] for link in summary["broken"][:5]), 'high', position=0)
+        chains = sum(1 for link in summary["redirected"] if link["hops"] > 1)
+        if summary["redirected"]:
+            add_issue(analysis, f"{len(summary['redirected'])} links redirect"
+                                + (f" ({chains} through redirect chains)" if chains else ""), 'medium',
+                      "Point redirected links straight at their final URL")
+        if summary["slow"]:
+            add_issue(analysis, f"{len(summary['slow'])} linked pages respond slower than {checker.slow_seconds:g}s", 'low')
+        if summary["unchecked"]:
+            add_recommendation(analysis, f"{summary['unchecked']} links not checked offline - run once online to check them")
         
         return analysis
         
     def analyze_headings(self):
         """Analyze heading structure"""
-        headings = {}
-        for i in range(1, 7):
-            headings[f'h{i}'] = len(self.soup.find_all(f'h{i}'))
-            
-        analysis = {
-            "heading_structure": headings,
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if headings['h1'] == 0:
-            analysis["issues"].append("No H1 heading found")
-        elif headings['h1'] > 1:
-            analysis["issues"].append(f"Multiple H1 headings found ({headings['h1']})")
-            
-        analysis["recommendations"].append("Use only one H1 containing focus keyword")
-        analysis["recommendations"].append("Structure headings logically (H1 → H2 → H3)")
-        
-        return analysis
+        features = get_page_features(self.soup)
+        headings = {f'h{i}': features.count(f'h{i}') for i in range(1, 7)}
+        return self.rule_report().section('headings', heading_structure=headings)
         
     def analyze_content_quality(self):
         """Analyze content quality"""
-        text_content = self.soup.get_text()
-        word_count = len(text_content.split())
-        
-        analysis = {
-            "word_count": word_count,
-            "issues": [],
-            "recommendations": []
-        }
-        
-        if word_count < 300:
-            analysis["issues"].append("Content may be too short for SEO")
-            
-        analysis["recommendations"].append("Aim for 500+ words on service pages, 1000+ on blog posts")
-        analysis["recommendations"].append("Include target keyword in first 50-100 words")
-        
-        return analysis
+        report = self.rule_report()
+        return report.section('content_quality', word_count=report.value('thin_content'))
         
     def analyze_schema_markup(self):
         """Analyze schema markup"""
-        scripts = self.soup.find_all('script', type='application/ld+json')
-        
-        analysis = {
-            "schema_found": len(scripts),
-            "recommendations": [
-                "Implement relevant schema markup (LocalBusiness, Article, FAQ)",
-                "Ensure schema accurately reflects on-page content",
-                "Use Schema.org validator to check for errors"
-            ]
-        }
-        
-        return analysis
-        
-    def generate_recommendations(self):
-        """Generate prioritized recommendations"""
-        high_priority = []
-        medium_priority = []
-        low_priority = []
+        report = self.rule_report()
+        return report.section('schema_markup', schema_found=report.value('schema_blocks'))
         
-        # Extract all issues and recommendations
+    def generate_recommendations(self, limit=10):
+        """Rank every issue and recommendation by its score and keep the top `limit` of each"""
+        ranked = []
         for category, data in self.analysis_results.items():
             for subcategory, analysis in data.items():
-                if 'issues' in analysis:
-                    for issue in analysis['issues']:
-                        high_priority.append(f"{subcategory.replace('_', ' ').title()}: {issue}")
-                        
-                if 'recommendations' in analysis:
-                    for rec in analysis['recommendations']:
-                        medium_priority.append(f"{subcategory.replace('_', ' ').title()}: {rec}")
+                scores = analysis.get('scores', {})
+                for kind in ('issues', 'recommendations'):
+                    for text in analysis.get(kind, []):
+                        ranked.append({
+                            "kind": kind,
+                            "text": f"{subcategory.replace('_', ' ').title()}: {text}",
+                            "score": scores.get(text, DEFAULT_SCORES[kind])
+                        })
                         
+        # Stable sort: findings with equal scores keep the order the frameworks found them in
+        ranked.sort(key=lambda finding: -finding["score"])
         return {
-            "high_priority": high_priority[:10],  # Top 10 issues
-            "medium_priority": medium_priority[:10],  # Top 10 recommendations
-            "low_priority": ["Implement continuous testing and optimization cycle"]
+            "high_priority": [finding["text"] for finding in ranked if finding["kind"] == "issues"][:limit],
+            "medium_priority": [finding["text"] for finding in ranked if finding["kind"] == "recommendations"][:limit],
+            "low_priority": ["Implement continuous testing and optimization cycle"],
+            "ranked": ranked
         }
         
-    def generate_pdf_report(self):
+    def analysis_settings(self):
+        """Options that change what an analysis contains; a stored analysis is only reused when they match"""
+        return {"check_links": self.check_links, "audit_assets": self.audit_assets, "offline": self.http_cache.offline}
+        
+    def analyze(self, verbose=True):
+        """Run both frameworks and rank the findings, or reuse the stored analysis of identical page content"""
+        rules = default_rules().fingerprint
+        stored = self.content_sha256 and self.analysis_store.lookup(self.content_sha256, self.url,
+                                                                     self.analysis_settings(), rules)
+        if stored:
+            self.load_analysis_document(stored)
+            if verbose:
+                print(f"\n♻️  Page content unchanged since {self.analyzed_at:%Y-%m-%d %H:%M} - reusing that analysis")
+            return stored
+            
+        self.analyze_cro_framework(verbose)
+        self.analyze_seo_framework(verbose)
+        self.recommendations = self.generate_recommendations()
+        self.analyzed_at = datetime.now()
+        document = self.analysis_document()
+        if self.content_sha256:
+            self.analysis_store.store(document)
+        return document
+        
+    def analysis_document(self):
+        """Versioned, JSON-serialisable snapshot of the analysis that every report format renders from"""
+        weight = self._page_weight[1] if self._page_weight else None
+        return {
+            "version": ANALYSIS_VERSION,
+            "rules": default_rules().fingerprint,
+            "url": self.url,
+            "content_sha256": self.content_sha256,
+            "html_bytes": self.html_bytes,
+            "analyzed_at": (self.analyzed_at or datetime.now()).isoformat(timespec='seconds'),
+            "settings": self.analysis_settings(),
+            "analysis": self.analysis_results,
+            "recommendations": self.recommendations or self.generate_recommendations(),
+            "page_weight": weight if weight and weight['measured'] else None
+        }
+        
+    def load_analysis_document(self, document):
+        """Restore an analysis snapshot so reports can be rendered without fetching or analysing the page"""
+        self.url = document['url']
+        self.content_sha256 = document['content_sha256']
+        self.html_bytes = document['html_bytes']
+        self.analyzed_at = datetime.fromisoformat(document['analyzed_at'])
+        self.analysis_results = document['analysis']
+        self.recommendations = document['recommendations']
+        self._page_weight = (self.soup, document['page_weight']) if document['page_weight'] else None
+        
+    def render_reports(self, basename, formats=('pdf',)):
+        """Write each requested report format from the current analysis; returns format -> path"""
+        reports = {}
+        if 'pdf' in formats:
+            reports['pdf'] = self.generate_pdf_report(f"{basename}.pdf")
+        if 'html' in formats or 'docx' in formats:
+            exporter = SimpleDocumentExporter('Conversion Optimization', output_dir=os.path.dirname(basename) or '.',
+                                              document_title=f"Conversion Optimization Report - {self.url}")
+            # One markdown parse feeds both renderers
+            exported = exporter.export_formats(self.report_markdown(),
+                                               [('word' if fmt == 'docx' else fmt) for fmt in formats if fmt != 'pdf'],
+                                               output_basename=os.path.basename(basename))
+            for fmt in ('html', 'docx'):
+                if fmt in formats:
+                    reports[fmt] = exported.get('word' if fmt == 'docx' else fmt)
+        return reports
+        
+    def report_markdown(self):
+        """The report as markdown, for the HTML and Word renderers"""
+        recommendations = self.recommendations or self.generate_recommendations()
+        lines = ["# Website Conversion Optimization Report", "",
+                 f"**Website:** {self.url}",
+                 f"**Analysis Date:** {(self.analyzed_at or datetime.now()).strftime('%B %d, %Y')}", "",
+                 "## Executive Summary", "", EXECUTIVE_SUMMARY, "",
+                 "## High Priority Issues", ""]
+        lines += [f"{i}. {issue}" for i, issue in enumerate(recommendations['high_priority'], 1)]
+        lines += ["", "## Medium Priority Recommendations", ""]
+        lines += [f"{i}. {rec}" for i, rec in enumerate(recommendations['medium_priority'], 1)]
+        
+        for framework, heading in (('cro', "Conversion Rate Optimization Analysis"), ('seo', "SEO Optimization Analysis")):
+            lines += ["", f"## {heading}"]
+            for section, data in self.analysis_results.get(framework, {}).items():
+                lines += ["", f"### {section.replace('_', ' ').title()}"]
+                if data.get('issues'):
+                    lines += ["", "**Issues:**"] + [f"- {issue}" for issue in data['issues']]
+                if data.get('recommendations'):
+                    lines += ["", "**Recommendations:**"] + [f"- {rec}" for rec in data['recommendations']]
+                    
+        weight = self._page_weight[1] if self._page_weight else None
+        if weight and weight['measured']:
+            lines += [""] + waterfall_markdown(weight, "Page Weight Waterfall")
+            
+        lines += ["", "## Implementation Roadmap"]
+        for heading, steps in ROADMAP:
+            lines += ["", f"**{heading}**"] + [f"- {step}" for step in steps]
+        return "\n".join(lines) + "\n"
+        
+    def generate_pdf_report(self, filename=None):
         """Generate PDF report with recommendations"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"conversion_optimization_report_{timestamp}.pdf"
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"conversion_optimization_report_{timestamp}.pdf"
         
         try:
             doc = SimpleDocTemplate(filename, pagesize=A4)
@@ -565,30 +543,26 @@ class ConversionOptimizationAgent:
             
             # Website info
             story.append(Paragraph(f"<b>Website:</b> {self.url}", styles['Normal']))
-            story.append(Paragraph(f"<b>Analysis Date:</b> {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+            analyzed_at = self.analyzed_at or datetime.now()
+            story.append(Paragraph(f"<b>Analysis Date:</b> {analyzed_at.strftime('%B %d, %Y')}", styles['Normal']))
             story.append(Spacer(1, 20))
             
             # Executive Summary
             story.append(Paragraph("Executive Summary", styles['Heading2']))
-            summary_text = f"""
-            This report analyzes your website using a comprehensive 25-point Conversion Rate Optimization (CRO) 
-            framework and 11-point SEO optimization checklist. The analysis identifies critical issues affecting 
-            user experience and search engine performance, along with actionable recommendations for improvement.
-            """
-            story.append(Paragraph(summary_text, styles['Normal']))
+            story.append(Paragraph(EXECUTIVE_SUMMARY, styles['Normal']))
             story.append(Spacer(1, 20))
             
-            # Recommendations
-            recommendations = self.generate_recommendations()
+            # Recommendations (ranked once by analyze(); callers that ran the frameworks directly rank here)
+            recommendations = self.recommendations or self.generate_recommendations()
             
             story.append(Paragraph("High Priority Issues", styles['Heading2']))
             for i, issue in enumerate(recommendations['high_priority'], 1):
-                story.append(Paragraph(f"{i}. {issue}", styles['Normal']))
+                story.append(Paragraph(f"{i}. {escape(issue)}", styles['Normal']))
             story.append(Spacer(1, 20))
             
             story.append(Paragraph("Medium Priority Recommendations", styles['Heading2']))
             for i, rec in enumerate(recommendations['medium_priority'], 1):
-                story.append(Paragraph(f"{i}. {rec}", styles['Normal']))
+                story.append(Paragraph(f"{i}. {escape(rec)}", styles['Normal']))
             story.append(Spacer(1, 20))
             
             # Detailed Analysis
@@ -606,12 +580,12 @@ class ConversionOptimizationAgent:
                     if 'issues' in data and data['issues']:
                         story.append(Paragraph("<b>Issues:</b>", styles['Normal']))
                         for issue in data['issues']:
-                            story.append(Paragraph(f"• {issue}", styles['Normal']))
+                            story.append(Paragraph(f"• {escape(issue)}", styles['Normal']))
                             
                     if 'recommendations' in data and data['recommendations']:
                         story.append(Paragraph("<b>Recommendations:</b>", styles['Normal']))
                         for rec in data['recommendations']:
-                            story.append(Paragraph(f"• {rec}", styles['Normal']))
+                            story.append(Paragraph(f"• {escape(rec)}", styles['Normal']))
                             
                 story.append(Spacer(1, 10))
             
@@ -627,39 +601,42 @@ class ConversionOptimizationAgent:
                     if 'issues' in data and data['issues']:
                         story.append(Paragraph("<b>Issues:</b>", styles['Normal']))
                         for issue in data['issues']:
-                            story.append(Paragraph(f"• {issue}", styles['Normal']))
+                            story.append(Paragraph(f"• {escape(issue)}", styles['Normal']))
                             
                     if 'recommendations' in data and data['recommendations']:
                         story.append(Paragraph("<b>Recommendations:</b>", styles['Normal']))
                         for rec in data['recommendations']:
-                            story.append(Paragraph(f"• {rec}", styles['Normal']))
+                            story.append(Paragraph(f"• {escape(rec)}", styles['Normal']))
                             
                 story.append(Spacer(1, 10))
             
+            # Asset waterfall (only once asset sizes have been measured)
+            weight = self._page_weight[1] if self._page_weight else None
+            if weight and weight['measured']:
+                story.append(PageBreak())
+                story.append(Paragraph("Page Weight Waterfall", styles['Heading2']))
+                story.append(Paragraph(f"<b>Total weight:</b> {weight['total_bytes'] / 1024:,.0f}KB across "
+                                       f"{weight['asset_count']} assets", styles['Normal']))
+                story.append(Spacer(1, 10))
+                cell_style = ParagraphStyle('WaterfallCell', parent=styles['Normal'], fontSize=7, leading=8)
+                rows = [['#', 'Type', 'Resource', 'KB', 'Flags']] + [
+                    [row['position'], row['type'], Paragraph(escape(row['resource']), cell_style), row['size_kb'],
+                     Paragraph(escape(row['flags']), cell_style)]
+                    for row in waterfall_rows(weight)[:60]]
+                table = Table(rows, colWidths=[0.3 * inch, 0.8 * inch, 3.4 * inch, 0.6 * inch, 1.6 * inch], repeatRows=1)
+                table.setStyle(TableStyle([
+                    ('FONTSIZE', (0, 0), (-1, -1), 7),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP')
+                ]))
+                story.append(table)
+            
             # Implementation roadmap
             story.append(PageBreak())
             story.append(Paragraph("Implementation Roadmap", styles['Heading2']))
-            roadmap_text = """
-            <b>Week 1-2: Critical Issues</b><br/>
-            • Fix meta titles and descriptions<br/>
-            • Optimize page speed<br/>
-            • Improve mobile experience<br/>
-            <br/>
-            <b>Week 3-4: CRO Improvements</b><br/>
-            • Optimize headlines and CTAs<br/>
-            • Add social proof elements<br/>
-            • Simplify forms<br/>
-            <br/>
-            <b>Week 5-8: Content & SEO</b><br/>
-            • Improve content structure<br/>
-            • Implement schema markup<br/>
-            • Optimize internal linking<br/>
-            <br/>
-            <b>Ongoing: Testing & Optimization</b><br/>
-            • A/B testing<br/>
-            • Performance monitoring<br/>
-            • Weekly optimization reviews
-            """
+            roadmap_text = "<br/><br/>".join(
+                f"<b>{heading}</b><br/>" + "<br/>".join(f"• {step}" for step in steps) for heading, steps in ROADMAP)
             story.append(Paragraph(roadmap_text, styles['Normal']))
             
             # Build PDF
@@ -671,7 +648,7 @@ class ConversionOptimizationAgent:
             print(f"❌ Error generating PDF: {e}")
             return None
             
-    def run(self):
+    def run(self, formats=('pdf',)):
         """Main execution flow"""
         print("🚀 Conversion Optimization Agent Started")
         print("=" * 50)
@@ -684,25 +661,90 @@ class ConversionOptimizationAgent:
         if not self.scrape_website():
             return False
             
-        # Step 3: Run analysis
-        self.analyze_cro_framework()
-        self.analyze_seo_framework()
+        # Step 3: Run analysis (reused when the page content is unchanged since the last run)
+        self.analyze()
         
-        # Step 4: Generate PDF report
-        pdf_file = self.generate_pdf_report()
+        # Step 4: Save the analysis as JSON and render the reports from it
+        basename = f"conversion_optimization_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        analysis_file = save_analysis(self.analysis_document(), f"{basename}.json")
+        reports = self.render_reports(basename, formats)
         
-        if pdf_file:
-            print(f"\n✅ Analysis complete! Report saved as: {pdf_file}")
+        if all(reports.get(report_format) for report_format in formats):
+            print(f"\n✅ Analysis complete! Report saved as: {', '.join(reports[report_format] for report_format in formats)}")
+            print(f"💾 Analysis data: {analysis_file} (re-render with --render {analysis_file})")
             print("\n📋 Summary of findings:")
-            recommendations = self.generate_recommendations()
-            print(f"• {len(recommendations['high_priority'])} high priority issues identified")
-            print(f"• {len(recommendations['medium_priority'])} optimization opportunities found")
-            print("\nReview the PDF report for detailed analysis and implementation roadmap.")
+            print(f"• {len(self.recommendations['high_priority'])} high priority issues identified")
+            print(f"• {len(self.recommendations['medium_priority'])} optimization opportunities found")
+            print("\nReview the report for detailed analysis and implementation roadmap.")
         else:
-            print("❌ Failed to generate PDF report")
+            print("❌ Failed to generate " + ", ".join(f.upper() for f in formats if not reports.get(f)) + " report")
             
         return True
 
+def mode_args(args):
+    """Options shared with the site_crawler and batch_analyzer command lines"""
+    shared = ['--client', args.client] if args.client else []
+    shared += ['--cache-dir', args.cache_dir] if args.cache_dir else []
+    shared += ['--offline'] if args.offline else []
+    shared += [] if args.no_link_check else ['--check-links']
+    shared += [] if args.no_asset_audit else ['--audit-assets']
+    return shared
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Conversion optimization analysis agent')
+    parser.add_argument('--offline', action='store_true',
+                        help='Replay cached pages only (no network requests)')
+    parser.add_argument('--client', help='Client name - caches pages in that client\'s project folder')
+    parser.add_argument('--crawl', metavar='URL',
+                        help='Crawl the whole site from URL and roll up issues across pages '
+                             '(see site_crawler.py for budgets)')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='Analyse every URL listed in FILE (one per line, - for stdin) without prompting '
+                             '(see batch_analyzer.py for worker options)')
+    parser.add_argument('--no-link-check', action='store_true',
+                        help='Skip checking every linked URL for errors, redirects and slow responses')
+    parser.add_argument('--no-asset-audit', action='store_true',
+                        help='Skip measuring the size of every image, script, stylesheet and font')
+    parser.add_argument('--format', dest='formats', nargs='+', choices=REPORT_FORMATS,
+                        help='Report formats to write (default: pdf); the analysis is always saved as JSON too')
+    parser.add_argument('--render', metavar='ANALYSIS_JSON',
+                        help='Re-render the reports from a saved analysis without fetching or analysing the page')
+    parser.add_argument('--cache-dir',
+                        help='Directory for the HTTP response cache (default: the client folder, '
+                             'or ./.http_cache next to the PDF reports when no client is given)')
+    args = parser.parse_args(argv)
+    
+    if args.crawl:
+        if args.formats:
+            parser.error('--format cannot be used with --crawl (the crawl writes a site-wide issue report)')
+        from site_crawler import main as crawl_main
+        crawl_main([args.crawl] + mode_args(args))
+        sys.exit(0)
+    
+    if args.batch:
+        if args.formats and args.formats != ['pdf']:
+            parser.error('--batch only writes PDF reports')
+        from batch_analyzer import main as batch_main
+        batch_main([args.batch] + mode_args(args))
+        sys.exit(0)
+    
+    formats = args.formats or ['pdf']
+    if args.render:
+        agent = ConversionOptimizationAgent()
+        try:
+            agent.load_analysis_document(load_analysis(args.render))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Cannot read analysis {args.render}: {e}")
+            sys.exit(1)
+        reports = agent.render_reports(os.path.splitext(args.render)[0], formats)
+        sys.exit(0 if all(reports.get(report_format) for report_format in formats) else 1)
+    
+    # Reports are written to the working directory, so without a client the cache lives there too
+    cache_dir = args.cache_dir or (client_cache_dir(args.client) if args.client else DEFAULT_CACHE_DIRNAME)
+    agent = ConversionOptimizationAgent(cache_dir=cache_dir, offline=args.offline, check_links=not args.no_link_check,
+                                        audit_assets=not args.no_asset_audit)
+    agent.run(formats)
+
 if __name__ == "__main__":
-    agent = ConversionOptimizationAgent()
-    agent.run()
\ No newline at end of file
+    main()
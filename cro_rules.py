@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Declarative CRO and SEO rules for the conversion optimization agent
+Every check is data: the elements it looks at (a small CSS-style selector), what
+it measures about them, the test that makes the measurement a problem, its
+severity and the message and recommendation to give. Standing advice from the
+framework is data too (rules with no test). RuleSet compiles the selectors into
+a dispatch table keyed by tag name and feeds them all from one pass over the
+page's tag index, so adding rules costs only the tags they select.
+
+Selectors support tag names, *, .class, [attr], [attr=value], [attr*=value] and
+[attr!=value], combined in comma-separated lists. A value of a|b|c matches any
+of the alternatives; attribute values compare case-insensitively.
+"""
+
+import hashlib
+import json
+import operator
+import re
+from urllib.parse import urlparse
+
+from page_features import get_page_features
+
+# Points per severity; a triggered rule scores points x weight x how far it overshoots its threshold
+SEVERITY_POINTS = {'critical': 100, 'high': 60, 'medium': 30, 'low': 10, 'info': 5}
+
+# Scores for findings nobody scored (sections built without the rule engine or add_issue)
+DEFAULT_SCORES = {'issues': SEVERITY_POINTS['medium'], 'recommendations': SEVERITY_POINTS['info']}
+
+OPERATORS = {'==': operator.eq, '!=': operator.ne, '>': operator.gt, '>=': operator.ge,
+             '<': operator.lt, '<=': operator.le}
+
+CTA_CLASSES = 'btn|button|cta|call-to-action'
+SOCIAL_PROOF_CLASSES = 'testimonial|review|rating|star'
+TRUST_KEYWORDS = ('security', 'ssl', 'guarantee', 'certified', 'secure', 'trust', 'badge')
+FORM_FIELD_TAGS = ['input', 'select', 'textarea']
+
+def text_of(tag, page):
+    """Stripped visible text of a matched element"""
+    return page.features.element_text(tag).strip()
+
+def form_field_count(form, page, arg):
+    """Fields a visitor has to fill in (hidden inputs and submit buttons excluded)"""
+    return sum(1 for field in form.find_all(FORM_FIELD_TAGS) if field.get('type') not in ('hidden', 'submit'))
+
+def keyword_strings(page, keywords):
+    """Number of (visible string, keyword) pairs where the string mentions the keyword
+
+    Comments and script/style code are not page copy, so a keyword there is not a signal.
+    """
+    lowered = [string.lower() for string in page.features.strings]
+    everything = '\x00'.join(lowered)
+    # Keywords the page never mentions cost one search of the joined text instead of one per string
+    return sum(sum(1 for string in lowered if keyword in string) for keyword in keywords if keyword in everything)
+
+# name -> function(matches, page, arg); per-element rules call it with a single element instead
+MEASURES = {
+    'count': lambda matches, page, arg: len(matches),
+    'text_count': lambda matches, page, arg: sum(1 for tag in matches if text_of(tag, page)),
+    'first_text_length': lambda matches, page, arg: len(page.features.element_text(matches[0])) if matches else None,
+    'first_attr_length': lambda matches, page, arg: len(matches[0].get(arg) or '') if matches else None,
+    'missing_attr': lambda matches, page, arg: sum(1 for tag in matches if not tag.get(arg)),
+    'field_count': form_field_count,
+    'word_count': lambda matches, page, arg: page.features.word_count,
+    'url_length': lambda matches, page, arg: len(page.url or ''),
+    'url_underscores': lambda matches, page, arg: urlparse(page.url or '').path.count('_'),
+    'keyword_strings': lambda matches, page, arg: keyword_strings(page, arg),
+}
+
+RULES = [
+    # CRO: headlines
+    {'id': 'h1_missing', 'area': 'headline_analysis', 'select': 'h1', 'measure': 'text_count', 'test': ('==', 0),
+     'severity': 'high', 'issue': "No H1 headlines found",
+     'recommendation': "Add a compelling H1 headline using the 4-U formula (Useful, Unique, Urgent, Ultra-specific)"},
+    {'id': 'h1_multiple', 'area': 'headline_analysis', 'select': 'h1', 'measure': 'text_count', 'test': ('>', 1),
+     'severity': 'medium', 'issue': "Multiple H1 tags found ({value})",
+     'recommendation': "Use only one H1 per page for better SEO"},
+
+    # CRO: value proposition
+    {'id': 'value_proposition', 'area': 'value_proposition',
+     'select': 'main.hero, main.banner, main.main, main.content, div.hero, div.banner, div.main, div.content',
+     'advice': "Ensure value proposition is clear above the fold with customer problem focus", 'severity': 'low'},
+
+    # CRO: calls to action
+    {'id': 'cta_missing', 'area': 'cta_analysis', 'select': f'button[class*={CTA_CLASSES}], a[class*={CTA_CLASSES}]',
+     'measure': 'text_count', 'test': ('==', 0), 'severity': 'critical', 'issue': "No clear CTAs found"},
+    {'id': 'cta_first_person', 'area': 'cta_analysis',
+     'advice': "Use first-person psychology in CTAs ('Get MY guide' vs 'Get YOUR guide')"},
+    {'id': 'cta_thumb_zone', 'area': 'cta_analysis', 'advice': "Place CTAs in mobile thumb zone for better accessibility"},
+
+    # CRO: forms
+    {'id': 'form_fields', 'area': 'form_analysis', 'select': 'form', 'measure': 'field_count', 'per_element': True,
+     'test': ('>', 5), 'severity': 'high', 'issue': "Form has {value} fields (recommended max: 5)"},
+    {'id': 'form_field_limit', 'area': 'form_analysis', 'severity': 'low',
+     'advice': "Limit forms to maximum 5 fields - every additional field kills conversions"},
+
+    # CRO: social proof and trust
+    {'id': 'social_proof_missing', 'area': 'social_proof',
+     'select': f'div[class*={SOCIAL_PROOF_CLASSES}], section[class*={SOCIAL_PROOF_CLASSES}]',
+     'measure': 'count', 'test': ('==', 0), 'severity': 'high', 'issue': "No clear social proof elements found"},
+    {'id': 'testimonials_near_cta', 'area': 'social_proof', 'advice': "Add testimonials with faces/names near CTAs"},
+    {'id': 'testimonial_results', 'area': 'social_proof', 'advice': "Include specific results and outcomes in testimonials"},
+    {'id': 'trust_signals', 'area': 'trust_signals', 'measure': 'keyword_strings', 'arg': TRUST_KEYWORDS,
+     'advice': "Cluster trust signals (security badges, guarantees, policies) together for maximum impact"},
+
+    # CRO: mobile and content structure
+    {'id': 'viewport_missing', 'area': 'mobile_optimization', 'select': 'meta[name=viewport]', 'measure': 'count',
+     'test': ('==', 0), 'severity': 'critical', 'issue': "No viewport meta tag found"},
+    {'id': 'mobile_thumb_zone', 'area': 'mobile_optimization', 'advice': "Ensure CTAs are in mobile thumb zone"},
+    {'id': 'mobile_devices', 'area': 'mobile_optimization', 'advice': "Test on real devices, not just browser tools"},
+    {'id': 'reading_level', 'area': 'content_structure', 'advice': "Use Grade 6 reading level - smart people prefer simple"},
+    {'id': 'sentence_length', 'area': 'content_structure', 'advice': "Keep sentences to 11 words maximum"},
+    {'id': 'benefit_language', 'area': 'content_structure',
+     'advice': "Use benefit-first language - features tell, benefits sell"},
+
+    # SEO: meta tags
+    {'id': 'title_missing', 'area': 'meta_tags', 'select': 'title', 'measure': 'count', 'test': ('==', 0),
+     'severity': 'critical', 'issue': "Missing page title"},
+    {'id': 'title_long', 'area': 'meta_tags', 'select': 'title', 'measure': 'first_text_length', 'test': ('>', 60),
+     'severity': 'medium', 'issue': "Title too long (over 60 characters)"},
+    {'id': 'description_missing', 'area': 'meta_tags', 'select': 'meta[name=description]', 'measure': 'count',
+     'test': ('==', 0), 'severity': 'high', 'issue': "Missing meta description"},
+    {'id': 'description_long', 'area': 'meta_tags', 'select': 'meta[name=description]', 'measure': 'first_attr_length',
+     'arg': 'content', 'test': ('>', 156), 'severity': 'low', 'issue': "Meta description too long (over 156 characters)"},
+    {'id': 'meta_keywords', 'area': 'meta_tags', 'advice': "Include target keyword in title and description"},
+
+    # SEO: URL
+    {'id': 'url_long', 'area': 'url_structure', 'measure': 'url_length', 'test': ('>', 80), 'severity': 'low',
+     'issue': "URL too long (over 80 characters)"},
+    {'id': 'url_underscores', 'area': 'url_structure', 'measure': 'url_underscores', 'test': ('>', 0),
+     'severity': 'low', 'issue': "URL contains underscores"},
+    {'id': 'url_length_advice', 'area': 'url_structure', 'advice': "Keep URLs 50-60 characters for optimal SEO"},
+    {'id': 'url_keywords', 'area': 'url_structure', 'advice': "Include target keywords in URL structure"},
+
+    # SEO: images and links
+    {'id': 'img_alt_missing', 'area': 'images', 'select': 'img', 'measure': 'missing_attr', 'arg': 'alt',
+     'test': ('>', 0), 'severity': 'medium', 'issue': "{value} images missing alt text"},
+    {'id': 'anchor_text', 'area': 'internal_links', 'advice': "Use descriptive anchor text with keywords"},
+    {'id': 'link_structure', 'area': 'internal_links', 'advice': "Create logical linking structure"},
+
+    # SEO: headings, content and schema
+    {'id': 'heading_h1_missing', 'area': 'headings', 'select': 'h1', 'measure': 'count', 'test': ('==', 0),
+     'severity': 'high', 'issue': "No H1 heading found"},
+    {'id': 'heading_h1_multiple', 'area': 'headings', 'select': 'h1', 'measure': 'count', 'test': ('>', 1),
+     'severity': 'medium', 'issue': "Multiple H1 headings found ({value})"},
+    {'id': 'heading_keyword', 'area': 'headings', 'advice': "Use only one H1 containing focus keyword"},
+    {'id': 'heading_order', 'area': 'headings', 'advice': "Structure headings logically (H1 → H2 → H3)"},
+    {'id': 'thin_content', 'area': 'content_quality', 'measure': 'word_count', 'test': ('<', 300),
+     'severity': 'medium', 'issue': "Content may be too short for SEO"},
+    {'id': 'content_length', 'area': 'content_quality', 'advice': "Aim for 500+ words on service pages, 1000+ on blog posts"},
+    {'id': 'keyword_placement', 'area': 'content_quality', 'advice': "Include target keyword in first 50-100 words"},
+    {'id': 'schema_blocks', 'area': 'schema_markup', 'select': 'script[type=application/ld+json]', 'measure': 'count',
+     'advice': "Implement relevant schema markup (LocalBusiness, Article, FAQ)"},
+    {'id': 'schema_accuracy', 'area': 'schema_markup', 'advice': "Ensure schema accurately reflects on-page content"},
+    {'id': 'schema_validation', 'area': 'schema_markup', 'advice': "Use Schema.org validator to check for errors"},
+]
+
+SIMPLE_SELECTOR = re.compile(r'^(?P<tag>\*|[a-z][a-z0-9-]*)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$', re.IGNORECASE)
+SELECTOR_PART = re.compile(r'\.(?P<cls>[\w-]+)|\[(?P<attr>[\w:-]+)\s*(?:(?P<op>\*=|!=|=)\s*(?P<value>[^\]]*))?\]')
+
+def severity_score(severity):
+    """Score of a finding at a severity, for sections built outside the rule engine"""
+    return SEVERITY_POINTS[severity]
+
+def add_recommendation(section, recommendation, severity='info', position=None):
+    """Add a scored recommendation to an analysis section (appended unless a position is given)"""
+    recommendations = section.setdefault('recommendations', [])
+    recommendations.insert(len(recommendations) if position is None else position, recommendation)
+    section.setdefault('scores', {})[recommendation] = severity_score(severity)
+
+def add_issue(section, issue, severity, recommendation=None):
+    """Add a scored issue (and the recommendation that fixes it) to an analysis section"""
+    section.setdefault('issues', []).append(issue)
+    section.setdefault('scores', {})[issue] = severity_score(severity)
+    if recommendation:
+        add_recommendation(section, recommendation, severity)
+
+def _attribute_text(tag, name):
+    value = tag.get(name)
+    if value is None:
+        return None
+    return (' '.join(value) if isinstance(value, list) else value).lower()
+
+def compile_selector(selector):
+    """Selector string -> [(tag name or '*', predicate(tag) -> bool), ...], one entry per comma-separated part"""
+    compiled = []
+    for part in selector.split(','):
+        match = SIMPLE_SELECTOR.match(part.strip())
+        if not match:
+            raise ValueError(f"Unsupported selector: {part.strip()!r}")
+        tests = []
+        for piece in SELECTOR_PART.finditer(match.group('rest')):
+            if piece.group('cls'):
+                tests.append(lambda tag, cls=piece.group('cls'): cls in (tag.get('class') or []))
+                continue
+            attr, op = piece.group('attr').lower(), piece.group('op')
+            values = [value.lower() for value in (piece.group('value') or '').strip('\'"').split('|')]
+            if op is None:
+                tests.append(lambda tag, attr=attr: tag.has_attr(attr))
+            elif op == '=':
+                tests.append(lambda tag, attr=attr, values=values: _attribute_text(tag, attr) in values)
+            elif op == '!=':
+                tests.append(lambda tag, attr=attr, values=values: _attribute_text(tag, attr) not in values)
+            else:
+                search = re.compile('|'.join(re.escape(value) for value in values if value)).search
+                tests.append(lambda tag, attr=attr, search=search: attr in tag.attrs
+                             and search(_attribute_text(tag, attr)) is not None)
+        if len(tests) > 1:
+            predicate = lambda tag, tests=tuple(tests): all(test(tag) for test in tests)
+        else:
+            predicate = tests[0] if tests else None
+        compiled.append(((match.group('tag') or '*').lower(), predicate))
+    return compiled
+
+class PageContext:
+    """What measures can read about a page besides the matched elements"""
+
+    def __init__(self, soup, url):
+        self.soup = soup
+        self.url = url
+        self.features = get_page_features(soup)
+
+class RuleReport:
+    """Results of one RuleSet evaluation: per-rule values and scored findings, grouped by area"""
+
+    def __init__(self, results, matches):
+        self.results = results
+        self._matches = matches
+        self.by_area = {}
+        for result in results.values():
+            self.by_area.setdefault(result['area'], []).append(result)
+
+    def value(self, rule_id):
+        return self.results[rule_id]['value']
+
+    def matches(self, rule_id):
+        """Elements a rule's selector matched, in document order"""
+        return self._matches.get(self.results[rule_id]['select'], [])
+
+    def section(self, area, **fields):
+        """Analysis section for an area: the given data fields plus issues, recommendations and their scores"""
+        section = dict(fields, issues=[], recommendations=[], scores={})
+        for result in self.by_area.get(area, []):
+            for issue in result['issues']:
+                section['issues'].append(issue)
+                section['scores'][issue] = result['score']
+            if result['recommendation'] and result['triggered']:
+                section['recommendations'].append(result['recommendation'])
+                section['scores'].setdefault(result['recommendation'], result['score'])
+        return section
+
+class RuleSet:
+    """Rules compiled into a tag-name dispatch table and evaluated from one pass over a page"""
+
+    def __init__(self, rules=RULES):
+        self.rules = []
+        self.selectors = {}
+        self.dispatch = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule):
+        """Validate and compile one rule (selectors shared by several rules are matched once)"""
+        rule = dict(rule)
+        if rule.get('measure', 'count') not in MEASURES:
+            raise ValueError(f"Rule {rule['id']}: unknown measure {rule.get('measure')!r}")
+        if rule.get('test') and rule['test'][0] not in OPERATORS:
+            raise ValueError(f"Rule {rule['id']}: unknown operator {rule['test'][0]!r}")
+        rule.setdefault('severity', 'info' if 'advice' in rule else 'medium')
+        if rule['severity'] not in SEVERITY_POINTS:
+            raise ValueError(f"Rule {rule['id']}: unknown severity {rule['severity']!r}")
+        if 'test' in rule and 'issue' not in rule:
+            raise ValueError(f"Rule {rule['id']}: a test needs an issue message")
+
+        selector = rule.get('select')
+        if selector and selector not in self.selectors:
+            self.selectors[selector] = compile_selector(selector)
+            for tag_name, predicate in self.selectors[selector]:
+                self.dispatch.setdefault(tag_name, []).append((selector, predicate))
+        self.rules.append(rule)
+
+    @property
+    def fingerprint(self):
+        """Short hash of the rule definitions, so results made with different rules are not mixed up"""
+        definitions = json.dumps(self.rules, sort_keys=True, default=str)
+        return hashlib.sha256(definitions.encode('utf-8')).hexdigest()[:16]
+
+    def match(self, features):
+        """selector -> matched tags in document order, from one pass over the page's tag index"""
+        matched = {selector: [] for selector in self.selectors}
+        wildcard = self.dispatch.get('*', [])
+        for tag_name, entries in features.tag_index():
+            candidates = self.dispatch.get(tag_name, []) + wildcard
+            if not candidates:
+                continue
+            for entry in entries:
+                for selector, predicate in candidates:
+                    if predicate is None or predicate(entry[1]):
+                        matched[selector].append(entry)
+        for selector, entries in matched.items():
+            if len(self.selectors[selector]) > 1:
+                # A selector list spans several tag names, and a tag matching several of its parts counts once
+                entries = sorted({id(tag): (position, tag) for position, tag in entries}.values(), key=lambda entry: entry[0])
+            matched[selector] = [tag for _, tag in entries]
+        return matched
+
+    def evaluate(self, soup, url=None):
+        """Run every rule against a parsed page and return a RuleReport"""
+        page = PageContext(soup, url)
+        matched = self.match(page.features)
+        results = {}
+        for rule in self.rules:
+            elements = matched.get(rule.get('select'), [])
+            measure = MEASURES[rule.get('measure', 'count')]
+            if rule.get('per_element'):
+                values = [measure(element, page, rule.get('arg')) for element in elements]
+            else:
+                values = [measure(elements, page, rule.get('arg'))]
+
+            result = {'id': rule['id'], 'area': rule['area'], 'select': rule.get('select'), 'severity': rule['severity'],
+                      'value': values if rule.get('per_element') else values[0], 'issues': [], 'triggered': False,
+                      'recommendation': rule.get('recommendation') or rule.get('advice'), 'score': 0}
+            if 'advice' in rule:
+                result['triggered'] = True
+                result['score'] = SEVERITY_POINTS[rule['severity']] * rule.get('weight', 1)
+            elif 'test' in rule:
+                op, threshold = rule['test']
+                failing = [value for value in values if value is not None and OPERATORS[op](value, threshold)]
+                if failing:
+                    result['triggered'] = True
+                    result['issues'] = [rule['issue'].format(value=value, threshold=threshold) for value in failing]
+                    result['score'] = round(max(self.score(rule, value) for value in failing), 1)
+            results[rule['id']] = result
+        return RuleReport(results, matched)
+
+    @staticmethod
+    def score(rule, value):
+        """Severity points x weight, up to 1.5x more the further past its threshold a value is"""
+        op, threshold = rule['test']
+        base = SEVERITY_POINTS[rule['severity']] * rule.get('weight', 1)
+        if op in ('==', '!='):
+            return base
+        overshoot = abs(value - threshold) / max(abs(threshold), 1)
+        return base * (1 + 0.5 * min(1.0, overshoot))
+
+_default_rules = None
+
+def default_rules():
+    """The compiled RULES, built on first use"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = RuleSet()
+    return _default_rules
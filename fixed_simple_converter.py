@@ -21,6 +21,7 @@ except ImportError:
 class FixedSimpleDocumentExporter(SimpleDocumentExporter):
     def __init__(self, client_name: str, project_path: str = None):
         self.client_name = client_name
+        self.document_title = f"{client_name} - Testing Framework"
         # Create a safe directory name (no spaces or special characters)
         safe_name = re.sub(r'[^\w\-_]', '_', client_name.lower())
         
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+HTML parser selection for the analysers
+Every analyser works on a BeautifulSoup tree; this picks the fastest tree
+builder that is installed (lxml) and falls back to Python's html.parser.
+Set PPC_HTML_PARSER=html.parser (or lxml) to force a backend.
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401 - only checked for availability, BeautifulSoup drives it
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Fastest first; html.parser ships with Python so it is always available
+PARSER_PREFERENCE = ['lxml', 'html.parser']
+PARSER_ENV_VAR = 'PPC_HTML_PARSER'
+
+def available_parsers():
+    """Installed parser backends, fastest first"""
+    return [name for name in PARSER_PREFERENCE if name != 'lxml' or LXML_AVAILABLE]
+
+def get_parser_name(preferred=None):
+    """Backend to use: the explicit choice, then PPC_HTML_PARSER, then the fastest installed"""
+    choice = preferred or os.environ.get(PARSER_ENV_VAR)
+    parsers = available_parsers()
+    if choice:
+        if choice not in parsers:
+            raise ValueError(f"HTML parser '{choice}' is not available (installed: {', '.join(parsers)})")
+        return choice
+    return parsers[0]
+
+def parse_html(markup, parser=None):
+    """Parse markup (str or bytes) into a BeautifulSoup tree with the selected backend"""
+    return BeautifulSoup(markup, get_parser_name(parser))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache shared by the scrapers
+Responses are stored content-addressed under the client project folder and
+revalidated with ETag/Last-Modified, so repeat audits cost a 304 instead of a
+full download. Offline mode replays the cache without touching the network.
+
+Layout (also read and written by verify_tracking.js):
+    <cache_dir>/entries/<sha256 of url>.json   response metadata
+    <cache_dir>/bodies/<sha256 of body>        raw response bodies
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIRNAME = '.http_cache'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_SIZE_MB = 200
+
+class OfflineCacheMiss(requests.exceptions.RequestException):
+    """Raised in offline mode when a URL has never been cached"""
+
+def client_cache_dir(client_name):
+    """Cache directory inside a client's project folder (same folder lookup as competitor_research)"""
+    sanitized = client_name.lower().replace(' ', '_')
+    for variation in (sanitized, client_name.replace(' ', '_'), client_name.replace(' ', '-')):
+        if os.path.exists(variation):
+            return os.path.join(variation, DEFAULT_CACHE_DIRNAME)
+    return os.path.join(sanitized, DEFAULT_CACHE_DIRNAME)
+
+def url_key(url):
+    """Cache key for a URL"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+class HttpCache:
+    """On-disk response cache with conditional revalidation, TTL and size-based eviction"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIRNAME, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_size_mb=DEFAULT_MAX_SIZE_MB, offline=False):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, 'entries')
+        self.bodies_dir = os.path.join(cache_dir, 'bodies')
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.offline = offline
+        self.stats = {'hits': 0, 'revalidated': 0, 'downloaded': 0, 'misses': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _write_atomic(self, path, data):
+        """Write bytes via a temp file so concurrent readers never see partial files"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _entry_path(self, url):
+        return os.path.join(self.entries_dir, f"{url_key(url)}.json")
+
+    def lookup(self, url):
+        """Return the cached entry for url (None if missing or its body is gone)"""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(os.path.join(self.bodies_dir, entry.get('body_sha256', ''))):
+            return None
+        return entry
+
+    def _save_entry(self, entry):
+        self._write_atomic(self._entry_path(entry['url']), json.dumps(entry, indent=2).encode('utf-8'))
+
+    def store(self, url, response):
+        """Store a successful response and return its entry"""
+        body = response.content
+        body_sha256 = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.bodies_dir, body_sha256)
+        if not os.path.exists(body_path):
+            self._write_atomic(body_path, body)
+
+        now = time.time()
+        entry = {
+            'url': url,
+            'final_url': response.url,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'encoding': response.encoding,
+            'elapsed_seconds': response.elapsed.total_seconds(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_sha256': body_sha256,
+            'size': len(body),
+            'truncated': getattr(response, 'truncated', False),
+            'stored_at': now,
+            'validated_at': now,
+            'accessed_at': now
+        }
+        self._save_entry(entry)
+        return entry
+
+    def conditional_headers(self, entry):
+        """Validators to send so an unchanged page comes back as 304"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def build_response(self, entry, elapsed_seconds=None):
+        """Rebuild a requests.Response from a cache entry"""
+        with open(os.path.join(self.bodies_dir, entry['body_sha256']), 'rb') as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = entry.get('status_code', 200)
+        response.reason = 'OK'
+        response.url = entry.get('final_url') or entry['url']
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.encoding = entry.get('encoding')
+        response._content = body
+        response.elapsed = timedelta(seconds=entry.get('elapsed_seconds', 0) if elapsed_seconds is None else elapsed_seconds)
+        response.truncated = entry.get('truncated', False)
+        response.from_cache = True
+        return response
+
+    def fetch(self, url, headers=None, timeout=15, session=None, **kwargs):
+        """GET url through the cache, revalidating any stored copy
+
+        Without a session the shared HttpClient is used, so page= and retry=
+        work the same for every caller.
+        """
+        entry = self.lookup(url)
+
+        if self.offline:
+            if entry is None:
+                self._count('misses')
+                raise OfflineCacheMiss(f"{url} is not in the offline cache ({self.cache_dir})")
+            self._count('hits')
+            self._touch(entry)
+            return self.build_response(entry)
+
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(entry))
+        if session is None:
+            from http_client import get_http_client
+            session = get_http_client()
+        response = session.get(url, headers=request_headers, timeout=timeout, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            # Unchanged - refresh validators and serve the stored body
+            for header in ('ETag', 'Last-Modified', 'Date', 'Cache-Control', 'Expires'):
+                if header in response.headers:
+                    entry['headers'][header] = response.headers[header]
+            entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+            entry['validated_at'] = time.time()
+            self._touch(entry)
+            self._count('revalidated')
+            return self.build_response(entry, elapsed_seconds=response.elapsed.total_seconds())
+
+        if response.status_code == 200:
+            self.store(url, response)
+            self._count('downloaded')
+        return response
+
+    def _touch(self, entry):
+        entry['accessed_at'] = time.time()
+        self._save_entry(entry)
+
+    def prune(self):
+        """Evict entries past their TTL, then least recently used entries until under the size limit"""
+        if not os.path.isdir(self.entries_dir):
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for name in os.listdir(self.entries_dir):
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if now - entry.get('validated_at', 0) > self.ttl_seconds:
+                os.remove(path)
+                removed += 1
+            else:
+                entries.append((entry.get('accessed_at', 0), path, entry))
+
+        # Bodies are shared between URLs, so size is counted per unique body
+        entries.sort(key=lambda item: item[0])
+        body_refs = {}
+        for _, _, entry in entries:
+            body_refs[entry['body_sha256']] = body_refs.get(entry['body_sha256'], 0) + 1
+        total_size = sum(
+            os.path.getsize(os.path.join(self.bodies_dir, body))
+            for body in body_refs if os.path.exists(os.path.join(self.bodies_dir, body))
+        )
+
+        for _, path, entry in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            os.remove(path)
+            removed += 1
+            body_refs[entry['body_sha256']] -= 1
+            if body_refs[entry['body_sha256']] == 0:
+                total_size -= entry.get('size', 0)
+
+        # Remove bodies no entry points to any more
+        live_bodies = {body for body, refs in body_refs.items() if refs > 0}
+        if os.path.isdir(self.bodies_dir):
+            for name in os.listdir(self.bodies_dir):
+                if name not in live_bodies and not name.startswith('.tmp-'):
+                    os.remove(os.path.join(self.bodies_dir, name))
+
+        return removed
+
+    def summary(self):
+        """One-line description of cache activity for this run"""
+        mode = 'offline replay' if self.offline else 'online'
+        return (f"HTTP cache ({mode}): {self.stats['hits']} replayed, {self.stats['revalidated']} unchanged (304), "
+                f"{self.stats['downloaded']} downloaded, {self.stats['misses']} missing")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the scrapers
+One pooled requests.Session per process (connections are reused per host),
+exponential backoff with jitter for 429/5xx and connection errors, size-capped
+streaming of HTML pages, and the user-agent rotation fallback used when a site
+blocks the first request.
+Retry settings come from the orchestrator.retry and orchestrator.http blocks in config.yaml.
+"""
+
+import codecs
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import OfflineCacheMiss
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 1.x reports DNS failures as a NewConnectionError with the resolver's message
+    NameResolutionError = None
+
+DNS_FAILURE_MESSAGES = ('Name or service not known', 'nodename nor servname', 'getaddrinfo failed',
+                        'No address associated with hostname', 'Failed to resolve')
+
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Page bodies are streamed in chunks of this size and capped at max_page_mb (config.yaml)
+STREAM_CHUNK_BYTES = 64 * 1024
+DEFAULT_MAX_PAGE_MB = 5
+
+DEFAULT_USER_AGENTS = [
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0'
+]
+
+def browser_headers(user_agent):
+    """Full set of browser-like request headers for a user agent"""
+    return {
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Cache-Control': 'max-age=0'
+    }
+
+def load_http_settings(config_file=DEFAULT_CONFIG_FILE):
+    """Retry and pool settings from config.yaml (defaults if the file or PyYAML is missing)"""
+    settings = {
+        'retry_enabled': False,
+        'max_attempts': 3,
+        'backoff_seconds': 5,
+        'max_backoff_seconds': 30,
+        'pool_connections': 10,
+        'pool_maxsize': 10,
+        'max_page_mb': DEFAULT_MAX_PAGE_MB
+    }
+    if not YAML_AVAILABLE or not os.path.exists(config_file):
+        return settings
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        print(f"⚠️  Could not read {config_file}, using default HTTP settings: {e}")
+        return settings
+    orchestrator = config.get('orchestrator', {})
+    retry = orchestrator.get('retry', {})
+    http = orchestrator.get('http', {})
+
+    # The retry block decides whether, how often and how soon to retry; its delay is the backoff base
+    settings['retry_enabled'] = retry.get('enabled', settings['retry_enabled'])
+    settings['max_attempts'] = retry.get('max_attempts', settings['max_attempts'])
+    settings['backoff_seconds'] = retry.get('delay_seconds', settings['backoff_seconds'])
+    for key in ('max_backoff_seconds', 'pool_connections', 'pool_maxsize', 'max_page_mb'):
+        settings[key] = http.get(key, settings[key])
+    return settings
+
+def is_transient_error(error):
+    """True for timeouts and dropped connections, False for failures a retry cannot fix (DNS, TLS, proxy)"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    if isinstance(error, (requests.exceptions.SSLError, requests.exceptions.ProxyError)):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    if NameResolutionError is not None and isinstance(reason, NameResolutionError):
+        return False
+    return not any(message in str(error) for message in DNS_FAILURE_MESSAGES)
+
+class NotHtmlError(requests.exceptions.RequestException):
+    """A page request answered with a non-HTML Content-Type; its body was not downloaded"""
+
+def read_page_body(response, max_bytes):
+    """Read a streamed response body, stopping at max_bytes or once the document has ended
+
+    Only the first max_bytes are kept (response.truncated is set when the page was
+    cut short). The body is decoded incrementally so the closing </html> tag is
+    spotted as soon as it arrives; whatever follows it is never downloaded.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    if response.ok and content_type and 'html' not in content_type.lower():
+        response.close()
+        raise NotHtmlError(f"{response.url} is {content_type.split(';')[0]}, not an HTML page", response=response)
+
+    declared = response.headers.get('Content-Length', '')
+    if declared.isdigit() and int(declared) > max_bytes:
+        print(f"  ✂️  {response.url} is {int(declared) / 1048576:.1f}MB, reading the first {max_bytes / 1048576:.1f}MB")
+
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    chunks, size, tail = [], 0, ''
+    body_closed = truncated = False
+    try:
+        for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+            if size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - size]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+            if truncated:
+                break
+
+            # Keep a few characters of overlap so a tag split across chunks is still found;
+            # </html> only counts after </body>, in case a script quotes it earlier on
+            text = (tail + decoder.decode(chunk)).lower()
+            body_closed = body_closed or '</body' in text
+            if body_closed and '</html' in text:
+                break
+            tail = text[-6:]
+    finally:
+        response.close()
+
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated
+    return response
+
+class HttpClient:
+    """Pooled session that retries rate-limited and failed requests with backoff"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, retry_enabled=True,
+                 max_attempts=3, backoff_seconds=1, max_backoff_seconds=30, max_page_mb=DEFAULT_MAX_PAGE_MB):
+        self.max_attempts = max(1, int(max_attempts)) if retry_enabled else 1
+        self.max_page_bytes = int(max_page_mb * 1024 * 1024)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.stats = {'requests': 0, 'retries': 0}
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config_file=DEFAULT_CONFIG_FILE):
+        """Client configured from config.yaml"""
+        return cls(**load_http_settings(config_file))
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def backoff_delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (1-based)"""
+        # A numeric Retry-After from the server wins over our own schedule
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff_seconds)
+
+        delay = self.backoff_seconds * (2 ** (attempt - 1))
+        return min(delay * random.uniform(0.5, 1.5), self.max_backoff_seconds)
+
+    def get(self, url, headers=None, timeout=15, retry=True, page=False, **kwargs):
+        """GET url on the shared session, retrying 429/5xx and connection errors unless retry is False
+
+        page=True streams the body with the max_page_mb cap and rejects non-HTML
+        responses before their body is downloaded (see read_page_body).
+        """
+        max_attempts = self.max_attempts if retry else 1
+        if page:
+            kwargs['stream'] = True
+        for attempt in range(1, max_attempts + 1):
+            self._count('requests')
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_attempts or not is_transient_error(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"  ⏳ {type(e).__name__} for {url}, retry {attempt}/{max_attempts - 1} in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == max_attempts:
+                    return read_page_body(response, self.max_page_bytes) if page else response
+                delay = self.backoff_delay(attempt, response)
+                print(f"  ⏳ HTTP {response.status_code} for {url}, retry {attempt}/{max_attempts - 1} in {delay:.1f}s")
+                response.close()
+
+            self._count('retries')
+            time.sleep(delay)
+
+class UserAgentRotation:
+    """Fallback strategy: retry a blocked page with other browser identities, then minimal headers"""
+
+    def __init__(self, user_agents=None, minimal_user_agent='curl/7.68.0', minimal_timeout=10):
+        self.user_agents = user_agents or DEFAULT_USER_AGENTS
+        self.minimal_user_agent = minimal_user_agent
+        self.minimal_timeout = minimal_timeout
+
+    def fetch(self, url, get, timeout=15):
+        """Fetch url with get(url, headers=..., timeout=..., retry=...), rotating identities on failure
+
+        Only the first identity gets backoff retries - the fallbacks exist for blocked
+        requests, so retrying each of them would multiply the wait on a failing site.
+        Returns a successful response; a 404, a non-HTML page or an offline cache miss
+        is raised immediately, otherwise the minimal-headers attempt's error is raised.
+        """
+        for i, user_agent in enumerate(self.user_agents):
+            if i > 0:
+                print(f"  🔄 Trying fallback method {i}...")
+            try:
+                response = get(url, headers=browser_headers(user_agent), timeout=timeout, retry=(i == 0))
+                response.raise_for_status()
+                return response
+
+            except (OfflineCacheMiss, NotHtmlError):
+                raise
+
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 403:
+                    print(f"  ⚠️  Access denied (403) with user agent {i+1}")
+                elif e.response.status_code == 404:
+                    raise
+                else:
+                    print(f"  ⚠️  HTTP error {e.response.status_code}")
+
+            except requests.exceptions.RequestException as e:
+                print(f"  ⚠️  Request failed: {str(e)}")
+
+        # If all user agents fail, try with minimal headers
+        print("  🔄 Trying minimal headers approach...")
+        response = get(url, headers={'User-Agent': self.minimal_user_agent}, timeout=self.minimal_timeout, retry=False)
+        response.raise_for_status()
+        return response
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Process-wide pooled client configured from config.yaml, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient.from_config()
+        return _client
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server for the test suite
+Tests define a QuietHandler subclass with the routes they need and run it
+with serve(), which yields the server's base URL and shuts it down afterwards.
+"""
+
+import contextlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Request handler that keeps the access log out of test output"""
+
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def serve(handler):
+    """Serve handler on a free local port, yielding the base URL (no trailing slash)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
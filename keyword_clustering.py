@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Keyword clustering into ad groups
+Usage: python keyword_clustering.py "Client Name" [keywords.csv search_terms.csv ...] [--threshold 0.7]
+
+Groups tens of thousands of keywords (keyword opportunity and expansion CSVs,
+Google Ads search-term exports or plain lists) into proposed ad groups in
+near-linear time. Each keyword is reduced to its core - locations and intent
+modifiers stripped, plurals folded - and summarised by a MinHash signature of
+its character trigrams. Locality-sensitive hashing over signature bands finds
+candidate neighbours without comparing every pair; candidates whose estimated
+similarity passes the threshold are joined and the connected components
+become ad groups.
+
+Writes 06_campaign_structure/ad_group_keywords_<timestamp>.csv (Google Ads
+Editor import) and ad_group_proposals_<timestamp>.md with representative
+headlines for each group.
+"""
+
+import argparse
+import collections
+import csv
+import glob
+import os
+import re
+import sys
+import zlib
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from http_cache import client_cache_dir
+from keyword_engine import client_keyword_settings
+from keyword_expansion import normalise_keyword, write_ads_editor_csv
+
+# Columns that hold keyword text in the CSVs this toolkit reads and writes, and in search-term exports
+KEYWORD_COLUMNS = ['Keyword', 'keyword', 'keyword_opportunity', 'Search term', 'Search Term', 'search_term', 'Query', 'query']
+
+SHINGLE_SIZE = 3
+HASH_FUNCTIONS = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 similarity very likely share a bucket, so 0.7+ rarely miss
+HASH_PRIME = (1 << 31) - 1
+SIGNATURE_CHUNK = 4096  # keywords hashed per vectorised block (bounds temporary memory)
+MAX_HEADLINE_CHARS = 30
+UNCLUSTERED_GROUP = 'Unclustered'
+
+def read_keywords(path):
+    """Keywords from a CSV with a known keyword column, or one per line from any other file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = f.readline()
+        f.seek(0)
+        header = next(csv.reader([sample]), [])
+        column = next((name for name in KEYWORD_COLUMNS if name in header), None)
+        if column:
+            return [row[column] for row in csv.DictReader(f) if row.get(column)]
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def _stem(word):
+    """Fold simple English plurals so 'balloon arches' and 'balloon arch' share a core"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+class KeywordClusterer:
+    """MinHash/LSH grouping of keywords by the similarity of their cores"""
+
+    def __init__(self, ignore_terms=(), threshold=0.7, hash_functions=HASH_FUNCTIONS, bands=BANDS, seed=7):
+        # Multi-word locations and modifiers ("gold coast", "near me") are removed as whole phrases
+        phrases = sorted({normalise_keyword(term) for term in ignore_terms if normalise_keyword(term)},
+                         key=len, reverse=True)
+        self.ignore_pattern = re.compile(
+            r'(?<!\S)(?:' + '|'.join(re.escape(phrase) for phrase in phrases) + r')(?!\S)') if phrases else None
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = hash_functions // bands
+        random = np.random.default_rng(seed)
+        self.hash_a = random.integers(1, HASH_PRIME, size=self.rows_per_band * bands, dtype=np.int64)
+        self.hash_b = random.integers(0, HASH_PRIME, size=self.rows_per_band * bands, dtype=np.int64)
+
+    def core(self, keyword):
+        """Keyword without locations or modifiers, plurals folded (the keyword itself if nothing is left)"""
+        text = self.ignore_pattern.sub(' ', keyword) if self.ignore_pattern else keyword
+        words = [_stem(word) for word in text.split()] or [_stem(word) for word in keyword.split()]
+        return ' '.join(words)
+
+    def _shingles(self, core):
+        """Hashes of the character trigrams of a core (word boundaries included)"""
+        padded = f" {core} "
+        grams = {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+        return [zlib.crc32(gram.encode('utf-8')) % HASH_PRIME for gram in grams]
+
+    def signatures(self, cores):
+        """MinHash signature matrix (keywords x hash functions), computed in vectorised chunks"""
+        signatures = np.empty((len(cores), len(self.hash_a)), dtype=np.int64)
+        for start in range(0, len(cores), SIGNATURE_CHUNK):
+            shingle_sets = [self._shingles(core) for core in cores[start:start + SIGNATURE_CHUNK]]
+            lengths = np.array([len(shingles) for shingles in shingle_sets])
+            values = np.fromiter((value for shingles in shingle_sets for value in shingles), dtype=np.int64,
+                                 count=int(lengths.sum()))
+            hashed = (self.hash_a[:, None] * values[None, :] + self.hash_b[:, None]) % HASH_PRIME
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            signatures[start:start + len(shingle_sets)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return signatures
+
+    def _candidate_pairs(self, signatures):
+        """Pairs sharing at least one LSH band bucket, as (bucket leader, member) index arrays"""
+        leaders, members = [], []
+        for band in range(self.bands):
+            columns = slice(band * self.rows_per_band, (band + 1) * self.rows_per_band)
+            band_rows = np.ascontiguousarray(signatures[:, columns])
+            keys = band_rows.view(np.dtype((np.void, band_rows.dtype.itemsize * self.rows_per_band))).ravel()
+            _, bucket, bucket_sizes = np.unique(keys, return_inverse=True, return_counts=True)
+            shared = bucket_sizes[bucket] > 1
+            if not shared.any():
+                continue
+            # Link every member of a bucket to the bucket's first keyword (a star, not all pairs)
+            indices = np.flatnonzero(shared)
+            order = indices[np.argsort(bucket[indices], kind='stable')]
+            sorted_buckets = bucket[order]
+            first = np.concatenate(([True], sorted_buckets[1:] != sorted_buckets[:-1]))
+            leader_of = order[first][np.cumsum(first) - 1]
+            leaders.append(leader_of[~first])
+            members.append(order[~first])
+        if not leaders:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(leaders), np.concatenate(members)
+
+    def cluster(self, keywords):
+        """Cluster keywords, returning a list of keyword lists (largest group first)"""
+        keywords = list(dict.fromkeys(k for k in (normalise_keyword(k) for k in keywords) if k))
+        if not keywords:
+            return []
+        # Keywords that differ only by location or modifier share a core, which is hashed once
+        cores = [self.core(keyword) for keyword in keywords]
+        unique_cores, core_of = np.unique(np.array(cores, dtype=object), return_inverse=True)
+        signatures = self.signatures(list(unique_cores))
+        leaders, members = self._candidate_pairs(signatures)
+
+        # Keep candidate pairs whose estimated Jaccard similarity passes the threshold
+        if len(leaders):
+            similarity = (signatures[leaders] == signatures[members]).mean(axis=1)
+            keep = similarity >= self.threshold
+            leaders, members = leaders[keep], members[keep]
+        graph = sparse.coo_matrix((np.ones(len(leaders), dtype=np.int8), (leaders, members)),
+                                  shape=(len(unique_cores), len(unique_cores)))
+        _, labels = connected_components(graph, directed=False)
+
+        groups = collections.defaultdict(list)
+        for keyword, label in zip(keywords, labels[core_of.ravel()]):
+            groups[label].append(keyword)
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def describe(self, group):
+        """Ad group name and up to three headlines (30 characters or fewer) for a keyword group"""
+        cores = [self.core(keyword) for keyword in group]
+        word_counts = collections.Counter(word for core in cores for word in set(core.split()))
+
+        # The most central core covers the group's common words with the fewest extras
+        def centrality(core):
+            words = core.split()
+            return (sum(word_counts[word] for word in words) / len(words), -len(core))
+        ranked_cores = sorted(dict.fromkeys(cores), key=centrality, reverse=True)
+        name = ranked_cores[0].title()
+
+        headlines = []
+        for candidate in ranked_cores + sorted(group, key=len):
+            headline = candidate.title()
+            if len(headline) <= MAX_HEADLINE_CHARS and headline not in headlines:
+                headlines.append(headline)
+            if len(headlines) == 3:
+                break
+        return name, headlines
+
+def propose_ad_groups(keywords, clusterer, min_group_size=2):
+    """[(ad group name, headlines, keywords)] with groups below min_group_size collected as Unclustered"""
+    proposals, unclustered, used_names = [], [], collections.Counter()
+    for group in clusterer.cluster(keywords):
+        if len(group) < min_group_size:
+            unclustered.extend(group)
+            continue
+        name, headlines = clusterer.describe(group)
+        used_names[name] += 1
+        if used_names[name] > 1:
+            name = f"{name} {used_names[name]}"
+        proposals.append((name, headlines, sorted(group)))
+    if unclustered:
+        proposals.append((UNCLUSTERED_GROUP, [], sorted(unclustered)))
+    return proposals
+
+def write_proposals(proposals, folder_name, client_name, timestamp, total_keywords):
+    """Write the Ads Editor keyword CSV and the ad group proposal report, returning their paths"""
+    out_dir = os.path.join(folder_name, '06_campaign_structure')
+    csv_path = os.path.join(out_dir, f"ad_group_keywords_{timestamp}.csv")
+    report_path = os.path.join(out_dir, f"ad_group_proposals_{timestamp}.md")
+
+    pairs = ((name, keyword) for name, _, keywords in proposals for keyword in keywords)
+    write_ads_editor_csv(pairs, csv_path, f"{client_name} - Search")
+
+    grouped = [p for p in proposals if p[0] != UNCLUSTERED_GROUP]
+    lines = [
+        "# Proposed Ad Groups",
+        f"**Client:** {client_name}",
+        f"**Keywords:** {total_keywords:,} in {len(grouped):,} ad groups",
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        ""
+    ]
+    for name, headlines, keywords in proposals:
+        lines.append(f"## {name} ({len(keywords)} keywords)")
+        if headlines:
+            lines.append(f"**Headlines:** {' | '.join(headlines)}")
+        sample = keywords[:10]
+        lines.append(f"**Keywords:** {', '.join(sample)}{' ...' if len(keywords) > len(sample) else ''}")
+        lines.append("")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return csv_path, report_path
+
+def default_inputs(folder_name):
+    """The latest keyword opportunity and keyword expansion CSVs for a client"""
+    inputs = []
+    for pattern in ('02_market_research/keyword_opportunities_*.csv', '06_campaign_structure/keyword_expansion_*.csv'):
+        matches = sorted(glob.glob(os.path.join(folder_name, pattern)))
+        if matches:
+            inputs.append(matches[-1])
+    return inputs
+
+def main():
+    parser = argparse.ArgumentParser(description='Cluster keywords and search terms into proposed ad groups')
+    parser.add_argument('client_name', help='Client or business name')
+    parser.add_argument('inputs', nargs='*', help='Keyword CSVs or lists (default: latest opportunity and expansion CSVs)')
+    parser.add_argument('--threshold', type=float, default=0.7, help='Similarity needed to join a group (0-1)')
+    parser.add_argument('--min-group-size', type=int, default=2, help='Smaller groups are listed as Unclustered')
+    args = parser.parse_args()
+
+    folder_name = os.path.dirname(client_cache_dir(args.client_name))
+    inputs = args.inputs or default_inputs(folder_name)
+    if not inputs:
+        print("❌ No keyword files found: pass CSVs or run competitor_research.py first")
+        sys.exit(1)
+
+    keywords = []
+    for path in inputs:
+        loaded = read_keywords(path)
+        print(f"📥 {len(loaded):,} keywords from {path}")
+        keywords.extend(loaded)
+
+    settings = client_keyword_settings(folder_name)
+    clusterer = KeywordClusterer(ignore_terms=settings['locations'] + settings['intent_modifiers'],
+                                 threshold=args.threshold)
+    start = datetime.now()
+    proposals = propose_ad_groups(keywords, clusterer, args.min_group_size)
+    total = sum(len(group) for _, _, group in proposals)
+    print(f"🧩 {total:,} unique keywords grouped into {sum(1 for p in proposals if p[0] != UNCLUSTERED_GROUP):,} "
+          f"ad groups in {(datetime.now() - start).total_seconds():.1f}s")
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    csv_path, report_path = write_proposals(proposals, folder_name, args.client_name, timestamp, total)
+    print(f"✅ Ads Editor keywords: {csv_path}")
+    print(f"📋 Ad group proposals: {report_path}")
+
+if __name__ == "__main__":
+    main()
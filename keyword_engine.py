@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Sparse TF-IDF phrase engine for keyword research
+Competitor pages (and the client's own site) are tokenised once, their 1-3 word
+phrases are encoded as integer keys with NumPy and counted into a SciPy sparse
+document-term matrix, so distinctive phrases per competitor and the phrases
+competitors share but the client lacks come from a few matrix operations even
+over thousands of pages.
+
+Locations and services used for keyword suggestions come from the client's
+business_data.json, falling back to the keyword_research block in config.yaml.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+from scipy import sparse
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+# Common words dropped from per-page content themes
+STOP_WORDS = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can', 'may', 'might', 'must', 'shall', 'this', 'that', 'these', 'those', 'a', 'an'}
+
+# Phrases may not start or end with these (site chrome and pronouns say nothing about a business)
+PHRASE_STOP_WORDS = STOP_WORDS | {
+    'our', 'your', 'you', 'we', 'us', 'it', 'its', 'as', 'so', 'if', 'not', 'all', 'any', 'more', 'most',
+    'than', 'then', 'there', 'their', 'they', 'them', 'what', 'when', 'where', 'which', 'who', 'how',
+    'also', 'just', 'very', 'here', 'click', 'read', 'menu', 'home', 'page', 'skip', 'content', 'copyright',
+    'rights', 'reserved', 'privacy', 'policy', 'terms', 'cookies', 'www', 'com', 'http', 'https'
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9]*(?:['’-][a-z0-9]+)*")
+
+DEFAULT_SETTINGS = {
+    'ngram_range': [1, 3],
+    'min_document_frequency': 1,     # phrases on fewer pages than this are ignored
+    'min_phrase_count': 2,           # a distinctive phrase must appear at least this often on its page
+    'max_document_share': 0.9,       # in sets of 10+ pages, phrases on more than this share are boilerplate
+    'distinctive_per_competitor': 5,
+    'max_gap_phrases': 25,
+    'max_opportunities': 200,
+    'locations': [],
+    'services': [],
+    'intent_modifiers': ['best', 'cheap', 'affordable', 'local', 'professional', 'custom'],
+    'expansion_match_types': ['Phrase', 'Exact'],
+    'negative_min_cost': 20.0,       # search-term n-grams with this much spend and no conversions
+    'negative_min_clicks': 5,        # (and at least this many clicks) are negative keyword candidates
+    'max_negative_candidates': 30
+}
+
+def tokenize(text):
+    """Lowercase word tokens of a page's visible text"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def load_keyword_settings(config_file=DEFAULT_CONFIG_FILE):
+    """keyword_research settings from config.yaml (defaults if the file or PyYAML is missing)"""
+    settings = {key: list(value) if isinstance(value, list) else value for key, value in DEFAULT_SETTINGS.items()}
+    if not YAML_AVAILABLE or not os.path.exists(config_file):
+        return settings
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        print(f"⚠️  Could not read {config_file}, using default keyword settings: {e}")
+        return settings
+    for key, value in (config.get('keyword_research') or {}).items():
+        if key in settings and value is not None:
+            settings[key] = value
+    return settings
+
+def _split_list(value):
+    """List from a JSON list or a comma/semicolon separated string"""
+    if isinstance(value, list):
+        items = value
+    else:
+        items = re.split(r'[,;/]|\band\b', value or '')
+    return [item.strip() for item in items if item and item.strip()]
+
+def client_keyword_settings(folder_name, config_file=DEFAULT_CONFIG_FILE):
+    """Keyword settings with the client's locations, services and website from business_data.json"""
+    settings = load_keyword_settings(config_file)
+    settings['website'] = None
+    data_path = os.path.join(folder_name, '02_market_research', 'claude_research', 'business_data.json')
+    try:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            business = json.load(f)
+    except (OSError, ValueError):
+        return settings
+
+    locations = []
+    for field in ('location', 'service_area'):
+        for place in _split_list(business.get(field)):
+            # "Gold Coast, Australia" is split above; country-level names are too broad for PPC modifiers
+            if place.lower() not in ('australia', 'new zealand', 'united states', 'united kingdom', 'usa', 'uk'):
+                locations.append(place)
+    if locations:
+        settings['locations'] = list(dict.fromkeys(locations))
+    services = _split_list(business.get('services'))
+    if services:
+        settings['services'] = services
+    settings['website'] = business.get('website') or None
+    return settings
+
+class PhraseMatrix:
+    """TF-IDF weighted document x phrase matrix over a set of pages"""
+
+    def __init__(self, documents, ngram_range=(1, 3), min_document_frequency=1, max_document_share=0.9,
+                 stop_words=PHRASE_STOP_WORDS):
+        """documents maps a page name (URL) to its visible text"""
+        self.names = list(documents)
+        vocabulary = {}
+        doc_ids = []
+        stop_ids = set()
+        for text in documents.values():
+            ids = []
+            for token in tokenize(text):
+                token_id = vocabulary.get(token)
+                if token_id is None:
+                    token_id = vocabulary[token] = len(vocabulary)
+                    if token in stop_words:
+                        stop_ids.add(token_id)
+                ids.append(token_id)
+            doc_ids.append(np.array(ids, dtype=np.int64))
+
+        self.words = np.array(sorted(vocabulary, key=vocabulary.get), dtype=object)
+        size = max(len(vocabulary), 1)
+        is_stop = np.zeros(size, dtype=bool)
+        is_stop[list(stop_ids)] = True
+
+        # Each n-gram order is encoded as base-`size` integer keys (int64 holds trigrams of a 2M word
+        # vocabulary), counted, then stacked as column blocks
+        blocks, orders, phrase_keys = [], [], []
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            rows, keys = [], []
+            for row, ids in enumerate(doc_ids):
+                if len(ids) < n:
+                    continue
+                windows = np.lib.stride_tricks.sliding_window_view(ids, n)
+                keep = ~(is_stop[windows[:, 0]] | is_stop[windows[:, -1]])
+                windows = windows[keep]
+                key = np.zeros(len(windows), dtype=np.int64)
+                for position in range(n):
+                    key = key * size + windows[:, position]
+                keys.append(key)
+                rows.append(np.full(len(key), row, dtype=np.int64))
+            if not keys:
+                continue
+            unique_keys, columns = np.unique(np.concatenate(keys), return_inverse=True)
+            counts = sparse.csr_matrix(
+                (np.ones(len(columns), dtype=np.float64), (np.concatenate(rows), columns)),
+                shape=(len(doc_ids), len(unique_keys)))
+            counts.sum_duplicates()
+            blocks.append(counts)
+            orders.append(np.full(len(unique_keys), n, dtype=np.int8))
+            phrase_keys.append(unique_keys)
+
+        if blocks:
+            counts = sparse.hstack(blocks, format='csc')
+            orders, phrase_keys = np.concatenate(orders), np.concatenate(phrase_keys)
+        else:
+            counts = sparse.csc_matrix((len(doc_ids), 0))
+            orders, phrase_keys = np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64)
+
+        # Drop phrases too rare to compare, and in larger sets the ones so common they are boilerplate
+        document_frequency = np.diff(counts.indptr)
+        max_documents = len(doc_ids)
+        if len(doc_ids) >= 10:
+            max_documents = max(min_document_frequency, max_document_share * len(doc_ids))
+        keep = np.flatnonzero((document_frequency >= min(min_document_frequency, len(doc_ids)))
+                              & (document_frequency <= max_documents))
+        counts = counts[:, keep].tocsr()
+        self._orders, self._phrase_keys = orders[keep], phrase_keys[keep]
+        self._size = size
+        self.document_frequency = document_frequency[keep]
+        self.counts = counts
+
+        # Sublinear term frequency, smoothed idf, rows scaled to unit length
+        weights = counts.copy()
+        weights.data = 1 + np.log(weights.data)
+        idf = np.log((1 + len(doc_ids)) / (1 + self.document_frequency)) + 1
+        weights = weights @ sparse.diags(idf, format='csr', shape=(len(idf), len(idf)))
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.weights = (sparse.diags(1 / norms, format='csr') @ weights).tocsr()
+
+    def phrase(self, column):
+        """Text of the phrase in one matrix column"""
+        n, key = self._orders[column], self._phrase_keys[column]
+        ids = []
+        for _ in range(n):
+            key, token_id = divmod(int(key), self._size)
+            ids.append(token_id)
+        return ' '.join(self.words[token_id] for token_id in reversed(ids))
+
+    def top_phrases(self, name, limit, min_count=2):
+        """Highest-weighted phrases used at least min_count times in one document, as (phrase, weight, count)"""
+        index = self.names.index(name)
+        row = self.weights.getrow(index)
+        row_counts = self.counts.getrow(index).toarray().ravel()[row.indices]
+        candidates = np.flatnonzero(row_counts >= min_count)
+        order = candidates[np.argsort(-row.data[candidates], kind='stable')][:limit]
+        return [(self.phrase(row.indices[i]), float(row.data[i]), int(row_counts[i])) for i in order]
+
+    def gaps(self, client_name, competitor_names, limit):
+        """Phrases competitors rank highly that the client's page never uses
+
+        Returns (phrase, mean competitor weight, number of competitors using it).
+        """
+        rows = [self.names.index(name) for name in competitor_names]
+        competitor_weights = self.weights[rows]
+        mean_weight = np.asarray(competitor_weights.mean(axis=0)).ravel()
+        used_by = np.diff(competitor_weights.tocsc().indptr)
+        client_counts = self.counts.getrow(self.names.index(client_name)).toarray().ravel()
+
+        candidates = np.flatnonzero((client_counts == 0) & (used_by >= min(2, len(rows))))
+        order = candidates[np.argsort(-mean_weight[candidates])][:limit]
+        return [(self.phrase(column), float(mean_weight[column]), int(used_by[column])) for column in order]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Streaming keyword expansion
+Usage: python keyword_expansion.py "Client Name" [--keyword "balloon garland" ...] [--modifier cheap ...]
+                                   [--match-types Phrase Exact] [--campaign NAME] [--bloom]
+
+Crosses target keywords with services, locations and intent modifiers lazily,
+normalising each candidate to a valid Google Ads keyword and dropping duplicates
+as it goes, then streams the result straight into a Google Ads Editor import
+CSV. Nothing holds the cross product in memory, so expansions into the hundreds
+of thousands of keywords run in constant memory apart from the de-duplication
+filter, which can be a fixed-size Bloom filter for very large runs.
+
+Keywords default to the last competitor run's target keywords; services and
+locations come from business_data.json or config.yaml (see keyword_engine.py).
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import math
+import os
+import re
+import sys
+import unicodedata
+from datetime import datetime
+
+from analysis_journal import AnalysisJournal
+from http_cache import client_cache_dir
+from keyword_engine import client_keyword_settings
+
+# Characters Google Ads rejects in keyword text
+INVALID_KEYWORD_CHARS = re.compile(r"[!@%^*=(){};~`<>?\\|,\"“”]")
+MAX_KEYWORD_WORDS = 10
+MAX_KEYWORD_CHARS = 80
+
+DEFAULT_TEMPLATE = '{modifier} {keyword} {service} {location}'
+DEFAULT_MATCH_TYPES = ['Phrase', 'Exact']
+ADS_EDITOR_COLUMNS = ['Campaign', 'Ad group', 'Keyword', 'Criterion Type']
+MATCH_TYPES = {'broad': 'Broad', 'phrase': 'Phrase', 'exact': 'Exact'}
+
+# Above this many candidates the exact de-duplication set is swapped for a Bloom filter
+BLOOM_THRESHOLD = 1_000_000
+
+def normalise_keyword(text):
+    """Lowercase keyword with invalid characters and repeated words removed (None if unusable)"""
+    text = INVALID_KEYWORD_CHARS.sub(' ', unicodedata.normalize('NFKC', text).lower())
+    words = list(dict.fromkeys(text.split()))
+    keyword = ' '.join(words)
+    if not words or len(words) > MAX_KEYWORD_WORDS or len(keyword) > MAX_KEYWORD_CHARS:
+        return None
+    return keyword
+
+def _digest(keyword):
+    return hashlib.blake2b(keyword.encode('utf-8'), digest_size=16).digest()
+
+class ExactSeen:
+    """Exact de-duplication by 64-bit keyword digest"""
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, keyword):
+        """Record keyword, returning False if it was already seen"""
+        key = int.from_bytes(_digest(keyword)[:8], 'little')
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+class BloomFilter:
+    """Fixed-size probabilistic set: a few keywords may be wrongly dropped, none are ever repeated"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, keyword):
+        """Record keyword, returning False if it was (probably) already seen"""
+        digest = _digest(keyword)
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        added = False
+        for i in range(self.hash_count):
+            position = (first + i * second) % self.size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        return added
+
+def expansion_size(keywords, services=(), locations=(), modifiers=()):
+    """Number of candidates expand_keywords will generate (before de-duplication)"""
+    return len(keywords) * (len(services) + 1) * (len(locations) + 1) * (len(modifiers) + 1)
+
+def seen_filter(expected, use_bloom=None):
+    """De-duplication filter sized for the expected number of candidates"""
+    if use_bloom is None:
+        use_bloom = expected > BLOOM_THRESHOLD
+    return BloomFilter(expected) if use_bloom else ExactSeen()
+
+def expand_keywords(keywords, services=(), locations=(), modifiers=(), template=DEFAULT_TEMPLATE, seen=None):
+    """Lazily yield (ad group, keyword) for every unique keyword x service x location x modifier combination
+
+    Services, locations and modifiers are optional slots, so the plain keyword and
+    every partial combination are produced too. Each ad group is a keyword/service pair.
+    """
+    if seen is None:
+        seen = seen_filter(expansion_size(keywords, services, locations, modifiers))
+    for keyword, service in itertools.product(keywords, [''] + list(services)):
+        ad_group = normalise_keyword(f"{keyword} {service}")
+        if ad_group is None:
+            continue
+        for location, modifier in itertools.product([''] + list(locations), [''] + list(modifiers)):
+            candidate = normalise_keyword(template.format(
+                keyword=keyword, service=service, location=location, modifier=modifier))
+            if candidate and seen.add(candidate):
+                yield ad_group.title(), candidate
+
+def write_ads_editor_csv(expansions, filepath, campaign, match_types=DEFAULT_MATCH_TYPES):
+    """Stream expansions into a Google Ads Editor keyword import CSV, returning the keyword count"""
+    criterion_types = [MATCH_TYPES[match_type.lower()] for match_type in match_types]
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    written = 0
+    with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(ADS_EDITOR_COLUMNS)
+        for ad_group, keyword in expansions:
+            for criterion_type in criterion_types:
+                writer.writerow([campaign, ad_group, keyword, criterion_type])
+            written += 1
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description='Expand keywords into a Google Ads Editor import CSV')
+    parser.add_argument('client_name', help='Client or business name')
+    parser.add_argument('--keyword', action='append', dest='keywords',
+                        help='Seed keyword (repeatable; default: the last competitor run\'s target keywords)')
+    parser.add_argument('--service', action='append', dest='services', help='Service (repeatable)')
+    parser.add_argument('--location', action='append', dest='locations', help='Location (repeatable)')
+    parser.add_argument('--modifier', action='append', dest='modifiers', help='Intent modifier (repeatable)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help=f'Keyword template (default: "{DEFAULT_TEMPLATE}")')
+    parser.add_argument('--match-types', nargs='+', choices=['Broad', 'Phrase', 'Exact'],
+                        help='Criterion types per keyword (default: expansion_match_types in config.yaml)')
+    parser.add_argument('--campaign', help='Campaign name (default: "<Client> - Search")')
+    parser.add_argument('--bloom', action='store_true', help='De-duplicate with a fixed-size Bloom filter')
+    parser.add_argument('--output', help='CSV path (default: 06_campaign_structure/keyword_expansion_<timestamp>.csv)')
+    args = parser.parse_args()
+
+    folder_name = os.path.dirname(client_cache_dir(args.client_name))
+    settings = client_keyword_settings(folder_name)
+
+    keywords = args.keywords
+    if not keywords:
+        journal = AnalysisJournal(folder_name)
+        keywords = journal.run['target_keywords'] if journal.load() else []
+    if not keywords:
+        print("❌ No seed keywords: pass --keyword or run competitor_research.py first")
+        sys.exit(1)
+
+    services = args.services or settings['services']
+    locations = args.locations or settings['locations']
+    modifiers = args.modifiers or settings['intent_modifiers']
+    match_types = args.match_types or settings['expansion_match_types']
+    candidates = expansion_size(keywords, services, locations, modifiers)
+    print(f"🔀 {len(keywords)} keywords x {len(services) + 1} services x {len(locations) + 1} locations x "
+          f"{len(modifiers) + 1} modifiers = {candidates:,} candidates")
+
+    output = args.output or os.path.join(
+        folder_name, '06_campaign_structure', f"keyword_expansion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    expansions = expand_keywords(keywords, services, locations, modifiers, template=args.template,
+                                 seen=seen_filter(candidates, use_bloom=args.bloom or None))
+    written = write_ads_editor_csv(expansions, output, args.campaign or f"{args.client_name} - Search", match_types)
+    print(f"✅ {written:,} unique keywords ({written * len(match_types):,} rows) written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Concurrent link health checks for the conversion optimization audit
+Usage: python link_checker.py https://example.com/page [--workers 16] [--per-host 8]
+
+Every link on a page is checked in parallel through the shared pooled session:
+HEAD first, falling back to a GET (closed after the headers) when HEAD fails or
+the server answers 405/501 to it. Redirects are followed by hand so the whole
+chain is reported, and a per-host limit keeps one site from being flooded.
+Results are kept in memory for the rest of the process (a site crawl checks its
+navigation once) and in <cache_dir>/link_status.json for later runs, which drops
+results older than the TTL each time it is written.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, urldefrag
+
+import requests
+
+from html_parser import parse_html
+from http_cache import DEFAULT_CACHE_DIRNAME, client_cache_dir
+from http_client import get_http_client, browser_headers, DEFAULT_USER_AGENTS
+
+LINK_STATUS_FILENAME = 'link_status.json'
+DEFAULT_TTL_SECONDS = 24 * 3600
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Statuses meaning the server does not support HEAD, so the link is retried with GET
+HEAD_UNSUPPORTED_CODES = {405, 501}
+NOT_CHECKED = 'Not checked (offline)'
+
+# Link schemes that never point at a page
+SKIPPED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'sms:')
+
+def host_key(netloc):
+    """Host without port or www., so example.com and www.example.com count as one site"""
+    host = netloc.lower().rsplit('@', 1)[-1].split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+def link_targets(soup, page_url):
+    """Absolute http(s) URLs linked from a page, split into (internal, outbound), in page order"""
+    site = host_key(urlparse(page_url).netloc)
+    internal, outbound, seen = [], [], set()
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '').strip()
+        if not href or href.startswith('#') or href.lower().startswith(SKIPPED_SCHEMES):
+            continue
+        try:
+            url = urldefrag(urljoin(page_url, href))[0]
+            parsed = urlparse(url)
+        except ValueError:
+            continue
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc or url in seen:
+            continue
+        seen.add(url)
+        (internal if host_key(parsed.netloc) == site else outbound).append(url)
+    return internal, outbound
+
+def is_broken(result):
+    """True for 4xx/5xx answers and links that could not be reached at all"""
+    return result['error'] is not None or (result['status'] or 0) >= 400
+
+class LinkChecker:
+    """Check links concurrently with per-host limits, caching results in memory and on disk"""
+
+    filename = LINK_STATUS_FILENAME
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIRNAME, max_workers=16, per_host=8, timeout=10,
+                 slow_seconds=2.0, max_redirects=5, ttl_seconds=DEFAULT_TTL_SECONDS, offline=False):
+        self.path = os.path.join(cache_dir, self.filename)
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.slow_seconds = slow_seconds
+        self.max_redirects = max_redirects
+        self.ttl_seconds = ttl_seconds
+        self.offline = offline
+        self.session = get_http_client().session
+        self.headers = browser_headers(DEFAULT_USER_AGENTS[0])
+        self.stats = {'checked': 0, 'cached': 0, 'requests': 0}
+
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self.results = self._load()
+
+    def _load(self):
+        """Results saved by earlier runs (an unreadable file just means starting over)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Drop expired results, then write the rest via a temp file so a concurrent reader never sees half a file"""
+        with self._lock:
+            now = time.time()
+            self.results = {url: result for url, result in self.results.items()
+                            if now - result['checked_at'] < self.ttl_seconds}
+            data = json.dumps(self.results, indent=1).encode('utf-8')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def _slot(self, url):
+        """Semaphore limiting concurrent requests to url's host"""
+        host = host_key(urlparse(url).netloc)
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _request(self, method, url):
+        with self._slot(url):
+            with self._lock:
+                self.stats['requests'] += 1
+            response = self.session.request(method, url, headers=self.headers, timeout=self.timeout,
+                                            allow_redirects=False, stream=True)
+            response.close()
+            return response
+
+    def _probe(self, url):
+        """One hop: HEAD, retried as GET when HEAD errors or the server does not support it"""
+        try:
+            response = self._request('HEAD', url)
+            if response.status_code not in HEAD_UNSUPPORTED_CODES:
+                return response
+        except requests.exceptions.RequestException:
+            pass
+        return self._request('GET', url)
+
+    def check_url(self, url):
+        """Check one link, following redirects by hand to record the chain"""
+        result = {'status': None, 'final_url': url, 'redirects': [], 'elapsed': 0.0,
+                  'error': None, 'checked_at': time.time()}
+        started = time.perf_counter()
+        current, seen = url, {url}
+        try:
+            for _ in range(self.max_redirects + 1):
+                response = self._probe(current)
+                result['status'] = response.status_code
+                location = response.headers.get('Location')
+                if response.status_code not in REDIRECT_CODES or not location:
+                    break
+                result['redirects'].append([response.status_code, current])
+                current = urldefrag(urljoin(current, location))[0]
+                result['final_url'] = current
+                if current in seen:
+                    result['error'] = 'Redirect loop'
+                    break
+                seen.add(current)
+            else:
+                result['error'] = f"More than {self.max_redirects} redirects"
+        except requests.exceptions.Timeout:
+            result['error'] = f"Timed out after {self.timeout}s"
+        except requests.exceptions.RequestException as e:
+            result['error'] = type(e).__name__
+        except ValueError:
+            # A malformed Location header (requests parses it too, even with allow_redirects=False)
+            result['error'] = 'Invalid redirect URL'
+        result['elapsed'] = round(time.perf_counter() - started, 3)
+        return result
+
+    def unchecked_result(self, url):
+        """Placeholder for a URL that offline mode could not check"""
+        return {'status': None, 'final_url': url, 'redirects': [], 'elapsed': 0.0,
+                'error': NOT_CHECKED, 'checked_at': 0}
+
+    def _fresh(self, url):
+        result = self.results.get(url)
+        return result is not None and (self.offline or time.time() - result['checked_at'] < self.ttl_seconds)
+
+    def check(self, urls):
+        """Check urls in parallel (cached results are reused) and return {url: result}"""
+        urls = list(dict.fromkeys(urls))
+        with self._lock:
+            pending = [url for url in urls if not self._fresh(url)]
+            self.stats['cached'] += len(urls) - len(pending)
+
+        if pending and self.offline:
+            with self._lock:
+                return {url: self.results.get(url) or self.unchecked_result(url) for url in urls}
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                checked = dict(zip(pending, executor.map(self.check_url, pending)))
+            with self._lock:
+                self.results.update(checked)
+                self.stats['checked'] += len(checked)
+            self.save()
+
+        with self._lock:
+            return {url: self.results[url] for url in urls}
+
+    def summarize(self, results):
+        """Broken, redirected and slow links from check() results"""
+        summary = {'broken': [], 'redirected': [], 'slow': [], 'unchecked': 0}
+        for url, result in results.items():
+            if result['error'] == NOT_CHECKED:
+                summary['unchecked'] += 1
+            elif is_broken(result):
+                summary['broken'].append({'url': url, 'status': result['status'], 'error': result['error']})
+            else:
+                if result['redirects']:
+                    summary['redirected'].append({'url': url, 'final_url': result['final_url'],
+                                                  'hops': len(result['redirects'])})
+                if result['elapsed'] > self.slow_seconds:
+                    summary['slow'].append({'url': url, 'seconds': result['elapsed']})
+        return summary
+
+_checkers = {}
+_checkers_lock = threading.Lock()
+
+def get_link_checker(cache_dir=DEFAULT_CACHE_DIRNAME, offline=False):
+    """Process-wide checker per cache directory, so every page of a crawl shares its results"""
+    key = (os.path.abspath(cache_dir), offline)
+    with _checkers_lock:
+        if key not in _checkers:
+            _checkers[key] = LinkChecker(cache_dir, offline=offline)
+        return _checkers[key]
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Check every link on a page for errors, redirects and slow responses')
+    parser.add_argument('url', help='Page whose links are checked')
+    parser.add_argument('--workers', type=int, default=16, help='Links checked in parallel')
+    parser.add_argument('--per-host', type=int, default=8, help='Maximum parallel requests to one host')
+    parser.add_argument('--slow', type=float, default=2.0, help='Seconds after which a link counts as slow')
+    parser.add_argument('--client', help='Client name - results are cached in that client\'s project folder')
+    args = parser.parse_args(argv)
+
+    cache_dir = client_cache_dir(args.client) if args.client else DEFAULT_CACHE_DIRNAME
+    checker = LinkChecker(cache_dir, max_workers=args.workers, per_host=args.per_host, slow_seconds=args.slow)
+    response = get_http_client().get(args.url, headers=checker.headers, page=True)
+    internal, outbound = link_targets(parse_html(response.content), response.url)
+
+    started = time.perf_counter()
+    summary = checker.summarize(checker.check(internal + outbound))
+    print(f"🔗 {len(internal)} internal and {len(outbound)} outbound links checked in "
+          f"{time.perf_counter() - started:.1f}s ({checker.stats['cached']} from cache)")
+    for link in summary['broken']:
+        print(f"❌ {link['status'] or link['error']}: {link['url']}")
+    for link in summary['redirected']:
+        print(f"↪️  {link['hops']} redirect(s): {link['url']} -> {link['final_url']}")
+    for link in summary['slow']:
+        print(f"🐢 {link['seconds']:.1f}s: {link['url']}")
+    return summary
+
+if __name__ == "__main__":
+    main()
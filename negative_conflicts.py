@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Negative keyword conflict detection
+Usage: python negative_conflicts.py "Client Name" [--negatives negatives.csv ...] [--keywords keywords.csv ...]
+                                    [--min-conversions 1]
+
+Finds negative keywords that block positive keywords or converting search terms,
+following Google Ads negative match types:
+
+    broad   "balloon hire"   blocks terms containing every word, in any order
+    phrase  "balloon hire"   blocks terms containing the words in this order
+    exact   [balloon hire]   blocks only the term "balloon hire"
+
+Terms are split into words on whitespace and punctuation, numbers included, so
+[bedroom] does not block "2 bedroom". Negatives never match close variants or
+plurals. Ad group negatives apply to their ad group, campaign negatives to the
+whole campaign and negatives without a campaign (shared lists) to everything.
+
+Phrase and exact negatives are compiled into a token-level Aho-Corasick
+automaton and broad negatives into a trie over their sorted word sets, so
+each distinct term is scanned once however many negatives there are.
+
+Negatives are read from 06_campaign_structure/*negative*.csv (Google Ads Editor
+exports, or any CSV with keyword, match type, campaign and ad group columns).
+Positives are the latest keyword_opportunities, keyword_expansion and
+ad_group_keywords CSVs, plus the keywords and converting search terms in
+05_historical_data/. Conflicts are written to
+02_market_research/negative_keyword_conflicts_<timestamp>.csv.
+"""
+
+import argparse
+import collections
+import csv
+import glob
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from http_cache import client_cache_dir
+from search_term_data import load_history, report_rows, term_words
+
+MATCH_TYPES = ('exact', 'phrase', 'broad')
+NEGATIVES_DIRNAME = '06_campaign_structure'
+NEGATIVE_FILE_PATTERN = '*negative*.csv'
+
+KEYWORD_COLUMNS = ['keyword', 'negative keyword', 'negative keywords', 'keyword_opportunity', 'search keyword']
+MATCH_TYPE_COLUMNS = ['criterion type', 'match type', 'type']
+CAMPAIGN_COLUMNS = ['campaign', 'campaign name']
+AD_GROUP_COLUMNS = ['ad group', 'ad group name']
+
+CONFLICT_FIELDS = ['campaign', 'ad_group', 'blocked', 'source', 'conversions', 'cost',
+                   'negative_keyword', 'negative_match_type', 'negative_level', 'negative_campaign', 'negative_ad_group']
+
+def parse_keyword(text, criterion_type=''):
+    """(words, match type) from keyword text in [exact]/"phrase"/broad notation and an optional criterion type"""
+    text = text.strip()
+    criterion_type = criterion_type.lower()
+    match_type = next((name for name in MATCH_TYPES if name in criterion_type), None)
+    if len(text) > 1 and text[0] == '[' and text[-1] == ']':
+        match_type, text = match_type or 'exact', text[1:-1]
+    elif len(text) > 1 and text[0] == '"' and text[-1] == '"':
+        match_type, text = match_type or 'phrase', text[1:-1]
+    return tuple(term_words(text)), match_type or 'broad'
+
+def _column(header, names):
+    cells = [cell.strip().lower() for cell in header]
+    return next((cells.index(name) for name in names if name in cells), None)
+
+def read_keyword_file(path):
+    """(negatives, positives) from a keyword CSV
+
+    Rows whose criterion type mentions "negative" are negatives. A file without
+    any such rows is all negatives if its name says so, otherwise all positives,
+    which covers Ads Editor exports, plain negative lists and keyword CSVs alike.
+    """
+    negatives, positives = [], []
+    rows = report_rows(path)
+    header = next(rows, [])
+    keyword_index = _column(header, KEYWORD_COLUMNS)
+    if keyword_index is None:
+        rows.close()
+        raise ValueError(f"{path} has no keyword column")
+    type_index = _column(header, MATCH_TYPE_COLUMNS)
+    campaign_index = _column(header, CAMPAIGN_COLUMNS)
+    ad_group_index = _column(header, AD_GROUP_COLUMNS)
+
+    def cell(row, index):
+        return row[index].strip() if index is not None and index < len(row) else ''
+
+    for row in rows:
+        text = cell(row, keyword_index)
+        if not text:
+            continue
+        criterion_type = cell(row, type_index)
+        words, match_type = parse_keyword(text, criterion_type)
+        if not words:
+            continue
+        entry = {'keyword': text, 'words': words, 'match_type': match_type,
+                 'campaign': cell(row, campaign_index), 'ad_group': cell(row, ad_group_index),
+                 'negative': 'negative' in criterion_type.lower()}
+        (negatives if entry['negative'] else positives).append(entry)
+
+    if not negatives and 'negative' in os.path.basename(path).lower():
+        negatives, positives = positives, []
+    for entry in negatives:
+        entry.pop('negative')
+        entry['level'] = 'Ad group' if entry['ad_group'] else 'Campaign' if entry['campaign'] else 'Shared list'
+    for entry in positives:
+        entry.pop('negative')
+    return negatives, positives
+
+class NegativeMatcher:
+    """Negative keywords compiled for single-pass matching of search terms and keywords"""
+
+    def __init__(self, negatives):
+        self.negatives = list(negatives)
+        self.vocabulary = {}
+
+        # Phrase and exact negatives: Aho-Corasick automaton over word ids
+        self._goto, self._output = [{}], [[]]
+        # Broad negatives: trie over each negative's distinct word ids in ascending order
+        self._broad_goto, self._broad_output = [{}], [[]]
+
+        for index, negative in enumerate(self.negatives):
+            ids = [self.vocabulary.setdefault(word, len(self.vocabulary)) for word in negative['words']]
+            if negative['match_type'] == 'broad':
+                node = 0
+                for word_id in sorted(set(ids)):
+                    node = self._child(self._broad_goto, self._broad_output, node, word_id)
+                self._broad_output[node].append(index)
+            else:
+                node = 0
+                for word_id in ids:
+                    node = self._child(self._goto, self._output, node, word_id)
+                self._output[node].append(index)
+
+        # Failure links, breadth first; each state also reports the patterns ending at its fallbacks
+        self._fail = [0] * len(self._goto)
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word_id, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and word_id not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word_id, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    @staticmethod
+    def _child(goto, output, node, word_id):
+        child = goto[node].get(word_id)
+        if child is None:
+            child = goto[node][word_id] = len(goto)
+            goto.append({})
+            output.append([])
+        return child
+
+    def match(self, words):
+        """Indexes of the negatives that block a term given as a sequence of words"""
+        ids = [self.vocabulary.get(word, -1) for word in words]
+        known = sorted({word_id for word_id in ids if word_id >= 0})
+        if not known:
+            return []  # most search terms share no word with any negative
+        hits = []
+
+        state = 0
+        for position, word_id in enumerate(ids):
+            while state and word_id not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word_id, 0)
+            for index in self._output[state]:
+                negative = self.negatives[index]
+                # An exact negative must span the whole term
+                if negative['match_type'] == 'exact' and (position + 1 != len(ids) or len(negative['words']) != len(ids)):
+                    continue
+                hits.append(index)
+
+        # Every broad negative whose word set is a subset of the term's words
+        stack = [(0, 0)]
+        while stack:
+            node, start = stack.pop()
+            for position in range(start, len(known)):
+                child = self._broad_goto[node].get(known[position])
+                if child is not None:
+                    hits.extend(self._broad_output[child])
+                    stack.append((child, position + 1))
+        return hits
+
+def applies(negative, campaign, ad_group):
+    """Whether a negative's level covers a positive in this campaign and ad group (blank: any)"""
+    if negative['campaign'] and campaign and negative['campaign'].lower() != campaign.lower():
+        return False
+    if negative['ad_group'] and ad_group and negative['ad_group'].lower() != ad_group.lower():
+        return False
+    return True
+
+def find_conflicts(matcher, positives):
+    """Conflict rows for positives (dicts with keyword, campaign, ad_group, source and optional metrics)"""
+    matches = {}
+    conflicts = []
+    for positive in positives:
+        text = positive['keyword']
+        hits = matches.get(text)
+        if hits is None:
+            hits = matches[text] = matcher.match(parse_keyword(text)[0])
+        for index in hits:
+            negative = matcher.negatives[index]
+            if not applies(negative, positive.get('campaign', ''), positive.get('ad_group', '')):
+                continue
+            conflicts.append({
+                'campaign': positive.get('campaign') or negative['campaign'],
+                'ad_group': positive.get('ad_group') or negative['ad_group'],
+                'blocked': text,
+                'source': positive['source'],
+                'conversions': positive.get('conversions', ''),
+                'cost': positive.get('cost', ''),
+                'negative_keyword': negative['keyword'],
+                'negative_match_type': negative['match_type'],
+                'negative_level': negative['level'],
+                'negative_campaign': negative['campaign'],
+                'negative_ad_group': negative['ad_group']
+            })
+    return conflicts
+
+def negative_keyword_files(folder_name):
+    """Negative keyword lists in a client's 06_campaign_structure folder"""
+    return sorted(glob.glob(os.path.join(folder_name, NEGATIVES_DIRNAME, '**', NEGATIVE_FILE_PATTERN), recursive=True))
+
+def load_negatives(paths):
+    """Negatives (and any positives) from every readable keyword file"""
+    negatives, positives = [], []
+    for path in paths:
+        try:
+            file_negatives, file_positives = read_keyword_file(path)
+        except (OSError, ValueError, UnicodeError, csv.Error) as e:
+            print(f"⚠️  Skipping {path}: {e}")
+            continue
+        negatives.extend(file_negatives)
+        positives.extend(dict(positive, source=f"Keyword ({os.path.basename(path)})") for positive in file_positives)
+    return negatives, positives
+
+def default_keyword_files(folder_name):
+    """The latest keyword opportunity, expansion and ad group CSVs for a client"""
+    paths = []
+    for pattern in ('02_market_research/keyword_opportunities_*.csv', '06_campaign_structure/keyword_expansion_*.csv',
+                    '06_campaign_structure/ad_group_keywords_*.csv'):
+        matches = sorted(glob.glob(os.path.join(folder_name, pattern)))
+        if matches:
+            paths.append(matches[-1])
+    return paths
+
+def historical_positives(folder_name, min_conversions=1.0):
+    """Account keywords and converting search terms per campaign and ad group from 05_historical_data/"""
+    positives = []
+    for table in load_history(folder_name):
+        column = 'search_term' if table.kind == 'search_terms' else 'keyword'
+        terms = table[column]
+        campaigns = table['campaign'] if 'campaign' in table else None
+        ad_groups = table['ad_group'] if 'ad_group' in table else None
+
+        # Sum metrics per (term, campaign, ad group) combination of dictionary codes
+        combined = np.asarray(terms.codes, dtype=np.int64)
+        for scope in (campaigns, ad_groups):
+            if scope is not None:
+                combined = combined * len(scope.values) + np.asarray(scope.codes, dtype=np.int64)
+        keys, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        conversions = np.bincount(inverse, weights=table['conversions'], minlength=len(keys)) \
+            if 'conversions' in table else np.zeros(len(keys))
+        cost = np.bincount(inverse, weights=table['cost'], minlength=len(keys)) if 'cost' in table else np.zeros(len(keys))
+
+        keep = np.arange(len(keys)) if table.kind == 'keywords' else np.flatnonzero(conversions >= min_conversions)
+        source = 'Account keyword' if table.kind == 'keywords' else 'Converting search term'
+        for group in keep.tolist():
+            row = first[group]
+            positives.append({
+                'keyword': terms[row],
+                'campaign': campaigns[row] if campaigns is not None else '',
+                'ad_group': ad_groups[row] if ad_groups is not None else '',
+                'source': source,
+                'conversions': round(float(conversions[group]), 2),
+                'cost': round(float(cost[group]), 2)
+            })
+    return positives
+
+def opportunity_positives(path):
+    """Suggested keywords from a keyword_opportunities CSV (negative suggestions are skipped)"""
+    from competitor_research import NEGATIVE_SOURCE
+    with open(path, newline='', encoding='utf-8') as f:
+        return [{'keyword': row['keyword_opportunity'], 'campaign': '', 'ad_group': '',
+                 'source': f"Keyword opportunity ({row.get('source', '')})"}
+                for row in csv.DictReader(f)
+                if row.get('keyword_opportunity') and row.get('source') != NEGATIVE_SOURCE]
+
+def write_conflicts(conflicts, filepath):
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CONFLICT_FIELDS)
+        writer.writeheader()
+        writer.writerows(conflicts)
+
+def summarize_conflicts(conflicts):
+    """Conflict counts per (campaign, ad group), most conflicts first"""
+    counts = collections.Counter((row['campaign'] or '(all campaigns)', row['ad_group'] or '(all ad groups)')
+                                 for row in conflicts)
+    return counts.most_common()
+
+def main():
+    parser = argparse.ArgumentParser(description='Find negative keywords that block keywords or converting search terms')
+    parser.add_argument('client_name', help='Client or business name')
+    parser.add_argument('--negatives', nargs='+', help=f'Negative keyword CSVs (default: {NEGATIVES_DIRNAME}/{NEGATIVE_FILE_PATTERN})')
+    parser.add_argument('--keywords', nargs='+', help='Keyword CSVs to check (default: latest opportunity, expansion and ad group CSVs)')
+    parser.add_argument('--min-conversions', type=float, default=1.0,
+                        help='Search terms with at least this many conversions are checked')
+    args = parser.parse_args()
+
+    folder_name = os.path.dirname(client_cache_dir(args.client_name))
+    negatives, positives = load_negatives(args.negatives or negative_keyword_files(folder_name))
+    if not negatives:
+        print(f"❌ No negative keywords found: pass --negatives or add {NEGATIVE_FILE_PATTERN} files to "
+              f"{os.path.join(folder_name, NEGATIVES_DIRNAME)}")
+        sys.exit(1)
+
+    for path in args.keywords or default_keyword_files(folder_name):
+        if os.path.basename(path).startswith('keyword_opportunities_'):
+            positives.extend(opportunity_positives(path))
+        else:
+            positives.extend(load_negatives([path])[1])
+    positives.extend(historical_positives(folder_name, args.min_conversions))
+
+    start = datetime.now()
+    matcher = NegativeMatcher(negatives)
+    conflicts = find_conflicts(matcher, positives)
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"🧮 {len(negatives):,} negatives checked against {len(positives):,} keywords and search terms in {elapsed:.1f}s")
+
+    if not conflicts:
+        print("✅ No negative keyword conflicts")
+        return
+    filepath = os.path.join(folder_name, '02_market_research',
+                            f"negative_keyword_conflicts_{start.strftime('%Y%m%d_%H%M%S')}.csv")
+    write_conflicts(conflicts, filepath)
+    for (campaign, ad_group), count in summarize_conflicts(conflicts)[:20]:
+        print(f"   🚫 {campaign} > {ad_group}: {count} blocked")
+    print(f"⚠️  {len(conflicts):,} conflicts saved to {filepath}")
+
+if __name__ == "__main__":
+    main()
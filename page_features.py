@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Single-pass page feature extraction
+Walks a BeautifulSoup tree once and indexes the tags and text the analysers need,
+so each helper reads precomputed results instead of re-traversing the document.
+The tree is never modified, so analysers see the same page whatever order they run in.
+"""
+
+import collections
+import heapq
+import threading
+
+from bs4.element import CData, NavigableString, Tag
+
+# Subtrees the analysers treat as invisible (their text never counts as page copy)
+NON_CONTENT_TAGS = {'script', 'style'}
+
+# String types BeautifulSoup.get_text() joins for a whole document
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+# Elements whose own visible text is collected during the walk (headings, copy, CTAs, page sections)
+TEXT_ELEMENT_TAGS = {
+    'title', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'a', 'button', 'label', 'strong', 'em', 'b',
+    'header', 'nav', 'main', 'article', 'section', 'aside', 'footer', 'form'
+}
+
+class _EndOfElement:
+    """Walk marker popped once all of an element's descendants have been visited"""
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+class PageFeatures:
+    """Tag index and visible text for one parsed page, built in a single tree walk"""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self._tags = collections.defaultdict(list)
+        self._element_text = {}
+        self._section_text = {}
+        self._tokens = None
+        self.strings = []  # visible text strings in document order (no comments, doctypes or script/style code)
+        open_elements = []  # text part lists of the TEXT_ELEMENT_TAGS currently being walked
+
+        # Iterative pre-order walk so document order is preserved without recursion limits
+        position = 0
+        stack = list(reversed(soup.contents))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _EndOfElement):
+                self._element_text[id(node.tag)] = ''.join(open_elements.pop())
+            elif isinstance(node, Tag):
+                self._tags[node.name].append((position, node))
+                position += 1
+                if node.name in NON_CONTENT_TAGS:
+                    continue
+                if node.name in TEXT_ELEMENT_TAGS:
+                    open_elements.append([])
+                    stack.append(_EndOfElement(node))
+                stack.extend(reversed(node.contents))
+            elif type(node) in TEXT_STRING_TYPES:
+                self.strings.append(node)
+                for parts in open_elements:
+                    parts.append(node)
+
+        self.text = ''.join(self.strings)
+        self.text_lower = self.text.lower()
+
+    @property
+    def tokens(self):
+        """Whitespace-separated words of the visible text"""
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+
+    @property
+    def word_count(self):
+        return len(self.tokens)
+
+    def element_text(self, tag):
+        """Visible text of one element (script and style contents excluded), like tag.get_text()"""
+        text = self._element_text.get(id(tag))
+        if text is None:
+            # Only TEXT_ELEMENT_TAGS are collected during the walk
+            text = ''.join(string for string in tag.strings if type(string) in TEXT_STRING_TYPES)
+        return text
+
+    def section_text(self, *names):
+        """Space-joined visible text of every element with the given names, in document order"""
+        if names not in self._section_text:
+            self._section_text[names] = ' '.join(self.element_text(tag) for tag in self.find_all(*names))
+        return self._section_text[names]
+
+    def find_all(self, *names):
+        """All tags with any of the given names, in document order"""
+        if len(names) == 1:
+            return [tag for _, tag in self._tags.get(names[0], [])]
+        merged = heapq.merge(*(self._tags.get(name, []) for name in names), key=lambda entry: entry[0])
+        return [tag for _, tag in merged]
+
+    def find(self, name, attrs=None, **kwargs):
+        """First tag with the given name whose attributes match, or None"""
+        attrs = dict(attrs or {}, **kwargs)
+        for _, tag in self._tags.get(name, []):
+            if all(self._attribute_matches(tag.get(key), expected) for key, expected in attrs.items()):
+                return tag
+        return None
+
+    def tag_index(self):
+        """(tag name, [(document position, tag), ...]) for every tag name on the page"""
+        return self._tags.items()
+
+    def count(self, *names):
+        """Number of tags with any of the given names"""
+        return sum(len(self._tags.get(name, [])) for name in names)
+
+    def _attribute_matches(self, actual, expected):
+        """Match an attribute value the same way BeautifulSoup's find() does"""
+        if actual is None:
+            return False
+        if expected is True:
+            return True
+
+        # Multi-valued attributes (rel, class) match on any single value or the joined string
+        candidates = list(actual) + [' '.join(actual)] if isinstance(actual, list) else [actual]
+        if hasattr(expected, 'search'):
+            return any(expected.search(candidate) for candidate in candidates)
+        return expected in candidates
+
+_local = threading.local()
+
+def get_page_features(soup):
+    """Return the PageFeatures for soup, walking the tree only on first use"""
+    cached = getattr(_local, 'features', None)
+    if cached is None or cached.soup is not soup:
+        cached = PageFeatures(soup)
+        _local.features = cached
+    return cached
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Page-weight audit: the size of every asset a page loads
+Usage: python page_weight.py https://example.com [https://competitor.com ...] [--client "Client Name"]
+
+Every image (src and srcset), script, stylesheet, icon and font a page
+references is resolved and sized concurrently, with a HEAD request or, when
+that gives no Content-Length, a one-byte range request. Sizes are cached in
+<cache_dir>/asset_sizes.json, so offline runs and later audits reuse them.
+The audit totals the page weight, flags oversized and non-WebP/AVIF images,
+lists render-blocking resources, estimates the cost of third-party scripts
+and renders a cumulative-weight waterfall table.
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urljoin, urlparse, urldefrag
+
+import requests
+
+from html_parser import parse_html
+from http_cache import HttpCache, DEFAULT_CACHE_DIRNAME, OfflineCacheMiss, client_cache_dir
+from http_client import get_http_client
+from link_checker import LinkChecker, NOT_CHECKED, host_key
+
+ASSET_SIZES_FILENAME = 'asset_sizes.json'
+ASSET_TTL_SECONDS = 7 * 24 * 3600
+
+# Thresholds for the flags (KB = 1024 bytes)
+OVERSIZED_IMAGE_KB = 200
+LEGACY_IMAGE_MIN_KB = 10
+HEAVY_PAGE_KB = 3 * 1024
+
+# Rough main-thread cost of JavaScript on a mid-range phone: about 1 second per MB
+SCRIPT_MS_PER_KB = 1.0
+
+# Bodies are only downloaded when a server gives neither Content-Length nor Content-Range
+MAX_COUNTED_BYTES = 20 * 1024 * 1024
+COUNT_CHUNK_BYTES = 64 * 1024
+
+FONT_EXTENSIONS = ('.woff2', '.woff', '.ttf', '.otf', '.eot')
+# Formats that need no conversion; icons are left alone too
+MODERN_IMAGE_FORMATS = ('webp', 'avif', 'svg', 'x-icon', 'vnd.microsoft.icon', 'ico')
+PRELOAD_TYPES = {'image': 'image', 'font': 'font', 'script': 'script', 'style': 'stylesheet'}
+
+FONT_FACE_PATTERN = re.compile(r'@font-face\s*\{[^}]*\}', re.IGNORECASE)
+CSS_URL_PATTERN = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)', re.IGNORECASE)
+CONTENT_RANGE_PATTERN = re.compile(r'/\s*(\d+)\s*$')
+
+def srcset_urls(srcset):
+    """Candidate URLs of a srcset attribute, without their width/density descriptors"""
+    return [candidate.split()[0] for candidate in re.split(r',\s+|,(?=\S+\s)', srcset.strip())
+            if candidate.strip()]
+
+def asset_format(asset):
+    """Lower-case format name from the Content-Type, falling back to the file extension"""
+    content_type = asset.get('content_type') or ''
+    if '/' in content_type:
+        return content_type.split('/', 1)[1].split('+')[0]
+    extension = os.path.splitext(urlparse(asset['url']).path)[1].lower()
+    return {'.jpg': 'jpeg'}.get(extension, extension.lstrip('.'))
+
+def is_oversized_image(asset):
+    return asset['type'] == 'image' and (asset['bytes'] or 0) > OVERSIZED_IMAGE_KB * 1024
+
+def is_legacy_image(asset):
+    """A measured JPEG/PNG/GIF image big enough to be worth converting to WebP or AVIF"""
+    return (asset['type'] == 'image' and asset['bytes'] is not None and asset['bytes'] > LEGACY_IMAGE_MIN_KB * 1024
+            and asset_format(asset) not in MODERN_IMAGE_FORMATS)
+
+def page_assets(soup, page_url):
+    """Assets a page loads, in document order, each {url, type, tag, render_blocking, third_party, alternate}
+
+    srcset candidates are alternates: a browser downloads one per image, so they
+    are sized and flagged but only the src counts towards the page weight.
+    References that are not valid URLs are skipped.
+    """
+    site = host_key(urlparse(page_url).netloc)
+    assets, by_url = [], {}
+
+    def add(reference, asset_type, tag, render_blocking=False, alternate=False):
+        reference = (reference or '').strip()
+        if not reference or reference.startswith(('data:', '#')):
+            return
+        try:
+            url = urldefrag(urljoin(page_url, reference))[0]
+            parsed = urlparse(url)
+        except ValueError:
+            return
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            return
+        if url in by_url:
+            # A preloaded script or image is still blocking (or counted) where it is actually used
+            existing = by_url[url]
+            existing['render_blocking'] = existing['render_blocking'] or render_blocking
+            existing['alternate'] = existing['alternate'] and alternate
+            return
+        host = host_key(parsed.netloc)
+        asset = {'url': url, 'type': asset_type, 'tag': tag, 'render_blocking': render_blocking,
+                 'third_party': host != site and not host.endswith('.' + site), 'alternate': alternate}
+        by_url[url] = asset
+        assets.append(asset)
+
+    for element in soup.find_all(['img', 'source', 'script', 'link', 'style']):
+        name = element.name
+        if name == 'img':
+            src = element.get('src') or element.get('data-src')
+            candidates = srcset_urls(element.get('srcset') or element.get('data-srcset') or '')
+            add(src or (candidates[0] if candidates else ''), 'image', 'img')
+            for candidate in candidates:
+                add(candidate, 'image', 'img srcset', alternate=True)
+        elif name == 'source' and element.parent is not None and element.parent.name == 'picture':
+            for candidate in srcset_urls(element.get('srcset') or ''):
+                add(candidate, 'image', 'picture source', alternate=True)
+        elif name == 'script' and element.get('src'):
+            in_head = element.find_parent('head') is not None
+            deferred = element.has_attr('async') or element.has_attr('defer') or element.get('type') == 'module'
+            add(element['src'], 'script', 'script', render_blocking=in_head and not deferred)
+        elif name == 'link' and element.get('href'):
+            rel = [value.lower() for value in (element.get('rel') or [])]
+            href = element['href']
+            if 'stylesheet' in rel:
+                # Print stylesheets download without holding up the first render
+                blocking = (element.find_parent('head') is not None and not element.has_attr('disabled')
+                            and (element.get('media') or 'all').strip().lower() != 'print')
+                add(href, 'stylesheet', 'link stylesheet', render_blocking=blocking)
+            elif 'preload' in rel and element.get('as') in PRELOAD_TYPES:
+                add(href, PRELOAD_TYPES[element['as']], 'link preload')
+            elif any('icon' in value for value in rel):
+                add(href, 'image', 'link icon')
+            elif href.split('#')[0].split('?')[0].lower().endswith(FONT_EXTENSIONS):
+                add(href, 'font', 'link')
+        elif name == 'style':
+            for font_face in FONT_FACE_PATTERN.findall(element.get_text()):
+                for reference in CSS_URL_PATTERN.findall(font_face):
+                    add(reference, 'font', '@font-face')
+    return assets
+
+class AssetSizer(LinkChecker):
+    """LinkChecker's concurrent, per-host-limited and cached checks, recording each asset's transfer size"""
+
+    filename = ASSET_SIZES_FILENAME
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIRNAME, max_workers=16, per_host=4, timeout=10,
+                 ttl_seconds=ASSET_TTL_SECONDS, offline=False):
+        super().__init__(cache_dir, max_workers=max_workers, per_host=per_host, timeout=timeout,
+                         ttl_seconds=ttl_seconds, offline=offline)
+
+    def unchecked_result(self, url):
+        return {'status': None, 'bytes': None, 'content_type': '', 'elapsed': 0.0,
+                'error': NOT_CHECKED, 'checked_at': 0}
+
+    def _range_size(self, url):
+        """Size from a one-byte range request (the full body is only counted if the server ignores ranges)"""
+        headers = dict(self.headers, Range='bytes=0-0')
+        response = self.session.get(url, headers=headers, timeout=self.timeout, allow_redirects=True, stream=True)
+        try:
+            match = CONTENT_RANGE_PATTERN.search(response.headers.get('Content-Range', ''))
+            declared = response.headers.get('Content-Length', '')
+            if response.status_code == 206 and match:
+                return response, int(match.group(1))
+            if response.status_code >= 400:
+                return response, None
+            if declared.isdigit():
+                return response, int(declared)
+            size = 0
+            for chunk in response.raw.stream(COUNT_CHUNK_BYTES, decode_content=False):
+                size += len(chunk)
+                if size >= MAX_COUNTED_BYTES:
+                    break
+            return response, size
+        finally:
+            response.close()
+
+    def check_url(self, url):
+        """Transfer size of one asset: HEAD, then a range request when HEAD gives no length"""
+        result = {'status': None, 'bytes': None, 'content_type': '', 'elapsed': 0.0,
+                  'error': None, 'checked_at': time.time()}
+        started = time.perf_counter()
+        try:
+            with self._slot(url):
+                with self._lock:
+                    self.stats['requests'] += 1
+                response = self.session.head(url, headers=self.headers, timeout=self.timeout, allow_redirects=True)
+                declared = response.headers.get('Content-Length', '')
+                size = int(declared) if declared.isdigit() and response.status_code < 400 else None
+                if size is None:
+                    with self._lock:
+                        self.stats['requests'] += 1
+                    response, size = self._range_size(url)
+            result['status'] = response.status_code
+            result['bytes'] = size
+            result['content_type'] = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        except requests.exceptions.Timeout:
+            result['error'] = f"Timed out after {self.timeout}s"
+        except requests.exceptions.RequestException as e:
+            result['error'] = type(e).__name__
+        result['elapsed'] = round(time.perf_counter() - started, 3)
+        return result
+
+_sizers = {}
+_sizers_lock = threading.Lock()
+
+def get_asset_sizer(cache_dir=DEFAULT_CACHE_DIRNAME, offline=False):
+    """Process-wide sizer per cache directory, so assets shared between pages are sized once"""
+    key = (os.path.abspath(cache_dir), offline)
+    with _sizers_lock:
+        if key not in _sizers:
+            _sizers[key] = AssetSizer(cache_dir, offline=offline)
+        return _sizers[key]
+
+def audit_page(soup, page_url, html_bytes=None, sizer=None):
+    """Page-weight audit of a parsed page; without a sizer only the static checks are made
+
+    Returns a dict with the sized assets, totals by type, oversized and legacy-format
+    images, render-blocking resources and third-party script cost per host.
+    """
+    assets = page_assets(soup, page_url)
+    results = sizer.check([asset['url'] for asset in assets]) if sizer and assets else {}
+    for asset in assets:
+        result = results.get(asset['url']) or {}
+        asset['bytes'] = result.get('bytes') if (result.get('status') or 0) < 400 else None
+        asset['status'] = result.get('status')
+        asset['content_type'] = result.get('content_type', '')
+        asset['elapsed'] = result.get('elapsed')
+        asset['error'] = result.get('error')
+
+    counted = [asset for asset in assets if not asset['alternate']]
+    by_type = {}
+    for asset in counted:
+        by_type[asset['type']] = by_type.get(asset['type'], 0) + (asset['bytes'] or 0)
+
+    oversized = [asset for asset in assets if is_oversized_image(asset)]
+    legacy = [asset for asset in assets if is_legacy_image(asset)]
+
+    third_party = {}
+    for asset in counted:
+        if asset['type'] == 'script' and asset['third_party']:
+            host = urlparse(asset['url']).netloc.lower()
+            entry = third_party.setdefault(host, {'host': host, 'scripts': 0, 'bytes': 0, 'unmeasured': 0})
+            entry['scripts'] += 1
+            entry['bytes'] += asset['bytes'] or 0
+            entry['unmeasured'] += asset['bytes'] is None
+    for entry in third_party.values():
+        entry['estimated_ms'] = round(entry['bytes'] / 1024 * SCRIPT_MS_PER_KB)
+
+    return {
+        'url': page_url,
+        'html_bytes': html_bytes,
+        'total_bytes': (html_bytes or 0) + sum(by_type.values()),
+        'bytes_by_type': by_type,
+        'assets': assets,
+        'asset_count': len(counted),
+        'measured': sum(1 for asset in counted if asset['bytes'] is not None),
+        'oversized_images': sorted(oversized, key=lambda asset: -asset['bytes']),
+        'legacy_images': sorted(legacy, key=lambda asset: -asset['bytes']),
+        'render_blocking': [asset for asset in counted if asset['render_blocking']],
+        'third_party_scripts': sorted(third_party.values(), key=lambda entry: -entry['bytes'])
+    }
+
+def kb(size):
+    return round(size / 1024, 1)
+
+def page_weight_fields(audit):
+    """Flat summary of an audit for CSV exports and the competitor store"""
+    by_type = audit['bytes_by_type']
+    return {
+        'page_size_kb': kb(audit['total_bytes']),
+        'html_size_kb': kb(audit['html_bytes'] or 0),
+        'asset_count': audit['asset_count'],
+        'unmeasured_assets': audit['asset_count'] - audit['measured'],
+        'image_kb': kb(by_type.get('image', 0)),
+        'script_kb': kb(by_type.get('script', 0)),
+        'stylesheet_kb': kb(by_type.get('stylesheet', 0)),
+        'font_kb': kb(by_type.get('font', 0)),
+        'render_blocking_resources': len(audit['render_blocking']),
+        'oversized_images': len(audit['oversized_images']),
+        'third_party_script_kb': kb(sum(entry['bytes'] for entry in audit['third_party_scripts']))
+    }
+
+def short_url(url, limit=60):
+    """host/path trimmed to limit characters for tables"""
+    parsed = urlparse(url)
+    text = parsed.netloc + parsed.path + (f"?{parsed.query}" if parsed.query else '')
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+def asset_flags(asset):
+    """Short labels for the waterfall's flags column"""
+    flags = []
+    if asset['render_blocking']:
+        flags.append('blocking')
+    if asset['third_party']:
+        flags.append('3rd party')
+    if is_oversized_image(asset):
+        flags.append('oversized')
+    if is_legacy_image(asset):
+        flags.append(f"{asset_format(asset) or 'legacy'} (use WebP/AVIF)")
+    if asset['alternate']:
+        flags.append('srcset alternate')
+    if asset.get('error') not in (None, NOT_CHECKED) or (asset.get('status') or 0) >= 400:
+        flags.append(asset.get('error') or f"HTTP {asset['status']}")
+    return flags
+
+def waterfall_rows(audit, width=30):
+    """Rows of the cumulative-weight waterfall: the HTML first, then assets in document order
+
+    Each bar starts where the previous asset's ended, so the last bar reaches
+    the full page weight; srcset alternates and unmeasured assets get no bar.
+    """
+    total = audit['total_bytes'] or 1
+    rows, offset = [], 0
+    entries = [{'url': audit['url'], 'type': 'document', 'bytes': audit['html_bytes'], 'elapsed': None,
+                'render_blocking': False, 'third_party': False, 'alternate': False}] + audit['assets']
+    for position, asset in enumerate(entries):
+        size = asset['bytes']
+        bar = ''
+        if size is not None and not asset['alternate']:
+            start = round(offset / total * width)
+            offset += size
+            bar = '·' * start + '█' * max(1, round(offset / total * width) - start)
+        rows.append({
+            'position': position,
+            'type': asset['type'],
+            'resource': short_url(asset['url']),
+            'size_kb': '?' if size is None else f"{kb(size):,.1f}",
+            'fetch_ms': '' if asset.get('elapsed') is None else f"{asset['elapsed'] * 1000:,.0f}",
+            'flags': ', '.join(asset_flags(asset)) if position else '',
+            'bar': bar
+        })
+    return rows
+
+def waterfall_markdown(audit, title=None):
+    """Markdown section for one page: totals, findings and the waterfall table"""
+    fields = page_weight_fields(audit)
+    lines = [f"## {title or audit['url']}", "",
+             f"**Total weight:** {fields['page_size_kb']:,.1f}KB ({fields['html_size_kb']:,.1f}KB HTML, "
+             f"{fields['image_kb']:,.1f}KB images, {fields['script_kb']:,.1f}KB scripts, "
+             f"{fields['stylesheet_kb']:,.1f}KB CSS, {fields['font_kb']:,.1f}KB fonts)"]
+    if fields['unmeasured_assets']:
+        lines.append(f"**Not measured:** {fields['unmeasured_assets']} of {fields['asset_count']} assets")
+    if audit['render_blocking']:
+        lines.append(f"**Render-blocking:** {len(audit['render_blocking'])} resources in the page head")
+    for entry in audit['third_party_scripts']:
+        lines.append(f"**Third-party scripts:** {entry['host']} - {entry['scripts']} scripts, {kb(entry['bytes']):,.1f}KB "
+                     f"(~{entry['estimated_ms']}ms to parse and run on mobile)")
+    lines += ["", "| # | Type | Resource | KB | Fetch ms | Flags | Cumulative weight |",
+              "|---|---|---|---:|---:|---|---|"]
+    for row in waterfall_rows(audit):
+        bar = f"`{row['bar']}`" if row['bar'] else ''
+        lines.append(f"| {row['position']} | {row['type']} | {row['resource'].replace('|', '%7C')} | {row['size_kb']} | "
+                     f"{row['fetch_ms']} | {row['flags']} | {bar} |")
+    lines.append("")
+    return lines
+
+def write_waterfall_report(audits, filepath, heading='Page Weight'):
+    """Write a markdown report with a summary table and one waterfall per (label, audit)"""
+    lines = [f"# {heading}", f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}", "",
+             "| Page | Total KB | Images KB | Scripts KB | CSS KB | Fonts KB | Render-blocking | 3rd-party JS KB | Oversized images |",
+             "|---|---:|---:|---:|---:|---:|---:|---:|---:|"]
+    for label, audit in audits:
+        fields = page_weight_fields(audit)
+        lines.append(f"| {label} | {fields['page_size_kb']:,.1f} | {fields['image_kb']:,.1f} | {fields['script_kb']:,.1f} | "
+                     f"{fields['stylesheet_kb']:,.1f} | {fields['font_kb']:,.1f} | {fields['render_blocking_resources']} | "
+                     f"{fields['third_party_script_kb']:,.1f} | {fields['oversized_images']} |")
+    lines.append("")
+    for label, audit in audits:
+        lines += waterfall_markdown(audit, title=label)
+
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return filepath
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Measure page weight and write an asset waterfall for one or more pages')
+    parser.add_argument('urls', nargs='+', help='Pages to audit (e.g. your landing page, then competitors)')
+    parser.add_argument('--client', help='Client name - cache and report go in that client\'s project folder')
+    parser.add_argument('--offline', action='store_true', help='Use cached pages and asset sizes only (no network requests)')
+    args = parser.parse_args(argv)
+
+    cache_dir = client_cache_dir(args.client) if args.client else DEFAULT_CACHE_DIRNAME
+    output_dir = os.path.join(os.path.dirname(cache_dir), '02_market_research') if args.client else '.'
+    http_cache = HttpCache(cache_dir, offline=args.offline)
+    sizer = get_asset_sizer(cache_dir, offline=args.offline)
+
+    audits = []
+    for url in args.urls:
+        try:
+            response = http_cache.fetch(url, headers=sizer.headers, timeout=15, session=get_http_client(), page=True)
+        except (OfflineCacheMiss, requests.exceptions.RequestException) as e:
+            print(f"❌ {url}: {e}")
+            continue
+        audit = audit_page(parse_html(response.content), response.url or url, len(response.content), sizer)
+        fields = page_weight_fields(audit)
+        print(f"⚖️  {url}: {fields['page_size_kb']:,.1f}KB across {fields['asset_count']} assets, "
+              f"{fields['render_blocking_resources']} render-blocking, {fields['oversized_images']} oversized images")
+        audits.append((url, audit))
+
+    if audits:
+        filepath = os.path.join(output_dir, f"page_weight_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md")
+        write_waterfall_report(audits, filepath)
+        print(f"✅ Waterfall report saved: {filepath}")
+    return audits
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import subprocess
 import time
 from datetime import datetime
 from pathlib import Path
+from http_cache import DEFAULT_CACHE_DIRNAME
+from analysis_journal import AnalysisJournal
 
 try:
     from rich.console import Console
@@ -106,7 +108,8 @@ class ResearchOrchestrator:
             self.print_info(f"Analyzing {website_url}...")
             
             result = subprocess.run(
-                ['node', 'verify_tracking.js', website_url],
+                ['node', 'verify_tracking.js', website_url,
+                 '--cache-dir', os.path.join(self.folder_name, DEFAULT_CACHE_DIRNAME)],
                 capture_output=True,
                 text=True,
                 timeout=60
@@ -219,11 +222,17 @@ class ResearchOrchestrator:
             return True
         
         try:
-            # Run competitor_research.py
-            self.print_info("Running traditional competitor analysis...")
+            # Run competitor_research.py, continuing an interrupted run from its journal
+            command = ['python3', 'competitor_research.py', self.client_name]
+            journal = AnalysisJournal(self.folder_name)
+            if journal.load() and not journal.complete:
+                self.print_info(f"Resuming interrupted competitor analysis ({len(journal.pending_urls())} URLs left)")
+                command.append('--resume')
+            else:
+                self.print_info("Running traditional competitor analysis...")
             
             result = subprocess.run(
-                ['python3', 'competitor_research.py', self.client_name],
+                command,
                 capture_output=True,
                 text=True,
                 timeout=900  # 15 minutes timeout
@@ -244,7 +253,8 @@ class ResearchOrchestrator:
                 return True
                 
         except subprocess.TimeoutExpired:
-            self.print_warning("Competitor analysis timed out")
+            self.print_warning("Competitor analysis timed out - finished sites are kept in the journal, "
+                               "re-run to analyse only the rest")
             return True
         except FileNotFoundError:
             self.print_warning("competitor_research.py not found - skipping")
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Historical Google Ads / Microsoft Ads report ingestion
+Usage: python search_term_data.py "Client Name" [report.csv ...]
+
+Reads search-term and keyword performance exports from 05_historical_data/
+(UTF-8 or UTF-16, comma or tab separated, with the report title rows, total
+rows and locale-formatted numbers such as "1.234,56 €" that both platforms
+emit). Each file is parsed once, in chunks, into a columnar cache of raw
+NumPy buffers that later runs memory-map instead of re-parsing the CSV:
+
+    05_historical_data/.columnar_cache/<file>-<source signature>/
+        meta.json                 row count, columns and the source file's size and mtime
+        <numeric column>.bin      float64 values
+        <text column>.codes.bin   int32 dictionary codes, one per row
+        <text column>.offsets.bin int64 offsets into .data.bin (Arrow-style string column)
+        <text column>.data.bin    UTF-8 bytes of the distinct values
+
+A changed or replaced export gets a new signature and is re-ingested.
+"""
+
+import argparse
+import codecs
+import contextlib
+import csv
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from http_cache import client_cache_dir
+
+HISTORICAL_DIRNAME = '05_historical_data'
+CACHE_DIRNAME = '.columnar_cache'
+CHUNK_ROWS = 100_000
+CACHE_FORMAT_VERSION = 1
+
+# Canonical columns and the headers Google Ads and Microsoft Ads use for them
+TEXT_COLUMNS = {
+    'search_term': ['search term', 'search terms', 'search query', 'query'],
+    'keyword': ['keyword', 'keyword text', 'search keyword'],
+    'match_type': ['match type', 'search keyword match type', 'delivered match type', 'keyword match type'],
+    'campaign': ['campaign', 'campaign name'],
+    'ad_group': ['ad group', 'ad group name'],
+}
+NUMERIC_COLUMNS = {
+    'impressions': ['impressions', 'impr.', 'impr'],
+    'clicks': ['clicks'],
+    'cost': ['cost', 'spend'],
+    'conversions': ['conversions', 'conv.', 'all conv.'],
+    'conversion_value': ['conv. value', 'conversion value', 'revenue', 'all conv. value'],
+}
+HEADER_SCAN_LINES = 20
+
+NUMBER_JUNK = re.compile(r'[^\d,.\-]')
+# Thousands separator, spaces (including the non-breaking ones some locales use) and currency/percent signs
+NUMBER_DELETIONS = {separator: str.maketrans('', '', separator + ' \t\u00a0\u202f%$€£\'')
+                    for separator in (',', '.')}
+EMPTY_NUMBER = re.compile(r'^(?:-+|—)?$', re.MULTILINE)
+# Words of a search term: runs of letters and digits in any script, split on whitespace and punctuation
+TERM_WORD_PATTERN = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+def term_words(text):
+    """Lowercase words of a search term or keyword, numbers and accented words included (e.g. "iphone 15 case")"""
+    return TERM_WORD_PATTERN.findall(text.lower())
+
+def _header_map(row):
+    """{canonical column: index} for a header row, or None if it is not a report header"""
+    cells = [cell.strip().lower() for cell in row]
+    mapping = {}
+    for canonical, aliases in list(TEXT_COLUMNS.items()) + list(NUMERIC_COLUMNS.items()):
+        for alias in aliases:
+            if alias in cells:
+                mapping[canonical] = cells.index(alias)
+                break
+    if ('search_term' in mapping or 'keyword' in mapping) and 'clicks' in mapping:
+        return mapping
+    return None
+
+def _open_report(path):
+    """Text stream for an export, handling the UTF-16 'CSV for Excel' variant"""
+    with open(path, 'rb') as f:
+        start = f.read(4)
+    if start.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return open(path, 'r', encoding='utf-16', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+def report_rows(path):
+    """Rows of an export, comma or tab separated"""
+    with _open_report(path) as f:
+        preview = [f.readline() for _ in range(HEADER_SCAN_LINES)]
+        delimiter = '\t' if any(line.count('\t') > line.count(',') for line in preview if line.strip()) else ','
+        f.seek(0)
+        yield from csv.reader(f, delimiter=delimiter)
+
+def detect_decimal_separator(values):
+    """'.' or ',' judging by sample numbers such as '1,234.56', '1.234,56' or '12,5'"""
+    for value in values:
+        value = NUMBER_JUNK.sub('', value)
+        last_dot, last_comma = value.rfind('.'), value.rfind(',')
+        if last_dot >= 0 and last_comma >= 0:
+            return ',' if last_comma > last_dot else '.'
+        if last_comma >= 0 and len(value) - last_comma - 1 != 3:
+            return ','
+        if last_dot >= 0 and len(value) - last_dot - 1 != 3:
+            return '.'
+    return '.'
+
+def parse_numbers(cells, decimal='.'):
+    """float64 array from locale-formatted cells ('--', blanks and junk become 0)"""
+    # One pass over the whole chunk as a single string is far cheaper than per-cell cleaning
+    thousands = ',' if decimal == '.' else '.'
+    text = '\n'.join(cells).translate(NUMBER_DELETIONS[thousands])
+    if decimal == ',':
+        text = text.replace(',', '.')
+    values = EMPTY_NUMBER.sub('0', text).split('\n')
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        # A stray currency code or note in a cell: clean those cells one at a time
+        cleaned = [NUMBER_JUNK.sub('', value) for value in values]
+        return np.array([float(value) if value.strip('-.') else 0.0 for value in cleaned])
+
+def source_signature(path):
+    """Size and modification time identify one version of an export"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+class StringColumn:
+    """Dictionary-encoded text column backed by memory-mapped codes, offsets and UTF-8 data"""
+
+    def __init__(self, codes, offsets, data):
+        self.codes = codes
+        self.offsets = offsets
+        self.data = data
+        self._values = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def values(self):
+        """Distinct values in code order (decoded on first use)"""
+        if self._values is None:
+            raw = self.data.tobytes()
+            offsets = self.offsets.tolist()
+            self._values = [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+        return self._values
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+class ReportTable:
+    """One ingested export: memory-mapped columns plus the report metadata"""
+
+    def __init__(self, cache_dir, meta):
+        self.cache_dir = cache_dir
+        self.meta = meta
+        self.rows = meta['rows']
+        self.source = meta['source']
+        self.kind = meta['kind']
+        self.columns = {}
+        for name in meta['numeric_columns']:
+            self.columns[name] = self._map(f"{name}.bin", np.float64)
+        for name in meta['text_columns']:
+            self.columns[name] = StringColumn(self._map(f"{name}.codes.bin", np.int32),
+                                              self._map(f"{name}.offsets.bin", np.int64),
+                                              self._map(f"{name}.data.bin", np.uint8))
+
+    def _map(self, filename, dtype):
+        path = os.path.join(self.cache_dir, filename)
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def total(self, name):
+        return float(self.columns[name].sum()) if name in self.columns else 0.0
+
+class _ColumnWriter:
+    """Appends chunks of one column to its cache buffers"""
+
+    def __init__(self, cache_dir, name, text):
+        self.text = text
+        self.name = name
+        self.cache_dir = cache_dir
+        suffix = '.codes.bin' if text else '.bin'
+        self.file = open(os.path.join(cache_dir, name + suffix), 'wb')
+        self.lookup = {}
+
+    def write(self, cells, decimal):
+        if self.text:
+            # Only the chunk's distinct values go through the Python dictionary
+            distinct, inverse = np.unique(np.asarray(cells, dtype=str), return_inverse=True)
+            lookup = self.lookup
+            chunk_codes = np.fromiter((lookup.setdefault(value.strip(), len(lookup)) for value in distinct.tolist()),
+                                      dtype=np.int32, count=len(distinct))
+            chunk_codes[inverse.ravel()].tofile(self.file)
+        else:
+            parse_numbers(cells, decimal).tofile(self.file)
+
+    def close(self):
+        self.file.close()
+        if not self.text:
+            return
+        encoded = [value.encode('utf-8') for value in self.lookup]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        offsets.tofile(os.path.join(self.cache_dir, f"{self.name}.offsets.bin"))
+        with open(os.path.join(self.cache_dir, f"{self.name}.data.bin"), 'wb') as f:
+            f.write(b''.join(encoded))
+
+def cache_dir_for(path, cache_root=None):
+    """Cache directory for the current version of an export"""
+    if cache_root is None:
+        cache_root = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    signature = source_signature(path)
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', os.path.splitext(os.path.basename(path))[0])
+    return os.path.join(cache_root, f"{name}-{signature['size']}-{signature['mtime_ns']}")
+
+def ingest(path, cache_root=None, chunk_rows=CHUNK_ROWS, decimal=None):
+    """Parse an export into its columnar cache (always re-parses) and return the ReportTable"""
+    cache_dir = cache_dir_for(path, cache_root)
+    tmp_dir = cache_dir + '.partial'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    with contextlib.closing(report_rows(path)) as reader:
+
+        mapping = None
+        for line_number, row in enumerate(reader):
+            mapping = _header_map(row)
+            if mapping or line_number >= HEADER_SCAN_LINES:
+                break
+        if not mapping:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise ValueError(f"{path} is not a search-term or keyword report (no search term/keyword and clicks columns)")
+
+        writers = {name: _ColumnWriter(tmp_dir, name, name in TEXT_COLUMNS) for name in mapping}
+        term_index = mapping.get('search_term', mapping.get('keyword'))
+        width = max(mapping.values()) + 1
+        rows = 0
+        chunk = []
+
+        def flush():
+            nonlocal decimal
+            if decimal is None:
+                decimal = detect_decimal_separator(row[mapping['cost']] for row in chunk) if 'cost' in mapping else '.'
+            for name, index in mapping.items():
+                writers[name].write([row[index] for row in chunk], decimal)
+
+        for row in reader:
+            # Skip totals, blank lines and the copyright footer Microsoft Ads appends
+            if len(row) < width or not row[term_index].strip() or row[0].startswith(('Total', '©')):
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                flush()
+                rows += len(chunk)
+                chunk = []
+        if chunk:
+            flush()
+            rows += len(chunk)
+
+    for writer in writers.values():
+        writer.close()
+
+    meta = {
+        'version': CACHE_FORMAT_VERSION,
+        'source': os.path.abspath(path),
+        'source_signature': source_signature(path),
+        'kind': 'search_terms' if 'search_term' in mapping else 'keywords',
+        'rows': rows,
+        'decimal_separator': decimal or '.',
+        'text_columns': [name for name in mapping if name in TEXT_COLUMNS],
+        'numeric_columns': [name for name in mapping if name in NUMERIC_COLUMNS],
+        'ingested_at': time.time()
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    # Publish the finished cache in one rename so readers never see a partial one
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+    # Older versions of the same export are no longer needed
+    prefix = os.path.basename(cache_dir).rsplit('-', 2)[0] + '-'
+    for stale in glob.glob(os.path.join(os.path.dirname(cache_dir), prefix + '*')):
+        if stale != cache_dir and os.path.isdir(stale) and stale.rsplit('-', 2)[0] == cache_dir.rsplit('-', 2)[0]:
+            shutil.rmtree(stale, ignore_errors=True)
+    return ReportTable(cache_dir, meta)
+
+def load_report(path, cache_root=None, **ingest_options):
+    """ReportTable for an export, memory-mapped from cache when the export is unchanged"""
+    cache_dir = cache_dir_for(path, cache_root)
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') == CACHE_FORMAT_VERSION:
+            return ReportTable(cache_dir, meta)
+    except (OSError, ValueError):
+        pass
+    return ingest(path, cache_root, **ingest_options)
+
+def historical_reports(folder_name):
+    """Export files in a client's 05_historical_data folder"""
+    history_dir = os.path.join(folder_name, HISTORICAL_DIRNAME)
+    paths = []
+    for pattern in ('*.csv', '*.tsv', '*.txt'):
+        paths.extend(glob.glob(os.path.join(history_dir, '**', pattern), recursive=True))
+    return sorted(path for path in paths if f"{os.sep}{CACHE_DIRNAME}{os.sep}" not in path)
+
+def load_history(folder_name, kind=None):
+    """Every readable export for a client as ReportTables (optionally only 'search_terms' or 'keywords')"""
+    tables = []
+    for path in historical_reports(folder_name):
+        try:
+            table = load_report(path)
+        except (ValueError, UnicodeError, csv.Error) as e:
+            print(f"⚠️  Skipping {path}: {e}")
+            continue
+        if kind is None or table.kind == kind:
+            tables.append(table)
+    return tables
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest search-term and keyword exports into the columnar cache')
+    parser.add_argument('client_name', help='Client or business name')
+    parser.add_argument('reports', nargs='*', help=f'Export files (default: everything in {HISTORICAL_DIRNAME}/)')
+    parser.add_argument('--decimal', choices=['.', ','], help='Decimal separator (default: detected per file)')
+    parser.add_argument('--force', action='store_true', help='Re-parse even if a cache exists')
+    args = parser.parse_args()
+
+    folder_name = os.path.dirname(client_cache_dir(args.client_name))
+    reports = args.reports or historical_reports(folder_name)
+    if not reports:
+        print(f"❌ No exports found in {os.path.join(folder_name, HISTORICAL_DIRNAME)}")
+        sys.exit(1)
+
+    for path in reports:
+        start = time.perf_counter()
+        try:
+            if args.force:
+                table = ingest(path, decimal=args.decimal)
+            else:
+                table = load_report(path, decimal=args.decimal)
+        except (ValueError, UnicodeError, csv.Error) as e:
+            print(f"❌ {path}: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        print(f"📊 {os.path.basename(path)}: {table.rows:,} {table.kind.replace('_', ' ')} rows | "
+              f"cost {table.total('cost'):,.2f} | clicks {table.total('clicks'):,.0f} | "
+              f"conversions {table.total('conversions'):,.1f} | loaded in {elapsed * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
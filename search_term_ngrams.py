@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Search-term n-gram waste analysis
+Usage: python search_term_ngrams.py "Client Name" [--min-cost 20] [--min-clicks 5] [--top 1000]
+
+Aggregates impressions, clicks, cost and conversions by 1-3 word n-gram across
+every search-term export in 05_historical_data/ (see search_term_data.py).
+Metrics are first summed per distinct search term with np.bincount over the
+cached dictionary codes, so only distinct terms are tokenised; their n-grams
+are then encoded as integer keys, sorted and grouped with NumPy, so millions
+of rows never pass through a Python dict of n-grams.
+
+N-grams with spend but no conversions are negative-keyword candidates; they
+are written to 02_market_research/search_term_ngrams_<timestamp>.csv and feed
+the keyword opportunity and competitive insight reports of competitor_research.py.
+"""
+
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from http_cache import client_cache_dir
+from keyword_engine import STOP_WORDS, client_keyword_settings
+from search_term_data import HISTORICAL_DIRNAME, load_history, term_words
+
+METRICS = ['impressions', 'clicks', 'cost', 'conversions']
+REPORT_FIELDS = ['ngram', 'words', 'search_terms', 'impressions', 'clicks', 'cost', 'conversions',
+                 'cost_per_conversion', 'negative_candidate']
+
+class NgramStats:
+    """Metrics per search-term n-gram, summed over one or more search-term reports"""
+
+    def __init__(self, tables, ngram_range=(1, 3), stop_words=STOP_WORDS):
+        # Map every table's distinct terms onto one term index and sum metrics per term
+        term_index = {}
+        term_metrics = {metric: [] for metric in METRICS}
+        for table in tables:
+            if 'search_term' not in table:
+                continue
+            column = table['search_term']
+            local = np.fromiter((term_index.setdefault(value.strip().lower(), len(term_index))
+                                 for value in column.values), dtype=np.int64, count=len(column.values))
+            codes = local[np.asarray(column.codes)]
+            for metric in METRICS:
+                weights = np.asarray(table[metric], dtype=np.float64) if metric in table else None
+                term_metrics[metric].append((codes, weights))
+
+        self.term_count = len(term_index)
+        totals = {}
+        for metric, parts in term_metrics.items():
+            total = np.zeros(self.term_count, dtype=np.float64)
+            for codes, weights in parts:
+                if weights is not None:
+                    total += np.bincount(codes, weights=weights, minlength=self.term_count)
+            totals[metric] = total
+
+        # Tokenise each distinct term once into one flat array of token ids (numbers are words, so every
+        # n-gram really appears in a search term)
+        vocabulary = {}
+        lengths = np.zeros(self.term_count, dtype=np.int64)
+        flat = []
+        for term, index in term_index.items():
+            tokens = term_words(term)
+            lengths[index] = len(tokens)
+            flat.extend(tokens)
+        ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in flat),
+                          dtype=np.int64, count=len(flat))
+        self.words = np.array(sorted(vocabulary, key=vocabulary.get) or [''], dtype=object)
+        size = max(len(vocabulary), 1)
+        self._size = size
+        is_stop = np.zeros(size, dtype=bool)
+        is_stop[[vocabulary[word] for word in stop_words if word in vocabulary]] = True
+
+        token_term = np.repeat(np.arange(self.term_count, dtype=np.int64), lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        position = np.arange(len(ids), dtype=np.int64) - offsets[token_term]
+
+        # N-gram keys of each order: one lexsort per order drops repeats of an n-gram within a term and
+        # leaves equal keys adjacent, so group ids come from where the key changes
+        orders, keys, group_terms, group_ids = [], [], [], []
+        groups = 0
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            starts = np.flatnonzero(position + n <= lengths[token_term])
+            starts = starts[~(is_stop[ids[starts]] | is_stop[ids[starts + n - 1]])]
+            if not len(starts):
+                continue
+            key = np.zeros(len(starts), dtype=np.int64)
+            for offset in range(n):
+                key = key * size + ids[starts + offset]
+            term = token_term[starts]
+            order = np.lexsort((term, key))
+            key, term = key[order], term[order]
+            distinct = np.ones(len(key), dtype=bool)
+            distinct[1:] = (key[1:] != key[:-1]) | (term[1:] != term[:-1])
+            key, term = key[distinct], term[distinct]
+            first = np.ones(len(key), dtype=bool)
+            first[1:] = key[1:] != key[:-1]
+            group_ids.append(np.cumsum(first) - 1 + groups)
+            group_terms.append(term)
+            keys.append(key[first])
+            orders.append(np.full(int(first.sum()), n, dtype=np.int8))
+            groups += int(first.sum())
+
+        if keys:
+            inverse, term = np.concatenate(group_ids), np.concatenate(group_terms)
+            self.orders, self._keys = np.concatenate(orders), np.concatenate(keys)
+            self.search_terms = np.bincount(inverse, minlength=groups)
+            self.metrics = {metric: np.bincount(inverse, weights=totals[metric][term], minlength=groups)
+                            for metric in METRICS}
+        else:
+            self.orders, self._keys = np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64)
+            self.search_terms = np.zeros(0, dtype=np.int64)
+            self.metrics = {metric: np.zeros(0) for metric in METRICS}
+        self.totals = {metric: float(totals[metric].sum()) for metric in METRICS}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def ngram(self, index):
+        """Text of one n-gram"""
+        key, ids = int(self._keys[index]), []
+        for _ in range(self.orders[index]):
+            key, token_id = divmod(key, self._size)
+            ids.append(token_id)
+        return ' '.join(self.words[token_id] for token_id in reversed(ids))
+
+    def row(self, index, negative=False):
+        """Report row for one n-gram"""
+        cost, conversions = float(self.metrics['cost'][index]), float(self.metrics['conversions'][index])
+        return {
+            'ngram': self.ngram(index),
+            'words': int(self.orders[index]),
+            'search_terms': int(self.search_terms[index]),
+            'impressions': int(self.metrics['impressions'][index]),
+            'clicks': int(self.metrics['clicks'][index]),
+            'cost': round(cost, 2),
+            'conversions': round(conversions, 2),
+            'cost_per_conversion': round(cost / conversions, 2) if conversions else '',
+            'negative_candidate': negative
+        }
+
+    def top_spend(self, limit):
+        """Indexes of the n-grams with the highest cost"""
+        limit = min(limit, len(self))
+        if not limit:
+            return []
+        top = np.argpartition(-self.metrics['cost'], limit - 1)[:limit]
+        return top[np.argsort(-self.metrics['cost'][top], kind='stable')].tolist()
+
+    def negative_candidates(self, min_cost=20.0, min_clicks=5, limit=30):
+        """Report rows for n-grams with spend and no conversions, highest cost first
+
+        An n-gram that contains an already listed, shorter candidate is skipped:
+        the shorter phrase negative blocks it too.
+        """
+        metrics = self.metrics
+        wasted = np.flatnonzero((metrics['conversions'] <= 0) & (metrics['cost'] > 0)
+                                & (metrics['cost'] >= min_cost) & (metrics['clicks'] >= min_clicks))
+        # Shorter n-grams first at equal cost, so they are listed before the phrases containing them
+        wasted = wasted[np.lexsort((self.orders[wasted], -metrics['cost'][wasted]))]
+        candidates = []
+        for index in wasted.tolist():
+            text = self.ngram(index)
+            if any(f" {row['ngram']} " in f" {text} " for row in candidates):
+                continue
+            candidates.append(self.row(index, negative=True))
+            if len(candidates) >= limit:
+                break
+        return candidates
+
+def load_ngram_stats(folder_name, ngram_range=(1, 3)):
+    """NgramStats over a client's search-term exports (None if there are none)"""
+    tables = load_history(folder_name, kind='search_terms')
+    if not tables:
+        return None
+    return NgramStats(tables, ngram_range=ngram_range)
+
+def write_ngram_report(stats, filepath, min_cost=20.0, min_clicks=5, max_candidates=30, top=1000):
+    """Write negative candidates then the top n-grams by spend to a CSV, returning the candidates"""
+    candidates = stats.negative_candidates(min_cost, min_clicks, max_candidates)
+    listed = {row['ngram'] for row in candidates}
+    rows = candidates + [row for row in (stats.row(index) for index in stats.top_spend(top))
+                         if row['ngram'] not in listed]
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return candidates
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate search-term spend by n-gram and flag negative keywords')
+    parser.add_argument('client_name', help='Client or business name')
+    parser.add_argument('--min-cost', type=float, help='Minimum spend for a negative candidate (default: config.yaml)')
+    parser.add_argument('--min-clicks', type=int, help='Minimum clicks for a negative candidate (default: config.yaml)')
+    parser.add_argument('--top', type=int, default=1000, help='N-grams by spend listed after the candidates')
+    args = parser.parse_args()
+
+    folder_name = os.path.dirname(client_cache_dir(args.client_name))
+    settings = client_keyword_settings(folder_name)
+    start = datetime.now()
+    stats = load_ngram_stats(folder_name, tuple(settings['ngram_range']))
+    if stats is None:
+        print(f"❌ No search-term exports found in {os.path.join(folder_name, HISTORICAL_DIRNAME)}")
+        sys.exit(1)
+
+    filepath = os.path.join(folder_name, '02_market_research',
+                            f"search_term_ngrams_{start.strftime('%Y%m%d_%H%M%S')}.csv")
+    candidates = write_ngram_report(stats, filepath,
+                                    min_cost=args.min_cost if args.min_cost is not None else settings['negative_min_cost'],
+                                    min_clicks=args.min_clicks if args.min_clicks is not None else settings['negative_min_clicks'],
+                                    max_candidates=settings['max_negative_candidates'], top=args.top)
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"🔎 {stats.term_count:,} distinct search terms, {len(stats):,} n-grams in {elapsed:.1f}s")
+    for row in candidates[:10]:
+        print(f"   🚫 {row['ngram']}: {row['cost']:,.2f} spent, {row['clicks']} clicks, no conversions")
+    print(f"✅ {len(candidates)} negative keyword candidates saved to {filepath}")
+
+if __name__ == "__main__":
+    main()
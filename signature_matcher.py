@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Compiled signature matcher for tracking, CMS and third-party tool detection
+Signatures live in tool_signatures.json and are compiled once into a single
+combined matcher, so every tool is found with one scan of the page HTML
+"""
+
+import json
+import os
+import re
+import threading
+
+DEFAULT_SIGNATURE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tool_signatures.json')
+
+# Characters that end a run of required literal text in a regex pattern
+REGEX_METACHARS = set('.^$*+?{}[]()|')
+OPTIONAL_QUANTIFIERS = set('?*{')
+
+def required_literal(pattern):
+    """Longest piece of literal text every match of pattern must contain (None if unknown)"""
+    if re.search(r'(?<!\\)\|', pattern):
+        return None
+
+    runs, current = [], ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            if escaped.isalnum():
+                # Character classes like \d or \s are not literal text
+                runs.append(current)
+                current = ''
+            else:
+                current += escaped
+            i += 2
+        elif char in '([':
+            # Skip groups and character classes entirely
+            runs.append(current)
+            current = ''
+            closing = ')' if char == '(' else ']'
+            depth = 0
+            while i < len(pattern):
+                if pattern[i] == '\\':
+                    i += 2
+                    continue
+                if pattern[i] == char:
+                    depth += 1
+                elif pattern[i] == closing:
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+        elif char in REGEX_METACHARS:
+            # A quantifier may make the previous character optional
+            if char in OPTIONAL_QUANTIFIERS and current:
+                current = current[:-1]
+            runs.append(current)
+            current = ''
+            i = pattern.index('}', i) + 1 if char == '{' and '}' in pattern[i:] else i + 1
+        else:
+            current += char
+            i += 1
+    runs.append(current)
+
+    longest = max(runs, key=len)
+    return longest or None
+
+def overlaps(first, second):
+    """True if a proper suffix of first is a prefix of second"""
+    return any(second.startswith(first[i:]) for i in range(1, len(first)))
+
+class Signature:
+    """One pattern that identifies a tool"""
+
+    def __init__(self, category, tool, pattern, is_regex, case_sensitive):
+        self.category = category
+        self.tool = tool
+        self.pattern = pattern
+        self.case_sensitive = case_sensitive
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self.regex = re.compile(pattern if is_regex else re.escape(pattern), flags)
+
+        # Literal text is looked up in lowercased HTML, then confirmed with the full pattern
+        anchor = required_literal(pattern) if is_regex else pattern
+        self.anchor = anchor.lower() if anchor else None
+        self.anchor_is_exact = not is_regex and not case_sensitive
+
+    def confirm(self, html):
+        """Check the full pattern once its anchor has been seen"""
+        return self.anchor_is_exact or bool(self.regex.search(html))
+
+class SignatureRegistry:
+    """All known tool signatures compiled into one anchor matcher"""
+
+    def __init__(self):
+        self.categories = {}
+        self.signatures = []
+        self._anchor_matcher = None
+        self._signatures_by_anchor = {}
+        self._unanchored = []
+
+    @classmethod
+    def from_files(cls, *paths):
+        """Build a registry from one or more JSON signature files (later files extend earlier ones)"""
+        registry = cls()
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                registry.add_definitions(json.load(f))
+        registry.compile()
+        return registry
+
+    def add_definitions(self, definitions):
+        """Add signatures from a parsed signature file"""
+        for category, spec in definitions.items():
+            tools = self.categories.setdefault(category, [])
+            for tool, patterns in spec.get('signatures', {}).items():
+                if tool not in tools:
+                    tools.append(tool)
+                for pattern in patterns:
+                    self.signatures.append(Signature(
+                        category, tool, pattern,
+                        spec.get('regex', True),
+                        spec.get('case_sensitive', False)
+                    ))
+
+    def compile(self):
+        """Compile every anchor into a single alternation (longest first)"""
+        self._signatures_by_anchor = {}
+        self._unanchored = []
+        for signature in self.signatures:
+            if signature.anchor:
+                self._signatures_by_anchor.setdefault(signature.anchor, []).append(signature)
+            else:
+                self._unanchored.append(signature)
+
+        anchors = sorted(self._signatures_by_anchor, key=len, reverse=True)
+        self._anchor_matcher = re.compile('|'.join(re.escape(anchor) for anchor in anchors)) if anchors else None
+
+    def _find_anchors(self, html_lower):
+        """Every anchor present in html_lower, including ones hidden by overlapping matches"""
+        found = set()
+        matcher = self._anchor_matcher
+        pending = set(self._signatures_by_anchor)
+
+        while matcher is not None:
+            new_anchors = {match.group(0) for match in matcher.finditer(html_lower)}
+            pending -= new_anchors
+            found |= new_anchors
+
+            # Anchors contained in a found anchor are present too
+            contained = {other for other in pending if any(other in anchor for anchor in new_anchors)}
+            found |= contained
+            pending -= contained
+
+            # Only anchors that start inside a match's text can have been skipped over
+            pending = {other for other in pending if any(overlaps(anchor, other) for anchor in new_anchors)}
+            matcher = re.compile('|'.join(re.escape(anchor) for anchor in sorted(pending, key=len, reverse=True))) if pending else None
+
+        return found
+
+    def scan(self, html):
+        """Return {category: set of tools} detected in html"""
+        detected = {category: set() for category in self.categories}
+        html_lower = html.lower()
+
+        candidates = list(self._unanchored)
+        for anchor in self._find_anchors(html_lower):
+            candidates.extend(self._signatures_by_anchor[anchor])
+
+        for signature in candidates:
+            if signature.tool in detected[signature.category]:
+                continue
+            if signature.confirm(html):
+                detected[signature.category].add(signature.tool)
+
+        return detected
+
+    def detect(self, html, category):
+        """Tools of one category found in html, in registry order"""
+        found = scan_cached(self, html)[category]
+        return [tool for tool in self.categories.get(category, []) if tool in found]
+
+_registries = {}
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+def get_signature_registry(*extra_files):
+    """Default registry (plus any extra signature files), compiled on first use"""
+    key = (DEFAULT_SIGNATURE_FILE,) + tuple(extra_files)
+    with _registry_lock:
+        if key not in _registries:
+            _registries[key] = SignatureRegistry.from_files(*key)
+        return _registries[key]
+
+def scan_cached(registry, html):
+    """Scan html once per thread, reusing the result for repeated lookups on the same page"""
+    cached = getattr(_local, 'scan', None)
+    if cached is None or cached[0] is not registry or cached[1] is not html:
+        cached = (registry, html, registry.scan(html))
+        _local.scan = cached
+    return cached[2]
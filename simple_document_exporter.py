@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Simple Document Exporter for Testing Frameworks
-Works without complex dependencies - creates Word docs and beautiful HTML
+Works without complex dependencies - creates Word docs, PDFs and beautiful HTML
+
+Markdown is parsed once into a list of blocks (headings, paragraphs, list
+items, tables, blank lines) with bold runs already split out; the HTML, Word
+and PDF backends all render from that list, and multi-format exports render
+the backends concurrently in a process pool.
 """
 
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
+from html import escape
 import argparse
 
 try:
@@ -20,90 +29,197 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+EXPORT_FORMATS = ('html', 'word', 'pdf')
+FILE_EXTENSIONS = {'html': 'html', 'word': 'docx', 'pdf': 'pdf'}
+
+# Below this many blocks, starting worker processes costs more than rendering the backends one after another
+PARALLEL_MIN_BLOCKS = 400
+
+BOLD_PATTERN = re.compile(r'(\*\*.*?\*\*)')
+NUMBERED_PATTERN = re.compile(r'^\d+\.\s')
+
+def parse_inline(text):
+    """Split text into (text, bold) runs on **bold** markers"""
+    runs = []
+    for part in BOLD_PATTERN.split(text):
+        if part.startswith('**') and part.endswith('**') and len(part) >= 4:
+            runs.append((part[2:-2], True))
+        elif part:
+            runs.append((part, False))
+    return runs
+
+def parse_markdown(markdown_content):
+    """Parse markdown once into the block list every backend renders from
+
+    Blocks are plain dicts so they pickle cheaply into worker processes:
+    heading (level 1-4, text), paragraph (runs), bullet (runs), numbered
+    (prefix, runs), table (rows of (text, runs) cells, header first, separator
+    rows dropped; a table of separators alone is left out) and blank.
+    """
+    blocks = []
+    table = None
+    for line in markdown_content.split('\n'):
+        line_stripped = line.strip()
+        if line_stripped.startswith('|'):
+            if table is None:
+                table = {'type': 'table', 'rows': []}
+                blocks.append(table)
+            cells = line_stripped.split('|')[1:-1]
+            if cells and not line_stripped.startswith('|---'):
+                table['rows'].append([(cell.strip(), parse_inline(cell.strip())) for cell in cells])
+            continue
+        table = None
+
+        if not line_stripped:
+            blocks.append({'type': 'blank'})
+        elif line_stripped.startswith(('# ', '## ', '### ', '#### ')):
+            level = line_stripped.index(' ')
+            blocks.append({'type': 'heading', 'level': level, 'text': line_stripped[level + 1:].strip()})
+        elif line_stripped.startswith('- '):
+            blocks.append({'type': 'bullet', 'runs': parse_inline(line_stripped[2:].strip())})
+        else:
+            numbered = NUMBERED_PATTERN.match(line_stripped)
+            if numbered:
+                blocks.append({'type': 'numbered', 'prefix': numbered.group(0),
+                               'runs': parse_inline(line_stripped[numbered.end():])})
+            else:
+                blocks.append({'type': 'paragraph', 'runs': parse_inline(line_stripped)})
+    return [block for block in blocks if block['type'] != 'table' or block['rows']]
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _export_worker(exporter, output_format, blocks, output_filename):
+    """Render one backend in a worker process"""
+    return exporter.write_format(output_format, blocks, output_filename)
+
 class SimpleDocumentExporter:
-    def __init__(self, client_name: str, project_path: str = None):
+    def __init__(self, client_name: str, project_path: str = None, document_title: str = None, output_dir: str = None):
         self.client_name = client_name
         self.project_path = Path(project_path) if project_path else Path(f"./{client_name}")
-        self.output_dir = self.project_path / "exports"
+        self.document_title = document_title or f"{client_name} - Testing Framework"
+        self.output_dir = Path(output_dir) if output_dir else self.project_path / "exports"
         self.output_dir.mkdir(exist_ok=True)
         
+    def default_filename(self, output_format: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        return f"{self.client_name}_Testing_Framework_{timestamp}.{FILE_EXTENSIONS[output_format]}"
+    
     def export_to_word(self, markdown_content: str, output_filename: str = None) -> str:
         """Convert markdown to professional Word document"""
-        if not DOCX_AVAILABLE:
-            print("❌ Word export requires python-docx. Install with: pip install python-docx")
-            return None
-        
-        if not output_filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-            output_filename = f"{self.client_name}_Testing_Framework_{timestamp}.docx"
-        
-        output_path = self.output_dir / output_filename
-        
-        # Create Word document
-        doc = Document()
-        
-        # Set up document properties
-        doc.core_properties.title = f"{self.client_name} - Testing Framework"
-        doc.core_properties.author = "PPC Campaign Planning System"
-        doc.core_properties.subject = "6-Month Testing Framework"
-        
-        # Add custom styles
-        self._add_word_styles(doc)
-        
-        # Parse markdown and convert to Word
-        self._convert_markdown_to_word(markdown_content, doc)
-        
-        # Save document
-        doc.save(output_path)
-        
-        print(f"✅ Word document saved: {output_path}")
-        return str(output_path)
+        return self.write_format('word', parse_markdown(markdown_content), output_filename)
     
     def export_to_html(self, markdown_content: str, output_filename: str = None) -> str:
         """Convert markdown to beautiful HTML (Google Docs friendly)"""
-        if not output_filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-            output_filename = f"{self.client_name}_Testing_Framework_{timestamp}.html"
+        return self.write_format('html', parse_markdown(markdown_content), output_filename)
+    
+    def export_to_pdf(self, markdown_content: str, output_filename: str = None) -> str:
+        """Convert markdown to a printable PDF"""
+        return self.write_format('pdf', parse_markdown(markdown_content), output_filename)
+    
+    def write_format(self, output_format: str, blocks: list, output_filename: str = None) -> str:
+        """Render parsed blocks with one backend and save the file; returns its path (None if unavailable)"""
+        if output_format == 'word' and not DOCX_AVAILABLE:
+            print("❌ Word export requires python-docx. Install with: pip install python-docx")
+            return None
+        if output_format == 'pdf' and not PDF_AVAILABLE:
+            print("❌ PDF export requires reportlab. Install with: pip install reportlab")
+            return None
         
-        output_path = self.output_dir / output_filename
+        output_path = self.output_dir / (output_filename or self.default_filename(output_format))
         
-        # Convert markdown to HTML
-        html_content = self._markdown_to_html(markdown_content)
+        if output_format == 'word':
+            # Create Word document
+            doc = Document()
+            
+            # Set up document properties
+            doc.core_properties.title = self.document_title
+            doc.core_properties.author = "PPC Campaign Planning System"
+            doc.core_properties.subject = "6-Month Testing Framework"
+            
+            # Add custom styles, then the parsed content
+            self._add_word_styles(doc)
+            self._render_word(blocks, doc)
+            doc.save(output_path)
+            print(f"✅ Word document saved: {output_path}")
         
-        # Create full HTML document
-        full_html = self._create_html_document(html_content)
+        elif output_format == 'pdf':
+            self._render_pdf(blocks, output_path)
+            print(f"✅ PDF document saved: {output_path}")
         
-        # Save HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_html)
+        else:
+            # Create full HTML document
+            full_html = self._create_html_document(self._render_html(blocks))
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(full_html)
+            print(f"✅ HTML document saved: {output_path}")
+            print(f"💡 Open in browser and copy/paste to Google Docs for perfect formatting")
         
-        print(f"✅ HTML document saved: {output_path}")
-        print(f"💡 Open in browser and copy/paste to Google Docs for perfect formatting")
         return str(output_path)
     
-    def export_both_formats(self, markdown_content: str) -> dict:
-        """Export to both Word and HTML"""
+    def export_formats(self, markdown_content: str, formats=EXPORT_FORMATS, output_basename: str = None,
+                       parallel: bool = None) -> dict:
+        """Parse once and render each format, concurrently in worker processes for large documents on multi-core machines
+        
+        Returns format -> path, plus <format>_error / <format>_info entries for
+        formats that failed or need an optional dependency.
+        """
+        blocks = parse_markdown(markdown_content)
         results = {}
-        
-        # Export to HTML (always works)
-        try:
-            html_path = self.export_to_html(markdown_content)
-            results['html'] = html_path
-        except Exception as e:
-            results['html_error'] = str(e)
-        
-        # Export to Word (if available)
-        try:
-            if DOCX_AVAILABLE:
-                word_path = self.export_to_word(markdown_content)
-                results['word'] = word_path
-            else:
+        jobs = {}
+        for output_format in formats:
+            if output_format == 'word' and not DOCX_AVAILABLE:
                 results['word_info'] = "Install python-docx for Word export: pip install python-docx"
-        except Exception as e:
-            results['word_error'] = str(e)
-        
+            elif output_format == 'pdf' and not PDF_AVAILABLE:
+                results['pdf_info'] = "Install reportlab for PDF export: pip install reportlab"
+            else:
+                jobs[output_format] = (f"{output_basename}.{FILE_EXTENSIONS[output_format]}" if output_basename
+                                       else self.default_filename(output_format))
+        
+        if parallel is None:
+            parallel = len(jobs) > 1 and len(blocks) >= PARALLEL_MIN_BLOCKS and available_cpus() > 1
+        if parallel:
+            try:
+                # Spawned workers: the exporter may be called from a process with live threads
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=len(jobs), mp_context=context) as executor:
+                    futures = {output_format: executor.submit(_export_worker, self, output_format, blocks, filename)
+                               for output_format, filename in jobs.items()}
+                    for output_format, future in futures.items():
+                        try:
+                            results[output_format] = future.result()
+                        except BrokenProcessPool:
+                            raise
+                        except Exception as e:
+                            results[f'{output_format}_error'] = str(e)
+                return results
+            except (OSError, BrokenProcessPool) as e:
+                print(f"⚠️  Parallel export unavailable ({e}) - rendering formats one at a time")
+                results = {key: value for key, value in results.items() if key.endswith('_info')}
+        
+        for output_format, filename in jobs.items():
+            try:
+                results[output_format] = self.write_format(output_format, blocks, filename)
+            except Exception as e:
+                results[f'{output_format}_error'] = str(e)
         return results
     
+    def export_both_formats(self, markdown_content: str) -> dict:
+        """Export to both Word and HTML"""
+        return self.export_formats(markdown_content, ('html', 'word'))
+    
     def _add_word_styles(self, doc):
         """Add professional styles to Word document with Montserrat font"""
         styles = doc.styles
@@ -161,233 +277,177 @@ class SimpleDocumentExporter:
     
     def _convert_markdown_to_word(self, markdown_content: str, doc):
         """Convert markdown content to Word document elements"""
-        lines = markdown_content.split('\n')
-        current_table = None
-        table_headers = []
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
-            if not line_stripped:
-                if current_table is not None:
-                    current_table = None
-                    table_headers = []
-                continue
-            
-            # Main title (# )
-            if line_stripped.startswith('# '):
-                title = line_stripped[2:].strip()
-                try:
-                    paragraph = doc.add_paragraph(title)
-                    paragraph.style = 'Framework Title'
-                except:
-                    paragraph = doc.add_paragraph(title)
-                    paragraph.runs[0].bold = True
-                    paragraph.runs[0].font.size = Pt(24)
-            
-            # Heading 1 (## )
-            elif line_stripped.startswith('## '):
-                heading = line_stripped[3:].strip()
-                try:
-                    paragraph = doc.add_paragraph(heading)
-                    paragraph.style = 'Framework H1'
-                except:
-                    paragraph = doc.add_paragraph(heading)
-                    paragraph.runs[0].bold = True
-                    paragraph.runs[0].font.size = Pt(18)
-            
-            # Heading 2 (### )
-            elif line_stripped.startswith('### '):
-                heading = line_stripped[4:].strip()
-                try:
-                    paragraph = doc.add_paragraph(heading)
-                    paragraph.style = 'Framework H2'
-                except:
-                    paragraph = doc.add_paragraph(heading)
-                    paragraph.runs[0].bold = True
-                    paragraph.runs[0].font.size = Pt(14)
+        self._render_word(parse_markdown(markdown_content), doc)
+    
+    def _render_word(self, blocks: list, doc):
+        """Add parsed blocks to a Word document"""
+        heading_styles = {1: ('Framework Title', 24), 2: ('Framework H1', 18), 3: ('Framework H2', 14)}
+        style_ids = {}
+        
+        def set_style(paragraph, name):
+            # python-docx rescans every style in the document on each assignment by name, so resolve each once
+            if name not in style_ids:
+                style_ids[name] = doc.part.get_style_id(doc.styles[name], WD_STYLE_TYPE.PARAGRAPH)
+            paragraph._p.style = style_ids[name]
+        
+        for block in blocks:
+            kind = block['type']
             
-            # Heading 3 (#### )
-            elif line_stripped.startswith('#### '):
-                heading = line_stripped[5:].strip()
-                paragraph = doc.add_paragraph(heading)
+            if kind == 'heading':
+                paragraph = doc.add_paragraph(block['text'])
+                if block['level'] in heading_styles:
+                    style, size = heading_styles[block['level']]
+                    try:
+                        set_style(paragraph, style)
+                        continue
+                    except KeyError:
+                        pass
+                else:
+                    size = 12
                 paragraph.runs[0].bold = True
-                paragraph.runs[0].font.size = Pt(12)
+                paragraph.runs[0].font.size = Pt(size)
             
-            # Table detection
-            elif '|' in line_stripped and line_stripped.startswith('|'):
-                if current_table is None:
-                    # New table - extract headers
-                    headers = [cell.strip() for cell in line_stripped.split('|')[1:-1]]
-                    table_headers = headers
-                    current_table = doc.add_table(rows=1, cols=len(headers))
-                    current_table.style = 'Table Grid'
-                    
-                    # Add headers
-                    for i, header in enumerate(headers):
-                        cell = current_table.rows[0].cells[i]
-                        cell.text = header
+            elif kind == 'table':
+                headers = [text for text, _ in block['rows'][0]]
+                table = doc.add_table(rows=1, cols=len(headers))
+                table.style = 'Table Grid'
+                
+                # Add headers
+                for i, header in enumerate(headers):
+                    cell = table.rows[0].cells[i]
+                    cell.text = header
+                    if cell.paragraphs[0].runs:
                         cell.paragraphs[0].runs[0].bold = True
-                elif not line_stripped.startswith('|---'):
-                    # Data row
-                    cells_data = [cell.strip() for cell in line_stripped.split('|')[1:-1]]
-                    if len(cells_data) == len(table_headers):
-                        row = current_table.add_row()
-                        for i, cell_data in enumerate(cells_data):
-                            row.cells[i].text = cell_data
-            
-            # Bullet points (- )
-            elif line_stripped.startswith('- '):
-                text = line_stripped[2:].strip()
-                paragraph = doc.add_paragraph()
-                self._add_formatted_text_to_paragraph(paragraph, text)
-                paragraph.style = 'List Bullet'
-            
-            # Numbered points (1. )
-            elif re.match(r'^\d+\.\s', line_stripped):
-                text = re.sub(r'^\d+\.\s', '', line_stripped)
-                paragraph = doc.add_paragraph()
-                self._add_formatted_text_to_paragraph(paragraph, text)
-                paragraph.style = 'List Number'
+                
+                # Data rows (rows that don't match the header are skipped)
+                for cells in block['rows'][1:]:
+                    if len(cells) == len(headers):
+                        row = table.add_row()
+                        for i, (text, _) in enumerate(cells):
+                            row.cells[i].text = text
             
-            # Bold emphasis (**text**)
-            elif '**' in line_stripped:
+            elif kind in ('bullet', 'numbered', 'paragraph'):
                 paragraph = doc.add_paragraph()
-                self._add_formatted_text_to_paragraph(paragraph, line_stripped)
-            
-            # Regular paragraph
-            else:
-                if line_stripped:  # Skip empty lines
-                    paragraph = doc.add_paragraph()
-                    self._add_formatted_text_to_paragraph(paragraph, line_stripped)
+                self._add_runs_to_paragraph(paragraph, block['runs'])
+                if kind == 'bullet':
+                    set_style(paragraph, 'List Bullet')
+                elif kind == 'numbered':
+                    set_style(paragraph, 'List Number')
     
     def _add_formatted_text_to_paragraph(self, paragraph, text):
         """Add text with bold/italic formatting to paragraph"""
-        # Handle bold text (**text**)
-        parts = re.split(r'(\*\*.*?\*\*)', text)
-        
-        for part in parts:
-            if part.startswith('**') and part.endswith('**'):
-                # Bold text
-                bold_text = part[2:-2]
-                run = paragraph.add_run(bold_text)
+        self._add_runs_to_paragraph(paragraph, parse_inline(text))
+    
+    def _add_runs_to_paragraph(self, paragraph, runs):
+        for text, bold in runs:
+            run = paragraph.add_run(text)
+            if bold:
                 run.bold = True
-            else:
-                # Regular text
-                paragraph.add_run(part)
     
     def _markdown_to_html(self, markdown_content: str) -> str:
         """Convert markdown to HTML with proper formatting"""
-        lines = markdown_content.split('\n')
+        return self._render_html(parse_markdown(markdown_content))
+    
+    def _render_html(self, blocks: list) -> str:
+        """Render parsed blocks as an HTML fragment"""
+        heading_tags = {1: ('h1', 'main-title'), 2: ('h2', 'section-heading'), 3: ('h3', 'subsection-heading'),
+                        4: ('h4', 'test-heading')}
         html_lines = []
-        in_table = False
-        table_lines = []
         
-        for line in lines:
-            line_stripped = line.strip()
-            
-            if not line_stripped:
-                if in_table:
-                    # End table
-                    html_lines.append(self._create_html_table(table_lines))
-                    table_lines = []
-                    in_table = False
+        for block in blocks:
+            kind = block['type']
+            if kind == 'blank':
                 html_lines.append('<br>')
-                continue
-            
-            # Main title (# )
-            if line_stripped.startswith('# '):
-                title = line_stripped[2:].strip()
-                html_lines.append(f'<h1 class="main-title">{title}</h1>')
-            
-            # Heading 1 (## )
-            elif line_stripped.startswith('## '):
-                heading = line_stripped[3:].strip()
-                html_lines.append(f'<h2 class="section-heading">{heading}</h2>')
-            
-            # Heading 2 (### )
-            elif line_stripped.startswith('### '):
-                heading = line_stripped[4:].strip()
-                html_lines.append(f'<h3 class="subsection-heading">{heading}</h3>')
-            
-            # Heading 3 (#### )
-            elif line_stripped.startswith('#### '):
-                heading = line_stripped[5:].strip()
-                html_lines.append(f'<h4 class="test-heading">{heading}</h4>')
-            
-            # Table detection
-            elif '|' in line_stripped and line_stripped.startswith('|'):
-                if not in_table:
-                    in_table = True
-                table_lines.append(line_stripped)
-            
-            # Bullet points (- )
-            elif line_stripped.startswith('- '):
-                if in_table:
-                    html_lines.append(self._create_html_table(table_lines))
-                    table_lines = []
-                    in_table = False
-                text = line_stripped[2:].strip()
-                formatted_text = self._format_html_text(text)
-                html_lines.append(f'<li>{formatted_text}</li>')
-            
-            # Regular paragraph
+            elif kind == 'heading':
+                tag, css_class = heading_tags[block['level']]
+                html_lines.append(f'<{tag} class="{css_class}">{escape(block["text"], quote=False)}</{tag}>')
+            elif kind == 'table':
+                html_lines.append(self._create_html_table(block['rows']))
+            elif kind == 'bullet':
+                html_lines.append(f'<li>{self._format_html_runs(block["runs"])}</li>')
+            elif kind == 'numbered':
+                html_lines.append(f'<p>{escape(block["prefix"], quote=False)}{self._format_html_runs(block["runs"])}</p>')
             else:
-                if in_table:
-                    html_lines.append(self._create_html_table(table_lines))
-                    table_lines = []
-                    in_table = False
-                
-                formatted_text = self._format_html_text(line_stripped)
-                html_lines.append(f'<p>{formatted_text}</p>')
-        
-        # Handle any remaining table
-        if in_table and table_lines:
-            html_lines.append(self._create_html_table(table_lines))
+                html_lines.append(f'<p>{self._format_html_runs(block["runs"])}</p>')
         
         return '\n'.join(html_lines)
     
-    def _create_html_table(self, table_lines: list) -> str:
-        """Create HTML table from markdown table lines"""
-        if not table_lines:
+    def _create_html_table(self, rows: list) -> str:
+        """Create HTML table from parsed table rows (header first)"""
+        if not rows:
             return ''
         
         html = ['<table class="framework-table">']
         
-        for i, line in enumerate(table_lines):
-            if line.startswith('|---'):
-                continue  # Skip separator line
-            
-            cells = [cell.strip() for cell in line.split('|')[1:-1]]
-            
-            if i == 0:  # Header row
-                html.append('<thead><tr>')
-                for cell in cells:
-                    html.append(f'<th>{self._format_html_text(cell)}</th>')
-                html.append('</tr></thead><tbody>')
-            else:  # Data row
-                html.append('<tr>')
-                for cell in cells:
-                    formatted_cell = self._format_html_text(cell)
-                    # Add priority styling
-                    if 'HIGH' in cell:
-                        html.append(f'<td class="priority-high">{formatted_cell}</td>')
-                    elif 'MEDIUM' in cell:
-                        html.append(f'<td class="priority-medium">{formatted_cell}</td>')
-                    elif 'LOW' in cell:
-                        html.append(f'<td class="priority-low">{formatted_cell}</td>')
-                    else:
-                        html.append(f'<td>{formatted_cell}</td>')
-                html.append('</tr>')
+        html.append('<thead><tr>')
+        for _, runs in rows[0]:
+            html.append(f'<th>{self._format_html_runs(runs)}</th>')
+        html.append('</tr></thead><tbody>')
+        
+        for cells in rows[1:]:
+            html.append('<tr>')
+            for text, runs in cells:
+                formatted_cell = self._format_html_runs(runs)
+                # Add priority styling
+                if 'HIGH' in text:
+                    html.append(f'<td class="priority-high">{formatted_cell}</td>')
+                elif 'MEDIUM' in text:
+                    html.append(f'<td class="priority-medium">{formatted_cell}</td>')
+                elif 'LOW' in text:
+                    html.append(f'<td class="priority-low">{formatted_cell}</td>')
+                else:
+                    html.append(f'<td>{formatted_cell}</td>')
+            html.append('</tr>')
         
         html.append('</tbody></table>')
         return '\n'.join(html)
     
     def _format_html_text(self, text: str) -> str:
         """Format text with bold and other HTML formatting"""
-        # Handle bold text (**text**)
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-        return text
+        return self._format_html_runs(parse_inline(text))
+    
+    def _format_html_runs(self, runs: list) -> str:
+        # Literal angle brackets (e.g. a recommended <meta> tag) must not become markup
+        return ''.join(f'<strong>{escape(text, quote=False)}</strong>' if bold else escape(text, quote=False)
+                       for text, bold in runs)
+    
+    def _render_pdf(self, blocks: list, output_path):
+        """Lay out parsed blocks as a PDF with reportlab"""
+        styles = getSampleStyleSheet()
+        heading_styles = {1: styles['Title'], 2: styles['Heading1'], 3: styles['Heading2'], 4: styles['Heading3']}
+        body = ParagraphStyle('FrameworkBody', parent=styles['Normal'], fontSize=10, leading=13)
+        cell_style = ParagraphStyle('FrameworkCell', parent=body, fontSize=8, leading=10)
+        
+        def markup(runs):
+            return ''.join(f'<b>{escape(text)}</b>' if bold else escape(text) for text, bold in runs)
+        
+        story = []
+        for block in blocks:
+            kind = block['type']
+            if kind == 'blank':
+                story.append(Spacer(1, 4))
+            elif kind == 'heading':
+                story.append(Paragraph(escape(block['text']), heading_styles[block['level']]))
+            elif kind == 'table':
+                width = max(len(cells) for cells in block['rows'])
+                rows = [[Paragraph(markup(runs), cell_style) for _, runs in cells] + [''] * (width - len(cells))
+                        for cells in block['rows']]
+                table = Table(rows, repeatRows=1)
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP')
+                ]))
+                story.append(table)
+            elif kind == 'bullet':
+                story.append(Paragraph(markup(block['runs']), body, bulletText='•'))
+            elif kind == 'numbered':
+                story.append(Paragraph(markup(block['runs']), body, bulletText=block['prefix'].strip()))
+            else:
+                story.append(Paragraph(markup(block['runs']), body))
+        
+        doc = SimpleDocTemplate(str(output_path), pagesize=A4, title=self.document_title, author="PPC Campaign Planning System")
+        doc.build(story)
     
     def _create_html_document(self, content: str) -> str:
         """Create complete HTML document with professional styling"""
@@ -398,7 +458,7 @@ class SimpleDocumentExporter:
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{self.client_name} - Testing Framework</title>
+    <title>{escape(self.document_title)}</title>
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;600;700&display=swap" rel="stylesheet">
     <style>
         body {{
@@ -584,8 +644,11 @@ def main():
     parser = argparse.ArgumentParser(description='Export testing framework to documents (Simple Version)')
     parser.add_argument('client_name', help='Name of the client')
     parser.add_argument('input_file', help='Path to markdown file')
-    parser.add_argument('--format', choices=['word', 'html', 'both'], default='both')
+    parser.add_argument('--format', choices=['word', 'html', 'pdf', 'both', 'all'], default='both',
+                        help='both = Word and HTML, all = Word, HTML and PDF')
     parser.add_argument('--output-name', help='Custom output filename')
+    parser.add_argument('--parallel', action=argparse.BooleanOptionalAction, default=None,
+                        help='Render formats in worker processes (default: only for large documents on multi-core machines)')
     
     args = parser.parse_args()
     
@@ -603,8 +666,10 @@ def main():
     
     print(f"🔄 Converting {args.input_file} for {args.client_name}...")
     
-    if args.format == 'both':
-        results = exporter.export_both_formats(markdown_content)
+    if args.format in ('both', 'all'):
+        formats = EXPORT_FORMATS if args.format == 'all' else ('html', 'word')
+        basename = Path(args.output_name).stem if args.output_name else None
+        results = exporter.export_formats(markdown_content, formats, output_basename=basename, parallel=args.parallel)
         print(f"\n📄 Export Results:")
         for format_type, result in results.items():
             if 'error' in format_type:
@@ -622,6 +687,9 @@ def main():
     
     elif args.format == 'html':
         exporter.export_to_html(markdown_content, args.output_name)
+    
+    elif args.format == 'pdf':
+        exporter.export_to_pdf(markdown_content, args.output_name)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
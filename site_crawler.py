@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Site Crawler for Conversion Optimization Analysis
+Usage: python site_crawler.py https://example.com [--max-pages 200] [--max-depth 3]
+
+Discovers pages from internal links and sitemap.xml, runs the CRO and SEO
+frameworks from ConversionOptimizationAgent on every page and rolls the
+issues up to site level, ranked by how many pages each one affects.
+"""
+
+import argparse
+import collections
+import csv
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
+
+import requests
+from html_parser import parse_html
+
+from conversion_optimization_agent import ConversionOptimizationAgent
+from http_cache import HttpCache, DEFAULT_CACHE_DIRNAME, client_cache_dir
+from http_client import get_http_client, NotHtmlError, browser_headers, DEFAULT_USER_AGENTS
+
+# Query parameters that only track campaigns and never change page content
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'dclid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+
+# Links to files the CRO/SEO frameworks cannot analyse
+SKIP_EXTENSIONS = {
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.zip', '.gz',
+    '.mp4', '.mp3', '.mov', '.avi', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.css', '.js', '.json', '.xml', '.txt', '.woff', '.woff2', '.ttf'
+}
+
+MAX_SITEMAPS = 10
+
+def site_key(netloc):
+    """Host used to decide whether a link belongs to the crawled site (www. is ignored)"""
+    host = netloc.lower().split('@')[-1]
+    return host[4:] if host.startswith('www.') else host
+
+def canonicalize_url(url, base=None):
+    """Normalise a URL for de-duplication, or None if it is not a crawlable web page"""
+    try:
+        if base:
+            url = urljoin(base, url.strip())
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None  # malformed, e.g. an unclosed IPv6 bracket in http://[bad
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+
+    path = parsed.path or '/'
+    if os.path.splitext(path)[1].lower() in SKIP_EXTENSIONS:
+        return None
+    path = re.sub(r'/{2,}', '/', path)
+
+    # Drop default ports, tracking parameters and fragments; sort what is left
+    netloc = parsed.netloc.lower()
+    if (parsed.scheme == 'http' and netloc.endswith(':80')) or (parsed.scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((parsed.scheme.lower(), netloc, path, '', urlencode(query), ''))
+
+def issue_key(area, issue):
+    """Group issues that only differ by a count, e.g. '3 images missing alt text'"""
+    return f"{area}: " + re.sub(r'\d+', 'N', issue)
+
+class SiteCrawler:
+    """Crawl one site with a bounded concurrent frontier and roll up CRO/SEO issues"""
+
+    def __init__(self, start_url, max_pages=100, max_depth=3, max_workers=4, delay_seconds=0.0,
+                 use_sitemap=True, cache_dir=DEFAULT_CACHE_DIRNAME, offline=False, check_links=False,
+                 audit_assets=False):
+        self.start_url = canonicalize_url(start_url)
+        if not self.start_url:
+            raise ValueError(f"Not a crawlable URL: {start_url}")
+        self.site = site_key(urlparse(self.start_url).netloc)
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.delay_seconds = delay_seconds
+        self.use_sitemap = use_sitemap
+        self.check_links = check_links
+        self.audit_assets = audit_assets
+
+        self.http_cache = HttpCache(cache_dir, offline=offline)
+        self.http_client = get_http_client()
+        self.headers = browser_headers(DEFAULT_USER_AGENTS[0])
+        self.robots = None
+
+        self.pages = []
+        self.canonical_owners = {}
+
+    def is_internal(self, url):
+        """True if url is on the crawled site"""
+        return site_key(urlparse(url).netloc) == self.site
+
+    def fetch(self, url, timeout=15, page=False):
+        """GET a URL through the shared cache and pooled session (page=True streams it size-capped)"""
+        return self.http_cache.fetch(url, headers=self.headers, timeout=timeout,
+                                     session=self.http_client, allow_redirects=True, page=page)
+
+    def load_robots(self):
+        """Read robots.txt so disallowed pages are skipped (everything is allowed if it can't be read)"""
+        robots_url = urljoin(self.start_url, '/robots.txt')
+        self.robots = RobotFileParser(robots_url)
+        try:
+            response = self.fetch(robots_url, timeout=10)
+            if response.status_code == 200:
+                self.robots.parse(response.text.splitlines())
+                return
+        except requests.exceptions.RequestException:
+            pass
+        self.robots.parse([])
+
+    def allowed(self, url):
+        """robots.txt check for the crawler's user agent"""
+        return self.robots is None or self.robots.can_fetch(self.headers['User-Agent'], url)
+
+    def discover_sitemap_urls(self):
+        """Page URLs listed in the site's sitemaps (follows sitemap indexes)"""
+        sitemap_queue = collections.deque((self.robots.site_maps() if self.robots else None) or [])
+        if not sitemap_queue:
+            sitemap_queue.append(urljoin(self.start_url, '/sitemap.xml'))
+
+        seen_sitemaps, page_urls = set(), []
+        while sitemap_queue and len(seen_sitemaps) < MAX_SITEMAPS and len(page_urls) < self.max_pages:
+            sitemap_url = sitemap_queue.popleft()
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            try:
+                response = self.fetch(sitemap_url, timeout=10)
+                if response.status_code != 200:
+                    continue
+                root = ET.fromstring(response.content)
+            except (requests.exceptions.RequestException, ET.ParseError):
+                continue
+
+            # <sitemapindex> lists more sitemaps, <urlset> lists pages
+            for loc in root.iter():
+                if not loc.tag.endswith('loc') or not loc.text:
+                    continue
+                if root.tag.endswith('sitemapindex'):
+                    sitemap_queue.append(loc.text.strip())
+                else:
+                    page_urls.append(loc.text.strip())
+
+        print(f"🗺️  Sitemap: {len(page_urls)} URLs from {len(seen_sitemaps)} sitemap(s)")
+        return page_urls
+
+    def extract_links(self, soup, base_url):
+        """Canonical internal links on a page, in document order"""
+        links = []
+        for link in soup.find_all('a', href=True):
+            if 'nofollow' in (link.get('rel') or []):
+                continue
+            url = canonicalize_url(link['href'], base_url)
+            if url and self.is_internal(url):
+                links.append(url)
+        return links
+
+    def analyze_page(self, url, depth):
+        """Fetch one page and run the CRO/SEO frameworks on it (runs in a worker thread)"""
+        page = {'url': url, 'depth': depth, 'status': None, 'title': '', 'canonical': url,
+                'issues': [], 'links': [], 'error': None}
+        try:
+            try:
+                response = self.fetch(url, page=True)
+            except NotHtmlError as e:
+                page['status'] = e.response.status_code
+                page['error'] = 'Not an HTML page'
+                return page
+            page['status'] = response.status_code
+            if response.status_code != 200:
+                page['error'] = f"HTTP {response.status_code}"
+                return page
+            if 'html' not in response.headers.get('Content-Type', 'text/html').lower():
+                page['error'] = 'Not an HTML page'
+                return page
+
+            final_url = canonicalize_url(response.url) or url
+            soup = parse_html(response.content)
+
+            canonical_tag = soup.find('link', rel='canonical', href=True)
+            if canonical_tag:
+                page['canonical'] = canonicalize_url(canonical_tag['href'], final_url) or final_url
+            else:
+                page['canonical'] = final_url
+            if self.is_internal(final_url):
+                page['links'] = self.extract_links(soup, final_url)
+
+            # A throwaway agent per page keeps the frameworks' per-page state out of other threads
+            # Link checks share one process-wide cache, so navigation links are only checked once per crawl
+            agent = ConversionOptimizationAgent(cache_dir=self.http_cache.cache_dir, offline=self.http_cache.offline,
+                                                check_links=self.check_links, audit_assets=self.audit_assets)
+            agent.url = final_url
+            agent.soup = soup
+            agent.html_bytes = len(response.content)
+            agent.analyze_cro_framework(verbose=False)
+            agent.analyze_seo_framework(verbose=False)
+
+            page['title'] = agent.analysis_results['seo']['meta_tags']['title'] or ''
+            for data in agent.analysis_results.values():
+                for area, analysis in data.items():
+                    for issue in analysis.get('issues', []):
+                        page['issues'].append((area.replace('_', ' ').title(), issue))
+
+        except Exception as e:
+            page['error'] = str(e)
+        return page
+
+    def crawl(self):
+        """Breadth-first crawl within the page and depth budgets, returning per-page results"""
+        print(f"🕷️  Crawling {self.start_url} (max {self.max_pages} pages, depth {self.max_depth}, "
+              f"{self.max_workers} workers)")
+        self.load_robots()
+
+        seen = set()
+        frontier = collections.deque()
+
+        def enqueue(url, depth):
+            if url in seen or len(seen) >= self.max_pages or depth > self.max_depth:
+                return
+            if not self.is_internal(url) or not self.allowed(url):
+                return
+            seen.add(url)
+            frontier.append((url, depth))
+
+        enqueue(self.start_url, 0)
+        if self.use_sitemap:
+            for url in self.discover_sitemap_urls():
+                canonical = canonicalize_url(url)
+                if canonical:
+                    enqueue(canonical, 1)
+
+        self.pages = []
+        self.canonical_owners = {}
+        in_flight = {}
+        next_slot = time.monotonic()
+        crawl_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier or in_flight:
+                # Submit while workers are free; the optional delay spaces out request starts
+                now = time.monotonic()
+                while frontier and len(in_flight) < self.max_workers and now >= next_slot:
+                    url, depth = frontier.popleft()
+                    in_flight[executor.submit(self.analyze_page, url, depth)] = url
+                    next_slot = now + self.delay_seconds
+
+                if not in_flight:
+                    time.sleep(max(0, next_slot - now))
+                    continue
+
+                timeout = max(0, next_slot - now) if frontier and len(in_flight) < self.max_workers else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    del in_flight[future]
+                    page = future.result()
+                    self.record_page(page)
+                    for link in page['links']:
+                        enqueue(link, page['depth'] + 1)
+
+        elapsed = time.perf_counter() - crawl_start
+        rate = len(self.pages) / elapsed * 60 if elapsed else 0
+        print(f"🏁 Crawled {len(self.pages)} pages in {elapsed:.1f}s ({rate:.0f} pages/min)")
+        print(f"🗄️  {self.http_cache.summary()}")
+        if not self.http_cache.offline:
+            self.http_cache.prune()
+        return self.pages
+
+    def record_page(self, page):
+        """Store a finished page, marking pages whose canonical was already analysed"""
+        page['duplicate_of'] = None
+        if not page['error']:
+            owner = self.canonical_owners.setdefault(page['canonical'], page)
+            if owner is not page:
+                if page['canonical'] == page['url']:
+                    # The canonical page itself outranks duplicates that finished first
+                    owner['duplicate_of'] = page['url']
+                    self.canonical_owners[page['canonical']] = page
+                else:
+                    page['duplicate_of'] = owner['url']
+        self.pages.append(page)
+
+        status = '✅' if not page['error'] else '⚠️ '
+        detail = page['error'] or f"{len(page['issues'])} issues"
+        print(f"  {status} [{len(self.pages)}] {page['url']} - {detail}")
+
+    def rollup(self):
+        """Site-level issues ranked by the number of (non-duplicate) pages they affect"""
+        analysed = [page for page in self.pages if not page['error'] and not page['duplicate_of']]
+        issues = {}
+        for page in analysed:
+            for area, issue in page['issues']:
+                key = issue_key(area, issue)
+                entry = issues.setdefault(key, {'issue': key, 'example': f"{area}: {issue}", 'pages': []})
+                if not entry['pages'] or entry['pages'][-1] != page['url']:
+                    entry['pages'].append(page['url'])
+
+        ranked = sorted(issues.values(), key=lambda entry: (-len(entry['pages']), entry['issue']))
+        for entry in ranked:
+            entry['page_count'] = len(entry['pages'])
+            entry['page_share'] = round(100 * entry['page_count'] / len(analysed), 1) if analysed else 0
+        return ranked
+
+    def save_reports(self, output_dir='.'):
+        """Write the markdown rollup and a per-page CSV, returning both paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        slug = re.sub(r'[^a-z0-9]+', '_', self.site).strip('_')
+        report_path = os.path.join(output_dir, f"site_audit_{slug}_{timestamp}.md")
+        pages_path = os.path.join(output_dir, f"site_audit_{slug}_{timestamp}_pages.csv")
+
+        ranked = self.rollup()
+        analysed = [page for page in self.pages if not page['error'] and not page['duplicate_of']]
+        failed = [page for page in self.pages if page['error']]
+        duplicates = [page for page in self.pages if page['duplicate_of']]
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(f"# Site Conversion & SEO Audit - {self.site}\n\n")
+            f.write(f"**Start URL**: {self.start_url}\n")
+            f.write(f"**Crawl Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"**Pages Analysed**: {len(analysed)} "
+                    f"({len(duplicates)} canonical duplicates, {len(failed)} failed)\n\n")
+
+            f.write("## Issues by Pages Affected\n\n")
+            f.write("| Rank | Issue | Pages | % of Pages | Example Pages |\n")
+            f.write("|------|-------|-------|------------|---------------|\n")
+            for rank, entry in enumerate(ranked, 1):
+                examples = ', '.join(entry['pages'][:3])
+                f.write(f"| {rank} | {entry['example']} | {entry['page_count']} | {entry['page_share']}% | {examples} |\n")
+
+            if failed:
+                f.write("\n## Pages That Could Not Be Analysed\n\n")
+                for page in failed:
+                    f.write(f"- {page['url']}: {page['error']}\n")
+
+        with open(pages_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['url', 'depth', 'status', 'title', 'canonical', 'duplicate_of', 'issue_count', 'issues', 'error'])
+            for page in self.pages:
+                writer.writerow([
+                    page['url'], page['depth'], page['status'], page['title'], page['canonical'],
+                    page['duplicate_of'] or '', len(page['issues']),
+                    '; '.join(f"{area}: {issue}" for area, issue in page['issues']), page['error'] or ''
+                ])
+
+        print(f"✅ Site audit saved: {report_path}")
+        print(f"✅ Page details saved: {pages_path}")
+        return report_path, pages_path
+
+    def print_summary(self, limit=10):
+        """Print the most widespread issues"""
+        ranked = self.rollup()
+        print(f"\n📋 Top site-wide issues:")
+        for entry in ranked[:limit]:
+            print(f"• {entry['example']} - {entry['page_count']} pages ({entry['page_share']}%)")
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Crawl a site and roll up CRO/SEO issues across pages')
+    parser.add_argument('url', help='Start URL (the crawl stays on this site)')
+    parser.add_argument('--max-pages', type=int, default=100, help='Maximum pages to analyse')
+    parser.add_argument('--max-depth', type=int, default=3, help='Maximum link depth from the start URL')
+    parser.add_argument('--workers', type=int, default=4, help='Pages fetched and analysed in parallel')
+    parser.add_argument('--delay', type=float, default=0.0, help='Minimum seconds between request starts')
+    parser.add_argument('--no-sitemap', action='store_true', help='Only follow links, skip sitemap.xml')
+    parser.add_argument('--client', help='Client name - cache and reports go in that client\'s project folder')
+    parser.add_argument('--offline', action='store_true', help='Replay cached pages only (no network requests)')
+    parser.add_argument('--cache-dir', help='Directory for the HTTP response cache')
+    parser.add_argument('--check-links', action='store_true', help='Check every linked URL for errors, redirects and slow responses')
+    parser.add_argument('--audit-assets', action='store_true',
+                        help='Measure the size of every image, script, stylesheet and font on each page')
+    args = parser.parse_args(argv)
+
+    cache_dir = args.cache_dir or (client_cache_dir(args.client) if args.client else DEFAULT_CACHE_DIRNAME)
+    output_dir = os.path.join(os.path.dirname(client_cache_dir(args.client)), '08_reporting') if args.client else '.'
+
+    print("🚀 Conversion Optimization Site Crawl")
+    print("=" * 50)
+    crawler = SiteCrawler(args.url, max_pages=args.max_pages, max_depth=args.max_depth,
+                          max_workers=args.workers, delay_seconds=args.delay,
+                          use_sitemap=not args.no_sitemap, cache_dir=cache_dir, offline=args.offline,
+                          check_links=args.check_links, audit_assets=args.audit_assets)
+    crawler.crawl()
+    crawler.print_summary()
+    crawler.save_reports(output_dir)
+    return crawler
+
+if __name__ == "__main__":
+    main()
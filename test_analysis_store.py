@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test analysis snapshots: JSON keyed by page content hash, reuse for identical content and re-rendering without fetching
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from analysis_store import ANALYSIS_VERSION, content_hash, load_analysis, snapshot_key
+from conversion_optimization_agent import ConversionOptimizationAgent
+from http_test_server import QuietHandler, serve
+
+PAGE = '''<html><head><title>Balloon Garlands</title></head><body>
+<h1>Balloon garlands for every party</h1><p>Book <b>today</b>.</p>
+<form><input name="a"><input name="b"><input name="c"><input name="d"><input name="e"><input name="f"></form>
+</body></html>'''
+
+class PageHandler(QuietHandler):
+    body = PAGE.encode('utf-8')
+    hits = 0
+
+    def do_GET(self):
+        PageHandler.hits += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+def analysed_agent(url, cache_dir):
+    """Fetch and analyse url, counting how often the frameworks run and findings are ranked"""
+    agent = ConversionOptimizationAgent(cache_dir=cache_dir)
+    agent.url = url
+    calls = {'frameworks': 0, 'rankings': 0}
+    run_cro, rank = agent.analyze_cro_framework, agent.generate_recommendations
+
+    def counted_cro(verbose=True):
+        calls['frameworks'] += 1
+        return run_cro(verbose)
+
+    def counted_rank(limit=10):
+        calls['rankings'] += 1
+        return rank(limit)
+
+    agent.analyze_cro_framework, agent.generate_recommendations = counted_cro, counted_rank
+    agent.get_url_input = lambda: True
+    agent.run(formats=('pdf', 'html'))
+    return agent, calls
+
+def test_analysis_store():
+    print("🧪 Testing Analysis Snapshots")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            cache_dir = os.path.join(work_dir, '.http_cache')
+            with serve(PageHandler) as base, contextlib.redirect_stdout(io.StringIO()):
+                url = base + '/landing'
+                first, first_calls = analysed_agent(url, cache_dir)
+                reports = sorted(name for name in os.listdir(work_dir) if name.startswith('conversion_optimization_report_'))
+                snapshot = load_analysis(next(name for name in reports if name.endswith('.json')))
+                second, second_calls = analysed_agent(url, cache_dir)
+                # The same HTML at another URL gets its own snapshot and leaves the first one in place
+                mirror, mirror_calls = analysed_agent(base + '/mirror', cache_dir)
+                third, third_calls = analysed_agent(url, cache_dir)
+                PageHandler.body = PAGE.replace('every party', 'weddings').encode('utf-8')
+                changed, changed_calls = analysed_agent(url, cache_dir)
+            stored = sorted(os.listdir(os.path.join(cache_dir, 'analyses')))
+
+            # Re-render from the JSON with the site down
+            hits_before = PageHandler.hits
+            with contextlib.redirect_stdout(io.StringIO()):
+                rendered = ConversionOptimizationAgent(cache_dir=cache_dir)
+                rendered.load_analysis_document(snapshot)
+                paths = rendered.render_reports(os.path.join(work_dir, 'rerendered'), ('pdf', 'html'))
+            with open(paths['html'], encoding='utf-8') as f:
+                html = f.read()
+            assert PageHandler.hits == hits_before and paths['pdf'] and os.path.getsize(paths['pdf']) > 0 \
+                and 'Form has 6 fields' in html, "reports should be rendered from the snapshot without fetching"
+
+            with open('old.json', 'w', encoding='utf-8') as f:
+                json.dump(dict(snapshot, version=ANALYSIS_VERSION - 1), f)
+            try:
+                load_analysis('old.json')
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("snapshots from other versions should be rejected")
+        finally:
+            os.chdir(original_dir)
+
+    assert first_calls == {'frameworks': 1, 'rankings': 1}, "the analysis should be ranked once per run"
+    keys = [snapshot_key(agent.content_sha256, agent.url, agent.analysis_settings(), snapshot['rules'])
+            for agent in (first, mirror, changed)]
+    assert stored == sorted(f"{key}.json" for key in keys) \
+        and snapshot['content_sha256'] == content_hash(PAGE) and snapshot['version'] == ANALYSIS_VERSION, \
+        "snapshots should be keyed by content hash, URL, settings and rules"
+    assert mirror_calls['frameworks'] == 1 and third_calls == {'frameworks': 0, 'rankings': 0}, \
+        "identical content at two URLs should keep separate snapshots"
+    assert second_calls == {'frameworks': 0, 'rankings': 0} and second.analysis_results == first.analysis_results \
+        and second.recommendations == first.recommendations, "identical content should reuse the analysis"
+    assert changed_calls['frameworks'] == 1 and changed.content_sha256 != first.content_sha256, \
+        "changed content should be analysed again"
+    assert len({os.path.splitext(name)[0] for name in reports}) == 1 \
+        and sorted(os.path.splitext(name)[1] for name in reports) == ['.html', '.json', '.pdf'], \
+        "the JSON should be written next to the reports"
+    assert snapshot['recommendations']['high_priority'][:2] == [
+        'Cta Analysis: No clear CTAs found', 'Mobile Optimization: No viewport meta tag found'], \
+        "findings should keep their ranking"
+
+    print("✅ Analysis snapshots are reused and re-rendered offline")
+
+if __name__ == "__main__":
+    test_analysis_store()
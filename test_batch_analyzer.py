@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test batch analysis of a URL list against a local server
+"""
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+import batch_analyzer
+import conversion_optimization_agent
+from batch_analyzer import BatchAnalyzer, read_urls
+from http_test_server import QuietHandler, serve
+
+PAGE = '<html><head><title>{title}</title></head><body><h1>{title}</h1>{extra}</body></html>'
+
+PAGES = {
+    '/balloons': PAGE.format(title='Balloon Garlands', extra='<img src="a.png"><img src="b.png">'),
+    '/catering': PAGE.format(title='Event Catering', extra='<img src="c.png" alt="Buffet">'),
+    '/venues': PAGE.format(title='Venues', extra=''),
+}
+
+class PageHandler(QuietHandler):
+    def do_GET(self):
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = PAGES[self.path].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def test_batch_analyzer():
+    print("🧪 Testing Batch Analyzer")
+    print("=" * 40)
+
+    with serve(PageHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        lines = ['# weekly audit\n', f'{base}/balloons\n', '\n', f'{base}/missing\n',
+                 f'{base}/catering\n', f'{base}/venues\n', f'{base}/balloons\n']
+        urls = read_urls(lines)
+        assert len(urls) == 4, "comments, blank lines and duplicates should be skipped"
+
+        batch = BatchAnalyzer(urls, output_dir=os.path.join(work_dir, 'reports'), fetch_workers=4,
+                              processes=2, cache_dir=os.path.join(work_dir, 'cache'))
+        # Fetching goes straight through the shared cache; agents are only built for analysis
+        agent_class = batch_analyzer.ConversionOptimizationAgent
+        batch_analyzer.ConversionOptimizationAgent = None
+        try:
+            fetched_url, content, _ = batch.fetch(f'{base}/venues')
+        finally:
+            batch_analyzer.ConversionOptimizationAgent = agent_class
+        assert fetched_url == f'{base}/venues' and content == PAGES['/venues'].encode('utf-8'), \
+            "pages should be fetched without building an agent"
+
+        results = batch.run()
+        by_path = {result['url'][len(base):]: result for result in results}
+        assert [result['url'] for result in results] == urls, "results should be kept in input order"
+        assert by_path['/missing']['error'] == 'HTTP 404', "a missing page should be reported, not fatal"
+        assert all(os.path.exists(by_path[path]['report']) for path in PAGES), "each analysed page should get a PDF"
+        assert by_path['/balloons']['images_missing_alt'] == 2 and by_path['/catering']['images_missing_alt'] == 0, \
+            "per-page findings should be collected"
+        assert by_path['/balloons']['page_size_kb'] == round(len(PAGES['/balloons']) / 1024, 1), \
+            "page weight should include the fetched HTML size"
+        assert batch.elapsed > 0, "throughput should be measured"
+
+        report_path, csv_path = batch.save_comparison()
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert os.path.exists(report_path) and len(rows) == 4 and rows[0]['title'] == 'Balloon Garlands', \
+            "the comparison table should list every URL"
+
+        # The agent's --batch passes its cache, offline and audit options through to the batch
+        with open(os.path.join(work_dir, 'urls.txt'), 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        batches = []
+        batch_class = batch_analyzer.BatchAnalyzer
+
+        class RecordedBatch(batch_class):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                batches.append(self)
+
+        batch_analyzer.BatchAnalyzer = RecordedBatch
+        original_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    conversion_optimization_agent.main(['--batch', 'urls.txt', '--cache-dir', 'cache', '--offline',
+                                                        '--no-link-check', '--no-asset-audit'])
+                except SystemExit as e:
+                    assert e.code == 0, "the batch should finish"
+            with contextlib.redirect_stderr(io.StringIO()):
+                try:
+                    conversion_optimization_agent.main(['--batch', 'urls.txt', '--format', 'html'])
+                except SystemExit as e:
+                    assert e.code == 2, "formats other than PDF should be rejected with --batch"
+                else:
+                    raise AssertionError("formats other than PDF should be rejected with --batch")
+        finally:
+            os.chdir(original_dir)
+            batch_analyzer.BatchAnalyzer = batch_class
+        replayed = {result['url'][len(base):]: result for result in batches[0].results}
+        assert batches[0].agent_options == {'cache_dir': 'cache', 'offline': True, 'check_links': False,
+                                            'audit_assets': False}, "batch options should be passed through"
+        assert replayed['/missing']['error'] == 'Not in cache (run once without --offline)' \
+            and not any(replayed[path]['error'] for path in PAGES), "the batch should replay the given cache"
+
+    print("✅ Batch analyzer fetches, analyses and compares a URL list")
+
+if __name__ == "__main__":
+    test_batch_analyzer()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test the benchmark suite's fixtures, measurement and regression check (without the slow pages)
+"""
+
+from benchmark_suite import compare, load_fixtures, measure, scale_page
+
+def test_benchmark_suite():
+    print("🧪 Testing Benchmark Suite")
+    print("=" * 40)
+
+    pages, documents = load_fixtures(quick=True)
+    scaled = scale_page(pages['landing_page'], 256 * 1024)
+    metrics = measure(lambda: sum(range(1000)))
+
+    baseline = {'benchmarks': {'bench': {'ops_per_sec': 100.0, 'peak_kb': 1000.0, 'retained_blocks': 500}}}
+    steady = {'bench': {'ops_per_sec': 90.0, 'peak_kb': 1100.0, 'retained_blocks': 550}}
+    slower = {'bench': {'ops_per_sec': 70.0, 'peak_kb': 1000.0, 'retained_blocks': 500}}
+    hungrier = {'bench': {'ops_per_sec': 100.0, 'peak_kb': 2000.0, 'retained_blocks': 5000}}
+
+    assert {'landing_page', 'service_page', 'synthetic_1mb'} <= set(pages) and len(documents) == 2, \
+        "fixtures should load without the network"
+    assert 'synthetic_10mb' not in pages, "quick mode should skip the 10MB page"
+    assert 200 * 1024 < len(scaled) <= 256 * 1024 and scaled.endswith('</body></html>'), \
+        "the synthetic page should be scaled close to the requested size"
+    assert metrics['ops_per_sec'] > 0 and {'peak_kb', 'retained_blocks'} <= set(metrics), \
+        "speed and memory metrics should be recorded"
+    assert compare(steady, baseline, 0.2) == [], "changes within the threshold should pass"
+    assert [r[1] for r in compare(slower, baseline, 0.2)] == ['ops_per_sec'], "a slowdown should be flagged"
+    assert [r[1] for r in compare(hungrier, baseline, 0.2)] == ['peak_kb', 'retained_blocks'], \
+        "memory growth should be flagged"
+    assert compare({'new': metrics}, baseline, 0.2) == [], "benchmarks missing from the baseline should be ignored"
+
+    print("✅ Benchmark suite measures and flags regressions")
+
+if __name__ == "__main__":
+    test_benchmark_suite()
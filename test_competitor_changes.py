@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test that a recrawl reuses analyses of unchanged pages and reports what changed on the others
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from competitor_research import AnalysisJournal, EnhancedCompetitorResearcher
+from http_test_server import QuietHandler, serve
+
+PAGE = ('<html><head><title>{title}</title><script nonce="{nonce}">var built = {epoch};</script></head>'
+        '<body><h1>Balloon Garlands</h1><p>Rendered at {time}. Session {nonce}.</p>'
+        '<p>Packages from {price}. Call 0412 345 678.</p><a href="/contact">{cta}</a></body></html>')
+
+class ChangingHandler(QuietHandler):
+    """Serves each path from the current week's page settings"""
+    pages = {}
+
+    def do_GET(self):
+        body = PAGE.format(**ChangingHandler.pages[self.path]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def page(title, cta, price, week):
+    return {'title': title, 'cta': cta, 'price': price, 'time': f"09:1{week} am",
+            'nonce': f"n0nce{week}a8f3c2e9d7b1x4k6q2", 'epoch': f"17500000{week}0"}
+
+def crawl(urls, timestamp):
+    researcher = EnhancedCompetitorResearcher('Change Client', politeness_delay=0)
+    researcher.timestamp = timestamp
+    journal = AnalysisJournal(researcher.folder_name)
+    journal.start(timestamp, 'Balloon garlands', urls, ['balloon garland'])
+    researcher.complete_analysis(journal)
+    return researcher, journal
+
+def test_competitor_changes():
+    print("🧪 Testing Competitor Change Detection")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    with serve(ChangingHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        urls = [f"{base}/alpha", f"{base}/bravo"]
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ChangingHandler.pages = {'/alpha': page('Alpha Balloons', 'Book now', '$350', 1),
+                                         '/bravo': page('Bravo Events', 'Get a quote', '$500', 1)}
+                first, first_journal = crawl(urls, '20250601_090000')
+
+                # A week later: alpha only has new timestamps and nonces, bravo has new copy
+                ChangingHandler.pages = {'/alpha': page('Alpha Balloons', 'Book now', '$350', 2),
+                                         '/bravo': page('Bravo Events | Sale', 'Book today', '$450', 2)}
+                second, second_journal = crawl(urls, '20250608_090000')
+
+            with open(os.path.join(second.folder_name, '02_market_research', 'competitor_changes_20250608_090000.md'),
+                      encoding='utf-8') as f:
+                report = f.read()
+        finally:
+            os.chdir(original_dir)
+
+    alpha_before, bravo_before = first_journal.ordered_results()
+    alpha_after, bravo_after = second_journal.ordered_results()
+    assert alpha_before['content_fingerprint'] == alpha_after['content_fingerprint'], \
+        "volatile tokens (times, nonces) should not change the fingerprint"
+    assert second.store.path == os.path.join(second.folder_name, '02_market_research', 'competitor_snapshots.sqlite'), \
+        "the snapshot store should live in the client folder"
+    assert second.unchanged_urls == {urls[0]}, "the unchanged page should reuse its analysis"
+    assert urls[0] not in second.page_weights and urls[1] in second.page_weights \
+        and alpha_after['page_size_kb'] == alpha_before['page_size_kb'], \
+        "the unchanged page should keep its page weight instead of sizing its assets again"
+    assert bravo_after['title_tag'] == 'Bravo Events | Sale' \
+        and bravo_after['content_fingerprint'] != bravo_before['content_fingerprint'], "the changed page should be re-analysed"
+    assert 'Bravo Events → Bravo Events | Sale' in report, "the change report should list the title change"
+    assert 'CTAs added:** Book today' in report and 'CTAs removed:** Get a quote' in report, \
+        "the change report should list CTA changes"
+    assert f"## {urls[0]}" not in report, "the unchanged page should be left out of the change report"
+
+    print("✅ Recrawls reuse unchanged pages and report changes")
+
+if __name__ == "__main__":
+    test_competitor_changes()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test that an interrupted competitor run resumes from its journal without re-fetching finished sites
+"""
+
+import contextlib
+import csv
+import glob
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from analysis_journal import AnalysisJournal
+from competitor_research import EnhancedCompetitorResearcher
+from http_test_server import QuietHandler, serve
+
+PAGE = ('<html><head><title>{name} Balloon Hire</title></head><body><h1>{name}</h1>'
+        '<p>Balloon garlands for events. Call 0412 345 678.</p><a href="/contact">Book now</a></body></html>')
+
+class CompetitorHandler(QuietHandler):
+    hits = []
+
+    def do_GET(self):
+        CompetitorHandler.hits.append(self.path)
+        body = PAGE.format(name=self.path.strip('/').title()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def test_competitor_journal():
+    print("🧪 Testing Resumable Competitor Analysis")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    with serve(CompetitorHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        urls = [f"{base}/alpha", f"{base}/bravo", f"{base}/charlie"]
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                # First run: inputs journaled, one site analysed, then the process "dies"
+                first = EnhancedCompetitorResearcher('Journal Client', politeness_delay=0)
+                journal = AnalysisJournal(first.folder_name)
+                journal.start(first.timestamp, 'Balloon garlands', urls, ['balloon garland'])
+                first.analyze_competitors(urls[:1], journal=journal)
+                with open(journal.path, 'a', encoding='utf-8') as f:
+                    f.write('{"type": "result", "url": "' + urls[1] + '", "anal')  # torn write
+
+                CompetitorHandler.hits.clear()
+                resumed = EnhancedCompetitorResearcher('Journal Client', politeness_delay=0)
+                resumed.run_enhanced_analysis(resume=True)
+            assert sorted(CompetitorHandler.hits) == ['/bravo', '/charlie'], "finished sites should not be fetched again"
+            assert resumed.timestamp == first.timestamp, "reports should keep the original run timestamp"
+
+            reloaded = AnalysisJournal(first.folder_name)
+            reloaded.load()
+            assert len(reloaded.results) == 3, "a torn journal line should be ignored"
+            assert reloaded.complete and not reloaded.pending_urls(), "the resumed run should be marked complete"
+
+            csv_path = os.path.join(first.folder_name, '02_market_research',
+                                    f'enhanced_competitor_analysis_{first.timestamp}.csv')
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            assert [row['competitor_url'] for row in rows] == urls, "the CSV should be built from the whole journal"
+
+            # Resuming a finished run leaves its reports alone
+            reports = {path: os.path.getmtime(path) for path in glob.glob(os.path.join(first.folder_name, '*', '*'))}
+            CompetitorHandler.hits.clear()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                EnhancedCompetitorResearcher('Journal Client', politeness_delay=0).run_enhanced_analysis(resume=True)
+            assert f"Run {first.timestamp} already finished" in output.getvalue(), "resuming a finished run should say so"
+            assert CompetitorHandler.hits == [], "resuming a finished run should not fetch anything"
+            assert {path: os.path.getmtime(path) for path in glob.glob(os.path.join(first.folder_name, '*', '*'))} == reports, \
+                "resuming a finished run should not rewrite its reports"
+        finally:
+            os.chdir(original_dir)
+
+    # The orchestrator reads the journal without loading the researcher and its dependencies
+    loaded = subprocess.run([sys.executable, '-c', "import sys, research_orchestrator; print('competitor_research' in sys.modules)"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert loaded.stdout.strip() == 'False', f"research_orchestrator should not import competitor_research: {loaded.stderr}"
+
+    print("✅ Interrupted competitor runs resume from their journal")
+
+if __name__ == "__main__":
+    test_competitor_journal()
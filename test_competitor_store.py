@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the competitor snapshot store: run history, cross-client queries, CSV export and backfill
+"""
+
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+
+from competitor_store import CompetitorStore, client_store_path, find_store_paths
+
+STORE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'competitor_store.py')
+
+def analysis(url, title, readiness, tracking='Google Analytics 4'):
+    return {
+        'competitor_url': url,
+        'title_tag': title,
+        'h1_tags': [title],
+        'total_word_count': 420,
+        'tracking_stack': tracking,
+        'ppc_landing_quality': f"Good ({readiness}/10) - {readiness * 10}% ready"
+    }
+
+def test_competitor_store():
+    print("🧪 Testing Competitor Snapshot Store")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = CompetitorStore(os.path.join(work_dir, 'snapshots.sqlite'))
+        store.save_run('reality_events', '20250601_090000', [
+            analysis('https://alpha.example/', 'Alpha Balloons', 6),
+            {'competitor_url': 'https://bravo.example/', 'error': 'timed out'},
+        ])
+        store.save_run('reality_events', '20250608_090000', [
+            analysis('https://alpha.example/', 'Alpha Balloons | Now Booking', 8, 'Google Analytics 4, Meta Pixel'),
+            analysis('https://bravo.example/', 'Bravo Events', 5),
+        ])
+        store.save_run('five_by_five', '20250605_120000', [analysis('https://alpha.example/', 'Alpha Balloons', 6)])
+
+        history = store.history('https://alpha.example/', client='reality_events')
+        assert [s['title_tag'] for s in history] == ['Alpha Balloons', 'Alpha Balloons | Now Booking'], \
+            "history should be ordered by snapshot time"
+        assert history[1]['analysis']['h1_tags'] == ['Alpha Balloons | Now Booking'], "lists should survive the round trip"
+        assert [s['ppc_readiness'] for s in history] == [6, 8], "the readiness score should be queryable"
+
+        assert [s['client'] for s in store.history('ALPHA.example')] == ['reality_events', 'five_by_five', 'reality_events'], \
+            "domain history should span clients"
+        assert [s['snapshot_at'] for s in store.latest(client='reality_events')] == ['2025-06-08T09:00:00'] * 2, \
+            "latest should keep the newest snapshot per URL"
+
+        export_path = os.path.join(work_dir, 'reality_events', '02_market_research',
+                                   'enhanced_competitor_analysis_20250601_090000.csv')
+        store.export_csv('reality_events', '20250601_090000', export_path)
+        with open(export_path, newline='', encoding='utf-8') as f:
+            exported = list(csv.DictReader(f))
+        assert [row['competitor_url'] for row in exported] == ['https://alpha.example/', 'https://bravo.example/'] \
+            and exported[1]['error'] == 'timed out', "the CSV export should keep run order and error rows"
+
+        backfilled = CompetitorStore(os.path.join(work_dir, 'backfill.sqlite'))
+        assert backfilled.import_tree(work_dir) == (1, 2) and backfilled.clients() == ['reality_events'], \
+            "exported CSVs should backfill a new store"
+
+        # Without --store, each client's CSVs are imported into the store in its own project folder
+        subprocess.run([sys.executable, STORE_SCRIPT, 'import', '.'], cwd=work_dir, check=True, capture_output=True)
+        assert find_store_paths(work_dir) == [client_store_path(os.path.join(work_dir, 'reality_events'))], \
+            "the import should create a store in the client folder"
+        latest = subprocess.run([sys.executable, STORE_SCRIPT, 'latest', '--client', 'reality_events'], cwd=work_dir,
+                                check=True, capture_output=True, text=True)
+        assert 'Alpha Balloons' in latest.stdout and 'timed out' in latest.stdout, \
+            "the CLI should read a client's own store"
+
+    print("✅ Competitor snapshots are stored, queried and exported")
+
+if __name__ == "__main__":
+    test_competitor_store()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the declarative CRO/SEO rule engine: selectors, one-pass matching, per-rule scores and ranked recommendations
+"""
+
+from conversion_optimization_agent import ConversionOptimizationAgent
+from cro_rules import RULES, RuleSet, compile_selector
+from html_parser import parse_html
+
+PAGE = '''<html><head><title>Short title</title><meta name="Description" content="Balloon garlands"></head><body>
+<h1>First</h1><h1>Second</h1><h1> </h1>
+<a class="Btn-primary" href="/book">Book MY spot</a><a class="nav" href="/about">About</a>
+<button class="cta">Get started</button><button class="cta"></button>
+<div class="hero main">Garlands for every party</div>
+<div class="reviews">5 stars</div><section class="star-rating">4.9</section>
+<form><input name="a"><input name="b"><input name="c"><input type="hidden" name="d"><select name="e"></select>
+<textarea name="f"></textarea><input name="g"><input type="submit"></form>
+<form><input name="email"><input type="submit"></form>
+<img src="/a.jpg" alt="A"><img src="/b.jpg"><img src="/c.jpg" alt="">
+<p>Secure checkout with a money-back guarantee.</p>
+</body></html>'''
+
+def test_cro_rules():
+    print("🧪 Testing CRO Rule Engine")
+    print("=" * 40)
+
+    soup = parse_html(PAGE)
+    report = RuleSet().evaluate(soup, 'https://example.com/balloon_garlands')
+
+    agent = ConversionOptimizationAgent(cache_dir='.http_cache_unused')
+    agent.url, agent.soup = 'https://example.com/balloon_garlands', soup
+    agent.analyze_cro_framework(verbose=False)
+    agent.analyze_seo_framework(verbose=False)
+    recommendations = agent.generate_recommendations(limit=3)
+    issue_scores = [finding['score'] for finding in recommendations['ranked'] if finding['kind'] == 'issues']
+
+    # Many rules on the same tags share one pass over the tag index (timed in benchmark_suite.py)
+    many = RuleSet(RULES + [{'id': f'extra_{i}', 'area': 'extra', 'select': f'a[href*=/page-{i}], img[src*=.gif]',
+                             'measure': 'count', 'test': ('>', 0), 'issue': 'Extra {value}'} for i in range(300)])
+    many_report = many.evaluate(soup)
+
+    try:
+        RuleSet([{'id': 'bad', 'area': 'x', 'measure': 'nope'}])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("rules with an unknown measure should be rejected")
+
+    cro, seo = agent.analysis_results['cro'], agent.analysis_results['seo']
+    assert [tag.get_text() for tag in report.matches('value_proposition')] == ['Garlands for every party'], \
+        "class selectors should match class tokens"
+    assert len(report.matches('cta_missing')) == 3 and cro['cta_analysis']['ctas_found'] == ['Book MY spot', 'Get started'], \
+        "substring selectors should match any alternative"
+    assert report.value('description_missing') == 1, "attribute values should compare case-insensitively"
+    assert len(compile_selector('div.a, div[class*=a]')) == 2 and report.value('social_proof_missing') == 2, \
+        "a selector list should match each tag once"
+    assert report.value('h1_multiple') == 2 and 'Multiple H1 tags found (2)' in cro['headline_analysis']['issues'], \
+        "text elements should be counted"
+    assert report.value('form_fields') == [6, 1] \
+        and cro['form_analysis']['issues'] == ['Form has 6 fields (recommended max: 5)'], \
+        "per-element rules should report each form"
+    assert report.value('url_underscores') == 1 and report.value('trust_signals') == 2 \
+        and report.value('img_alt_missing') == 2, "page-level measures should be computed"
+    assert "Keep sentences to 11 words maximum" in cro['content_structure']['recommendations'], \
+        "standing advice should always be given"
+    assert cro['mobile_optimization']['recommendations'] == ['Ensure CTAs are in mobile thumb zone',
+                                                             'Test on real devices, not just browser tools'], \
+        "the viewport issue should keep the mobile advice unchanged"
+    assert seo['images']['recommendations'][-1] == "Include relevant keywords in alt text naturally", \
+        "alt text advice should follow the image size advice"
+    assert all(issue in section.get('scores', {}) for data in agent.analysis_results.values()
+               for section in data.values() for issue in section.get('issues', [])), "every finding should carry a score"
+    assert report.results['form_fields']['score'] > report.results['h1_multiple']['score'] > 0, \
+        "overshooting a threshold should raise the score"
+    assert issue_scores == sorted(issue_scores, reverse=True) and len(recommendations['high_priority']) == 3 \
+        and recommendations['high_priority'][:2] == ['Mobile Optimization: No viewport meta tag found',
+                                                     'Form Analysis: Form has 6 fields (recommended max: 5)'], \
+        "recommendations should be ranked by score"
+    assert len(many_report.results) == len(RULES) + 300 and many_report.value('extra_0') == 0, \
+        "hundreds of rules should be evaluated in one pass"
+
+    print("✅ CRO rules match, score and rank findings")
+
+if __name__ == "__main__":
+    test_cro_rules()
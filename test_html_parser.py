@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test HTML parser backend selection and that backends agree on the saved landing page
+"""
+
+import os
+
+from html_parser import LXML_AVAILABLE, PARSER_ENV_VAR, available_parsers, get_parser_name, parse_html
+
+def test_html_parser():
+    print("🧪 Testing HTML Parser Backends")
+    print("=" * 40)
+
+    with open('reality-events-balloon-garland-landing.html', 'rb') as f:
+        markup = f.read()
+
+    trees = {name: parse_html(markup, name) for name in available_parsers()}
+    reference = trees['html.parser']
+
+    assert get_parser_name() == ('lxml' if LXML_AVAILABLE else 'html.parser'), "the fastest installed backend should be preferred"
+
+    os.environ[PARSER_ENV_VAR] = 'html.parser'
+    try:
+        assert get_parser_name() == 'html.parser', f"{PARSER_ENV_VAR} should override the backend"
+    finally:
+        del os.environ[PARSER_ENV_VAR]
+
+    try:
+        get_parser_name('no-such-parser')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown backend should be rejected")
+
+    headings = [h.get_text(strip=True) for h in reference.find_all(['h1', 'h2', 'h3'])]
+    for name, soup in trees.items():
+        assert [h.get_text(strip=True) for h in soup.find_all(['h1', 'h2', 'h3'])] == headings, \
+            f"{name} should find the same headings as html.parser"
+        assert len(soup.find_all('a', href=True)) == len(reference.find_all('a', href=True)), \
+            f"{name} should find the same links as html.parser"
+
+    print(f"✅ {', '.join(trees)} agree on the landing page")
+
+if __name__ == "__main__":
+    test_html_parser()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk HTTP cache against a local server that supports ETag revalidation
+"""
+
+import os
+import tempfile
+
+from http_cache import HttpCache, OfflineCacheMiss
+from http_test_server import QuietHandler, serve
+
+PAGE = '<html><head><title>Cached Page</title></head><body><h1>Café</h1></body></html>'.encode('utf-8')
+
+class EtagHandler(QuietHandler):
+    """Serves one page and answers 304 when the client already has it"""
+    requests_seen = []
+
+    def do_GET(self):
+        EtagHandler.requests_seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+def test_http_cache():
+    print("🧪 Testing HTTP Response Cache")
+    print("=" * 40)
+
+    with serve(EtagHandler) as base, tempfile.TemporaryDirectory() as cache_dir:
+        url = base + '/'
+        cache = HttpCache(cache_dir)
+        first = cache.fetch(url)
+        assert first.status_code == 200 and cache.stats['downloaded'] == 1, "first fetch should download the page"
+
+        second = cache.fetch(url)
+        assert EtagHandler.requests_seen[-1] == '"v1"', "second fetch should send the stored ETag"
+        assert cache.stats['revalidated'] == 1 and second.status_code == 200, "second fetch should revalidate with a 304"
+        assert second.content == PAGE and second.text == first.text, "revalidated body should match the first download"
+
+        # Without a session the shared client handles page= and retry=
+        paged = cache.fetch(url, page=True, retry=False)
+        assert paged.content == PAGE and cache.stats['revalidated'] == 2, "page fetches should need no session"
+
+        offline = HttpCache(cache_dir, offline=True)
+        replayed = offline.fetch(url)
+        assert replayed.text == first.text and len(EtagHandler.requests_seen) == 3, \
+            "offline fetch should replay the cached page without a request"
+
+        try:
+            offline.fetch(url + 'missing')
+        except OfflineCacheMiss:
+            pass
+        else:
+            raise AssertionError("offline miss should raise OfflineCacheMiss")
+
+        # Evicting everything must also remove the stored body
+        HttpCache(cache_dir, max_size_mb=0).prune()
+        assert os.listdir(os.path.join(cache_dir, 'bodies')) == [], "prune should remove evicted bodies"
+
+    print("✅ HTTP cache downloads, revalidates, replays offline and prunes")
+
+if __name__ == "__main__":
+    test_http_cache()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the shared HTTP client's retry/backoff and user-agent rotation against a local server
+"""
+
+from http_client import HttpClient, UserAgentRotation, load_http_settings
+from http_test_server import QuietHandler, serve
+
+class FlakyHandler(QuietHandler):
+    """/flaky fails twice with 503, /down always does, /blocked refuses browser user agents"""
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+    ports = set()
+
+    def do_GET(self):
+        FlakyHandler.hits[self.path] = FlakyHandler.hits.get(self.path, 0) + 1
+        FlakyHandler.ports.add(self.client_address[1])
+        status = 200
+        if self.path == '/down' or (self.path == '/flaky' and FlakyHandler.hits[self.path] <= 2):
+            status = 503
+        elif self.path == '/limited':
+            status = 429
+        elif self.path == '/blocked' and not self.headers.get('User-Agent', '').startswith('curl'):
+            status = 403
+
+        body = b'ok' if status == 200 else b'error'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+def test_http_client():
+    print("🧪 Testing Shared HTTP Client")
+    print("=" * 40)
+
+    with serve(FlakyHandler) as base:
+        client = HttpClient(max_attempts=3, backoff_seconds=0.01)
+        flaky = client.get(f"{base}/flaky")
+        assert flaky.status_code == 200 and FlakyHandler.hits['/flaky'] == 3, "5xx should be retried until it succeeds"
+
+        limited = client.get(f"{base}/limited")
+        assert limited.status_code == 429 and FlakyHandler.hits['/limited'] == 3, \
+            "a persistent 429 should be given up after max_attempts"
+
+        single = HttpClient(retry_enabled=False).get(f"{base}/limited")
+        assert single.status_code == 429 and FlakyHandler.hits['/limited'] == 4, "disabled retries should send one request"
+        assert len(FlakyHandler.ports) <= 2, "the pooled session should reuse its connection"
+
+        blocked = UserAgentRotation().fetch(f"{base}/blocked", client.get)
+        assert blocked.text == 'ok' and FlakyHandler.hits['/blocked'] == 6, \
+            "rotation should fall back to minimal headers when browsers are refused"
+
+        try:
+            UserAgentRotation().fetch(f"{base}/down", client.get)
+        except Exception:
+            pass
+        assert FlakyHandler.hits['/down'] == 8, "only the first identity should get backoff retries"
+
+    settings = load_http_settings()
+    assert settings['max_attempts'] == 3 and settings['backoff_seconds'] == 5, \
+        "retry attempts and delay should come from orchestrator.retry"
+    assert settings['retry_enabled'] is False, "retries should stay off as configured"
+
+    print("✅ HTTP client retries, rotates user agents and reads its config")
+
+if __name__ == "__main__":
+    test_http_client()
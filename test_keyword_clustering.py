@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test keyword clustering into ad groups: grouping by core, headlines and the written proposals
+"""
+
+import csv
+import os
+import tempfile
+
+from keyword_clustering import KeywordClusterer, propose_ad_groups, read_keywords, write_proposals
+
+KEYWORDS = ['balloon arch hire', 'Balloon Arches Hire Gold Coast', 'best balloon arch hire', 'balloon arch',
+            'balloon garland', 'balloon garlands brisbane', 'cheap balloon garland',
+            'wedding photographer', 'wedding photographers near me', 'roof repairs']
+
+def test_keyword_clustering():
+    print("🧪 Testing Keyword Clustering")
+    print("=" * 40)
+
+    clusterer = KeywordClusterer(ignore_terms=['Gold Coast', 'Brisbane', 'best', 'cheap', 'near me'])
+    proposals = propose_ad_groups(KEYWORDS, clusterer)
+    groups = {name: keywords for name, _, keywords in proposals}
+    headlines = {name: lines for name, lines, _ in proposals}
+    assert sorted(groups.get('Balloon Arch', [])) == [
+        'balloon arch', 'balloon arch hire', 'balloon arches hire gold coast', 'best balloon arch hire'], \
+        "locations, modifiers and plurals should share a group"
+    assert 'balloon garland' in groups.get('Balloon Garland', []), "different products should stay apart"
+    assert groups.get('Unclustered') == ['roof repairs'], "singletons should be listed as unclustered"
+    assert all(len(line) <= 30 for lines in headlines.values() for line in lines), \
+        "headlines should fit the 30 character Google Ads limit"
+    assert headlines.get('Wedding Photographer', [None])[0] == 'Wedding Photographer', \
+        "a group's name should be its first headline"
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        terms_path = os.path.join(work_dir, 'search_terms.csv')
+        with open(terms_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Search term', 'Clicks'])
+            writer.writerows([[keyword, 1] for keyword in KEYWORDS])
+        loaded = read_keywords(terms_path)
+
+        csv_path, report_path = write_proposals(proposals, work_dir, 'Cluster Client', '20250601_090000', len(KEYWORDS))
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        with open(report_path, encoding='utf-8') as f:
+            report = f.read()
+
+    assert loaded == KEYWORDS, "search-term exports should be read by column"
+    assert {row['Keyword'] for row in rows} == {keyword.lower() for keyword in KEYWORDS}, \
+        "the Ads Editor CSV should have every keyword"
+    assert '**Headlines:** Balloon Arch' in report, "the proposal report should list headlines"
+
+    print("✅ Keywords cluster into ad group proposals")
+
+if __name__ == "__main__":
+    test_keyword_clustering()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the TF-IDF keyword engine: distinctive phrases, gaps against the client's site and client settings
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from competitor_research import EnhancedCompetitorResearcher
+from keyword_engine import PhraseMatrix, client_keyword_settings
+
+COMPETITOR_A = ('Website design Gold Coast. Our website design team builds Shopify stores. '
+                'Shopify stores that convert. Conversion rate optimisation for Shopify stores.')
+COMPETITOR_B = ('SEO management and website design. Local SEO management for trades. '
+                'Conversion rate optimisation audits. Conversion rate optimisation that pays.')
+CLIENT = 'We build websites. Website design and branding for growing businesses.'
+
+def test_keyword_engine():
+    print("🧪 Testing TF-IDF Keyword Engine")
+    print("=" * 40)
+
+    matrix = PhraseMatrix({'https://a.example/': COMPETITOR_A, 'https://b.example/': COMPETITOR_B,
+                           'https://client.example/': CLIENT})
+    distinctive_a = [phrase for phrase, _, _ in matrix.top_phrases('https://a.example/', 5)]
+    gaps = {phrase: used_by for phrase, _, used_by in
+            matrix.gaps('https://client.example/', ['https://a.example/', 'https://b.example/'], 10)}
+
+    original_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            research_dir = os.path.join('keyword_client', '02_market_research', 'claude_research')
+            os.makedirs(research_dir)
+            with open(os.path.join(research_dir, 'business_data.json'), 'w', encoding='utf-8') as f:
+                json.dump({'location': 'Gold Coast, Australia', 'service_area': 'Queensland',
+                           'services': 'Website Design, SEO Management', 'website': 'https://client.example/'}, f)
+            settings = client_keyword_settings('keyword_client')
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                researcher = EnhancedCompetitorResearcher('Keyword Client')
+                researcher.page_texts = {'https://a.example/': COMPETITOR_A, 'https://b.example/': COMPETITOR_B,
+                                         'https://client.example/': CLIENT}
+                opportunities = researcher.generate_keyword_opportunities(
+                    [{'competitor_url': 'https://a.example/'}, {'competitor_url': 'https://b.example/'},
+                     {'competitor_url': 'https://down.example/', 'error': 'timed out'}],
+                    ['web design'])
+    finally:
+        os.chdir(original_dir)
+
+    assert 'shopify stores' in distinctive_a, "a repeated competitor phrase should be distinctive"
+    assert gaps.get('conversion rate optimisation') == 2, \
+        "a trigram both competitors use and the client lacks should be a gap"
+    assert 'website design' not in gaps, "phrases the client already uses should not be gaps"
+    assert settings['locations'] == ['Gold Coast', 'Queensland'], "locations should come from business data"
+    assert settings['services'] == ['Website Design', 'SEO Management'], "services should come from business data"
+
+    sources = {o['keyword_opportunity']: o['source'] for o in opportunities}
+    assert sources.get('conversion rate optimisation') == 'Gap vs your site', "gap opportunities should reach the report"
+    assert sources.get('web design gold coast') == 'Location targeting', "location modifiers should use client locations"
+    assert not any('balloon' in keyword for keyword in sources), "no hard-coded balloon services should appear"
+
+    print("✅ Keyword engine scores phrases and finds gaps")
+
+if __name__ == "__main__":
+    test_keyword_engine()
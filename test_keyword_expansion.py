@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the streaming keyword expansion: normalisation, de-duplication and the Google Ads Editor CSV
+"""
+
+import csv
+import os
+import tempfile
+import types
+
+from keyword_expansion import (BloomFilter, ExactSeen, expand_keywords, expansion_size,
+                               normalise_keyword, write_ads_editor_csv)
+
+def test_keyword_expansion():
+    print("🧪 Testing Streaming Keyword Expansion")
+    print("=" * 40)
+
+    keywords = ['Balloon Garland!', 'balloon  garland', 'event styling']
+    services = ['hire', 'installation']
+    locations = ['Gold Coast', 'Brisbane']
+    modifiers = ['best', 'affordable']
+    expansions = expand_keywords(keywords, services, locations, modifiers)
+    assert isinstance(expansions, types.GeneratorType), "expansion should be a lazy generator"
+    pairs = list(expansions)
+    keywords_out = [keyword for _, keyword in pairs]
+
+    assert expansion_size(keywords, services, locations, modifiers) == 3 * 3 * 3 * 3, \
+        "the candidate count should cover every optional slot"
+    assert len(keywords_out) == 2 * 3 * 3 * 3, "duplicate seeds should collapse after normalisation"
+    assert len(set(keywords_out)) == len(keywords_out), "every keyword should be unique"
+    assert normalise_keyword('Hire hire balloons, now!') == 'hire balloons now', \
+        "invalid characters and repeated words should be removed"
+    assert normalise_keyword(' '.join(f"w{i}" for i in range(11))) is None, "over-long keywords should be rejected"
+    assert 'best balloon garland hire gold coast' in keywords_out, "the full combination should be generated"
+    assert ('Balloon Garland Hire', 'balloon garland hire brisbane') in pairs, "ad groups should pair keyword and service"
+
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.add(f"keyword {i}")
+    assert bloom.add('keyword 7') is False, "the Bloom filter should report a repeated keyword"
+    exact = ExactSeen()
+    assert exact.add('a b') and not exact.add('a b'), "the exact filter should detect repeats"
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, '06_campaign_structure', 'keyword_expansion.csv')
+        written = write_ads_editor_csv(iter(pairs), path, 'Client - Search', ['Phrase', 'Exact'])
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    assert written == len(pairs) and len(rows) == 2 * len(pairs), "each keyword should get one CSV row per match type"
+    assert list(rows[0]) == ['Campaign', 'Ad group', 'Keyword', 'Criterion Type'] \
+        and {row['Criterion Type'] for row in rows} == {'Phrase', 'Exact'}, "the CSV should use Google Ads Editor columns"
+
+    print("✅ Keyword expansion streams unique keywords to the Ads Editor CSV")
+
+if __name__ == "__main__":
+    test_keyword_expansion()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test concurrent link checking against a local site: broken links, redirect chains, slow pages and HEAD fallbacks
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from conversion_optimization_agent import ConversionOptimizationAgent
+from html_parser import parse_html
+from http_test_server import QuietHandler, serve
+from link_checker import LINK_STATUS_FILENAME, LinkChecker, link_targets
+
+ROUTES = {
+    '/ok': (200, None),
+    '/missing': (404, None),
+    '/error': (500, None),
+    '/moved': (301, '/moved-again'),
+    '/moved-again': (302, '/ok'),
+    '/loop': (302, '/loop'),
+    '/bad-redirect': (302, 'http://[bad'),
+}
+
+class LinkHandler(QuietHandler):
+    requests_seen = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def respond(self, method):
+        with self.lock:
+            LinkHandler.requests_seen.append((method, self.path))
+            LinkHandler.active += 1
+            LinkHandler.peak = max(LinkHandler.peak, LinkHandler.active)
+        try:
+            if self.path.startswith('/page-'):
+                time.sleep(0.2)
+                status, location = 200, None
+            elif self.path == '/slow':
+                time.sleep(0.6)
+                status, location = 200, None
+            elif self.path == '/no-head':
+                status, location = (405 if method == 'HEAD' else 200), None
+            else:
+                status, location = ROUTES.get(self.path, (404, None))
+            self.send_response(status)
+            if location:
+                self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        finally:
+            with self.lock:
+                LinkHandler.active -= 1
+
+    def do_HEAD(self):
+        self.respond('HEAD')
+
+    def do_GET(self):
+        self.respond('GET')
+
+def test_link_checker():
+    print("🧪 Testing Link Checker")
+    print("=" * 40)
+
+    page = parse_html(
+        '<html><body><a href="/ok">ok</a><a href="/ok#team">ok again</a><a href="missing">gone</a>'
+        '<a href="/moved">moved</a><a href="/slow">slow</a><a href="/no-head">no head</a>'
+        '<a href="mailto:hi@example.com">mail</a><a href="#top">top</a><a href="http://[bad">malformed</a>'
+        '<a href="https://outbound.invalid/">out</a></body></html>')
+
+    with serve(LinkHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        cache_dir = os.path.join(work_dir, 'cache')
+        internal, outbound = link_targets(page, base + '/index.html')
+        assert [url.replace(base, '') for url in internal] == ['/ok', '/missing', '/moved', '/slow', '/no-head'], \
+            "links should be resolved and de-duplicated, skipping malformed ones"
+        assert outbound == ['https://outbound.invalid/'], "outbound links should be split out"
+
+        checker = LinkChecker(cache_dir, slow_seconds=0.5, timeout=2)
+        results = checker.check(internal + [base + '/error', base + '/loop', base + '/bad-redirect'])
+        summary = checker.summarize(results)
+        broken = {link['url'].replace(base, ''): link for link in summary['broken']}
+        assert broken['/missing']['status'] == 404 and broken['/error']['status'] == 500, "4xx and 5xx should be reported"
+        assert ('GET', '/missing') not in LinkHandler.requests_seen, "a 404 answer to HEAD should not be retried with GET"
+        assert broken['/loop']['error'] == 'Redirect loop', "redirect loops should be reported"
+        assert broken['/bad-redirect']['error'] == 'Invalid redirect URL', "a malformed Location should be reported"
+        moved = results[base + '/moved']
+        assert moved['redirects'] == [[301, base + '/moved'], [302, base + '/moved-again']] \
+            and moved['final_url'] == base + '/ok' and moved['status'] == 200, "redirect chains should be followed"
+        assert results[base + '/no-head']['status'] == 200 and ('GET', '/no-head') in LinkHandler.requests_seen, \
+            "a 405 answer to HEAD should fall back to GET"
+        assert [link['url'] for link in summary['slow']] == [base + '/slow'], "slow links should be reported"
+
+        LinkHandler.requests_seen = []
+        rerun = LinkChecker(cache_dir, slow_seconds=0.5)
+        rerun.check(internal)
+        assert LinkHandler.requests_seen == [] and rerun.stats['cached'] == len(internal), \
+            "results should be reused across runs"
+
+        # Saving drops results older than the TTL
+        expiring = LinkChecker(cache_dir, ttl_seconds=60)
+        expiring.results[base + '/old'] = dict(expiring.results[base + '/ok'], checked_at=time.time() - 120)
+        expiring.check([base + '/new'])
+        with open(os.path.join(cache_dir, LINK_STATUS_FILENAME), encoding='utf-8') as f:
+            saved = json.load(f)
+        assert base + '/old' not in saved and base + '/new' in saved and base + '/ok' in saved, \
+            "expired results should be dropped when the file is written"
+
+        LinkHandler.peak = 0
+        many = [f"{base}/page-{i}" for i in range(40)]
+        limited = LinkChecker(cache_dir, max_workers=16, per_host=4)
+        started = time.perf_counter()
+        limited.check(many)
+        assert time.perf_counter() - started < 40 * 0.2 / 2, "links should be checked concurrently"
+        assert LinkHandler.peak <= 4, "the per-host limit should be honoured"
+
+        offline = LinkChecker(os.path.join(work_dir, 'empty'), offline=True)
+        offline_summary = offline.summarize(offline.check([base + '/ok']))
+        assert offline_summary['unchecked'] == 1 and not offline_summary['broken'], \
+            "offline mode should leave unknown links unchecked"
+
+        agent = ConversionOptimizationAgent(cache_dir=cache_dir, check_links=True)
+        agent.url = base + '/index.html'
+        agent.soup = page
+        links = agent.analyze_internal_links()
+        assert links['internal_link_count'] == 5 and links['outbound_link_count'] == 1, "the agent should count links"
+        assert '1 links redirect (1 through redirect chains)' in links['issues'] \
+            and any(issue.startswith('2 broken links') for issue in links['issues']), "the agent should report link health"
+
+        plain = ConversionOptimizationAgent(cache_dir=cache_dir)
+        plain.url, plain.soup = agent.url, page
+        unchecked = plain.analyze_internal_links()
+        assert 'broken_links' not in unchecked and unchecked['issues'] == [], "link checks should be opt-in"
+
+    print("✅ Link checker reports broken, redirected and slow links")
+
+if __name__ == "__main__":
+    test_link_checker()
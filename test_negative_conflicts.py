@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test negative keyword conflict detection: match types, negative levels and the keyword opportunity CSV
+"""
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+from competitor_research import NEGATIVE_SOURCE, EnhancedCompetitorResearcher
+from negative_conflicts import (NegativeMatcher, find_conflicts, historical_positives, load_negatives,
+                                negative_keyword_files, parse_keyword)
+
+ADS_EDITOR_EXPORT = [
+    ['Campaign', 'Ad group', 'Keyword', 'Criterion Type'],
+    ['', '', 'free', 'Negative Phrase'],
+    ['Garlands', '', 'hire balloon', 'Campaign Negative Broad'],
+    ['Garlands', 'Arches', '[balloon arch]', 'Negative Exact'],
+    ['Arches', '', 'kit arch', 'Campaign Negative Phrase'],
+    ['Garlands', 'Garland Hire', 'balloon garland hire', 'Phrase'],
+]
+
+SEARCH_TERMS = [
+    ['Search term', 'Campaign', 'Ad group', 'Clicks', 'Cost', 'Conversions'],
+    ['balloon hire gold coast', 'Garlands', 'Garland Hire', 10, 20.0, 2],
+    ['balloon arch', 'Garlands', 'Arches', 5, 10.0, 1],
+    ['balloon arch', 'Garlands', 'Garland Hire', 5, 10.0, 1],
+    ['free balloon ideas', 'Garlands', 'Garland Hire', 8, 16.0, 0],
+]
+
+def write_csv(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+def test_negative_conflicts():
+    print("🧪 Testing Negative Keyword Conflict Detection")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            write_csv(os.path.join('conflict_client', '06_campaign_structure', 'account_negatives.csv'), ADS_EDITOR_EXPORT)
+            write_csv(os.path.join('conflict_client', '06_campaign_structure', 'shared_negative_list.csv'),
+                      [['Negative keyword'], ['"balloon jobs"'], ['[arch kit]']])
+            write_csv(os.path.join('conflict_client', '05_historical_data', 'search_terms.csv'), SEARCH_TERMS)
+
+            negatives, positives = load_negatives(negative_keyword_files('conflict_client'))
+            matcher = NegativeMatcher(negatives)
+            terms = historical_positives('conflict_client')
+            conflicts = find_conflicts(matcher, positives + terms)
+
+            def blocked_by(text, campaign='', ad_group=''):
+                return sorted(row['negative_keyword'] for row in find_conflicts(
+                    matcher, [{'keyword': text, 'campaign': campaign, 'ad_group': ad_group, 'source': 'test'}]))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                researcher = EnhancedCompetitorResearcher('Conflict Client')
+                opportunities = [
+                    {'keyword_opportunity': 'free', 'source': NEGATIVE_SOURCE, 'frequency': 1, 'suggestion': '', 'priority': 'High'},
+                    {'keyword_opportunity': 'free balloon garland', 'source': 'Gap vs your site', 'frequency': 2, 'suggestion': '', 'priority': 'High'},
+                    {'keyword_opportunity': 'balloon garland', 'source': 'Gap vs your site', 'frequency': 2, 'suggestion': '', 'priority': 'High'},
+                ]
+                blocked = researcher.flag_negative_conflicts(opportunities)
+    finally:
+        os.chdir(original_dir)
+
+    assert parse_keyword('[balloon arch]') == (('balloon', 'arch'), 'exact') and parse_keyword('"balloon jobs"')[1] == 'phrase' \
+        and parse_keyword('balloon', 'Negative Broad')[1] == 'broad', "notation and criterion type should set the match type"
+    assert parse_keyword('3D printing')[0] == ('3d', 'printing') and parse_keyword('café')[0] == ('café',), \
+        "numbers and accented words should be kept whole"
+    digits = NegativeMatcher([dict(zip(('words', 'match_type'), parse_keyword(text)), keyword=text)
+                              for text in ('[bedroom]', '"d printing"')])
+    assert digits.match(parse_keyword('2 bedroom')[0]) == [] and digits.match(parse_keyword('bedroom')[0]) == [0], \
+        "an exact negative should not block a term with an extra number"
+    assert digits.match(parse_keyword('3d printing')[0]) == [], "a phrase negative should not match part of a word"
+    assert [p['keyword'] for p in positives] == ['balloon garland hire'], "Ads Editor positives should be kept apart"
+    assert len(negatives) == 6, "a plain list named as negatives should be read as all negatives"
+    assert blocked_by('cheap balloon jobs') == ['"balloon jobs"'] and blocked_by('jobs balloon') == [], \
+        "phrase negatives should need the words in order"
+    assert blocked_by('balloon hire', 'Garlands') == ['hire balloon'], "broad negatives should match in any order"
+    assert blocked_by('balloon arch', 'Garlands', 'Arches') == ['[balloon arch]'] \
+        and blocked_by('balloon arch hire', 'Garlands', 'Arches') == ['hire balloon'], \
+        "exact negatives should only match the whole term"
+    assert blocked_by('balloon hire', 'Parties') == [], "campaign negatives should stay in their campaign"
+    assert blocked_by('balloon arch', 'Garlands', 'Garland Hire') == [], "ad group negatives should stay in their ad group"
+    assert blocked_by('free balloon ideas', 'Parties', 'Any') == ['free'], "the shared list should apply everywhere"
+    assert {t['keyword'] for t in terms} == {'balloon hire gold coast', 'balloon arch'}, \
+        "only converting search terms should be checked"
+    assert {(c['blocked'], c['ad_group']) for c in conflicts} == {
+        ('balloon hire gold coast', 'Garland Hire'), ('balloon arch', 'Arches'), ('balloon garland hire', 'Garland Hire')}, \
+        "conflicts should be reported per ad group"
+    assert blocked == 1 and opportunities[1]['blocked_by_negative'] == 'free (phrase, all campaigns)' \
+        and opportunities[2]['blocked_by_negative'] == '' and opportunities[0]['blocked_by_negative'] == '', \
+        "only the blocked keyword opportunity should be flagged"
+
+    print("✅ Negative keyword conflicts detected by match type and level")
+
+if __name__ == "__main__":
+    test_negative_conflicts()
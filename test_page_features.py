@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass page feature index against BeautifulSoup's own lookups
+"""
+
+import re
+from bs4 import BeautifulSoup
+from page_features import get_page_features
+
+def test_page_features():
+    print("🧪 Testing Single-Pass Page Features")
+    print("=" * 40)
+
+    with open('reality-events-balloon-garland-landing.html', 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    soup = BeautifulSoup(html, 'html.parser')
+    features = get_page_features(soup)
+
+    assert get_page_features(soup) is features, "features should be cached per soup"
+    assert features.find_all('h1', 'h2', 'h3') == soup.find_all(['h1', 'h2', 'h3']), "headings should come back in document order"
+    assert features.find_all('a') == soup.find_all('a'), "every link should be indexed"
+    assert features.find('meta', attrs={'name': 'viewport'}) == soup.find('meta', attrs={'name': 'viewport'}), \
+        "meta lookup by attribute should match BeautifulSoup"
+    assert features.find('a', href=re.compile('tel', re.I)) == soup.find('a', href=re.compile('tel', re.I)), \
+        "regex attribute lookup should match BeautifulSoup"
+    assert len(soup.find_all('script')) == len(BeautifulSoup(html, 'html.parser').find_all('script')), \
+        "indexing should leave the tree intact"
+    for tag in soup.find_all(['h1', 'h2', 'a', 'p']):
+        assert features.element_text(tag) == tag.get_text(), f"element_text differs for {tag.name}"
+    assert features.element_text(soup.find('body')) == soup.find('body').get_text(), \
+        "element_text should work for elements outside the index"
+    assert features.section_text('p', 'h2') == ' '.join(tag.get_text() for tag in soup.find_all(['p', 'h2'])), \
+        "section_text should join the text of the requested tags"
+    assert features.tokens == features.text.split() and features.word_count == len(features.tokens), \
+        "tokens and word count should come from the visible text"
+
+    hidden = BeautifulSoup('<p>Secure <!-- trust badge --> checkout</p><script>var ssl = 1;</script>'
+                           '<style>.badge {}</style>', 'html.parser')
+    assert [str(string) for string in get_page_features(hidden).strings] == ['Secure ', ' checkout'], \
+        "strings should hold visible text only, without comments or script/style code"
+
+    # Visible text must match get_text() once scripts and styles are gone
+    for element in soup(['script', 'style']):
+        element.decompose()
+    assert features.text == soup.get_text(), "visible text should match get_text() without scripts and styles"
+
+    print("✅ Page features match BeautifulSoup's own lookups")
+
+if __name__ == "__main__":
+    test_page_features()
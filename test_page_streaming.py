@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test size-capped page streaming: early stop at </html>, the byte budget and non-HTML rejection
+"""
+
+import os
+import tempfile
+
+from http_cache import HttpCache
+from http_client import HttpClient, NotHtmlError, STREAM_CHUNK_BYTES
+from http_test_server import QuietHandler, serve
+
+PAGE_END = b'<h1>Landing Page</h1></body></html>'
+FILLER = b'<!-- ' + b'x' * 65000 + b' -->\n'
+
+class StreamingHandler(QuietHandler):
+    """Serves ~26MB pages in 64KB pieces, recording how much got out before the client hung up
+
+    Socket buffers absorb a few MB after the client stops reading, so the checks
+    only require that well under the full page was sent.
+    """
+    sent = {}
+
+    def send_page(self, content_type, pieces, declared_length=None):
+        # Recorded before the headers go out, as the client may hang up as soon as it reads them
+        StreamingHandler.sent[self.path] = 0
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if declared_length:
+            self.send_header('Content-Length', str(declared_length))
+        self.end_headers()
+        try:
+            for piece in pieces:
+                self.wfile.write(piece)
+                self.wfile.flush()
+                StreamingHandler.sent[self.path] += len(piece)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        head = b'<html><head><title>Stream</title></head><body>'
+        if self.path == '/trailing':
+            # Trackers and junk after </html> are never needed for the analysis
+            pieces = [head + PAGE_END] + [FILLER] * 400
+            self.send_page('text/html; charset=utf-8', pieces)
+        elif self.path == '/quoted':
+            script = b'<script>var shell = "</html>";</script>'
+            pieces = [head + script] + [FILLER] * 3 + [PAGE_END]
+            self.send_page('text/html; charset=utf-8', pieces)
+        elif self.path == '/huge':
+            pieces = [head] + [FILLER] * 400
+            self.send_page('text/html', pieces, declared_length=len(head) + len(FILLER) * 400)
+        elif self.path == '/image':
+            self.send_page('image/png', [b'\x89PNG' + b'\x00' * 65000] * 400)
+
+def test_page_streaming():
+    print("🧪 Testing Size-Capped Page Streaming")
+    print("=" * 40)
+
+    with serve(StreamingHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        client = HttpClient(retry_enabled=False, max_page_mb=1)
+        trailing = client.get(f"{base}/trailing", page=True)
+        assert PAGE_END in trailing.content and len(trailing.content) <= 2 * STREAM_CHUNK_BYTES and not trailing.truncated, \
+            "reading should stop at </html>"
+        assert StreamingHandler.sent['/trailing'] < len(FILLER) * 200, "the junk after </html> should not be downloaded"
+
+        quoted = client.get(f"{base}/quoted", page=True)
+        assert quoted.content.endswith(PAGE_END), "a quoted </html> inside a script should not stop the download"
+
+        huge = client.get(f"{base}/huge", page=True)
+        assert len(huge.content) == 1024 * 1024 and huge.truncated, "pages should be cut off at the byte budget"
+        assert '<title>Stream</title>' in huge.text, "truncated pages should still decode"
+
+        try:
+            client.get(f"{base}/image", page=True)
+        except NotHtmlError:
+            pass
+        else:
+            raise AssertionError("non-HTML responses should be rejected")
+        assert StreamingHandler.sent['/image'] < len(FILLER) * 200, "non-HTML bodies should not be downloaded"
+
+        cache = HttpCache(os.path.join(work_dir, 'cache'))
+        cache.fetch(f"{base}/huge", session=client, page=True)
+        replayed = HttpCache(os.path.join(work_dir, 'cache'), offline=True).fetch(f"{base}/huge")
+        assert replayed.truncated and len(replayed.content) == 1024 * 1024, "the cache should remember truncation"
+
+    print("✅ Pages stream with an early stop and a byte budget")
+
+if __name__ == "__main__":
+    test_page_streaming()
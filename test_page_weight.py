@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test the page-weight audit against a local site: asset discovery, HEAD/range sizing, flags and waterfall reports
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+import requests
+
+from competitor_research import EnhancedCompetitorResearcher
+from conversion_optimization_agent import ConversionOptimizationAgent
+from html_parser import parse_html
+from http_test_server import QuietHandler, serve
+from page_weight import AssetSizer, audit_page, page_assets, waterfall_rows
+
+PAGE = '''<html><head>
+<link rel="stylesheet" href="/site.css"><link rel="stylesheet" href="/print.css" media="print">
+<link rel="icon" href="/favicon.ico">
+<script src="/app.js"></script><script src="/later.js" defer></script>
+<script src="{third_party}/tag.js"></script>
+<style>@font-face {{ font-family: Brand; src: url('/brand.woff2') format('woff2'); }}</style>
+</head><body>
+<img src="/hero.png" srcset="/hero.png 1x, /hero-2x.png 2x" alt="Hero">
+<picture><source srcset="/photo.webp" type="image/webp"><img src="/photo.jpg"></picture>
+<img src="data:image/gif;base64,R0lGOD"><script src="/app.js"></script>
+<img src="http://[bad" srcset="//[bad/2x.png 2x"><link rel="alternate" href="http://[bad/feed.woff">
+</body></html>'''
+
+# path -> (size, HEAD sends Content-Length, server honours Range)
+ASSETS = {
+    '/site.css': (20 * 1024, True, True),
+    '/print.css': (2 * 1024, True, True),
+    '/favicon.ico': (4 * 1024, True, True),
+    '/app.js': (100 * 1024, False, True),
+    '/later.js': (30 * 1024, False, False),
+    '/tag.js': (80 * 1024, True, True),
+    '/brand.woff2': (40 * 1024, True, True),
+    '/hero.png': (300 * 1024, True, True),
+    '/hero-2x.png': (900 * 1024, True, True),
+    '/photo.webp': (50 * 1024, True, True),
+    '/photo.jpg': (120 * 1024, True, True),
+}
+
+class AssetHandler(QuietHandler):
+    requests_seen = []
+
+    def send_asset(self, head):
+        AssetHandler.requests_seen.append(self.path)
+        if self.path not in ASSETS:
+            self.send_response(404)
+            self.end_headers()
+            return
+        size, head_length, ranges = ASSETS[self.path]
+        content_type = {'.css': 'text/css', '.js': 'application/javascript', '.png': 'image/png', '.jpg': 'image/jpeg',
+                        '.webp': 'image/webp', '.ico': 'image/x-icon', '.woff2': 'font/woff2'}[os.path.splitext(self.path)[1]]
+        if not head and ranges and self.headers.get('Range') == 'bytes=0-0':
+            self.send_response(206)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Range', f'bytes 0-0/{size}')
+            self.send_header('Content-Length', '1')
+            self.end_headers()
+            self.wfile.write(b'x')
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if head_length or not head:
+            if head_length:
+                self.send_header('Content-Length', str(size))
+        self.end_headers()
+        if not head:
+            self.wfile.write(b'x' * size)
+
+    def do_HEAD(self):
+        self.send_asset(head=True)
+
+    def do_GET(self):
+        self.send_asset(head=False)
+
+def test_page_weight():
+    print("🧪 Testing Page Weight Audit")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    with serve(AssetHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        third_party = base.replace('127.0.0.1', 'localhost')
+        html = PAGE.format(third_party=third_party)
+        soup = parse_html(html)
+        os.chdir(work_dir)
+        try:
+            cache_dir = os.path.join('weight_client', '.http_cache')
+            assets = page_assets(soup, base + '/')
+            audit = audit_page(soup, base + '/', len(html), AssetSizer(cache_dir))
+            rows = waterfall_rows(audit)
+
+            AssetHandler.requests_seen = []
+            offline_audit = audit_page(soup, base + '/', len(html), AssetSizer(cache_dir, offline=True))
+            offline_requests = len(AssetHandler.requests_seen)
+
+            agent = ConversionOptimizationAgent(cache_dir=cache_dir, audit_assets=True)
+            agent.url, agent.soup, agent.html_bytes = base + '/', soup, len(html)
+            images = agent.analyze_images()
+            weight = agent.analyze_page_weight()
+            static = ConversionOptimizationAgent(cache_dir=cache_dir)
+            static.url, static.soup = base + '/', soup
+            static_images = static.analyze_images()
+            static_weight = static.analyze_page_weight()
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                researcher = EnhancedCompetitorResearcher('Weight Client')
+                response = requests.get(base + '/hero.png')
+                response._content = html.encode('utf-8')
+                fields = researcher.measure_page_weight(base + '/', soup, response)
+                report_path = researcher.generate_page_weight_report([{'competitor_url': base + '/'}])
+                insights = researcher.generate_competitive_insights([dict(fields, competitor_url=base + '/')])
+            with open(report_path, encoding='utf-8') as f:
+                report = f.read()
+        finally:
+            os.chdir(original_dir)
+
+    by_path = {asset['url'].replace(base, '').replace(third_party, ''): asset for asset in audit['assets']}
+    expected_total = len(html) + sum(ASSETS[path][0] for path in ASSETS if path not in ('/hero-2x.png', '/photo.webp'))
+
+    assert {asset['type'] for asset in assets} == {'stylesheet', 'image', 'script', 'font'} and len(assets) == len(ASSETS), \
+        "every asset type should be discovered, skipping malformed references"
+    assert by_path['/hero.png']['bytes'] == 300 * 1024, "HEAD sizes should be read"
+    assert by_path['/app.js']['bytes'] == 100 * 1024, "a range request should size assets without Content-Length"
+    assert by_path['/later.js']['bytes'] == 30 * 1024, "the body should be counted when ranges are ignored"
+    assert by_path['/hero-2x.png']['alternate'] and audit['total_bytes'] == expected_total, \
+        "srcset alternates should be sized but not counted"
+    assert [a['url'] for a in audit['oversized_images']] == [base + '/hero-2x.png', base + '/hero.png'], \
+        "oversized images should be flagged"
+    assert {a['url'].replace(base, '') for a in audit['legacy_images']} == {'/hero-2x.png', '/hero.png', '/photo.jpg'}, \
+        "legacy formats should be flagged, WebP and icons not"
+    assert {a['url'].replace(base, '').replace(third_party, '') for a in audit['render_blocking']} \
+        == {'/site.css', '/app.js', '/tag.js'}, "render-blocking resources should be found"
+    assert audit['third_party_scripts'][0]['host'] == third_party.split('//')[1] \
+        and audit['third_party_scripts'][0]['estimated_ms'] == 80, "third-party script cost should be estimated"
+    assert rows[0]['type'] == 'document' and len(rows) == len(assets) + 1, "the waterfall should list the document first"
+    assert all(row['bar'] == '' for row in rows if row['resource'].endswith(('hero-2x.png', 'photo.webp'))) \
+        and rows[-1]['bar'].endswith('█') and len(rows[-1]['bar']) == 30, "the waterfall should reach the full weight"
+    assert offline_requests == 0 and offline_audit['total_bytes'] == audit['total_bytes'], \
+        "sizes should be cached for offline runs"
+    assert '2 images over 200KB (largest 900KB)' in images['issues'] \
+        and '3 images not served as WebP/AVIF' in images['issues'], "the agent should flag measured images"
+    assert any('render-blocking' in issue for issue in weight['issues']) \
+        and any(issue.startswith('1 third-party scripts add 80KB') for issue in weight['issues']), \
+        "the agent should report page weight"
+    assert 'Compress images to under 200KB each' in static_images['recommendations'] \
+        and not any('KB' in issue for issue in static_images['issues']) \
+        and static_weight['unmeasured_assets'] == static_weight['asset_count'], \
+        "static advice should be given without measurements"
+    assert fields['page_size_kb'] == round(expected_total / 1024, 1) and fields['oversized_images'] == 2, \
+        "competitor page size should include assets"
+    assert '| 0 | document |' in report and 'Cumulative weight' in report, "the competitor waterfall report should be written"
+    assert any(i['insight_type'] == 'Page Weight' for i in insights), "page weight should reach the competitive insights"
+
+    print("✅ Page weight audit sizes, flags and reports assets")
+
+if __name__ == "__main__":
+    test_page_weight()
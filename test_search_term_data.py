@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test historical report ingestion: export layouts, locale numbers and the memory-mapped cache
+"""
+
+import codecs
+import os
+import tempfile
+
+import numpy as np
+
+from search_term_data import (ReportTable, detect_decimal_separator, historical_reports, ingest,
+                              load_history, load_report, parse_numbers)
+
+GOOGLE_EXPORT = '''Search terms report
+"1 June 2025 - 30 June 2025"
+Search term,Match type,Added/Excluded,Campaign,Ad group,Clicks,Impr.,CTR,Currency code,Avg. CPC,Cost,Conversions
+balloon garland gold coast,Phrase match,None,Search,Garlands,12,340,3.53%,AUD,1.25,"1,015.00",2.00
+free balloon ideas,Broad match,None,Search,Garlands,4,"1,200",0.33%,AUD,0.90,3.60,0.00
+balloon garland gold coast,Phrase match,None,Search,Garlands,3,50,6.00%,AUD,1.00,3.00,1.00
+Total: Search terms,,,,,19,"1,590",,,,"1,021.60",3.00
+'''
+
+MICROSOFT_EXPORT = '''Report Name: Search query report
+Report Time: 01/06/2025 to 30/06/2025
+
+Campaign name\tAd group name\tSearch term\tImpressions\tClicks\tSpend\tConversions
+Suche\tGirlanden\tballongirlande hamburg\t1.250\t40\t1.234,56 €\t3
+Suche\tGirlanden\tballon deko\t80\t2\t--\t0
+©2025 Microsoft Corporation. All rights reserved.
+'''
+
+def test_search_term_data():
+    print("🧪 Testing Historical Report Ingestion")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as client_dir:
+        history_dir = os.path.join(client_dir, '05_historical_data')
+        os.makedirs(history_dir)
+        google_path = os.path.join(history_dir, 'google_search_terms.csv')
+        with open(google_path, 'w', encoding='utf-8') as f:
+            f.write(GOOGLE_EXPORT)
+        microsoft_path = os.path.join(history_dir, 'microsoft_search_terms.csv')
+        with open(microsoft_path, 'wb') as f:
+            f.write(codecs.BOM_UTF16_LE + MICROSOFT_EXPORT.encode('utf-16-le'))
+
+        google = ingest(google_path, chunk_rows=2)
+        assert google.rows == 3, "title and total rows should be skipped"
+        assert {'search_term', 'campaign', 'ad_group', 'clicks', 'cost'} <= set(google.columns), \
+            "columns should be mapped to canonical names"
+        assert float(google['cost'][0]) == 1015.0 and float(google['impressions'][1]) == 1200.0, \
+            "thousands separators should be parsed"
+        assert google['clicks'].tolist() == [12.0, 4.0, 3.0], "chunks should concatenate in order"
+        assert google['search_term'].codes.tolist() == [0, 1, 0] and google['search_term'][2] == 'balloon garland gold coast', \
+            "text columns should be dictionary encoded"
+
+        cached = load_report(google_path)
+        assert isinstance(cached, ReportTable) and isinstance(cached['cost'], np.memmap), "a cache hit should be memory-mapped"
+
+        microsoft = load_report(microsoft_path)
+        assert microsoft.rows == 2 and microsoft['search_term'][0] == 'ballongirlande hamburg', \
+            "UTF-16 tab-separated exports should be read"
+        assert float(microsoft['cost'][0]) == 1234.56 and float(microsoft['impressions'][0]) == 1250.0, \
+            "decimal commas and currency symbols should be parsed"
+        assert float(microsoft['cost'][1]) == 0.0, "placeholder dashes should read as zero"
+
+        assert historical_reports(client_dir) == sorted([google_path, microsoft_path]), "the cache folder is not a report"
+        assert len(load_history(client_dir, kind='search_terms')) == 2, "history should load every export"
+
+    assert detect_decimal_separator(['1.234,56']) == ',' and detect_decimal_separator(['1,234']) == '.' \
+        and detect_decimal_separator(['12,5']) == ',', "the decimal separator should be detected from the values"
+    assert parse_numbers(['12.5%', 'AUD 3.10']).tolist() == [12.5, 3.1], "percentages and stray text should be stripped"
+
+    print("✅ Historical reports ingest into the memory-mapped cache")
+
+if __name__ == "__main__":
+    test_search_term_data()
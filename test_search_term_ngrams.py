@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test search-term n-gram aggregation, negative keyword candidates and their use in the competitor reports
+"""
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+from competitor_research import NEGATIVE_SOURCE, EnhancedCompetitorResearcher
+from search_term_data import ingest
+from search_term_ngrams import NgramStats, load_ngram_stats, write_ngram_report
+
+SEARCH_TERMS = [
+    # term, clicks, cost, conversions
+    ('balloon garland hire', 20, 40.0, 4),
+    ('free balloon garland ideas', 15, 30.0, 0),
+    ('diy balloon garland free free', 10, 25.0, 0),
+    ('balloon arch hire', 8, 16.0, 1),
+    ('balloon garland hire', 5, 10.0, 1),
+    ('balloon jobs', 2, 4.0, 0),
+    ('iphone 15 case', 1, 3.0, 0),
+]
+
+def write_export(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Search term', 'Campaign', 'Ad group', 'Clicks', 'Impr.', 'Cost', 'Conversions'])
+        for term, clicks, cost, conversions in rows:
+            writer.writerow([term, 'Search', 'Garlands', clicks, clicks * 10, cost, conversions])
+
+def test_search_term_ngrams():
+    print("🧪 Testing Search Term N-gram Analysis")
+    print("=" * 40)
+
+    original_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            history_dir = os.path.join('ngram_client', '05_historical_data')
+            os.makedirs(history_dir)
+            write_export(os.path.join(history_dir, 'june.csv'), SEARCH_TERMS[:4])
+            write_export(os.path.join(history_dir, 'july.csv'), SEARCH_TERMS[4:])
+
+            stats = load_ngram_stats('ngram_client')
+            rows = {stats.ngram(i): stats.row(i) for i in range(len(stats))}
+            candidates = stats.negative_candidates(min_cost=20, min_clicks=5)
+            report_path = os.path.join('ngram_client', '02_market_research', 'search_term_ngrams.csv')
+            write_ngram_report(stats, report_path, min_cost=20, min_clicks=5)
+            with open(report_path, newline='', encoding='utf-8') as f:
+                report = list(csv.DictReader(f))
+            single = NgramStats([ingest(os.path.join(history_dir, 'june.csv'))], ngram_range=(2, 2))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                researcher = EnhancedCompetitorResearcher('Ngram Client')
+                researcher.negative_candidates = candidates
+                researcher.page_texts = {
+                    'https://a.example/': 'Free balloon ideas and balloon styling. Free balloon ideas weekly.',
+                    'https://b.example/': 'Balloon styling for events.'}
+                opportunities = researcher.generate_keyword_opportunities(
+                    [{'competitor_url': 'https://a.example/'}, {'competitor_url': 'https://b.example/'}],
+                    ['balloon garland'])
+                insights = researcher.generate_competitive_insights([{'competitor_url': 'https://a.example/'}])
+    finally:
+        os.chdir(original_dir)
+
+    assert rows['balloon garland hire']['cost'] == 50.0 and rows['balloon garland hire']['search_terms'] == 1, \
+        "metrics should be summed across exports"
+    assert rows['balloon']['cost'] == 125.0 and rows['balloon']['clicks'] == 60, \
+        "unigram totals should cover every term containing the word"
+    assert rows['free']['search_terms'] == 2 and rows['free']['cost'] == 55.0, "repeated words should count a term once"
+    assert rows['free balloon garland']['conversions'] == 0.0, "trigrams should be aggregated"
+    assert all(single.orders == 2), "the n-gram range should be respected"
+    assert 'iphone 15' in rows and '15 case' in rows and 'iphone case' not in rows, \
+        "numbers should be kept so every n-gram appears in a search term"
+
+    flagged = {row['ngram'] for row in candidates}
+    assert candidates[0]['ngram'] == 'free' and candidates[0]['cost'] == 55.0, "spend without conversions should be flagged"
+    assert not any('free' in row['ngram'] for row in candidates[1:]), "phrases containing a flagged n-gram should be skipped"
+    assert 'garland' not in flagged, "converting n-grams should never be flagged"
+    assert 'jobs' not in flagged, "spend below the threshold should be ignored"
+    assert report[0]['ngram'] == 'free' and report[0]['negative_candidate'] == 'True', "the report should list candidates first"
+
+    suggested = [o['keyword_opportunity'] for o in opportunities]
+    assert opportunities[0]['source'] == NEGATIVE_SOURCE, "negatives should lead the keyword opportunities"
+    assert not any('free' in keyword for keyword in suggested[1:]), "competitor phrases with a negative should be suppressed"
+    assert any(i['insight_type'] == 'Search Term Waste' for i in insights), "waste should reach the competitive insights"
+
+    print("✅ Search-term n-grams flag wasted spend")
+
+if __name__ == "__main__":
+    test_search_term_ngrams()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test the compiled tool signature matcher
+"""
+
+from signature_matcher import get_signature_registry, required_literal
+
+def test_signature_matcher():
+    print("🧪 Testing Compiled Signature Matcher")
+    print("=" * 40)
+
+    registry = get_signature_registry()
+
+    html = """
+    <script src="https://www.googletagmanager.com/gtag/js"></script>
+    <script>gtag('config', 'AW-123456');</script>
+    <script src="//widget.intercom.io/widget/abc"></script>
+    <link href="/wp-content/themes/site.css"><script type="application/ld+json">{}</script>
+    """
+
+    assert required_literal(r'mc\.us\d+\.list-manage') == '.list-manage', "longest literal should anchor the regex"
+    assert required_literal(r'a|b') is None, "alternations have no required literal"
+    assert registry.detect(html, 'tracking') == ['Google Analytics', 'Google Ads', 'Intercom'], \
+        "tracking tools should be reported in registry order"
+    assert registry.detect(html, 'third_party') == ['Live Chat'], "overlapping signatures should report one tool"
+    assert registry.detect(html, 'cms') == ['WordPress'], "WordPress should be detected from its theme path"
+    assert registry.detect('ITEMPROP', 'structured_data') == [], "schema signatures should be case-sensitive"
+    assert registry.detect('', 'tracking') == [], "an empty page has no tools"
+
+    print("✅ Signature matcher detects tools in registry order")
+
+if __name__ == "__main__":
+    test_signature_matcher()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the document exporter: one markdown parse feeding the HTML, Word and PDF backends, serially or in worker processes
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+import simple_document_exporter
+from fixed_simple_converter import FixedSimpleDocumentExporter
+from simple_document_exporter import SimpleDocumentExporter, parse_markdown, DOCX_AVAILABLE, PDF_AVAILABLE
+
+MARKDOWN = '''# Testing Framework <2025>
+
+**Client:** Balloon Garlands
+
+## Month 1
+- Test **headline** variants
+- Keep forms under 5 fields
+1. Launch **Exact** match campaign
+
+| Test | Metric |
+|------|--------|
+| **Hero** | CTR |
+| Form | CVR |
+
+***
+#### Notes
+Plain paragraph with a <tag>.
+'''
+
+def test_simple_document_exporter():
+    print("🧪 Testing Document Exporter")
+    print("=" * 40)
+
+    parses = []
+    parse = simple_document_exporter.parse_markdown
+
+    def counted_parse(markdown_content):
+        parses.append(markdown_content)
+        return parse(markdown_content)
+
+    blocks = parse_markdown(MARKDOWN)
+    with tempfile.TemporaryDirectory() as work_dir:
+        exporter = SimpleDocumentExporter('Balloon Garlands', output_dir=work_dir, document_title='Garland Tests')
+        simple_document_exporter.parse_markdown = counted_parse
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                serial = exporter.export_formats(MARKDOWN, output_basename='serial', parallel=False)
+                parallel = exporter.export_formats(MARKDOWN, output_basename='parallel', parallel=True)
+                both = exporter.export_both_formats(MARKDOWN)
+        finally:
+            simple_document_exporter.parse_markdown = parse
+
+        outputs = {}
+        for name, results in (('serial', serial), ('parallel', parallel)):
+            with open(results['html'], encoding='utf-8') as f:
+                outputs[name] = f.read()
+        sizes = {name: os.path.getsize(path) for name, path in serial.items() if not name.endswith(('_info', '_error'))}
+
+        # A table made only of separator lines has no rows to render
+        separators = '# Notes\n|---|---|\n|---|---|\nAfter the table\n'
+        assert [block['type'] for block in parse_markdown(separators)] == ['heading', 'paragraph', 'blank'], \
+            "tables without rows should be left out"
+        with contextlib.redirect_stdout(io.StringIO()):
+            empty_table = exporter.export_formats(separators, output_basename='separators', parallel=False)
+        assert not any(name.endswith('_error') for name in empty_table), f"every backend should export: {empty_table}"
+
+        if DOCX_AVAILABLE:
+            from docx import Document
+            doc = Document(serial['word'])
+            styles = [(paragraph.style.name, paragraph.text) for paragraph in doc.paragraphs if paragraph.text]
+            assert doc.core_properties.title == 'Garland Tests', "the Word document should carry the document title"
+            assert ('Framework Title', 'Testing Framework <2025>') in styles \
+                and ('List Bullet', 'Test headline variants') in styles \
+                and ('List Number', 'Launch Exact match campaign') in styles \
+                and ('Normal', '***') in styles, "Word styles should be applied per block"
+            assert [cell.text for cell in doc.tables[0].rows[1].cells] == ['**Hero**', 'CTR'], \
+                "Word table cells should keep their text"
+        else:
+            assert 'word_info' in serial, "a missing Word backend should be reported"
+
+        # The fixed converter writes under the working directory
+        original_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fixed_html = FixedSimpleDocumentExporter('Balloon Garlands').export_to_html(MARKDOWN, 'fixed.html')
+            with open(fixed_html, encoding='utf-8') as f:
+                assert '<title>Balloon Garlands - Testing Framework</title>' in f.read(), \
+                    "the fixed converter should export with its title"
+        finally:
+            os.chdir(original_dir)
+
+    expected = {'html', 'word', 'pdf'} - ({'word'} if not DOCX_AVAILABLE else set()) - ({'pdf'} if not PDF_AVAILABLE else set())
+    html = outputs['serial']
+    assert len(parses) == 3, "markdown should be parsed once per export"
+    assert [block['type'] for block in blocks if block['type'] != 'blank'] == [
+        'heading', 'paragraph', 'heading', 'bullet', 'bullet', 'numbered', 'table', 'paragraph', 'heading', 'paragraph'], \
+        "blocks should cover every construct"
+    assert set(sizes) == expected and all(size > 0 for size in sizes.values()), "every available format should be written"
+    assert set(parallel) == set(serial) and outputs['parallel'] == html, "worker processes should render the same files"
+    assert set(both) - {'word_info'} == {'html', 'word'} - ({'word'} if not DOCX_AVAILABLE else set()), \
+        "both formats should still be exported"
+    assert '<h1 class="main-title">Testing Framework &lt;2025&gt;</h1>' in html and 'with a &lt;tag&gt;.' in html \
+        and '<title>Garland Tests</title>' in html, "HTML should be escaped"
+    assert '<li>Test <strong>headline</strong> variants</li>' in html and '<td><strong>Hero</strong></td>' in html, \
+        "bold runs should be rendered"
+
+    print("✅ Document exporter renders every format from one parse")
+
+if __name__ == "__main__":
+    test_simple_document_exporter()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the multi-page site crawler against a small local site
+"""
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+import conversion_optimization_agent
+import site_crawler
+from html_parser import parse_html
+from http_test_server import QuietHandler, serve
+from site_crawler import SiteCrawler, canonicalize_url
+
+PAGE = '<html><head><title>{title}</title>{canonical}</head><body><h1>{title}</h1>{links}<img src="x.png"></body></html>'
+
+def build_site():
+    """Home links to five services and a malformed URL; each service links to the next and to a duplicate of home"""
+    pages = {}
+    services = [f'/service-{i}' for i in range(5)]
+    pages['/'] = PAGE.format(title='Home', canonical='', links=''.join(
+        f'<a href="{path}#top">{path}</a>' for path in services) + '<a href="http://[bad">bad</a><img src="//[bad/x.png">')
+    for i, path in enumerate(services):
+        links = f'<a href="{services[(i + 1) % 5]}">next</a><a href="/?utm_source=nav">home</a><a href="/private/x">x</a>'
+        pages[path] = PAGE.format(title=f'Service {i}', canonical='', links=links)
+    pages['/private/x'] = PAGE.format(title='Private', canonical='', links='')
+    pages['/old-home'] = PAGE.format(title='Home', canonical='<link rel="canonical" href="/">', links='')
+    pages['/robots.txt'] = 'User-agent: *\nDisallow: /private/\n'
+    pages['/sitemap.xml'] = ('<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                             '<url><loc>http://[bad</loc></url><url><loc>{base}/old-home</loc></url></urlset>')
+    return pages
+
+class SiteHandler(QuietHandler):
+    pages = {}
+    base = ''
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path not in self.pages:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.pages[path].replace('{base}', self.base).encode('utf-8')
+        self.send_response(200)
+        content_type = 'text/plain' if path.endswith('.txt') else 'application/xml' if path.endswith('.xml') else 'text/html'
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def test_site_crawler():
+    print("🧪 Testing Site Crawler")
+    print("=" * 40)
+
+    assert canonicalize_url('HTTP://Example.com:80/a//b?utm_source=x&b=2&a=1#frag') == 'http://example.com/a/b?a=1&b=2', \
+        "canonical form should drop default ports, tracking parameters and fragments"
+    assert canonicalize_url('http://[bad') is None and canonicalize_url('//[bad/x', 'http://example.com/') is None, \
+        "malformed URLs should be treated as not crawlable"
+
+    SiteHandler.pages = build_site()
+    with serve(SiteHandler) as base, tempfile.TemporaryDirectory() as work_dir:
+        SiteHandler.base = base
+        crawler = SiteCrawler(base + '/', max_pages=20, max_depth=3, max_workers=3,
+                              cache_dir=os.path.join(work_dir, 'cache'))
+        pages = crawler.crawl()
+        urls = {page['url'] for page in pages}
+        assert len(urls) == len(pages) == 7, f"every page should be crawled once, got {sorted(urls)}"
+        assert base + '/old-home' in urls, "sitemap URLs should be discovered despite a malformed <loc>"
+        assert not any(page['error'] for page in pages), "malformed links and assets should not fail a page"
+        assert not any('/private/' in url for url in urls), "robots.txt disallow rules should be respected"
+        assert [page['url'] for page in pages if page['duplicate_of']] == [base + '/old-home'], \
+            "pages whose canonical points elsewhere should be marked duplicates"
+
+        links = crawler.extract_links(parse_html('<a href="http://[bad">x</a><a href="/service-1">y</a>'), base + '/')
+        assert links == [base + '/service-1'], "malformed hrefs should be skipped during link extraction"
+
+        limited = SiteCrawler(base + '/', max_pages=3, cache_dir=os.path.join(work_dir, 'cache'))
+        assert len(limited.crawl()) == 3, "the page budget should be honoured"
+
+        ranked = crawler.rollup()
+        assert ranked[0]['page_count'] == 6, "issues should be ranked by pages affected"
+        assert any('alt text' in entry['issue'] and entry['page_count'] == 6 for entry in ranked), \
+            "the missing alt text issue should be rolled up across pages"
+
+        report_path, pages_path = crawler.save_reports(work_dir)
+        assert os.path.exists(report_path) and os.path.exists(pages_path), "site reports should be written"
+
+        # The agent's --crawl passes its cache, offline and audit options through to the crawler
+        options = []
+        crawler_class = site_crawler.SiteCrawler
+        site_crawler.SiteCrawler = lambda *args, **kwargs: options.append(kwargs) or crawler_class(*args, **kwargs)
+        original_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    conversion_optimization_agent.main(['--crawl', base + '/', '--cache-dir', 'cache', '--offline',
+                                                        '--no-link-check', '--no-asset-audit'])
+                except SystemExit as e:
+                    assert e.code == 0, "the crawl should finish"
+            with contextlib.redirect_stderr(io.StringIO()):
+                try:
+                    conversion_optimization_agent.main(['--crawl', base + '/', '--format', 'html'])
+                except SystemExit as e:
+                    assert e.code == 2, "--format should be rejected with --crawl"
+                else:
+                    raise AssertionError("--format should be rejected with --crawl")
+        finally:
+            os.chdir(original_dir)
+            site_crawler.SiteCrawler = crawler_class
+        replayed = max(name for name in os.listdir(work_dir) if name.endswith('_pages.csv'))
+        with open(os.path.join(work_dir, replayed), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(options) == 1 and options[0]['cache_dir'] == 'cache' and options[0]['offline'] \
+            and not options[0]['check_links'] and not options[0]['audit_assets'], "crawl options should be passed through"
+        assert len(rows) == 7 and not any(row['error'] for row in rows), "the crawl should replay the given cache"
+
+    print("✅ Site crawler discovers, de-duplicates and ranks pages")
+
+if __name__ == "__main__":
+    test_site_crawler()
@@ -2,13 +2,20 @@
 
 /**
  * PPC Tracking Verification Tool
- * Usage: node verify_tracking.js <website_url>
+ * Usage: node verify_tracking.js <website_url> [--cache-dir DIR] [--offline]
  * Example: node verify_tracking.js https://example.com
+ *
+ * With --cache-dir, pages are cached in the same layout as http_cache.py
+ * (entries/<sha256 of url>.json + bodies/<sha256 of body>) and revalidated
+ * with ETag/Last-Modified. --offline replays the cache without any requests.
  */
 
 const https = require('https');
 const http = require('http');
 const url = require('url');
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
 
 // ANSI color codes for better output
 const colors = {
@@ -20,12 +27,27 @@ const colors = {
     bold: '\x1b[1m'
 };
 
-// Get website URL from command line arguments
-const websiteUrl = process.argv[2];
+// Get website URL and cache options from command line arguments
+const args = process.argv.slice(2);
+let websiteUrl = null;
+let cacheDir = null;
+let offline = false;
+for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--cache-dir') {
+        cacheDir = args[++i];
+    } else if (args[i] === '--offline') {
+        offline = true;
+    } else if (!websiteUrl) {
+        websiteUrl = args[i];
+    }
+}
+if (offline && !cacheDir) {
+    cacheDir = '.http_cache';
+}
 
 if (!websiteUrl) {
     console.error(`${colors.red}❌ Error: Please provide a website URL${colors.reset}`);
-    console.log(`${colors.blue}Usage: node verify_tracking.js <website_url>${colors.reset}`);
+    console.log(`${colors.blue}Usage: node verify_tracking.js <website_url> [--cache-dir DIR] [--offline]${colors.reset}`);
     console.log(`${colors.blue}Example: node verify_tracking.js https://example.com${colors.reset}`);
     process.exit(1);
 }
@@ -45,29 +67,34 @@ console.log(`${colors.blue}Website: ${websiteUrl}${colors.reset}`);
 console.log('═'.repeat(60));
 
 // Function to fetch webpage content
-function fetchWebpage(url) {
+function fetchWebpage(url, extraHeaders = {}) {
     return new Promise((resolve, reject) => {
         const client = url.startsWith('https://') ? https : http;
+        const startTime = Date.now();
         
         const options = {
             method: 'GET',
             headers: {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                ...extraHeaders
             }
         };
 
         const req = client.request(url, options, (res) => {
-            let data = '';
+            const chunks = [];
             
             res.on('data', (chunk) => {
-                data += chunk;
+                chunks.push(chunk);
             });
             
             res.on('end', () => {
+                const raw = Buffer.concat(chunks);
                 resolve({
                     statusCode: res.statusCode,
                     headers: res.headers,
-                    body: data
+                    body: raw.toString('utf8'),
+                    raw: raw,
+                    elapsedSeconds: (Date.now() - startTime) / 1000
                 });
             });
         });
@@ -85,6 +112,123 @@ function fetchWebpage(url) {
     });
 }
 
+// Cache helpers (layout shared with http_cache.py)
+function sha256(data) {
+    return crypto.createHash('sha256').update(data).digest('hex');
+}
+
+function writeAtomic(filePath, data) {
+    fs.mkdirSync(path.dirname(filePath), { recursive: true });
+    const tmpPath = path.join(path.dirname(filePath), `.tmp-${process.pid}-${crypto.randomBytes(6).toString('hex')}`);
+    fs.writeFileSync(tmpPath, data);
+    fs.renameSync(tmpPath, filePath);
+}
+
+function entryPath(pageUrl) {
+    return path.join(cacheDir, 'entries', `${sha256(pageUrl)}.json`);
+}
+
+function loadCacheEntry(pageUrl) {
+    try {
+        const entry = JSON.parse(fs.readFileSync(entryPath(pageUrl), 'utf8'));
+        if (!fs.existsSync(path.join(cacheDir, 'bodies', entry.body_sha256 || ''))) {
+            return null;
+        }
+        return entry;
+    } catch (error) {
+        return null;
+    }
+}
+
+function cachedResponse(entry) {
+    // Python stores original header casing; the analysers expect Node's lowercase keys
+    const headers = {};
+    for (const [name, value] of Object.entries(entry.headers || {})) {
+        headers[name.toLowerCase()] = value;
+    }
+    const raw = fs.readFileSync(path.join(cacheDir, 'bodies', entry.body_sha256));
+    return { statusCode: entry.status_code || 200, headers: headers, body: raw.toString('utf8'), fromCache: true };
+}
+
+function charsetFromHeaders(headers) {
+    const contentType = headers['content-type'] || '';
+    const match = contentType.match(/charset=["']?([^"';\s]+)/i);
+    if (match) {
+        return match[1];
+    }
+    // Same default requests applies to text responses without a charset
+    return contentType.includes('text') ? 'ISO-8859-1' : null;
+}
+
+function storeCacheEntry(pageUrl, response, previous) {
+    const bodySha = sha256(response.raw);
+    const bodyPath = path.join(cacheDir, 'bodies', bodySha);
+    if (!fs.existsSync(bodyPath)) {
+        writeAtomic(bodyPath, response.raw);
+    }
+    const now = Date.now() / 1000;
+    const entry = {
+        url: pageUrl,
+        final_url: pageUrl,
+        status_code: response.statusCode,
+        headers: response.headers,
+        encoding: charsetFromHeaders(response.headers),
+        elapsed_seconds: response.elapsedSeconds,
+        etag: response.headers['etag'] || null,
+        last_modified: response.headers['last-modified'] || null,
+        body_sha256: bodySha,
+        size: response.raw.length,
+        stored_at: previous && previous.body_sha256 === bodySha ? previous.stored_at : now,
+        validated_at: now,
+        accessed_at: now
+    };
+    writeAtomic(entryPath(pageUrl), JSON.stringify(entry, null, 2));
+}
+
+async function fetchWithCache(pageUrl) {
+    if (!cacheDir) {
+        return fetchWebpage(pageUrl);
+    }
+
+    const entry = loadCacheEntry(pageUrl);
+    if (offline) {
+        if (!entry) {
+            throw new Error(`${pageUrl} is not in the offline cache (${cacheDir})`);
+        }
+        entry.accessed_at = Date.now() / 1000;
+        writeAtomic(entryPath(pageUrl), JSON.stringify(entry, null, 2));
+        return cachedResponse(entry);
+    }
+
+    const validators = {};
+    if (entry && entry.etag) {
+        validators['If-None-Match'] = entry.etag;
+    }
+    if (entry && entry.last_modified) {
+        validators['If-Modified-Since'] = entry.last_modified;
+    }
+
+    const response = await fetchWebpage(pageUrl, validators);
+    if (response.statusCode === 304 && entry) {
+        // Unchanged - refresh validators and serve the stored body
+        for (const header of ['etag', 'last-modified', 'date', 'cache-control', 'expires']) {
+            if (response.headers[header]) {
+                const existing = Object.keys(entry.headers).find((name) => name.toLowerCase() === header) || header;
+                entry.headers[existing] = response.headers[header];
+            }
+        }
+        entry.etag = response.headers['etag'] || entry.etag;
+        entry.last_modified = response.headers['last-modified'] || entry.last_modified;
+        entry.validated_at = entry.accessed_at = Date.now() / 1000;
+        writeAtomic(entryPath(pageUrl), JSON.stringify(entry, null, 2));
+        return cachedResponse(entry);
+    }
+    if (response.statusCode === 200) {
+        storeCacheEntry(pageUrl, response, entry);
+    }
+    return response;
+}
+
 // Function to check for tracking codes
 function analyzeTrackingCodes(html) {
     const results = {
@@ -381,14 +525,18 @@ function displayResults(trackingResults, seoResults, headers) {
 async function main() {
     try {
         console.log('🔄 Fetching webpage...');
-        const response = await fetchWebpage(websiteUrl);
+        const response = await fetchWithCache(websiteUrl);
         
         if (response.statusCode !== 200) {
             console.error(`${colors.red}❌ Error: HTTP ${response.statusCode}${colors.reset}`);
             process.exit(1);
         }
 
-        console.log(`${colors.green}✅ Webpage fetched successfully${colors.reset}`);
+        if (response.fromCache) {
+            console.log(`${colors.green}✅ Webpage loaded from cache${colors.reset}`);
+        } else {
+            console.log(`${colors.green}✅ Webpage fetched successfully${colors.reset}`);
+        }
         
         const trackingResults = analyzeTrackingCodes(response.body);
         const seoResults = analyzeTechnicalSEO(response.body, response.headers);